@@ -5,15 +5,62 @@ Pytest配置文件
 
 import pytest
 import os
-import subprocess
-import sys
+import time
 from pathlib import Path
-from playwright.sync_api import Playwright, Browser, BrowserContext, Page
+from playwright.sync_api import Playwright, Browser, BrowserContext
+from tests.modules.worker_module import get_worker_dir, get_worker_id
 
 
 # pytest hook将在下面统一处理
 
 
+def pytest_configure(config):
+    """生成本次运行ID（pytest-xdist工作进程通过环境变量继承同一个ID）"""
+    from tests.modules.timing_module import get_run_id
+    get_run_id()
+
+
+def pytest_sessionstart(session):
+    """记录会话开始时间（会话结束时只有本次写入了Allure结果才生成报告）"""
+    session.start_time = time.time()
+
+
+def pytest_runtest_logstart(nodeid, location):
+    """记录当前执行的测试，步骤耗时按测试归档"""
+    from tests.modules.timing_module import set_current_test
+    set_current_test(nodeid)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_fixture_setup(fixturedef, request):
+    """会话级fixture的准备工作在首个使用它的测试中执行，其步骤耗时记入会话级记录，不计入该测试"""
+    if fixturedef.scope != 'session':
+        yield
+        return
+    from tests.modules.timing_module import session_timings
+    with session_timings():
+        yield
+
+
+def pytest_runtest_logreport(report):
+    """收集测试结果写入运行历史（pytest-xdist工作进程的报告会转发到主进程）"""
+    from tests.modules.run_history_module import record_test_report
+    record_test_report(report)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def boh_stub_server():
+    """ENV=local时启动本地BOH模拟服务（端口上已有模拟服务时直接复用）"""
+    if os.getenv('ENV', 'test') != 'local':
+        yield None
+        return
+    from tests.modules.stub_server_module import start_stub_server
+    server = start_stub_server()
+    yield server
+    if server is not None:
+        server.stop()
+
+
 @pytest.fixture(scope="session")
 def playwright():
     """创建Playwright实例"""
@@ -24,26 +71,96 @@ def playwright():
 
 @pytest.fixture(scope="session")
 def browser(playwright: Playwright):
-    """创建浏览器实例（Chrome）"""
+    """
+    创建浏览器实例（Chrome）
+    
+    会话级fixture：串行执行时整个会话共用一个浏览器，
+    pytest-xdist并行执行时每个工作进程各自启动一个浏览器，供该进程的所有测试复用
+    
+    BROWSER_DAEMON=true时连接常驻浏览器（不存在或不可用时先启动），测试结束后只断开连接，浏览器留给下次运行
+    """
     import os
     # CI环境使用headless模式，本地开发使用headed模式
     is_ci = os.getenv('CI', 'false').lower() == 'true'
-    browser = playwright.chromium.launch(
-        headless=is_ci,  # CI环境使用headless，本地显示浏览器窗口
-        channel="chrome" if not is_ci else None  # CI环境不使用系统Chrome，使用Playwright自带的
-    )
+    channel = "chrome" if not is_ci else None  # CI环境不使用系统Chrome，使用Playwright自带的
+    
+    from tests.modules.browser_daemon_module import connect_browser_daemon, is_browser_daemon_enabled
+    if is_browser_daemon_enabled():
+        browser = connect_browser_daemon(playwright, headless=is_ci, channel=channel)
+        print(f'🌐 已连接常驻浏览器（工作进程: {get_worker_id()}）')
+    else:
+        browser = playwright.chromium.launch(
+            headless=is_ci,  # CI环境使用headless，本地显示浏览器窗口
+            channel=channel
+        )
+        print(f'🌐 浏览器已启动（工作进程: {get_worker_id()}）')
     yield browser
     browser.close()
 
 
+@pytest.fixture(scope="session")
+def login_cache(browser: Browser):
+    """会话级登录态缓存，每个(环境, 账号, 品牌别名)只登录一次"""
+    from tests.modules.login_cache_module import LoginCache
+    return LoginCache(browser)
+
+
+@pytest.fixture(scope="session")
+def context_pool(browser: Browser):
+    """会话级浏览器上下文池（隔离级别为pooled的测试使用，见tests/modules/context_pool_module.py）"""
+    from tests.modules.context_pool_module import ContextPool
+    pool = ContextPool()
+    yield pool
+    pool.close()
+    if pool.stats['created']:
+        print(pool.format_stats())
+
+
+def _create_test_context(browser: Browser, request, context_options: dict):
+    """
+    新建浏览器上下文并注册静态资源缓存和请求过滤
+    
+    Returns:
+        (上下文, [静态资源缓存, 请求过滤器])，后两者在上下文关闭时输出统计
+    """
+    context = browser.new_context(**context_options)
+    
+    # 静态资源（JS、CSS等）从本地缓存返回（ASSET_CACHE_MODE=off 可关闭）；需要先于请求过滤注册，被过滤的请求不进入缓存
+    from tests.modules.asset_cache_module import apply_asset_cache
+    asset_cache = apply_asset_cache(context)
+    
+    # 按过滤配置拦截图片、字体、统计埋点等与校验无关的请求（默认不过滤，ROUTE_PROFILE或@pytest.mark.route_profile('standard') 启用）
+    from tests.modules.route_module import apply_route_profile, get_route_profile_name
+    route_filter = apply_route_profile(context, get_route_profile_name(request.node))
+    
+    return context, [route_filter, asset_cache]
+
+
 @pytest.fixture(scope="function")
 def context(browser: Browser, request):
-    """创建浏览器上下文，配置视频录制和截图"""
-    from pathlib import Path
+    """
+    创建浏览器上下文，按录制策略配置视频和Trace
+    
+    策略见tests/modules/capture_module.py：测试标记 @pytest.mark.capture(video=..., trace=...)
+    优先于环境变量VIDEO_MODE / TRACE_MODE，默认只保留失败用例的视频
+    
+    隔离级别为pooled（@pytest.mark.isolation('pooled') 或 CONTEXT_ISOLATION=pooled）时从上下文池获取已登录的上下文，
+    测试结束后重置并放回池中；池中的上下文跨测试复用，不录制视频（Trace按策略照常录制）
+    """
+    from tests.modules.artifact_module import get_artifact_worker
+    from tests.modules.capture_module import (
+        find_latest,
+        get_capture_mode,
+        get_video_size,
+        is_test_failed,
+        remove_artifacts,
+        should_keep,
+        should_record
+    )
     
-    # 创建测试结果目录
-    test_results_dir = Path('test-results')
-    test_results_dir.mkdir(exist_ok=True)
+    # 创建测试结果目录（并行执行时按工作进程隔离）
+    test_results_dir = get_worker_dir('test-results')
+    test_results_dir.mkdir(parents=True, exist_ok=True)
     
     # 为每个测试创建独立的目录
     test_name = request.node.name.replace('/', '_').replace('\\', '_')
@@ -54,39 +171,104 @@ def context(browser: Browser, request):
     is_ci = os.getenv('CI', 'false').lower() == 'true'
     viewport_config = {'width': 1920, 'height': 1080} if is_ci else None
     
-    # 配置视频录制（始终录制）
-    context = browser.new_context(
-        viewport=viewport_config,  # CI环境使用固定viewport，本地环境由测试代码控制
-        record_video_dir=str(test_dir),  # 视频保存目录
-        record_video_size={'width': 1920, 'height': 1080}  # 视频尺寸
-    )
+    # 加载缓存的登录态（标记fresh_login的测试完整执行登录流程）
+    from tests.modules.login_cache_module import is_login_cache_enabled
+    storage_state = None
+    if is_login_cache_enabled() and not request.node.get_closest_marker('fresh_login'):
+        try:
+            storage_state = request.getfixturevalue('login_cache').get_storage_state()
+        except Exception as e:
+            print(f'⚠️  获取登录态缓存失败，测试中将完整执行登录: {e}')
+    
+    # 隔离级别：pooled时从上下文池获取（标记fresh_login的测试始终新建上下文）
+    from tests.modules.context_pool_module import ISOLATION_POOLED, get_isolation_level, get_pool_key
+    pooled = get_isolation_level(request.node) == ISOLATION_POOLED
+    
+    # 按录制策略决定本次执行是否录制视频/Trace（池中的上下文跨测试复用，不录制视频）
+    video_mode = get_capture_mode(request.node, 'video')
+    trace_mode = get_capture_mode(request.node, 'trace')
+    record_video = should_record(video_mode, request.node) and not pooled
+    record_trace = should_record(trace_mode, request.node)
+    
+    context_options = {
+        'viewport': viewport_config,  # CI环境使用固定viewport，本地环境由测试代码控制
+        'storage_state': storage_state  # 预先登录的登录态
+    }
+    if record_video:
+        context_options['record_video_dir'] = str(test_dir)  # 视频保存目录
+        context_options['record_video_size'] = get_video_size()  # 视频尺寸（默认1280x720）
+    
+    if pooled:
+        from tests.config.login_config import CREDENTIALS, ENV
+        from tests.modules.route_module import get_route_profile_name
+        pool = request.getfixturevalue('context_pool')
+        pool_key = get_pool_key(
+            ENV, CREDENTIALS['account'], CREDENTIALS['brandAlias'], get_route_profile_name(request.node)
+        )
+        context = pool.acquire(
+            pool_key,
+            lambda: _create_test_context(browser, request, context_options),
+            storage_state=storage_state
+        )
+        reporters = []
+    else:
+        context, reporters = _create_test_context(browser, request, context_options)
+    if storage_state:
+        from tests.config.login_config import CREDENTIALS, ENV
+        from tests.modules.login_module import mark_session_context
+        mark_session_context(context, ENV, CREDENTIALS['account'], CREDENTIALS['brandAlias'])
+    
+    if record_trace:
+        context.tracing.start(screenshots=True, snapshots=True, sources=False)
     
     # 保存测试目录路径到request中，以便后续使用
     request.node.test_dir = test_dir
     
     yield context
     
+    failed = is_test_failed(request.node)
+    
+    # Trace只在需要保留时写入文件，否则直接丢弃
+    if record_trace:
+        try:
+            if should_keep(trace_mode, failed):
+                trace_path = test_dir / 'trace.zip'
+                context.tracing.stop(path=str(trace_path))
+                request.node.trace_path = str(trace_path)
+            else:
+                context.tracing.stop()
+        except Exception as e:
+            print(f'⚠️  保存Trace失败: {e}')
+    
+    if pooled:
+        # 测试失败时上下文状态不确定，不再复用
+        pool.release(context, reusable=not failed)
+        return
+    
+    for reporter in reporters:
+        if reporter is not None:
+            print(reporter.format_stats())
+    
     # 关闭context时，视频会自动保存
     context.close()
     
-    # 查找保存的视频文件（Playwright会自动生成文件名）
-    video_files = list(test_dir.glob('*.webm'))
-    if video_files:
-        # 使用最新的视频文件
-        video_file = max(video_files, key=lambda p: p.stat().st_mtime)
-        # 使用绝对路径或相对于报告目录的路径
-        request.node.video_path = str(video_file)
-    else:
-        # 如果没有找到，尝试使用默认名称
-        default_video = test_dir / 'video.webm'
-        if default_video.exists():
-            request.node.video_path = str(default_video)
+    if record_video:
+        if should_keep(video_mode, failed):
+            # 查找保存的视频文件（Playwright会自动生成文件名）
+            video_file = find_latest(test_dir, '*.webm')
+            if video_file:
+                request.node.video_path = str(video_file)
+        else:
+            # 通过的用例不保留视频（在后台线程中删除）
+            get_artifact_worker().submit(remove_artifacts, list(test_dir.glob('*.webm')), description='删除视频')
 
 
 @pytest.fixture(scope="function")
 def page(context: BrowserContext, request):
-    """创建页面对象，支持截图"""
+    """创建页面对象，支持截图（注入页面性能采集脚本）"""
+    from tests.modules.web_vitals_module import install_web_vitals
     page = context.new_page()
+    install_web_vitals(page)
     yield page
     
     # 测试结束后，如果失败则截图
@@ -96,12 +278,14 @@ def page(context: BrowserContext, request):
             if test_dir:
                 screenshot_path = test_dir / 'screenshot.png'
             else:
-                test_results_dir = Path('test-results')
+                test_results_dir = get_worker_dir('test-results')
                 test_name = request.node.name.replace('/', '_').replace('\\', '_')
                 screenshot_path = test_results_dir / test_name / 'screenshot.png'
-                screenshot_path.parent.mkdir(parents=True, exist_ok=True)
             
-            page.screenshot(path=str(screenshot_path), full_page=True)
+            # 截图数据在测试线程中取出，写盘交给后台线程（附件登记时会等待写入完成）
+            from tests.modules.artifact_module import get_artifact_worker, write_artifact
+            data = page.screenshot(full_page=True)
+            get_artifact_worker().submit(write_artifact, screenshot_path, data, path=screenshot_path, description='失败截图')
             # 保存截图路径到request中（使用绝对路径）
             request.node.screenshot_path = str(screenshot_path)
             print(f'📸 失败截图已保存: {screenshot_path}')
@@ -111,121 +295,296 @@ def page(context: BrowserContext, request):
     page.close()
 
 
+# 异步fixtures（playwright.async_api），需要安装pytest-asyncio，未安装时不注册
+try:
+    import pytest_asyncio
+except ImportError:
+    pytest_asyncio = None
+
+if pytest_asyncio is not None:
+    @pytest_asyncio.fixture(scope="session", loop_scope="session")
+    async def async_browser():
+        """
+        创建异步浏览器实例（会话级，整个会话共用一个事件循环）
+
+        同一个事件循环可以同时驱动多个页面，浏览器启动参数与同步browser fixture一致
+        """
+        from playwright.async_api import async_playwright
+        is_ci = os.getenv('CI', 'false').lower() == 'true'
+        channel = "chrome" if not is_ci else None
+        from tests.modules.browser_daemon_module import async_connect_browser_daemon, is_browser_daemon_enabled
+        async with async_playwright() as p:
+            if is_browser_daemon_enabled():
+                browser = await async_connect_browser_daemon(p, headless=is_ci, channel=channel)
+                print(f'🌐 异步浏览器已连接常驻浏览器（工作进程: {get_worker_id()}）')
+            else:
+                browser = await p.chromium.launch(headless=is_ci, channel=channel)
+                print(f'🌐 异步浏览器已启动（工作进程: {get_worker_id()}）')
+            yield browser
+            await browser.close()
+
+    @pytest_asyncio.fixture(loop_scope="session")
+    async def async_context(async_browser, request):
+        """
+        创建异步浏览器上下文，按录制策略配置视频和Trace
+
+        登录态缓存文件在有效期内时直接加载（缓存由同步login_cache写入，这里不会再启动同步浏览器），
+        否则测试中完整执行登录
+        """
+        from tests.config.login_config import CREDENTIALS, ENV
+        from tests.modules.artifact_module import get_artifact_worker
+        from tests.modules.capture_module import (
+            find_latest,
+            get_capture_mode,
+            get_video_size,
+            is_test_failed,
+            remove_artifacts,
+            should_keep,
+            should_record
+        )
+        from tests.modules.login_cache_module import get_storage_state_path, is_login_cache_enabled, is_storage_state_fresh
+
+        test_name = request.node.name.replace('/', '_').replace('\\', '_')
+        test_dir = get_worker_dir('test-results') / test_name
+        test_dir.mkdir(parents=True, exist_ok=True)
+
+        is_ci = os.getenv('CI', 'false').lower() == 'true'
+        context_options = {'viewport': {'width': 1920, 'height': 1080} if is_ci else None}
+
+        if is_login_cache_enabled() and not request.node.get_closest_marker('fresh_login'):
+            storage_path = get_storage_state_path(ENV, CREDENTIALS['account'], CREDENTIALS['brandAlias'])
+            if is_storage_state_fresh(storage_path):
+                context_options['storage_state'] = str(storage_path)
+
+        video_mode = get_capture_mode(request.node, 'video')
+        trace_mode = get_capture_mode(request.node, 'trace')
+        record_video = should_record(video_mode, request.node)
+        record_trace = should_record(trace_mode, request.node)
+        if record_video:
+            context_options['record_video_dir'] = str(test_dir)
+            context_options['record_video_size'] = get_video_size()
+
+        context = await async_browser.new_context(**context_options)
+        if context_options.get('storage_state'):
+            from tests.modules.login_module import mark_session_context
+            mark_session_context(context, ENV, CREDENTIALS['account'], CREDENTIALS['brandAlias'])
+        from tests.modules.asset_cache_module import async_apply_asset_cache
+        asset_cache = await async_apply_asset_cache(context)
+        from tests.modules.route_module import async_apply_route_profile, get_route_profile_name
+        route_filter = await async_apply_route_profile(context, get_route_profile_name(request.node))
+        if record_trace:
+            await context.tracing.start(screenshots=True, snapshots=True, sources=False)
+        request.node.test_dir = test_dir
+
+        yield context
+
+        failed = is_test_failed(request.node)
+        if record_trace:
+            try:
+                if should_keep(trace_mode, failed):
+                    trace_path = test_dir / 'trace.zip'
+                    await context.tracing.stop(path=str(trace_path))
+                    request.node.trace_path = str(trace_path)
+                else:
+                    await context.tracing.stop()
+            except Exception as e:
+                print(f'⚠️  保存Trace失败: {e}')
+
+        if route_filter is not None:
+            print(route_filter.format_stats())
+        if asset_cache is not None:
+            print(asset_cache.format_stats())
+        await context.close()
+
+        if record_video:
+            if should_keep(video_mode, failed):
+                video_file = find_latest(test_dir, '*.webm')
+                if video_file:
+                    request.node.video_path = str(video_file)
+            else:
+                get_artifact_worker().submit(remove_artifacts, list(test_dir.glob('*.webm')), description='删除视频')
+
+    @pytest_asyncio.fixture(loop_scope="session")
+    async def async_page(async_context, request):
+        """创建异步页面对象，失败时截图（注入页面性能采集脚本）"""
+        from tests.modules.web_vitals_module import async_install_web_vitals
+        page = await async_context.new_page()
+        await async_install_web_vitals(page)
+        yield page
+
+        if hasattr(request.node, 'rep_call') and request.node.rep_call.failed:
+            try:
+                screenshot_path = request.node.test_dir / 'screenshot.png'
+                from tests.modules.artifact_module import get_artifact_worker, write_artifact
+                data = await page.screenshot(full_page=True)
+                get_artifact_worker().submit(
+                    write_artifact, screenshot_path, data, path=screenshot_path, description='失败截图'
+                )
+                request.node.screenshot_path = str(screenshot_path)
+                print(f'📸 失败截图已保存: {screenshot_path}')
+            except Exception as e:
+                print(f'⚠️  截图保存失败: {e}')
+
+        await page.close()
+
+    def pytest_collection_modifyitems(items):
+        """
+        异步测试排在同步测试之前
+
+        sync_api的Playwright启动后主线程上一直有运行中的事件循环，之后pytest-asyncio无法再运行事件循环；
+        异步测试先执行时会话级事件循环只在测试执行期间运行，不影响之后启动sync_api的Playwright
+        """
+        items.sort(key=lambda item: item.get_closest_marker('asyncio') is None)
+
+
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_runtest_makereport(item, call):
-    """在测试报告中添加视频和截图（Allure）"""
+    """在测试报告中添加视频、Trace和截图（Allure）"""
     outcome = yield
     report = outcome.get_result()
     
     # 存储测试结果
     setattr(item, f"rep_{report.when}", report)
     
-    # 如果是测试调用阶段（call），添加Allure附件
-    if report.when == 'call':
-        # 添加视频到Allure报告
-        if hasattr(item, 'video_path'):
-            try:
-                import allure
-                video_path = item.video_path
-                video_path_obj = Path(video_path)
-                if video_path_obj.exists():
-                    # 将视频复制到allure-results目录
-                    allure_results_dir = Path('allure-results')
-                    allure_results_dir.mkdir(exist_ok=True)
-                    video_name = video_path_obj.name
-                    allure_video_path = allure_results_dir / video_name
-                    import shutil
-                    shutil.copy2(video_path_obj, allure_video_path)
-                    # 添加到Allure附件
-                    allure.attach.file(
-                        str(allure_video_path),
-                        name="操作视频",
-                        attachment_type=allure.attachment_type.WEBM
-                    )
-            except Exception as e:
-                print(f'⚠️  添加视频到Allure报告失败: {e}')
+    # 视频、Trace和失败截图在fixture清理时才写入磁盘，因此在teardown阶段添加Allure附件
+    # 附件通过allure.attach.file添加（后台写入的截图先等待写入完成）
+    if report.when == 'teardown':
+        import allure
+        from tests.modules.capture_module import attach_artifact
         
-        # 添加失败截图到Allure报告
-        if report.failed and hasattr(item, 'screenshot_path'):
-            try:
-                import allure
-                screenshot_path = item.screenshot_path
-                screenshot_path_obj = Path(screenshot_path)
-                if screenshot_path_obj.exists():
-                    # 读取截图文件并附加到Allure
-                    with open(screenshot_path_obj, 'rb') as f:
-                        allure.attach(
-                            f.read(),
-                            name="失败截图",
-                            attachment_type=allure.attachment_type.PNG
-                        )
-            except Exception as e:
-                print(f'⚠️  添加截图到Allure报告失败: {e}')
+        artifacts = [
+            ('video_path', '操作视频', allure.attachment_type.WEBM),
+            ('trace_path', 'Playwright Trace', allure.attachment_type.ZIP),
+            ('screenshot_path', '失败截图', allure.attachment_type.PNG)
+        ]
+        for attr, name, attachment_type in artifacts:
+            if hasattr(item, attr):
+                attach_artifact(getattr(item, attr), name, attachment_type)
+        
+        # 附加本测试的步骤耗时
+        from tests.modules.timing_module import format_step_summary, get_test_timings
+        timings = get_test_timings(item.nodeid)
+        if timings:
+            import json
+            print('\n⏱️  步骤耗时:')
+            print(format_step_summary(timings))
+            allure.attach(
+                json.dumps(timings, ensure_ascii=False, indent=2),
+                name="步骤耗时",
+                attachment_type=allure.attachment_type.JSON
+            )
+            
+            # 附加登录、导航和打开详情时采集的页面性能指标（按URL_CONFIG条目归类）
+            from tests.modules.web_vitals_module import get_page_metrics
+            page_metrics = get_page_metrics(timings)
+            if page_metrics:
+                allure.attach(
+                    json.dumps(page_metrics, ensure_ascii=False, indent=2),
+                    name="页面性能",
+                    attachment_type=allure.attachment_type.JSON
+                )
 
 
 @pytest.hookimpl(trylast=True)
 def pytest_sessionfinish(session, exitstatus):
     """
     测试会话结束后，生成Allure报告
+    （pytest-xdist并行执行时只在主进程生成，工作进程只保存各自的缓存数据）
     """
-    allure_results_dir = Path('allure-results')
-    allure_report_dir = Path('allure-report')
+    # 等待后台产物任务（截图写盘、删除不保留的产物）完成，之后才能生成报告
+    from tests.modules.artifact_module import ARTIFACT_DRAIN_TIMEOUT, drain_artifact_worker
+    artifact_stats = drain_artifact_worker()
+    if artifact_stats:
+        message = f'📦 产物后台任务: {artifact_stats["submitted"]} 个'
+        if artifact_stats['failed']:
+            message += f'，失败 {artifact_stats["failed"]} 个'
+        if artifact_stats['unfinished']:
+            message += f'，{ARTIFACT_DRAIN_TIMEOUT:.0f}秒内未完成 {artifact_stats["unfinished"]} 个'
+        print(message)
+    
+    # 保存选择器命中记录，并输出本次会话的命中统计
+    try:
+        from tests.modules.selector_module import get_selector_registry
+        registry = get_selector_registry()
+        stats_text = registry.format_stats()
+        if stats_text:
+            print('\n🎯 选择器命中统计:')
+            print(stats_text)
+        registry.save()
+    except Exception as e:
+        print(f'⚠️  保存选择器命中记录失败: {e}')
+    
+    # 保存步骤耗时JSON（并行执行时各工作进程先写入各自目录，再由主进程合并）
+    from tests.modules.timing_module import (
+        STEP_TIMINGS_FILE,
+        merge_step_timings,
+        reset_step_timings,
+        write_step_timings
+    )
+    timings_path = None
+    try:
+        timings_path = write_step_timings(get_worker_dir('test-results') / STEP_TIMINGS_FILE)
+        if not hasattr(session.config, 'workerinput') and timings_path is None:
+            worker_files = list(Path('test-results').glob(f'*/{STEP_TIMINGS_FILE}'))
+            timings_path = merge_step_timings(worker_files, Path('test-results') / STEP_TIMINGS_FILE)
+        if timings_path:
+            print(f'⏱️  步骤耗时已保存: {timings_path}')
+    except Exception as e:
+        print(f'⚠️  保存步骤耗时失败: {e}')
+    finally:
+        # 记录已写入文件，同一进程中的下一次会话（如pytest.main多次调用）从空记录开始
+        reset_step_timings()
+    
+    if hasattr(session.config, 'workerinput'):
+        return
+    
+    # 追加本次运行到运行历史数据库（查询：python -m tests.modules.run_history_module stats）
+    # 没有记录任何步骤耗时的运行（如只执行单元测试）不记录
+    from tests.modules.run_history_module import RUN_HISTORY_DB, is_run_history_enabled, record_session
+    if timings_path and is_run_history_enabled():
+        try:
+            history = record_session(timings_path, int(exitstatus))
+            if history:
+                print(
+                    f'📈 运行历史已记录: {history["tests"]} 个测试，{history["steps"]} 个步骤 ({RUN_HISTORY_DB})'
+                )
+        except Exception as e:
+            print(f'⚠️  记录运行历史失败: {e}')
+    
+    from tests.modules.report_module import (
+        ALLURE_REPORT_DIR,
+        ALLURE_RESULTS_DIR,
+        REPORT_LOG_FILE,
+        generate_report,
+        get_report_mode,
+        has_results_since,
+        open_report,
+        should_open_report,
+        start_background_generation
+    )
+    allure_results_dir = ALLURE_RESULTS_DIR
+    allure_report_dir = ALLURE_REPORT_DIR
     
-    if allure_results_dir.exists() and list(allure_results_dir.glob('*.json')):
+    if not has_results_since(allure_results_dir, getattr(session, 'start_time', 0)):
+        print('\n⚠️  本次运行没有写入Allure测试结果，跳过生成报告\n')
+    else:
         print('\n' + '='*80)
         print('📊 Allure测试结果已生成！')
         print(f'📁 结果目录: {allure_results_dir.absolute()}')
         print('='*80 + '\n')
         
-        # 尝试生成Allure报告（如果安装了allure命令行工具）
-        try:
-            result = subprocess.run(
-                ['allure', 'generate', str(allure_results_dir), '-o', str(allure_report_dir), '--clean'],
-                capture_output=True,
-                text=True,
-                timeout=60
+        # 生成模式见tests/modules/report_module.py：本地默认在后台进程中生成，CI默认在当前进程中生成
+        report_mode = get_report_mode()
+        if report_mode == 'background':
+            start_background_generation(
+                allure_results_dir, allure_report_dir, open_after=should_open_report(), since=session.start_time
             )
-            
-            if result.returncode == 0 and allure_report_dir.exists():
-                report_index = allure_report_dir / 'index.html'
-                if report_index.exists():
-                    print('✅ Allure报告已生成！')
-                    print(f'📁 报告目录: {allure_report_dir.absolute()}')
-                    
-                    # 使用allure open命令打开报告（会启动本地HTTP服务器）
-                    try:
-                        print('🚀 正在启动Allure服务器...')
-                        # allure open会在后台启动服务器并打开浏览器
-                        subprocess.Popen(
-                            ['allure', 'open', str(allure_report_dir)],
-                            stdout=subprocess.DEVNULL,
-                            stderr=subprocess.DEVNULL
-                        )
-                        print('✅ 已在浏览器中打开Allure报告（通过本地服务器）\n')
-                        print('💡 提示: 如果浏览器未自动打开，请使用以下命令:')
-                        print(f'   allure open {allure_report_dir}\n')
-                    except Exception as e:
-                        print(f'⚠️  自动打开报告失败: {e}')
-                        print(f'   请使用以下命令手动打开:')
-                        print(f'   allure open {allure_report_dir}\n')
-                        print(f'   或者直接打开文件（可能显示loading）:')
-                        print(f'   {report_index.absolute()}\n')
-                else:
-                    print('⚠️  Allure报告生成失败，但结果文件已保存\n')
-                    print('💡 提示: 使用以下命令生成并打开报告:')
-                    print(f'   allure generate {allure_results_dir} -o {allure_report_dir} --clean')
-                    print(f'   allure open {allure_report_dir}\n')
-            else:
-                print('⚠️  Allure命令行工具未安装，无法自动生成报告\n')
+            print(f'🕒 Allure报告正在后台生成，日志: {REPORT_LOG_FILE}')
+            print(f'   完成后使用 allure open {allure_report_dir} 查看\n')
+        elif report_mode == 'foreground':
+            report_index = generate_report(allure_results_dir, allure_report_dir, since=session.start_time)
+            if report_index is None:
                 print('💡 提示: 使用以下命令生成并打开报告:')
-                print(f'   allure generate {allure_results_dir} -o {allure_report_dir} --clean')
-                print(f'   allure open {allure_report_dir}\n')
-        except FileNotFoundError:
-            print('⚠️  Allure命令行工具未安装\n')
-            print('💡 提示: 安装Allure后使用以下命令生成并打开报告:')
-            print(f'   allure generate {allure_results_dir} -o {allure_report_dir} --clean')
-            print(f'   allure open {allure_report_dir}\n')
-        except subprocess.TimeoutExpired:
-            print('⚠️  生成Allure报告超时\n')
-    else:
-        print('\n⚠️  未找到Allure测试结果文件\n')
+                print('   python -m tests.modules.report_module --open\n')
+            elif should_open_report():
+                open_report(allure_report_dir)
@@ -0,0 +1,56 @@
+"""
+BOH后台接口配置
+按名称登记页面依赖的后端接口（URL正则），用于等待接口响应、捕获接口数据
+注意：这些是匹配完整请求URL的正则表达式
+"""
+
+import os
+
+API_CONFIG = {
+    # 登录接口
+    'login': os.getenv('API_LOGIN_PATTERN', r'/(api|oauth)/.*(login|token)'),
+
+    # 订货单列表（门店运营/订货）
+    'orderList': os.getenv('API_ORDER_LIST_PATTERN', r'/api/.*demand.*(list|query|search)'),
+
+    # 订货单详情
+    'orderDetail': os.getenv('API_ORDER_DETAIL_PATTERN', r'/api/.*demand.*(detail|get|info)')
+}
+
+
+# 订货单列表接口中各业务字段可能使用的键名（按顺序匹配第一个存在的键）
+ORDER_LIST_FIELDS = {
+    'order_number': ['code', 'orderCode', 'demandCode', 'orderNo', 'order_number'],
+    'status': ['statusName', 'statusLabel', 'status', 'processStatus'],
+    'store_name': ['storeName', 'receivedByName', 'store_name'],
+    'source': ['sourceName', 'typeName', 'source', 'type'],
+    'order_date': ['demandDate', 'orderDate', 'demand_date', 'order_date']
+}
+
+# 接口返回的枚举值与页面展示文案的对应关系
+API_VALUE_LABELS = {
+    'status': {
+        'INITED': '新建',
+        'SUBMITTED': '已提交',
+        'APPROVED': '已审核',
+        'REJECTED': '已驳回',
+        'CANCELLED': '已作废'
+    },
+    'source': {
+        'HD': '总部分配',
+        'SD': '门店订货'
+    }
+}
+
+
+def get_api_pattern(name: str) -> str:
+    """
+    获取接口URL正则
+
+    Args:
+        name: 接口名称（如：orderList），不在配置中时按正则原样使用
+
+    Returns:
+        接口URL正则
+    """
+    return API_CONFIG.get(name, name)
@@ -1,9 +1,10 @@
 """
 BOH后台登录配置
-包含生产环境和测试环境的域名及登录凭据
+包含生产环境、测试环境和本地模拟服务的域名及登录凭据
 """
 
 import os
+from .stub_config import STUB_CONFIG, get_stub_base_url
 
 LOGIN_CONFIG = {
     # 生产环境配置
@@ -28,17 +29,25 @@ LOGIN_CONFIG = {
             'password': 'admin@123',
             'brandAlias': 'hex'
         }
+    },
+
+    # 本地模拟服务配置（ENV=local，登录页和BOH页面由tests/modules/stub_server_module.py提供）
+    'local': {
+        'authBaseUrl': get_stub_base_url(),
+        'loginUrl': f'{get_stub_base_url()}/page/login',
+        'bohBaseUrl': get_stub_base_url(),
+        'credentials': STUB_CONFIG['credentials']
     }
 }
 
 # 默认使用测试环境（可通过环境变量切换）
-ENV = os.getenv('ENV', 'test')  # 'production' 或 'test'
+ENV = os.getenv('ENV', 'test')  # 'production'、'test' 或 'local'
 CURRENT_CONFIG = LOGIN_CONFIG.get(ENV, LOGIN_CONFIG['test'])
 
 # 导出当前环境的配置（方便直接使用）
 AUTH_BASE_URL = CURRENT_CONFIG['authBaseUrl']
-LOGIN_URL = CURRENT_CONFIG['loginUrl']
-BOH_BASE_URL = CURRENT_CONFIG['bohBaseUrl']
+LOGIN_URL = os.getenv('LOGIN_URL', CURRENT_CONFIG['loginUrl'])
+BOH_BASE_URL = os.getenv('BOH_BASE_URL', CURRENT_CONFIG['bohBaseUrl'])
 CREDENTIALS = CURRENT_CONFIG['credentials']
 
 
@@ -0,0 +1,67 @@
+"""
+请求过滤配置
+按配置拦截或替换与校验无关的资源（图片、字体、媒体、统计埋点、长轮询），加快页面加载并让networkidle可以达到
+注意：URL规则均为匹配完整请求URL的正则表达式
+"""
+
+# 默认使用的过滤配置（环境变量ROUTE_PROFILE或测试标记 @pytest.mark.route_profile('standard') 可覆盖）
+# 注册路由后浏览器不再使用HTTP缓存，每个命中的请求还要经过一次路由处理，因此默认不过滤
+DEFAULT_ROUTE_PROFILE = 'off'
+
+# 第三方统计服务的域名（含子域名）
+_ANALYTICS_HOSTS = (
+    r'google-analytics\.com|googletagmanager\.com|hm\.baidu\.com|cnzz\.com|'
+    r'growingio\.com|sensorsdata\.cn|hotjar\.com|sentry\.io'
+)
+
+# 拦截第三方统计脚本
+_ANALYTICS_BLOCK_PATTERNS = [
+    rf'^https?://([^/?#]+\.)?({_ANALYTICS_HOSTS})(:\d+)?/'
+]
+
+# 第三方统计服务的埋点上报地址直接返回204（避免SDK失败重试）
+_ANALYTICS_STUB_PATTERNS = [
+    r'^https?://([^/?#]+\.)?hm\.baidu\.com/hm\.gif',
+    r'^https?://([^/?#]+\.)?(google-analytics\.com|googletagmanager\.com)/(g/)?collect(\?|$)',
+    r'^https?://([^/?#]+\.)?sensorsdata\.cn(:\d+)?/sa(\.gif)?(\?|$)',
+    r'^https?://[^/?#]+\.log\.aliyuncs\.com/logstores/'
+]
+
+ROUTE_PROFILES = {
+    # 不过滤任何请求
+    'off': None,
+
+    # 标准配置：拦截图片、字体、媒体和第三方统计，埋点上报直接返回204
+    'standard': {
+        'block_resource_types': ['image', 'font', 'media'],
+        'block_patterns': _ANALYTICS_BLOCK_PATTERNS,
+        'stub_patterns': _ANALYTICS_STUB_PATTERNS
+    },
+
+    # 严格配置：在标准配置基础上替换长轮询和服务端推送请求（页面依赖实时消息时不要使用）
+    # 服务端推送请求无法按URL识别，所有请求都要经过路由处理
+    'strict': {
+        'block_resource_types': ['image', 'font', 'media', 'eventsource'],
+        'block_patterns': _ANALYTICS_BLOCK_PATTERNS,
+        'stub_patterns': _ANALYTICS_STUB_PATTERNS + [
+            r'/(poll|long-?polling|notice/unread|message/count)(/|\?|$)'
+        ]
+    }
+}
+
+# 按资源类型拦截时，只有URL带这些扩展名的请求才注册路由（其余请求不经过路由处理）；
+# 不在此表中的资源类型（如eventsource）需要检查所有请求
+ROUTE_RESOURCE_EXTENSIONS = {
+    'image': ['png', 'jpe?g', 'gif', 'webp', 'svg', 'ico', 'bmp', 'avif'],
+    'font': ['woff2?', 'ttf', 'otf', 'eot'],
+    'media': ['mp4', 'webm', 'mp3', 'ogg', 'wav', 'm4a']
+}
+
+# 不过滤的请求：'*' 对所有页面生效，其他键为url_config.URL_CONFIG中的分组名，只对该分组下的页面生效
+ROUTE_ALLOWLIST = {
+    # 登录页的验证码图片
+    '*': [r'captcha', r'verify-?code'],
+
+    # 商品页面需要展示商品图片
+    'product': [r'\.(png|jpe?g|webp|gif)(\?|$)']
+}
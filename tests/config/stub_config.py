@@ -0,0 +1,80 @@
+"""
+本地BOH模拟服务配置
+ENV=local时登录页、订货列表和详情页都由本地模拟服务提供，不依赖外部网络
+注意：端口、延迟、分页大小均可通过环境变量调整
+"""
+
+import os
+
+STUB_CONFIG = {
+    # 监听地址和端口（pytest-xdist并行执行时每个工作进程使用 端口+进程序号）
+    'host': os.getenv('BOH_STUB_HOST', '127.0.0.1'),
+    'port': int(os.getenv('BOH_STUB_PORT', '8765')),
+
+    # 每个请求的人为延迟（毫秒），接口请求可单独配置
+    'latencyMs': int(os.getenv('BOH_STUB_LATENCY_MS', '0')),
+    'apiLatencyMs': int(os.getenv('BOH_STUB_API_LATENCY_MS', os.getenv('BOH_STUB_LATENCY_MS', '0'))),
+
+    # 订货单列表每页行数，以及除种子数据外额外生成的订货单数量（用于模拟大列表）
+    'pageSize': int(os.getenv('BOH_STUB_PAGE_SIZE', '50')),
+    'fillerOrders': int(os.getenv('BOH_STUB_ORDER_COUNT', '200')),
+
+    # 登录凭据和租户名
+    'credentials': {
+        'account': 'admin',
+        'password': 'admin@123',
+        'brandAlias': 'hex'
+    },
+    'tenantName': '合阔x'
+}
+
+# 种子订货单（与test_login.py中的期望数据一致）
+STUB_ORDERS = [
+    {
+        'id': '4001',
+        'code': '342512080002',
+        'status': 'APPROVED',
+        'type': 'HD',
+        'demandDate': '2025-12-08',
+        'storeName': 'WEN测试直营门店01',
+        'storeCode': '100000010',
+        'products': [
+            {'code': 'T20251128012', 'name': '测试20251128012', 'unit': '个', 'quantity': 10}
+        ]
+    },
+    {
+        'id': '4002',
+        'code': '342512080001',
+        'status': 'APPROVED',
+        'type': 'HD',
+        'demandDate': '2025-12-08',
+        'storeName': 'WEN测试直营门店02',
+        'storeCode': '100000011',
+        'products': [
+            {'code': 'T20251128011', 'name': '测试20251128011', 'unit': '个', 'quantity': 5},
+            {'code': 'T20251128013', 'name': '测试20251128013', 'unit': '箱', 'quantity': 2}
+        ]
+    }
+]
+
+
+def get_stub_port() -> int:
+    """
+    获取当前进程使用的模拟服务端口
+
+    Returns:
+        端口号，pytest-xdist工作进程gwN使用 基础端口+N+1，避免互相冲突
+    """
+    worker = os.getenv('PYTEST_XDIST_WORKER', '')
+    offset = int(worker[2:]) + 1 if worker.startswith('gw') and worker[2:].isdigit() else 0
+    return STUB_CONFIG['port'] + offset
+
+
+def get_stub_base_url() -> str:
+    """
+    获取模拟服务的基础URL
+
+    Returns:
+        基础URL（如：http://127.0.0.1:8765）
+    """
+    return f'http://{STUB_CONFIG["host"]}:{get_stub_port()}'
@@ -5,6 +5,8 @@ BOH后台URL配置
 """
 
 import os
+from typing import Optional
+from urllib.parse import urlencode, urlparse
 
 URL_CONFIG = {
     # 组织管理URL
@@ -92,6 +94,18 @@ URL_CONFIG = {
 }
 
 
+# 列表页从URL读取筛选条件时使用的查询参数名（ORDER_LIST_DIRECT_URL=true时使用，可通过环境变量按实际页面调整）
+LIST_QUERY_PARAMS = {
+    # 订货列表
+    'order': {
+        'start_date': os.getenv('ORDER_LIST_PARAM_START', 'start'),    # 开始日期（YYYY-MM-DD）
+        'end_date': os.getenv('ORDER_LIST_PARAM_END', 'end'),          # 结束日期（YYYY-MM-DD）
+        'store': os.getenv('ORDER_LIST_PARAM_STORE', 'store'),         # 订货门店
+        'status': os.getenv('ORDER_LIST_PARAM_STATUS', 'status')       # 单据状态
+    }
+}
+
+
 def get_full_url(base_url: str, path: str) -> str:
     """
     获取完整的URL（需要配合baseUrl使用）
@@ -110,12 +124,64 @@ def get_full_url(base_url: str, path: str) -> str:
     return f'{clean_base_url}{clean_path}'
 
 
+def get_query_url(base_url: str, path: str, params: dict) -> str:
+    """
+    获取带查询参数的完整URL
+    
+    Args:
+        base_url: 基础URL
+        path: 相对路径
+        params: 查询参数，值为None的参数会被忽略
+        
+    Returns:
+        完整的URL（如：https://saas-boh-qa.hexcloud.cn/store-supply/demand-daily?start=2025-12-01&end=2025-12-31）
+    """
+    query = urlencode({key: value for key, value in params.items() if value is not None})
+    full_url = get_full_url(base_url, path)
+    return f'{full_url}?{query}' if query else full_url
+
+
+def get_url_group(url: str) -> Optional[str]:
+    """
+    获取页面URL所属的URL_CONFIG分组
+
+    Args:
+        url: 页面URL（完整URL或路径）
+
+    Returns:
+        分组名（如：storeOperations），不属于任何分组时返回None
+    """
+    path = urlparse(url).path or '/'
+    for group, paths in URL_CONFIG.items():
+        if any(path == page_path or path.startswith(f'{page_path}/') for page_path in paths.values()):
+            return group
+    return None
+
+
+def get_url_entry(url: str) -> Optional[str]:
+    """
+    获取页面URL对应的URL_CONFIG条目
+
+    Args:
+        url: 页面URL（完整URL或路径）
+
+    Returns:
+        条目名（分组.页面，如：storeOperations.order），不属于任何条目时返回None
+    """
+    path = urlparse(url).path or '/'
+    for group, paths in URL_CONFIG.items():
+        for name, page_path in paths.items():
+            if path == page_path or path.startswith(f'{page_path}/'):
+                return f'{group}.{name}'
+    return None
+
+
 def get_boh_base_url(env: str = None) -> str:
     """
     根据环境获取BOH的baseUrl
     
     Args:
-        env: 环境名称（'production' 或 'test'），如果为None则从环境变量获取
+        env: 环境名称（'production'、'test' 或 'local'），如果为None则从环境变量获取
         
     Returns:
         BOH的baseUrl
@@ -123,9 +189,11 @@ def get_boh_base_url(env: str = None) -> str:
     if env is None:
         env = os.getenv('ENV', 'test')
     
+    from .stub_config import get_stub_base_url
     boh_base_urls = {
         'production': 'https://boh.hexcloud.cn',
-        'test': 'https://saas-boh-qa.hexcloud.cn'
+        'test': 'https://saas-boh-qa.hexcloud.cn',
+        'local': get_stub_base_url()
     }
     return boh_base_urls.get(env, boh_base_urls['test'])
 
@@ -0,0 +1,162 @@
+"""
+接口数据捕获模块
+监听页面上指定名称的接口响应，按结构化数据查找记录并校验字段，
+替代对整行文本做子串匹配的DOM校验
+"""
+
+import weakref
+from typing import Any, Dict, List, Optional
+from playwright.sync_api import Page
+from .wait_module import response_matcher
+
+# 页面 -> {接口名称: [Response, ...]}，页面关闭后自动释放
+_captures = weakref.WeakKeyDictionary()
+
+
+def start_response_capture(page: Page, name: str):
+    """
+    开始捕获页面上指定名称的接口响应（同一页面同一接口只注册一次）
+
+    Args:
+        page: Playwright页面对象
+        name: 接口名称（见api_config.API_CONFIG）
+    """
+    captures = _captures.setdefault(page, {})
+    if name in captures:
+        return
+
+    responses = captures[name] = []
+    predicate = response_matcher(name)
+
+    def on_response(response):
+        # 事件回调中只保存响应对象，需要时再读取响应体
+        if predicate(response):
+            responses.append(response)
+
+    page.on('response', on_response)
+
+
+def get_captured_json(page: Page, name: str) -> List[Any]:
+    """
+    获取已捕获的接口响应数据（最新的在前）
+
+    Args:
+        page: Playwright页面对象
+        name: 接口名称
+
+    Returns:
+        解析后的JSON数据列表，无法解析的响应会被跳过
+    """
+    results = []
+    for response in reversed(_captures.get(page, {}).get(name, [])):
+        try:
+            results.append(response.json())
+        except Exception as e:
+            print(f'接口响应解析失败，已跳过: {response.url} ({e})')
+    return results
+
+
+async def async_get_captured_json(page, name: str) -> List[Any]:
+    """get_captured_json的异步版本（playwright.async_api的页面对象）"""
+    results = []
+    for response in reversed(_captures.get(page, {}).get(name, [])):
+        try:
+            results.append(await response.json())
+        except Exception as e:
+            print(f'接口响应解析失败，已跳过: {response.url} ({e})')
+    return results
+
+
+def find_record(data: Any, value: str) -> Optional[dict]:
+    """
+    在接口返回的JSON中查找某个字段值等于value的记录（深度优先，返回最内层的记录）
+
+    Args:
+        data: 接口返回的JSON数据
+        value: 要查找的值（如：订单号）
+
+    Returns:
+        包含该值的记录，未找到返回None
+    """
+    if isinstance(data, dict):
+        for child in data.values():
+            if isinstance(child, (dict, list)):
+                record = find_record(child, value)
+                if record is not None:
+                    return record
+        if any(not isinstance(v, (dict, list)) and str(v) == str(value) for v in data.values()):
+            return data
+    elif isinstance(data, list):
+        for item in data:
+            record = find_record(item, value)
+            if record is not None:
+                return record
+    return None
+
+
+def _flatten(record: dict, prefix: str = '') -> Dict[str, Any]:
+    """将嵌套记录展开为 {键路径: 标量值}"""
+    flat = {}
+    for key, value in record.items():
+        path = f'{prefix}.{key}' if prefix else str(key)
+        if isinstance(value, dict):
+            flat.update(_flatten(value, path))
+        elif not isinstance(value, list):
+            flat[path] = value
+    return flat
+
+
+def _normalize(field: str, value: Any, value_labels: dict) -> str:
+    """将接口值转换为页面展示文案（枚举值按映射转换）"""
+    text = '' if value is None else str(value)
+    return value_labels.get(field, {}).get(text, text)
+
+
+def _value_matches(field: str, expected: str, actual: str) -> bool:
+    """字段值比较：日期字段允许接口返回带时间的值"""
+    if field.endswith('date'):
+        return actual == expected or actual.startswith(f'{expected}T') or actual.startswith(f'{expected} ')
+    return actual == expected
+
+
+def match_record_fields(
+    record: dict,
+    expected: Dict[str, str],
+    field_map: Dict[str, List[str]],
+    value_labels: Dict[str, Dict[str, str]] = None
+) -> Dict[str, tuple]:
+    """
+    按字段校验接口记录
+
+    优先使用field_map中登记的键名；记录中没有登记的键时，
+    退回为"期望值与记录中某个字段值完全相等"，仍然不会做子串匹配
+
+    Args:
+        record: 接口记录
+        expected: 期望值 {字段名: 期望值}
+        field_map: 字段名 -> 可能的键名列表
+        value_labels: 字段名 -> {接口枚举值: 展示文案}
+
+    Returns:
+        不匹配的字段 {字段名: (期望值, 实际值)}，全部匹配时为空字典
+    """
+    value_labels = value_labels or {}
+    flat = _flatten(record)
+    # 叶子键名（忽略大小写）-> 值，用于按键名查找嵌套字段
+    leaf_values = {}
+    for path, value in flat.items():
+        leaf_values.setdefault(path.split('.')[-1].lower(), value)
+
+    mismatches = {}
+    for field, expected_value in expected.items():
+        keys = [k.lower() for k in field_map.get(field, [])]
+        present = [k for k in keys if k in leaf_values]
+        if present:
+            actual = _normalize(field, leaf_values[present[0]], value_labels)
+            if not _value_matches(field, expected_value, actual):
+                mismatches[field] = (expected_value, actual)
+        else:
+            candidates = [_normalize(field, v, value_labels) for v in flat.values()]
+            if not any(_value_matches(field, expected_value, c) for c in candidates):
+                mismatches[field] = (expected_value, None)
+    return mismatches
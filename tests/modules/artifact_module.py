@@ -0,0 +1,152 @@
+"""
+产物后台处理模块
+失败截图写盘、视频/Trace放入allure-results、删除通过用例的视频等文件操作交给后台线程池执行，
+测试线程只负责从浏览器取出数据和登记Allure附件，不再等待磁盘；会话结束时等待后台任务完成（有超时）
+
+工作线程数：环境变量ARTIFACT_WORKERS（默认2，0表示在测试线程中同步执行）
+"""
+
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+# 后台工作线程数
+ARTIFACT_WORKERS = int(os.getenv('ARTIFACT_WORKERS', '2'))
+
+# 会话结束时等待后台任务完成的超时时间（秒）
+ARTIFACT_DRAIN_TIMEOUT = float(os.getenv('ARTIFACT_DRAIN_TIMEOUT', '120'))
+
+
+class ArtifactWorker:
+    """
+    产物后台处理线程池
+
+    submit() 提交文件操作并按目标路径登记，后续依赖该文件的任务可以用 wait_for() 等待其写入完成；
+    任务中的异常只输出警告，不影响测试结果
+    """
+
+    def __init__(self, max_workers: int = ARTIFACT_WORKERS):
+        self._executor = (
+            ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='artifact') if max_workers > 0 else None
+        )
+        self._lock = threading.Lock()
+        self._futures: List[Future] = []
+        # 目标路径 -> 写入该文件的任务
+        self._pending: Dict[Path, Future] = {}
+        self.stats = {'submitted': 0, 'failed': 0}
+
+    def _run(self, fn: Callable, args: tuple, description: str):
+        try:
+            return fn(*args)
+        except Exception as e:
+            with self._lock:
+                self.stats['failed'] += 1
+            print(f'⚠️  处理产物失败（{description}）: {e}')
+            return None
+
+    def submit(self, fn: Callable, *args, path=None, description: str = '') -> Future:
+        """
+        提交后台任务
+
+        Args:
+            fn: 执行文件操作的函数
+            *args: fn的参数
+            path: 任务写入的目标文件（可选，登记后可用wait_for等待）
+            description: 任务描述（用于失败时的警告）
+
+        Returns:
+            任务的Future
+        """
+        with self._lock:
+            self.stats['submitted'] += 1
+        if self._executor is None:
+            future = Future()
+            future.set_result(self._run(fn, args, description))
+        else:
+            future = self._executor.submit(self._run, fn, args, description)
+        with self._lock:
+            self._futures.append(future)
+            if path is not None:
+                self._pending[Path(path)] = future
+        return future
+
+    def is_pending(self, path) -> bool:
+        """目标文件是否由已提交的任务写入（任务可能已完成）"""
+        with self._lock:
+            return Path(path) in self._pending
+
+    def wait_for(self, path, timeout: float = None):
+        """等待写入目标文件的任务完成（没有对应任务时直接返回）"""
+        with self._lock:
+            future = self._pending.get(Path(path))
+        if future is not None:
+            future.result(timeout=timeout)
+
+    def drain(self, timeout: float = ARTIFACT_DRAIN_TIMEOUT) -> int:
+        """
+        等待所有后台任务完成，并关闭线程池
+
+        Args:
+            timeout: 超时时间（秒）
+
+        Returns:
+            超时未完成的任务数
+        """
+        with self._lock:
+            futures = list(self._futures)
+        _, not_done = wait(futures, timeout=timeout)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        return len(not_done)
+
+
+_worker: Optional[ArtifactWorker] = None
+_worker_lock = threading.Lock()
+
+
+def get_artifact_worker() -> ArtifactWorker:
+    """获取当前进程的产物后台处理线程池（首次调用时创建）"""
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = ArtifactWorker()
+        return _worker
+
+
+def drain_artifact_worker(timeout: float = ARTIFACT_DRAIN_TIMEOUT) -> Optional[dict]:
+    """
+    会话结束时等待后台任务完成
+
+    Args:
+        timeout: 超时时间（秒）
+
+    Returns:
+        {'submitted', 'failed', 'unfinished'}，本进程没有提交过任务时返回None
+    """
+    global _worker
+    with _worker_lock:
+        worker, _worker = _worker, None
+    if worker is None:
+        return None
+    unfinished = worker.drain(timeout)
+    return dict(worker.stats, unfinished=unfinished)
+
+
+def write_artifact(path, data: bytes) -> Path:
+    """
+    将产物数据写入文件（后台任务）
+
+    Args:
+        path: 目标文件
+        data: 文件内容
+
+    Returns:
+        目标文件路径
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return path
@@ -0,0 +1,336 @@
+"""
+静态资源缓存模块
+在浏览器上下文上注册路由，将BOH前端的静态资源（JS、CSS、字体、图片）按内容哈希保存到磁盘，
+之后新建的上下文直接从磁盘返回，不再重复下载SPA资源包
+
+缓存失效：文件名带内容哈希的资源（如 app.3f2a1c9b.js）内容不会变化，一直有效；
+其他资源超过有效期（ASSET_CACHE_MAX_AGE）后重新下载；读取时校验内容哈希，文件损坏时视为未命中
+
+运行：python -m tests.modules.asset_cache_module --stats | --prune | --clear
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+# 缓存目录（可通过环境变量ASSET_CACHE_DIR覆盖）
+ASSET_CACHE_DIR = Path(os.getenv('ASSET_CACHE_DIR', '.cache/assets'))
+
+# 不带内容哈希的资源的有效期（秒）
+ASSET_CACHE_MAX_AGE = int(os.getenv('ASSET_CACHE_MAX_AGE', '86400'))
+
+# 缓存的资源类型和URL
+CACHEABLE_RESOURCE_TYPES = ('script', 'stylesheet', 'font', 'image')
+CACHEABLE_URL_PATTERN = re.compile(r'\.(js|mjs|css|woff2?|ttf|otf|eot|svg|png|jpe?g|gif|webp|ico)(\?|$)', re.IGNORECASE)
+
+# 文件名中的内容哈希（如 app.3f2a1c9b.js、chunk-vendors-8d1e2f3a.css）
+HASHED_ASSET_PATTERN = re.compile(r'[.\-_][0-9a-f]{8,}\.[a-z0-9]+(\?|$)', re.IGNORECASE)
+
+# 返回缓存内容时保留的响应头
+_KEPT_HEADERS = ('content-type', 'access-control-allow-origin', 'timing-allow-origin')
+
+
+def get_asset_cache_mode() -> str:
+    """
+    获取缓存模式（环境变量ASSET_CACHE_MODE）
+
+    Returns:
+        'on'（命中时返回缓存，未命中时下载并保存，默认）、'refresh'（忽略已有缓存，重新下载并保存）或 'off'
+    """
+    mode = os.getenv('ASSET_CACHE_MODE', 'on').lower()
+    if mode not in ('on', 'refresh', 'off'):
+        print(f'⚠️  未知的静态资源缓存模式 "{mode}"，使用默认值: on')
+        mode = 'on'
+    return mode
+
+
+class AssetCache:
+    """
+    按内容寻址的静态资源磁盘缓存
+
+    objects/ 下按内容SHA-256保存资源内容（相同内容只保存一份），meta/ 下按URL的哈希保存元数据；
+    每个条目单独写文件并原子替换，pytest-xdist并行执行时各工作进程可以同时读写
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path = ASSET_CACHE_DIR,
+        max_age: int = ASSET_CACHE_MAX_AGE,
+        refresh: bool = False
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.max_age = max_age
+        self.refresh = refresh
+        self.stats = {'hits': 0, 'misses': 0, 'stored': 0, 'bytes_served': 0}
+
+    def _meta_path(self, url: str) -> Path:
+        return self.cache_dir / 'meta' / f'{hashlib.sha256(url.encode("utf-8")).hexdigest()}.json'
+
+    def _object_path(self, digest: str) -> Path:
+        return self.cache_dir / 'objects' / digest[:2] / digest
+
+    @staticmethod
+    def is_cacheable(method: str, url: str, resource_type: str) -> bool:
+        """
+        请求是否使用缓存
+
+        Args:
+            method: 请求方法
+            url: 请求URL
+            resource_type: 资源类型
+
+        Returns:
+            bool: GET请求且为静态资源类型/扩展名
+        """
+        return (
+            method == 'GET'
+            and url.startswith(('http://', 'https://'))
+            and resource_type in CACHEABLE_RESOURCE_TYPES
+            and bool(CACHEABLE_URL_PATTERN.search(url))
+        )
+
+    def is_fresh(self, url: str, stored_at: float, now: float = None) -> bool:
+        """
+        缓存条目是否有效：带内容哈希的资源一直有效，其他资源在有效期内有效
+
+        Args:
+            url: 资源URL
+            stored_at: 保存时间（时间戳）
+            now: 当前时间（可选）
+
+        Returns:
+            bool: 是否有效
+        """
+        if HASHED_ASSET_PATTERN.search(url):
+            return True
+        return (now or time.time()) - stored_at <= self.max_age
+
+    def lookup(self, url: str) -> Optional[dict]:
+        """
+        查找缓存
+
+        Args:
+            url: 资源URL
+
+        Returns:
+            {'status', 'headers', 'body'}，未命中、过期或内容损坏时返回None
+        """
+        if self.refresh:
+            return None
+        meta_path = self._meta_path(url)
+        try:
+            meta = json.loads(meta_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return None
+        if meta.get('url') != url or not self.is_fresh(url, meta['stored_at']):
+            return None
+        try:
+            body = self._object_path(meta['sha256']).read_bytes()
+        except OSError:
+            return None
+        if hashlib.sha256(body).hexdigest() != meta['sha256']:
+            print(f'⚠️  静态资源缓存内容损坏，重新下载: {url}')
+            return None
+        return {'status': meta['status'], 'headers': meta['headers'], 'body': body}
+
+    def store(self, url: str, status: int, headers: dict, body: bytes) -> bool:
+        """
+        保存资源（只保存200响应，响应头为no-store时不保存）
+
+        Args:
+            url: 资源URL
+            status: 响应状态码
+            headers: 响应头
+            body: 响应内容
+
+        Returns:
+            bool: 是否已保存
+        """
+        headers = {key.lower(): value for key, value in headers.items()}
+        if status != 200 or 'no-store' in headers.get('cache-control', ''):
+            return False
+
+        digest = hashlib.sha256(body).hexdigest()
+        object_path = self._object_path(digest)
+        if not object_path.exists():
+            self._atomic_write(object_path, body)
+        meta = {
+            'url': url,
+            'sha256': digest,
+            'status': status,
+            'headers': {key: value for key, value in headers.items() if key in _KEPT_HEADERS},
+            'size': len(body),
+            'stored_at': time.time()
+        }
+        self._atomic_write(self._meta_path(url), json.dumps(meta, ensure_ascii=False).encode('utf-8'))
+        self.stats['stored'] += 1
+        return True
+
+    @staticmethod
+    def _atomic_write(path: Path, data: bytes):
+        """先写临时文件再原子替换，并行写入同一条目时不会写坏文件"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+
+    def _record_hit(self, cached: dict):
+        self.stats['hits'] += 1
+        self.stats['bytes_served'] += len(cached['body'])
+
+    def handle(self, route):
+        """路由处理器（sync_api）：命中时直接返回缓存，未命中时下载并保存"""
+        request = route.request
+        if not self.is_cacheable(request.method, request.url, request.resource_type):
+            route.fallback()
+            return
+        cached = self.lookup(request.url)
+        if cached is not None:
+            self._record_hit(cached)
+            route.fulfill(status=cached['status'], headers=cached['headers'], body=cached['body'])
+            return
+
+        self.stats['misses'] += 1
+        try:
+            response = route.fetch()
+            body = response.body()
+        except Exception:
+            # 下载失败（如页面已关闭）时交给浏览器正常处理
+            route.fallback()
+            return
+        self.store(request.url, response.status, response.headers, body)
+        route.fulfill(response=response, body=body)
+
+    async def handle_async(self, route):
+        """路由处理器（async_api）"""
+        request = route.request
+        if not self.is_cacheable(request.method, request.url, request.resource_type):
+            await route.fallback()
+            return
+        cached = self.lookup(request.url)
+        if cached is not None:
+            self._record_hit(cached)
+            await route.fulfill(status=cached['status'], headers=cached['headers'], body=cached['body'])
+            return
+
+        self.stats['misses'] += 1
+        try:
+            response = await route.fetch()
+            body = await response.body()
+        except Exception:
+            await route.fallback()
+            return
+        self.store(request.url, response.status, response.headers, body)
+        await route.fulfill(response=response, body=body)
+
+    def format_stats(self) -> str:
+        """格式化输出本上下文的缓存统计"""
+        return (
+            f'静态资源缓存: 命中 {self.stats["hits"]} 个（{self.stats["bytes_served"] / 1024:.0f}KB），'
+            f'未命中 {self.stats["misses"]} 个，新保存 {self.stats["stored"]} 个'
+        )
+
+    def prune(self, now: float = None) -> int:
+        """
+        删除过期条目和不再被引用的资源内容
+
+        Args:
+            now: 当前时间（可选）
+
+        Returns:
+            删除的条目数
+        """
+        removed = 0
+        referenced = set()
+        for meta_path in (self.cache_dir / 'meta').glob('*.json'):
+            try:
+                meta = json.loads(meta_path.read_text(encoding='utf-8'))
+            except (OSError, ValueError):
+                meta = None
+            if meta is None or not self.is_fresh(meta['url'], meta['stored_at'], now):
+                meta_path.unlink(missing_ok=True)
+                removed += 1
+            else:
+                referenced.add(meta['sha256'])
+        for object_path in (self.cache_dir / 'objects').glob('*/*'):
+            if object_path.name not in referenced:
+                object_path.unlink(missing_ok=True)
+        return removed
+
+    def summary(self) -> dict:
+        """缓存目录的条目数和占用空间"""
+        entries = len(list((self.cache_dir / 'meta').glob('*.json')))
+        objects = list((self.cache_dir / 'objects').glob('*/*'))
+        return {'entries': entries, 'objects': len(objects), 'bytes': sum(path.stat().st_size for path in objects)}
+
+
+def create_asset_cache() -> Optional[AssetCache]:
+    """
+    按环境变量创建静态资源缓存
+
+    Returns:
+        AssetCache，ASSET_CACHE_MODE=off时返回None
+    """
+    mode = get_asset_cache_mode()
+    if mode == 'off':
+        return None
+    return AssetCache(refresh=mode == 'refresh')
+
+
+def apply_asset_cache(context) -> Optional[AssetCache]:
+    """
+    在浏览器上下文（sync_api）上注册静态资源缓存
+
+    需要在请求过滤（route_module）之前注册：后注册的路由先执行，被过滤掉的请求不会进入缓存
+
+    Args:
+        context: 浏览器上下文
+
+    Returns:
+        注册的AssetCache，缓存关闭时返回None
+    """
+    cache = create_asset_cache()
+    if cache is not None:
+        context.route('**/*', cache.handle)
+    return cache
+
+
+async def async_apply_asset_cache(context) -> Optional[AssetCache]:
+    """
+    在浏览器上下文（async_api）上注册静态资源缓存（apply_asset_cache的异步版本）
+    """
+    cache = create_asset_cache()
+    if cache is not None:
+        await context.route('**/*', cache.handle_async)
+    return cache
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='静态资源缓存管理')
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument('--stats', action='store_true', help='输出缓存条目数和占用空间')
+    group.add_argument('--prune', action='store_true', help='删除过期条目和不再被引用的内容')
+    group.add_argument('--clear', action='store_true', help='清空缓存')
+    args = parser.parse_args()
+
+    cache = AssetCache()
+    if args.clear:
+        shutil.rmtree(cache.cache_dir, ignore_errors=True)
+        print(f'✓ 已清空静态资源缓存: {cache.cache_dir}')
+    elif args.prune:
+        print(f'✓ 已删除 {cache.prune()} 个过期条目')
+    summary = cache.summary()
+    print(f'静态资源缓存 {cache.cache_dir}: {summary["entries"]} 个条目，{summary["objects"]} 个内容文件，'
+          f'{summary["bytes"] / 1024 / 1024:.1f}MB')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
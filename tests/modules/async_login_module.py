@@ -0,0 +1,176 @@
+"""
+登录模块（异步版本）
+与login_module功能相同，基于playwright.async_api，同一个事件循环可以同时驱动多个页面
+选择器、配置和步骤记录与同步版本共用
+"""
+
+import os
+from ..config.login_config import LOGIN_URL, CREDENTIALS, BOH_BASE_URL
+from .login_module import (
+    ACCOUNT_SELECTORS,
+    AGREEMENT_SELECTORS,
+    BRAND_SELECTORS,
+    LOGIN_BUTTON_SELECTORS,
+    LOGIN_ERROR_SELECTORS,
+    PASSWORD_SELECTORS,
+    TENANT_HEADER_SELECTORS,
+    check_cached_session,
+    is_session_context
+)
+from .selector_module import async_resolve_selector
+from .snapshot_module import async_take_snapshot
+from .timing_module import timed_step
+from .wait_module import async_wait_for_dom_quiet, async_wait_for_page_ready
+from .web_vitals_module import measure_navigation
+
+
+async def _async_enter_with_existing_session(page) -> bool:
+    """
+    辅助函数：使用上下文中已有的登录态直接进入BOH
+
+    Args:
+        page: Playwright页面对象（async_api）
+
+    Returns:
+        bool: 登录态是否有效（未被重定向到登录页）
+    """
+    boh_base_url = os.getenv('BOH_BASE_URL', BOH_BASE_URL)
+    try:
+        await page.goto(boh_base_url, wait_until='domcontentloaded', timeout=30000)
+        await async_wait_for_page_ready(page, timeout=10000)
+    except Exception as e:
+        print(f'使用已有登录态打开BOH失败: {e}')
+        return False
+
+    if '/page/login' in page.url:
+        print('已有登录态无效，执行完整登录流程')
+        return False
+
+    print(f'✓ 已使用缓存的登录态进入BOH: {page.url}')
+    return True
+
+
+@timed_step('登录')
+@measure_navigation
+async def async_login(
+    page,
+    login_url: str = LOGIN_URL,
+    account: str = None,
+    password: str = None,
+    brand_alias: str = None,
+    reuse_session: bool = True
+):
+    """
+    执行登录操作（login的异步版本）
+
+    Args:
+        page: Playwright页面对象（async_api）
+        login_url: 登录页面URL（可选，默认使用配置文件中的URL）
+        account: 账号（可选，默认使用配置文件中的账号）
+        password: 密码（可选，默认使用配置文件中的密码）
+        brand_alias: 品牌别名（可选，默认使用配置文件中的品牌别名）
+        reuse_session: 上下文加载了相同环境、账号和品牌别名的登录态缓存（mark_session_context）时是否跳过登录页直接进入BOH
+    """
+    account = CREDENTIALS['account'] if account is None else account
+    password = CREDENTIALS['password'] if password is None else password
+    brand_alias = CREDENTIALS['brandAlias'] if brand_alias is None else brand_alias
+
+    if reuse_session and is_session_context(page.context):
+        if check_cached_session(page.context, login_url, account, brand_alias):
+            if await _async_enter_with_existing_session(page):
+                return
+        else:
+            await page.context.clear_cookies()
+
+    await page.goto(login_url, wait_until='domcontentloaded')
+    await page.wait_for_selector('input[type="text"], input[type="password"]', timeout=10000)
+    await async_wait_for_dom_quiet(page, timeout=2000)
+
+    account_input = await async_resolve_selector(page, 'accountInput', ACCOUNT_SELECTORS, timeout=5000)
+    if not account_input:
+        raise Exception('无法找到账号输入框')
+    await account_input.fill(account)
+
+    password_input = await async_resolve_selector(page, 'passwordInput', PASSWORD_SELECTORS, timeout=5000)
+    if not password_input:
+        raise Exception('无法找到密码输入框')
+    await password_input.fill(password)
+
+    brand_input = await async_resolve_selector(page, 'brandInput', BRAND_SELECTORS, timeout=2000)
+    if brand_input:
+        await brand_input.fill(brand_alias)
+        print(f'已填写品牌别名: {brand_alias}')
+    else:
+        print('未找到品牌别名输入框，继续执行')
+
+    try:
+        checkbox = await async_resolve_selector(page, 'agreementCheckbox', AGREEMENT_SELECTORS, timeout=1000)
+        if checkbox and not await checkbox.is_checked():
+            await checkbox.check()
+            print('已勾选协议复选框')
+    except Exception:
+        pass
+
+    login_button = await async_resolve_selector(page, 'loginButton', LOGIN_BUTTON_SELECTORS, timeout=5000)
+    try:
+        async with page.expect_navigation(timeout=15000, wait_until='domcontentloaded'):
+            if login_button:
+                await login_button.click()
+            else:
+                print('未找到登录按钮，尝试按Enter键')
+                await page.keyboard.press('Enter')
+    except Exception as e:
+        print(f'等待导航超时: {e}，继续检查URL...')
+
+    try:
+        await page.wait_for_url(lambda url: '/page/login' not in url, timeout=30000)
+        print(f'登录成功，页面已跳转到: {page.url}')
+    except Exception as e:
+        print(f'等待离开登录页超时: {e}')
+        for selector in LOGIN_ERROR_SELECTORS:
+            try:
+                error_element = page.locator(selector).first
+                if await error_element.is_visible():
+                    error_text = await error_element.text_content()
+                    if error_text:
+                        print(f'检测到错误/提示信息: {error_text[:200]}')
+            except Exception:
+                continue
+        page_text = (await async_take_snapshot(page)).text
+        print(f'登录超时，当前URL: {page.url}')
+        print(f'页面内容预览: {page_text[:500] if page_text else "空内容"}')
+        raise Exception('登录失败，页面仍在登录页面或登录超时')
+
+    await async_wait_for_page_ready(page, timeout=10000)
+    print(f'登录后页面URL: {page.url}')
+
+
+@timed_step('验证租户名')
+async def async_verify_tenant_name(page, expected_tenant_name: str = '合阔x'):
+    """
+    验证租户名（verify_tenant_name的异步版本）
+
+    Args:
+        page: Playwright页面对象（async_api）
+        expected_tenant_name: 期望的租户名，默认为"合阔x"
+    """
+    await async_wait_for_page_ready(page, timeout=5000)
+
+    found = False
+    try:
+        await page.get_by_text(expected_tenant_name, exact=False).first.wait_for(state='visible', timeout=5000)
+        found = True
+    except Exception:
+        header = await async_resolve_selector(
+            page, 'tenantHeader', TENANT_HEADER_SELECTORS,
+            params={'tenant': expected_tenant_name}, timeout=2000
+        )
+        if header:
+            found = await header.get_by_text(expected_tenant_name, exact=False).first.is_visible()
+
+    snapshot = await async_take_snapshot(page)
+    found = found or snapshot.contains(expected_tenant_name)
+    assert found is True, f'租户名 "{expected_tenant_name}" 未找到'
+    assert snapshot.contains(expected_tenant_name), f'页面文本中未包含租户名 "{expected_tenant_name}"'
+
+    print(f'✓ 租户名验证通过: {expected_tenant_name}')
@@ -0,0 +1,582 @@
+"""
+订货模块（异步版本）
+与order_module功能相同，基于playwright.async_api，同一个事件循环可以同时驱动多个页面
+选择器、页面脚本、订单行查找、断言和步骤记录与同步版本共用（order_module中的公开函数），这里只包含页面操作
+"""
+
+import os
+from datetime import date
+from typing import Union
+from ..config.login_config import BOH_BASE_URL
+from .api_capture_module import async_get_captured_json, find_record, start_response_capture
+from .order_module import (
+    DATE_PICKER_DAY_SELECTORS,
+    DATE_PICKER_SELECTORS,
+    DAY_CELL_FINDER_JS,
+    DETAIL_HEADER_PLACEHOLDERS,
+    DETAIL_SNAPSHOT_SCRIPT,
+    END_DATE_INPUT_SELECTOR,
+    ORDER_LIST_CONFIRM_TIMEOUT,
+    ORDER_ROW_ANCESTOR_XPATH,
+    ORDER_TABLE_SELECTORS,
+    PRODUCT_ROW_SELECTORS,
+    QUERY_BUTTON_SELECTORS,
+    SCROLL_TO_BOTTOM_JS,
+    SCROLL_TO_TOP_JS,
+    START_DATE_INPUT_SELECTOR,
+    as_date,
+    assert_order_detail,
+    assert_order_list_row,
+    assert_product_rows,
+    build_order_list_url,
+    find_order_row_in_snapshot,
+    find_order_row_in_table,
+    is_direct_list_navigation_enabled,
+    match_order_list_record
+)
+from .selector_module import async_resolve_selector
+from .snapshot_module import PageSnapshot, async_take_snapshot, remember_snapshot
+from .table_module import async_read_table
+from .timing_module import record_order_number, timed_step
+from .wait_module import (
+    StepBudget,
+    async_wait_for_dom_quiet,
+    async_wait_for_locator,
+    async_wait_for_named_response,
+    async_wait_for_page_ready
+)
+from .web_vitals_module import measure_navigation
+
+
+async def _async_select_date_from_picker(page, year: int, month: int, day: int) -> bool:
+    """
+    辅助函数：通过日期选择器选择日期（_select_date_from_picker的异步版本）
+
+    Args:
+        page: Playwright页面对象（async_api）
+        year: 年份
+        month: 月份
+        day: 日期
+
+    Returns:
+        bool: 是否成功选择日期
+    """
+    try:
+        picker = await async_resolve_selector(page, 'datePicker', DATE_PICKER_SELECTORS, timeout=3000)
+        if not picker:
+            return False
+        await async_wait_for_dom_quiet(page, quiet_ms=200, timeout=1000)
+
+        date_string = f'{year}-{str(month).zfill(2)}-{str(day).zfill(2)}'
+        day_element = await async_resolve_selector(
+            page, 'datePickerDay', DATE_PICKER_DAY_SELECTORS,
+            params={'date_string': date_string, 'year': year, 'month': month, 'day': day},
+            timeout=2000
+        )
+        if day_element:
+            try:
+                await day_element.click()
+                await async_wait_for_dom_quiet(page, quiet_ms=200, timeout=1000)
+                print(f'成功点击日期元素: {date_string}')
+                return True
+            except Exception:
+                pass
+
+        day_cells = page.locator('[class*="day"], [class*="date"], [role="gridcell"], td, [class*="calendar-day"]')
+        index = await day_cells.evaluate_all(DAY_CELL_FINDER_JS, {'day': str(day), 'dateString': date_string})
+        if index is not None and index >= 0:
+            await day_cells.nth(index).click()
+            await async_wait_for_dom_quiet(page, quiet_ms=200, timeout=1000)
+            print(f'成功点击日期单元格: {date_string}')
+            return True
+
+        return False
+    except Exception as e:
+        print(f'日期选择器操作失败: {e}')
+        return False
+
+
+async def _async_set_date(page, input_selector: str, value: date, label: str, budget: StepBudget):
+    """
+    辅助函数：点击日期输入框并通过日期选择器选择日期，最多重试3次，失败时直接填写输入框
+
+    Args:
+        page: Playwright页面对象（async_api）
+        input_selector: 日期输入框选择器
+        value: 日期
+        label: 日志中的名称（开始日期/结束日期）
+        budget: 步骤等待预算
+    """
+    date_input = page.locator(input_selector).first
+    if await date_input.count() == 0:
+        return
+
+    for attempt in range(3):
+        try:
+            print(f'点击{label}输入框（尝试 {attempt + 1}/3）')
+            await date_input.scroll_into_view_if_needed()
+            await date_input.click(force=True)
+            if await _async_select_date_from_picker(page, value.year, value.month, value.day):
+                print(f'成功通过日期选择器设置{label}: {value}')
+                return
+        except Exception:
+            pass
+        await async_wait_for_dom_quiet(page, quiet_ms=200, timeout=1000, budget=budget)
+
+    try:
+        await date_input.click()
+        await date_input.fill(value.isoformat())
+        print(f'通过fill设置{label}: {value}（后备方案）')
+    except Exception as e:
+        print(f'fill后备方案也失败: {e}')
+
+
+@timed_step('导航到订货页面')
+@measure_navigation
+async def async_navigate_to_order_page(page):
+    """
+    导航到订货页面（navigate_to_order_page的异步版本）
+
+    Args:
+        page: Playwright页面对象（async_api）
+    """
+    start_response_capture(page, 'orderList')
+
+    boh_base_url = os.getenv('BOH_BASE_URL', BOH_BASE_URL)
+    order_page_url = f'{boh_base_url}/store-supply/demand-daily'
+
+    try:
+        print(f'直接导航到订货页面: {order_page_url}')
+        await page.goto(order_page_url, wait_until='domcontentloaded', timeout=30000)
+        await async_wait_for_page_ready(page, timeout=10000)
+        print(f'导航后URL: {page.url}')
+    except Exception as e:
+        print(f'导航到订货页面失败: {e}')
+        if 'demand-daily' in page.url:
+            print('虽然出现错误，但URL已正确，继续执行')
+            await async_wait_for_page_ready(page, timeout=5000)
+            return
+        raise Exception(f'无法导航到订货页面: {e}')
+
+
+@timed_step('选择日期范围并查询')
+async def async_select_date_range_and_query(
+    page,
+    start_year: int,
+    start_month: int,
+    start_day: int,
+    end_year: int,
+    end_month: int,
+    end_day: int
+):
+    """
+    选择日期范围并查询（select_date_range_and_query的异步版本）
+
+    Args:
+        page: Playwright页面对象（async_api）
+        start_year: 开始年份
+        start_month: 开始月份
+        start_day: 开始日期
+        end_year: 结束年份
+        end_month: 结束月份
+        end_day: 结束日期
+    """
+    budget = StepBudget(60000)
+    start_response_capture(page, 'orderList')
+
+    if 'demand-daily' not in page.url:
+        await async_navigate_to_order_page(page)
+    await async_wait_for_page_ready(page, timeout=10000, budget=budget)
+
+    await _async_set_date(page, START_DATE_INPUT_SELECTOR, date(start_year, start_month, start_day), '开始日期', budget)
+    await _async_set_date(page, END_DATE_INPUT_SELECTOR, date(end_year, end_month, end_day), '结束日期', budget)
+    await async_wait_for_dom_quiet(page, timeout=2000, budget=budget)
+
+    query_button = await async_resolve_selector(page, 'queryButton', QUERY_BUTTON_SELECTORS, timeout=3000)
+    if query_button:
+        action = lambda: query_button.click(force=True)
+    else:
+        print('警告: 未找到查询按钮，尝试使用Enter键')
+        action = lambda: page.keyboard.press('Enter')
+
+    list_response = None
+    try:
+        list_response = await async_wait_for_named_response(
+            page, 'orderList', action=action, timeout=20000, budget=budget
+        )
+    except Exception as e:
+        print(f'触发查询时出错: {e}')
+
+    if list_response is not None:
+        print(f'订货单列表接口已返回: {list_response.status}')
+        await async_wait_for_dom_quiet(page, timeout=5000, budget=budget)
+    else:
+        await async_wait_for_page_ready(page, timeout=10000, budget=budget)
+
+    print(f'查询后页面URL: {page.url}')
+    if 'demand-daily' not in page.url:
+        print('警告: 查询后页面跳转到其他页面，重新导航回demand-daily')
+        await async_navigate_to_order_page(page)
+
+
+async def _async_list_filters_applied(page, list_response, start: str, end: str) -> bool:
+    """判断URL中的日期条件是否生效（_list_filters_applied的异步版本）"""
+    request = list_response.request
+    sent = f'{request.url} {request.post_data or ""}'
+    if start in sent and end in sent:
+        return True
+    try:
+        values = await page.locator('input').evaluate_all('inputs => inputs.map(input => input.value || "")')
+    except Exception:
+        return False
+    return any(start in value for value in values) and any(end in value for value in values)
+
+
+@timed_step('按条件打开订货列表')
+async def async_open_order_list(
+    page,
+    start_date: Union[date, str],
+    end_date: Union[date, str],
+    store: str = None,
+    status: str = None,
+    timeout: int = 30000
+) -> bool:
+    """
+    直接打开带筛选条件的订货列表（open_order_list的异步版本）
+
+    Args:
+        page: Playwright页面对象（async_api）
+        start_date: 开始日期（date或YYYY-MM-DD）
+        end_date: 结束日期（date或YYYY-MM-DD）
+        store: 订货门店（可选）
+        status: 单据状态（可选）
+        timeout: 打开页面的超时时间（毫秒）
+
+    Returns:
+        bool: 条件是否通过URL生效（False表示使用日期选择器查询）
+    """
+    start, end = as_date(start_date), as_date(end_date)
+    start_response_capture(page, 'orderList')
+
+    if is_direct_list_navigation_enabled():
+        list_url = build_order_list_url(start, end, store, status)
+        print(f'直接打开订货列表: {list_url}')
+        try:
+            list_response = await async_wait_for_named_response(
+                page, 'orderList',
+                action=lambda: page.goto(list_url, wait_until='domcontentloaded', timeout=timeout),
+                timeout=min(timeout, ORDER_LIST_CONFIRM_TIMEOUT)
+            )
+        except Exception as e:
+            print(f'⚠️  打开订货列表失败: {e}')
+            list_response = None
+
+        if list_response is not None and await _async_list_filters_applied(
+            page, list_response, start.isoformat(), end.isoformat()
+        ):
+            await async_wait_for_dom_quiet(page, timeout=5000)
+            print(f'✓ 订货列表已按URL条件加载: {start} ~ {end}')
+            return True
+        print('⚠️  URL中的筛选条件未生效，改为通过日期选择器查询')
+
+    await async_select_date_range_and_query(page, start.year, start.month, start.day, end.year, end.month, end.day)
+    return False
+
+
+async def _async_verify_order_in_list_api(page, order_number: str, expected: dict) -> bool:
+    """
+    辅助函数：使用捕获的订货单列表接口数据校验订单（_verify_order_in_list_api的异步版本）
+
+    Returns:
+        bool: 是否在接口数据中找到订单并完成校验（未找到时返回False，由调用方退回DOM校验）
+    """
+    if match_order_list_record(await async_get_captured_json(page, 'orderList'), order_number, expected) is None:
+        return False
+
+    await page.get_by_text(order_number, exact=True).first.wait_for(state='visible', timeout=10000)
+    print('✓ 订单行已在列表中展示')
+    return True
+
+
+@timed_step('验证订单列表')
+async def async_find_and_verify_order_in_list(
+    page,
+    order_number: str,
+    status: str,
+    store_name: str,
+    source: str,
+    order_date: str,
+    mode: str = None
+):
+    """
+    查找并验证订单列表数据（find_and_verify_order_in_list的异步版本）
+
+    Args:
+        page: Playwright页面对象（async_api）
+        order_number: 订单号
+        status: 状态
+        store_name: 订货门店
+        source: 来源
+        order_date: 订货日期
+        mode: 校验方式，'dom' 或 'api'（可选，默认读取环境变量ORDER_LIST_VERIFY_MODE，未设置时为'dom'）
+    """
+    record_order_number(order_number)
+    if mode is None:
+        mode = os.getenv('ORDER_LIST_VERIFY_MODE', 'dom').lower()
+
+    await async_wait_for_page_ready(page, timeout=10000)
+    if 'demand-daily' not in page.url:
+        await async_navigate_to_order_page(page)
+
+    if mode == 'api':
+        expected = {
+            'order_number': order_number,
+            'status': status,
+            'store_name': store_name,
+            'source': source,
+            'order_date': order_date
+        }
+        if await _async_verify_order_in_list_api(page, order_number, expected):
+            print('订单列表验证全部通过（接口数据）')
+            return
+
+    row_text = ''
+    # 通过表格读取到订单行时，按列名取值校验
+    list_table = None
+    table_row = None
+
+    # 滚动页面触发懒加载，等待新内容渲染完成
+    await page.evaluate(SCROLL_TO_BOTTOM_JS)
+    await async_wait_for_dom_quiet(page, timeout=2000)
+    await page.evaluate(SCROLL_TO_TOP_JS)
+    await async_wait_for_dom_quiet(page, timeout=2000)
+
+    if not await async_wait_for_locator(page.get_by_text(order_number, exact=True).first, timeout=10000):
+        print('订单号未在页面上显示，尝试其他方法')
+
+    # 方法1: 一次读取整张订单表格，按订货单号列直接取行
+    try:
+        table = await async_resolve_selector(page, 'orderListTable', ORDER_TABLE_SELECTORS, timeout=3000, first=False)
+        list_table = await async_read_table(table or page, '订货单号')
+        table_row, row_text = find_order_row_in_table(list_table, order_number)
+    except Exception as e:
+        print(f'数据表格读取失败: {e}')
+
+    # 方法2: 从订单号元素向上查找所在行
+    if not row_text:
+        try:
+            order_row = page.get_by_text(order_number, exact=True).first.locator(ORDER_ROW_ANCESTOR_XPATH).first
+            if await order_row.is_visible(timeout=2000):
+                row_text = await order_row.text_content() or ''
+                print('通过精确文本匹配找到订单行')
+        except Exception:
+            print('精确文本匹配失败，尝试其他方法')
+
+    # 方法3: 在页面快照中搜索订单号（表格行已按单元格提取，优先直接使用）
+    if not row_text:
+        try:
+            snapshot = await async_take_snapshot(page)
+            row_text = find_order_row_in_snapshot(snapshot, order_number)
+            if not row_text and order_number in snapshot.text:
+                order_element = page.locator(f'text={order_number}').first
+                if await order_element.is_visible(timeout=5000):
+                    order_row = order_element.locator('xpath=ancestor::tr | ancestor::*[contains(@class, "row")]').first
+                    if await order_row.is_visible(timeout=2000):
+                        row_text = await order_row.text_content() or ''
+                        print('通过页面搜索找到订单行')
+                    else:
+                        row_text = snapshot.text
+                        print('订单号存在于页面中')
+        except Exception as e:
+            print(f'页面搜索失败: {e}')
+
+    if not row_text or order_number not in row_text:
+        page_text = (await async_take_snapshot(page)).text
+        print(f'页面内容预览: {page_text[:2000] if page_text else "空内容"}')
+        raise Exception(f'未找到订单号 {order_number}')
+
+    assert_order_list_row(row_text, list_table, table_row, status, store_name, source, order_date)
+
+
+@timed_step('打开订单详情')
+@measure_navigation
+async def async_click_order_to_open_detail(page, order_number: str):
+    """
+    点击订单打开详情页（click_order_to_open_detail的异步版本）
+
+    Args:
+        page: Playwright页面对象（async_api）
+        order_number: 订单号
+    """
+    record_order_number(order_number)
+    start_response_capture(page, 'orderDetail')
+    await async_wait_for_page_ready(page, timeout=5000)
+
+    order_link_clicked = False
+    for exact in (True, False):
+        try:
+            order_link = page.get_by_text(order_number, exact=exact).first
+            await order_link.wait_for(state='visible', timeout=10000)
+            await order_link.click()
+            order_link_clicked = True
+            print('成功点击订单号链接' + ('' if exact else '（部分匹配）'))
+            break
+        except Exception:
+            print('订单号链接点击失败，尝试其他方法')
+
+    if not order_link_clicked:
+        link = page.locator(f'a:has-text("{order_number}"), [href*="{order_number}"]').first
+        try:
+            await link.click(timeout=2000)
+            order_link_clicked = True
+            print('通过链接选择器点击成功')
+        except Exception:
+            print('链接选择器查找失败')
+
+    if order_link_clicked:
+        try:
+            await page.wait_for_url(lambda url: 'detail' in url or '/order/' in url, timeout=15000)
+        except Exception:
+            pass
+    else:
+        print('警告: 可能未能点击订单链接，但继续执行')
+
+    await async_wait_for_page_ready(page, timeout=10000)
+    print(f'详情页URL: {page.url}')
+
+
+async def _async_observe_order_detail(page, order_number: str, timeout: int) -> dict:
+    """
+    辅助函数：在页面内等待详情页头部字段加载完成，并返回页面快照（_observe_order_detail的异步版本）
+
+    Returns:
+        dict: {'ready': 是否就绪, 'snapshot': PageSnapshot}
+    """
+    try:
+        result = await page.evaluate(DETAIL_SNAPSHOT_SCRIPT, {
+            'orderNumber': order_number,
+            'placeholders': DETAIL_HEADER_PLACEHOLDERS,
+            'timeoutMs': timeout
+        })
+        return {'ready': result['ready'], 'snapshot': remember_snapshot(page, result['snapshot'])}
+    except Exception as e:
+        print(f'等待详情页数据中断: {e}')
+        return {'ready': False, 'snapshot': PageSnapshot({'url': page.url})}
+
+
+@timed_step('加载订单详情')
+async def async_load_order_detail(page, order_number: str, timeout: int = 30000) -> dict:
+    """
+    加载订单详情页：等待详情数据就绪后返回结构化页面快照（load_order_detail的异步版本）
+
+    Args:
+        page: Playwright页面对象（async_api）
+        order_number: 订单号
+        timeout: 首次等待的超时时间（毫秒）
+
+    Returns:
+        dict: {'ready': 是否就绪, 'snapshot': PageSnapshot}
+    """
+    record_order_number(order_number)
+    start_response_capture(page, 'orderDetail')
+
+    print('等待详情页数据加载...')
+    snapshot = await _async_observe_order_detail(page, order_number, timeout)
+    if snapshot['ready']:
+        print(f'详情页数据已加载: {order_number}')
+        return snapshot
+
+    captured = await async_get_captured_json(page, 'orderDetail')
+    if not any(find_record(data, order_number) is not None for data in captured):
+        print('详情接口尚未返回该订单数据，等待接口响应...')
+        if await async_wait_for_named_response(page, 'orderDetail', timeout=10000) is not None:
+            snapshot = await _async_observe_order_detail(page, order_number, 5000)
+            if snapshot['ready']:
+                print(f'详情接口返回后数据已加载: {order_number}')
+                return snapshot
+
+    print('检测到详情页数据未加载（显示"-"），刷新页面...')
+    await async_wait_for_named_response(
+        page, 'orderDetail',
+        action=lambda: page.reload(wait_until='domcontentloaded'),
+        timeout=15000
+    )
+    snapshot = await _async_observe_order_detail(page, order_number, 15000)
+    if snapshot['ready']:
+        print('刷新后详情页数据已完全加载')
+    return snapshot
+
+
+@timed_step('验证订单详情')
+async def async_verify_order_detail(
+    page,
+    order_number: str,
+    status: str,
+    source: str,
+    order_date: str,
+    store_name: str,
+    store_code: str
+):
+    """
+    验证订单详情页顶部信息（verify_order_detail的异步版本）
+
+    Args:
+        page: Playwright页面对象（async_api）
+        order_number: 订单号
+        status: 状态
+        source: 来源
+        order_date: 订货日期
+        store_name: 订货门店
+        store_code: 订货门店编号
+    """
+    snapshot = (await async_load_order_detail(page, order_number))['snapshot']
+    assert_order_detail(snapshot, order_number, status, source, order_date, store_name, store_code)
+
+    print('详情页顶部信息验证通过')
+
+
+@timed_step('验证商品行')
+async def async_verify_product_rows(
+    page,
+    expected_count: int = 1,
+    product_code: str = None,
+    product_name: str = None
+):
+    """
+    验证商品行（verify_product_rows的异步版本）
+
+    Args:
+        page: Playwright页面对象（async_api）
+        expected_count: 期望的商品行数量
+        product_code: 商品编号
+        product_name: 商品名称
+    """
+    await async_wait_for_page_ready(page, timeout=10000)
+
+    product_table = None
+    product_rows = []
+    try:
+        product_table = await async_read_table(page, '商品编号')
+        if product_table:
+            product_rows = product_table.lookup_all('商品编号', product_code)
+            print(f'在商品表格中找到 {len(product_rows)} 个商品行')
+    except Exception as e:
+        print(f'商品表格读取失败: {e}')
+    rows_from_table = bool(product_rows)
+
+    if not product_rows:
+        rows_locator = await async_resolve_selector(
+            page, 'productRows', PRODUCT_ROW_SELECTORS,
+            params={'product_code': product_code}, timeout=5000, first=False
+        )
+        if rows_locator:
+            texts = await rows_locator.evaluate_all('rows => rows.map(row => row.textContent || "")')
+            product_rows = [text for text in texts if '商品编号' not in text and '商品名称' not in text]
+            print(f'找到 {len(product_rows)} 个商品行')
+
+    assert_product_rows(
+        (await async_take_snapshot(page)).text, product_table, product_rows,
+        expected_count, product_code, product_name, rows_from_table
+    )
+
+    print('商品信息验证通过')
@@ -0,0 +1,400 @@
+"""
+测试框架性能基准模块
+在本地模拟服务上重复执行登录和订货单校验流程，按步骤统计耗时p50/p95、Playwright调用次数和固定等待耗时，
+保存基线并与基线对比，用于衡量login_module / order_module的改动让测试变快还是变慢
+
+运行：python -m tests.modules.benchmark_module --iterations 10 --save-baseline
+对比：python -m tests.modules.benchmark_module --iterations 10 --compare
+"""
+
+import argparse
+import calendar
+import json
+import math
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+from ..config.stub_config import STUB_CONFIG, STUB_ORDERS
+from .stub_server_module import StubServer, StubState
+from .timing_module import get_test_timings, set_current_test
+
+# 基准结果和默认基线文件
+BENCHMARK_RESULT_FILE = Path('test-results') / 'benchmark.json'
+BENCHMARK_BASELINE_FILE = Path('benchmarks') / 'baseline.json'
+
+# 判定为变慢的阈值：p50超过基线的比例，且绝对差值超过最小毫秒数（避免短步骤的抖动误报）
+DEFAULT_THRESHOLD = 0.2
+DEFAULT_MIN_DELTA_MS = 50.0
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """
+    计算百分位数（线性插值）
+
+    Args:
+        values: 样本
+        pct: 百分位（0-100）
+
+    Returns:
+        百分位数，没有样本时为0
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    lower = math.floor(rank)
+    upper = math.ceil(rank)
+    value = ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+    return round(value, 1)
+
+
+def _flatten_steps(records: List[dict], prefix: str = '') -> List[dict]:
+    """将嵌套步骤展开为列表，子步骤名称为 外层/内层"""
+    steps = []
+    for record in records:
+        name = f'{prefix}{record["name"]}'
+        steps.append(dict(record, name=name))
+        steps.extend(_flatten_steps(record['children'], f'{name}/'))
+    return steps
+
+
+def summarize_runs(runs: List[List[dict]]) -> Dict[str, dict]:
+    """
+    按步骤汇总多次执行的记录
+
+    Args:
+        runs: 每次执行的顶层步骤记录（timing_module的记录格式）
+
+    Returns:
+        {步骤名称: 统计}，另含 'total'（每次执行所有顶层步骤的总耗时）
+    """
+    samples: Dict[str, dict] = {}
+    totals = []
+    for records in runs:
+        totals.append(sum(record['duration_ms'] for record in records))
+        for step in _flatten_steps(records):
+            sample = samples.setdefault(step['name'], {
+                'title': step['title'], 'duration_ms': [], 'calls': [], 'sleep_ms': [], 'wait_ms': [], 'failed': 0
+            })
+            sample['duration_ms'].append(step['duration_ms'])
+            sample['calls'].append(step['playwright_calls'])
+            sample['sleep_ms'].append(step['sleep_ms'])
+            sample['wait_ms'].append(step['wait_ms'])
+            if step['status'] != 'passed':
+                sample['failed'] += 1
+
+    summary = {}
+    for name, sample in samples.items():
+        summary[name] = {
+            'title': sample['title'],
+            'samples': len(sample['duration_ms']),
+            'failed': sample['failed'],
+            'p50_ms': percentile(sample['duration_ms'], 50),
+            'p95_ms': percentile(sample['duration_ms'], 95),
+            'calls_p50': percentile(sample['calls'], 50),
+            'calls_max': max(sample['calls']),
+            'sleep_p50_ms': percentile(sample['sleep_ms'], 50),
+            'wait_p50_ms': percentile(sample['wait_ms'], 50)
+        }
+    summary['total'] = {
+        'title': '总计',
+        'samples': len(totals),
+        'failed': 0,
+        'p50_ms': percentile(totals, 50),
+        'p95_ms': percentile(totals, 95),
+        'calls_p50': percentile([sum(r['playwright_calls'] for r in records) for records in runs], 50),
+        'calls_max': max([sum(r['playwright_calls'] for r in records) for records in runs], default=0),
+        'sleep_p50_ms': percentile([sum(r['sleep_ms'] for r in records) for records in runs], 50),
+        'wait_p50_ms': percentile([sum(r['wait_ms'] for r in records) for records in runs], 50)
+    }
+    return summary
+
+
+def compare_to_baseline(
+    summary: Dict[str, dict],
+    baseline: Dict[str, dict],
+    threshold: float = DEFAULT_THRESHOLD,
+    min_delta_ms: float = DEFAULT_MIN_DELTA_MS
+) -> List[str]:
+    """
+    与基线对比，找出变慢的步骤
+
+    以下情况视为退化：
+    - p50耗时超过基线 (1 + threshold) 倍且差值超过min_delta_ms
+    - Playwright调用次数p50多于基线
+    - 固定等待耗时p50比基线多出min_delta_ms以上（例如新增了wait_for_timeout）
+
+    Args:
+        summary: 本次统计（summarize_runs的结果）
+        baseline: 基线统计
+        threshold: 耗时增长比例阈值
+        min_delta_ms: 最小耗时差值（毫秒）
+
+    Returns:
+        退化说明列表，没有退化时为空列表
+    """
+    regressions = []
+    for name, current in summary.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        delta = current['p50_ms'] - base['p50_ms']
+        if delta > min_delta_ms and current['p50_ms'] > base['p50_ms'] * (1 + threshold):
+            regressions.append(
+                f'{current["title"]}: p50 {base["p50_ms"]:.0f}ms -> {current["p50_ms"]:.0f}ms (+{delta:.0f}ms)'
+            )
+        if current['calls_p50'] > base['calls_p50']:
+            regressions.append(
+                f'{current["title"]}: Playwright调用 {base["calls_p50"]:.0f} -> {current["calls_p50"]:.0f} 次'
+            )
+        sleep_delta = current['sleep_p50_ms'] - base['sleep_p50_ms']
+        if sleep_delta > min_delta_ms:
+            regressions.append(
+                f'{current["title"]}: 固定等待 {base["sleep_p50_ms"]:.0f}ms -> {current["sleep_p50_ms"]:.0f}ms'
+            )
+    return regressions
+
+
+def format_summary(summary: Dict[str, dict], baseline: Optional[Dict[str, dict]] = None) -> str:
+    """
+    格式化统计表
+
+    Args:
+        summary: 本次统计
+        baseline: 基线统计（可选，提供时显示p50相对基线的变化）
+
+    Returns:
+        表格文本
+    """
+    lines = [f'{"步骤":<40} {"p50":>8} {"p95":>8} {"调用":>6} {"固定等待":>8} {"条件等待":>8} {"失败":>4}']
+    for name, stats in summary.items():
+        line = (
+            f'{name:<40} {stats["p50_ms"]:>6.0f}ms {stats["p95_ms"]:>6.0f}ms {stats["calls_p50"]:>6.0f} '
+            f'{stats["sleep_p50_ms"]:>6.0f}ms {stats["wait_p50_ms"]:>6.0f}ms {stats["failed"]:>4}'
+        )
+        base = (baseline or {}).get(name)
+        if base and base['p50_ms']:
+            line += f'  ({(stats["p50_ms"] - base["p50_ms"]) / base["p50_ms"]:+.0%})'
+        lines.append(line)
+    return '\n'.join(lines)
+
+
+def run_flow(page, login_url: str):
+    """
+    执行一次完整流程（与test_login.py的步骤一致，使用模拟服务的种子订货单）
+
+    Args:
+        page: Playwright页面对象
+        login_url: 登录页URL
+    """
+    from .login_module import login
+    from .order_module import (
+        click_order_to_open_detail,
+        find_and_verify_order_in_list,
+        navigate_to_order_page,
+        select_date_range_and_query,
+        verify_order_detail,
+        verify_product_rows
+    )
+
+    order = STUB_ORDERS[0]
+    product = order['products'][0]
+    year, month, day = (int(part) for part in order['demandDate'].split('-'))
+    credentials = STUB_CONFIG['credentials']
+
+    login(
+        page,
+        login_url=login_url,
+        account=credentials['account'],
+        password=credentials['password'],
+        brand_alias=credentials['brandAlias']
+    )
+    navigate_to_order_page(page)
+    select_date_range_and_query(page, year, month, 1, year, month, calendar.monthrange(year, month)[1])
+    find_and_verify_order_in_list(
+        page,
+        order_number=order['code'],
+        status='已审核',
+        store_name=order['storeName'],
+        source='总部分配',
+        order_date=order['demandDate']
+    )
+    click_order_to_open_detail(page, order['code'])
+    verify_order_detail(
+        page,
+        order_number=order['code'],
+        status='已审核',
+        source='总部分配',
+        order_date=order['demandDate'],
+        store_name=order['storeName'],
+        store_code=order['storeCode']
+    )
+    verify_product_rows(page, expected_count=1, product_code=product['code'], product_name=product['name'])
+
+
+def run_benchmark(
+    iterations: int = 10,
+    warmup: int = 1,
+    headless: bool = True,
+    latency_ms: int = 0,
+    api_latency_ms: int = None,
+    page_size: int = STUB_CONFIG['pageSize'],
+    filler_orders: int = STUB_CONFIG['fillerOrders']
+) -> dict:
+    """
+    启动模拟服务和浏览器，重复执行流程并汇总
+
+    每次执行使用新的浏览器上下文（不复用登录态），预热执行不计入统计
+
+    Args:
+        iterations: 计入统计的执行次数
+        warmup: 预热执行次数
+        headless: 是否无头模式
+        latency_ms: 模拟服务页面请求延迟（毫秒）
+        api_latency_ms: 模拟服务接口请求延迟（毫秒），默认同latency_ms
+        page_size: 订货列表每页行数
+        filler_orders: 填充订货单数量
+
+    Returns:
+        基准结果（含配置、每次执行的状态和按步骤的统计）
+    """
+    from playwright.sync_api import sync_playwright
+
+    os.environ['STEP_TIMING'] = 'true'
+    os.environ['STEP_TIMING_CALLS'] = 'true'
+    state = StubState(
+        latency_ms=latency_ms,
+        api_latency_ms=latency_ms if api_latency_ms is None else api_latency_ms,
+        page_size=page_size,
+        filler_orders=filler_orders
+    )
+    server = StubServer(port=0, state=state).start()
+    # order_module / login_module 在调用时读取BOH_BASE_URL
+    previous_base_url = os.environ.get('BOH_BASE_URL')
+    os.environ['BOH_BASE_URL'] = server.base_url
+
+    runs = []
+    failures = []
+    try:
+        with sync_playwright() as p:
+            browser = p.chromium.launch(headless=headless)
+            try:
+                for index in range(warmup + iterations):
+                    is_warmup = index < warmup
+                    run_name = f'benchmark::{"warmup" if is_warmup else "run"}-{index}'
+                    set_current_test(run_name)
+                    context = browser.new_context(viewport={'width': 1440, 'height': 900})
+                    page = context.new_page()
+                    start = time.perf_counter()
+                    try:
+                        run_flow(page, f'{server.base_url}/page/login')
+                        error = None
+                    except Exception as e:
+                        error = f'{type(e).__name__}: {e}'[:500]
+                    finally:
+                        context.close()
+                    duration = (time.perf_counter() - start) * 1000
+                    print(f'{"预热" if is_warmup else "执行"} {index + 1}: {duration:.0f}ms' + (f' ✗ {error}' if error else ' ✓'))
+                    if is_warmup:
+                        continue
+                    runs.append(get_test_timings(run_name))
+                    if error:
+                        failures.append({'run': index - warmup, 'error': error})
+            finally:
+                browser.close()
+    finally:
+        set_current_test(None)
+        server.stop()
+        if previous_base_url is None:
+            os.environ.pop('BOH_BASE_URL', None)
+        else:
+            os.environ['BOH_BASE_URL'] = previous_base_url
+
+    return {
+        'written_at': datetime.now().isoformat(timespec='seconds'),
+        'config': {
+            'iterations': iterations,
+            'warmup': warmup,
+            'headless': headless,
+            'latency_ms': state.latency_ms,
+            'api_latency_ms': state.api_latency_ms,
+            'page_size': page_size,
+            'filler_orders': filler_orders
+        },
+        'failures': failures,
+        'steps': summarize_runs(runs)
+    }
+
+
+def load_result(path: Path) -> Optional[dict]:
+    """读取基准结果或基线文件，不存在时返回None"""
+    path = Path(path)
+    if not path.exists():
+        return None
+    return json.loads(path.read_text(encoding='utf-8'))
+
+
+def save_result(result: dict, path: Path) -> Path:
+    """保存基准结果或基线文件"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding='utf-8')
+    return path
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='测试框架性能基准（本地模拟服务）')
+    parser.add_argument('--iterations', type=int, default=10, help='计入统计的执行次数')
+    parser.add_argument('--warmup', type=int, default=1, help='预热执行次数')
+    parser.add_argument('--headed', action='store_true', help='显示浏览器窗口')
+    parser.add_argument('--latency', type=int, default=0, help='模拟服务页面请求延迟（毫秒）')
+    parser.add_argument('--api-latency', type=int, default=None, help='模拟服务接口请求延迟（毫秒），默认同--latency')
+    parser.add_argument('--page-size', type=int, default=STUB_CONFIG['pageSize'], help='订货列表每页行数')
+    parser.add_argument('--orders', type=int, default=STUB_CONFIG['fillerOrders'], help='填充订货单数量')
+    parser.add_argument('--output', default=str(BENCHMARK_RESULT_FILE), help='结果文件')
+    parser.add_argument('--save-baseline', nargs='?', const=str(BENCHMARK_BASELINE_FILE), help='将结果保存为基线')
+    parser.add_argument('--compare', nargs='?', const=str(BENCHMARK_BASELINE_FILE), help='与基线对比，有退化时返回1')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help='p50耗时增长比例阈值')
+    parser.add_argument('--min-delta', type=float, default=DEFAULT_MIN_DELTA_MS, help='最小耗时差值（毫秒）')
+    args = parser.parse_args()
+
+    baseline = load_result(args.compare) if args.compare else None
+    if args.compare and baseline is None:
+        print(f'⚠️  基线文件不存在: {args.compare}')
+
+    result = run_benchmark(
+        iterations=args.iterations,
+        warmup=args.warmup,
+        headless=not args.headed,
+        latency_ms=args.latency,
+        api_latency_ms=args.api_latency,
+        page_size=args.page_size,
+        filler_orders=args.orders
+    )
+    print()
+    print(format_summary(result['steps'], baseline['steps'] if baseline else None))
+    print(f'\n✓ 基准结果已保存: {save_result(result, args.output)}')
+    if args.save_baseline:
+        print(f'✓ 基线已保存: {save_result(result, args.save_baseline)}')
+
+    exit_code = 0
+    if result['failures']:
+        print(f'⚠️  {len(result["failures"])} 次执行失败，第一次错误: {result["failures"][0]["error"]}')
+        exit_code = 1
+    if baseline:
+        regressions = compare_to_baseline(result['steps'], baseline['steps'], args.threshold, args.min_delta)
+        if regressions:
+            print('⚠️  相对基线变慢:')
+            for regression in regressions:
+                print(f'  - {regression}')
+            exit_code = 1
+        else:
+            print('✓ 与基线相比没有退化')
+    return exit_code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,349 @@
+"""
+常驻浏览器模块
+在后台启动一个带远程调试端口的Chromium/Chrome，多次pytest运行通过CDP连接同一个浏览器，省去每次启动浏览器的时间
+浏览器信息（进程ID、端口、启动时间）保存在状态文件中；连接前做健康检查，浏览器已退出、无响应或运行过久时重新启动
+
+启用：BROWSER_DAEMON=true python -m pytest ...
+管理：python -m tests.modules.browser_daemon_module start | stop | status [--headed]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+from urllib.request import urlopen
+from .worker_module import file_lock
+
+# 状态文件和浏览器用户数据目录
+BROWSER_DAEMON_STATE_FILE = Path(os.getenv('BROWSER_DAEMON_STATE_FILE', '.cache/browser-daemon.json'))
+BROWSER_DAEMON_PROFILE_DIR = Path(os.getenv('BROWSER_DAEMON_PROFILE_DIR', '.cache/browser-daemon-profile'))
+
+# 远程调试端口
+BROWSER_DAEMON_PORT = int(os.getenv('BROWSER_DAEMON_PORT', '9333'))
+
+# 浏览器运行超过该时长（秒）后重新启动，避免长时间运行积累内存
+BROWSER_DAEMON_MAX_AGE = int(os.getenv('BROWSER_DAEMON_MAX_AGE', '28800'))
+
+# 启动后等待调试端口可用的超时时间（秒）
+BROWSER_DAEMON_START_TIMEOUT = 30
+
+# 系统Chrome的常见安装路径（channel="chrome"时使用）
+_CHROME_PATHS = (
+    'google-chrome',
+    'google-chrome-stable',
+    '/Applications/Google Chrome.app/Contents/MacOS/Google Chrome',
+    r'C:\Program Files\Google\Chrome\Application\chrome.exe',
+    r'C:\Program Files (x86)\Google\Chrome\Application\chrome.exe'
+)
+
+
+def is_browser_daemon_enabled() -> bool:
+    """
+    是否连接常驻浏览器（环境变量BROWSER_DAEMON=true开启，默认关闭）
+
+    Returns:
+        bool: 是否启用
+    """
+    return os.getenv('BROWSER_DAEMON', 'false').lower() == 'true'
+
+
+def find_chrome_executable() -> Optional[str]:
+    """
+    查找系统安装的Chrome
+
+    Returns:
+        Chrome可执行文件路径，未找到时返回None
+    """
+    for candidate in _CHROME_PATHS:
+        path = shutil.which(candidate) or (candidate if os.path.isfile(candidate) else None)
+        if path:
+            return path
+    return None
+
+
+def build_daemon_args(executable: str, port: int, headless: bool, profile_dir: Path) -> list:
+    """
+    构造浏览器启动参数
+
+    Args:
+        executable: 浏览器可执行文件
+        port: 远程调试端口
+        headless: 是否无头模式
+        profile_dir: 用户数据目录
+
+    Returns:
+        命令行参数列表
+    """
+    args = [
+        executable,
+        f'--remote-debugging-port={port}',
+        '--remote-debugging-address=127.0.0.1',
+        f'--user-data-dir={Path(profile_dir).resolve()}',
+        '--no-first-run',
+        '--no-default-browser-check',
+        '--disable-background-networking',
+        '--disable-renderer-backgrounting',
+        '--disable-backgrounding-occluded-windows'
+    ]
+    if headless:
+        args.extend(['--headless=new', '--hide-scrollbars', '--mute-audio'])
+    args.append('about:blank')
+    return args
+
+
+def read_daemon_state(path: Path = BROWSER_DAEMON_STATE_FILE) -> Optional[dict]:
+    """读取状态文件，不存在或损坏时返回None"""
+    try:
+        return json.loads(Path(path).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+
+
+def write_daemon_state(state: dict, path: Path = BROWSER_DAEMON_STATE_FILE):
+    """写入状态文件"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(state, ensure_ascii=False, indent=2), encoding='utf-8')
+
+
+def get_cdp_version(port: int, timeout: float = 2) -> Optional[dict]:
+    """
+    健康检查：请求调试端口的 /json/version
+
+    Args:
+        port: 远程调试端口
+        timeout: 超时时间（秒）
+
+    Returns:
+        浏览器版本信息（包含webSocketDebuggerUrl），无响应时返回None
+    """
+    try:
+        with urlopen(f'http://127.0.0.1:{port}/json/version', timeout=timeout) as response:
+            return json.loads(response.read().decode('utf-8'))
+    except Exception:
+        return None
+
+
+def is_daemon_state_stale(state: Optional[dict], headless: bool, channel: Optional[str], now: float = None) -> bool:
+    """
+    状态文件记录的浏览器是否需要重新启动（不检查浏览器是否仍在运行）
+
+    Args:
+        state: 状态文件内容
+        headless: 本次需要的无头模式
+        channel: 本次需要的浏览器渠道（'chrome' 或 None）
+        now: 当前时间（可选）
+
+    Returns:
+        bool: 没有记录、启动参数不一致或运行时间超过BROWSER_DAEMON_MAX_AGE时返回True
+    """
+    if not state:
+        return True
+    if state.get('headless') != headless or state.get('channel') != channel:
+        return True
+    return (now or time.time()) - state.get('started_at', 0) > BROWSER_DAEMON_MAX_AGE
+
+
+def stop_browser_daemon(state_path: Path = BROWSER_DAEMON_STATE_FILE) -> bool:
+    """
+    停止常驻浏览器并删除状态文件
+
+    Args:
+        state_path: 状态文件路径
+
+    Returns:
+        bool: 是否找到并停止了浏览器
+    """
+    state = read_daemon_state(state_path)
+    if not state:
+        return False
+    try:
+        os.kill(state['pid'], signal.SIGTERM)
+        # 等待浏览器退出，释放调试端口
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline and get_cdp_version(state['port'], timeout=0.5):
+            time.sleep(0.2)
+        stopped = True
+    except (OSError, KeyError):
+        stopped = False
+    Path(state_path).unlink(missing_ok=True)
+    shutil.rmtree(BROWSER_DAEMON_PROFILE_DIR, ignore_errors=True)
+    return stopped
+
+
+def _start_daemon_process(executable: str, port: int, headless: bool) -> subprocess.Popen:
+    """辅助函数：以脱离当前进程的方式启动浏览器（pytest退出后继续运行）"""
+    shutil.rmtree(BROWSER_DAEMON_PROFILE_DIR, ignore_errors=True)
+    BROWSER_DAEMON_PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    BROWSER_DAEMON_STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    log_file = open(BROWSER_DAEMON_STATE_FILE.with_suffix('.log'), 'ab')
+    options = {'stdin': subprocess.DEVNULL, 'stdout': log_file, 'stderr': log_file}
+    if os.name == 'nt':
+        options['creationflags'] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        options['start_new_session'] = True
+    try:
+        return subprocess.Popen(build_daemon_args(executable, port, headless, BROWSER_DAEMON_PROFILE_DIR), **options)
+    finally:
+        log_file.close()
+
+
+def ensure_browser_daemon(
+    executable: str,
+    headless: bool,
+    channel: Optional[str] = None,
+    port: int = BROWSER_DAEMON_PORT
+) -> str:
+    """
+    确保常驻浏览器在运行，返回CDP连接地址
+
+    状态文件记录的浏览器健康检查通过且未过期时直接复用，否则停止旧浏览器并重新启动；
+    pytest-xdist并行执行时用文件锁保证只有一个工作进程启动浏览器，其他进程连接同一个浏览器
+
+    Args:
+        executable: 浏览器可执行文件
+        headless: 是否无头模式
+        channel: 浏览器渠道（记录到状态文件，用于判断是否需要重新启动）
+        port: 远程调试端口
+
+    Returns:
+        CDP连接地址（如：http://127.0.0.1:9333）
+    """
+    with file_lock(BROWSER_DAEMON_STATE_FILE.with_suffix('.lock'), timeout=BROWSER_DAEMON_START_TIMEOUT + 10):
+        state = read_daemon_state()
+        if not is_daemon_state_stale(state, headless, channel) and get_cdp_version(state['port']):
+            return f'http://127.0.0.1:{state["port"]}'
+
+        if state:
+            print('常驻浏览器已退出、无响应或运行时间过长，重新启动')
+            stop_browser_daemon()
+
+        process = _start_daemon_process(executable, port, headless)
+        deadline = time.monotonic() + BROWSER_DAEMON_START_TIMEOUT
+        version = None
+        while time.monotonic() < deadline and process.poll() is None:
+            version = get_cdp_version(port, timeout=0.5)
+            if version:
+                break
+            time.sleep(0.2)
+        if not version:
+            process.kill()
+            raise RuntimeError(f'常驻浏览器启动失败（端口{port}），日志: {BROWSER_DAEMON_STATE_FILE.with_suffix(".log")}')
+
+        write_daemon_state({
+            'pid': process.pid,
+            'port': port,
+            'headless': headless,
+            'channel': channel,
+            'executable': executable,
+            'browser': version.get('Browser'),
+            'started_at': time.time()
+        })
+        print(f'🌐 常驻浏览器已启动: {version.get("Browser")}（进程: {process.pid}，端口: {port}）')
+        return f'http://127.0.0.1:{port}'
+
+
+def get_daemon_executable(playwright, channel: Optional[str]) -> str:
+    """
+    获取常驻浏览器使用的可执行文件：channel="chrome"时使用系统Chrome（未安装时退回Playwright自带的Chromium）
+
+    Args:
+        playwright: Playwright实例
+        channel: 浏览器渠道
+
+    Returns:
+        可执行文件路径
+    """
+    if channel == 'chrome':
+        executable = find_chrome_executable()
+        if executable:
+            return executable
+        print('⚠️  未找到系统Chrome，常驻浏览器使用Playwright自带的Chromium')
+    return playwright.chromium.executable_path
+
+
+def connect_browser_daemon(playwright, headless: bool, channel: Optional[str] = None):
+    """
+    连接常驻浏览器（不存在或不可用时先启动）
+
+    返回的Browser调用close()只断开连接并关闭本次创建的上下文，不会退出常驻浏览器
+
+    Args:
+        playwright: Playwright实例（sync_api）
+        headless: 是否无头模式
+        channel: 浏览器渠道（'chrome' 或 None）
+
+    Returns:
+        已连接的Browser
+    """
+    executable = get_daemon_executable(playwright, channel)
+    endpoint = ensure_browser_daemon(executable, headless, channel)
+    try:
+        return playwright.chromium.connect_over_cdp(endpoint)
+    except Exception as e:
+        # 端口有响应但无法建立连接（如浏览器正在退出），重新启动一次
+        print(f'⚠️  连接常驻浏览器失败，重新启动: {e}')
+        stop_browser_daemon()
+        return playwright.chromium.connect_over_cdp(ensure_browser_daemon(executable, headless, channel))
+
+
+async def async_connect_browser_daemon(playwright, headless: bool, channel: Optional[str] = None):
+    """
+    连接常驻浏览器（connect_browser_daemon的异步版本，启动和健康检查在线程中执行，不阻塞事件循环）
+
+    Args:
+        playwright: Playwright实例（async_api）
+        headless: 是否无头模式
+        channel: 浏览器渠道（'chrome' 或 None）
+
+    Returns:
+        已连接的Browser
+    """
+    executable = get_daemon_executable(playwright, channel)
+    endpoint = await asyncio.to_thread(ensure_browser_daemon, executable, headless, channel)
+    try:
+        return await playwright.chromium.connect_over_cdp(endpoint)
+    except Exception as e:
+        print(f'⚠️  连接常驻浏览器失败，重新启动: {e}')
+        await asyncio.to_thread(stop_browser_daemon)
+        endpoint = await asyncio.to_thread(ensure_browser_daemon, executable, headless, channel)
+        return await playwright.chromium.connect_over_cdp(endpoint)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='常驻浏览器管理')
+    parser.add_argument('action', choices=['start', 'stop', 'status'])
+    parser.add_argument('--headed', action='store_true', help='显示浏览器窗口')
+    parser.add_argument('--channel', default=None, help='浏览器渠道（如 chrome，默认使用Playwright自带的Chromium）')
+    args = parser.parse_args()
+
+    if args.action == 'stop':
+        print('✓ 常驻浏览器已停止' if stop_browser_daemon() else '常驻浏览器未运行')
+        return 0
+
+    if args.action == 'status':
+        state = read_daemon_state()
+        if not state or not get_cdp_version(state['port']):
+            print('常驻浏览器未运行')
+            return 1
+        age = (time.time() - state['started_at']) / 60
+        print(f'✓ 常驻浏览器运行中: {state["browser"]}（进程: {state["pid"]}，端口: {state["port"]}，'
+              f'{"无头" if state["headless"] else "有界面"}，已运行 {age:.0f} 分钟）')
+        return 0
+
+    from playwright.sync_api import sync_playwright
+    with sync_playwright() as p:
+        endpoint = ensure_browser_daemon(get_daemon_executable(p, args.channel), not args.headed, args.channel)
+    print(f'✓ 常驻浏览器可用: {endpoint}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,181 @@
+"""
+录制策略模块
+按策略决定视频/Trace是否录制、是否保留，保留的产物添加为Allure附件
+
+策略取值：
+    off            不录制
+    on-failure     录制，测试通过后删除
+    on-first-retry 只在第一次重试时录制（需要pytest-rerunfailures）
+    always         始终录制并保留
+
+优先级：测试上的 @pytest.mark.capture(video=..., trace=...) 标记 > 环境变量 VIDEO_MODE / TRACE_MODE > 默认值
+"""
+
+import os
+from pathlib import Path
+from typing import Optional
+from .artifact_module import get_artifact_worker
+
+CAPTURE_MODES = ('off', 'on-failure', 'on-first-retry', 'always')
+
+# 各类产物的默认策略：视频仅保留失败用例，Trace默认关闭
+DEFAULT_CAPTURE_MODES = {
+    'video': 'on-failure',
+    'trace': 'off'
+}
+
+# 环境变量名
+CAPTURE_MODE_ENV = {
+    'video': 'VIDEO_MODE',
+    'trace': 'TRACE_MODE'
+}
+
+
+def get_capture_mode(item, kind: str) -> str:
+    """
+    获取测试的录制策略
+
+    Args:
+        item: pytest测试项
+        kind: 产物类型，'video' 或 'trace'
+
+    Returns:
+        策略取值（见CAPTURE_MODES）
+    """
+    marker = item.get_closest_marker('capture') if item is not None else None
+    mode = marker.kwargs.get(kind) if marker else None
+    if mode is None:
+        mode = os.getenv(CAPTURE_MODE_ENV[kind], DEFAULT_CAPTURE_MODES[kind])
+    mode = mode.lower()
+    if mode not in CAPTURE_MODES:
+        print(f'⚠️  未知的{kind}录制策略 "{mode}"，使用默认值: {DEFAULT_CAPTURE_MODES[kind]}')
+        mode = DEFAULT_CAPTURE_MODES[kind]
+    return mode
+
+
+def get_video_size() -> dict:
+    """
+    获取视频分辨率（环境变量VIDEO_SIZE，格式如1280x720）
+
+    Returns:
+        {'width': 宽, 'height': 高}
+    """
+    width, height = os.getenv('VIDEO_SIZE', '1280x720').lower().split('x')
+    return {'width': int(width), 'height': int(height)}
+
+
+def _execution_count(item) -> int:
+    """测试的执行次数（pytest-rerunfailures重试时递增，未安装时为1）"""
+    return getattr(item, 'execution_count', 1)
+
+
+def should_record(mode: str, item) -> bool:
+    """
+    本次执行是否需要录制
+
+    Args:
+        mode: 录制策略
+        item: pytest测试项
+
+    Returns:
+        bool: 是否录制
+    """
+    if mode == 'off':
+        return False
+    if mode == 'on-first-retry':
+        return _execution_count(item) == 2
+    return True
+
+
+def should_keep(mode: str, failed: bool) -> bool:
+    """
+    录制结束后是否保留产物
+
+    Args:
+        mode: 录制策略
+        failed: 测试是否失败
+
+    Returns:
+        bool: 是否保留
+    """
+    if mode == 'on-failure':
+        return failed
+    return mode in ('always', 'on-first-retry')
+
+
+def is_test_failed(item) -> bool:
+    """测试在setup或call阶段是否失败"""
+    return any(
+        getattr(getattr(item, f'rep_{when}', None), 'failed', False)
+        for when in ('setup', 'call')
+    )
+
+
+def attach_artifact(path, name: str, attachment_type) -> bool:
+    """
+    将产物添加为当前测试的Allure附件（allure.attach.file，复制到结果目录）
+
+    附件需要在测试线程中登记（allure按当前测试记录附件）；产物本身由后台任务写入时（如失败截图），
+    先等待写入完成
+
+    Args:
+        path: 产物文件路径
+        name: 附件名称
+        attachment_type: allure.attachment_type中的类型
+
+    Returns:
+        bool: 是否添加成功
+    """
+    path = Path(path)
+    worker = get_artifact_worker()
+    if not path.exists() and not worker.is_pending(path):
+        return False
+
+    try:
+        import allure
+        worker.wait_for(path)
+        allure.attach.file(str(path), name=name, attachment_type=attachment_type)
+        return True
+    except Exception as e:
+        print(f'⚠️  添加附件到Allure报告失败: {e}')
+        return False
+
+
+def discard_artifacts(directory: Path, pattern: str) -> int:
+    """
+    删除不需要保留的产物
+
+    Args:
+        directory: 产物目录
+        pattern: 文件匹配模式（如：*.webm）
+
+    Returns:
+        删除的文件数
+    """
+    return remove_artifacts(list(Path(directory).glob(pattern)))
+
+
+def remove_artifacts(files: list) -> int:
+    """
+    删除指定的产物文件（可在后台线程中执行：文件列表在提交时确定，不会误删重试时新录制的产物）
+
+    Args:
+        files: 文件路径列表
+
+    Returns:
+        删除的文件数
+    """
+    removed = 0
+    for file in files:
+        try:
+            file.unlink()
+            removed += 1
+        except OSError as e:
+            print(f'⚠️  删除产物失败: {file} ({e})')
+    return removed
+
+
+def find_latest(directory: Path, pattern: str) -> Optional[Path]:
+    """获取目录中最新的产物文件"""
+    files = list(Path(directory).glob(pattern))
+    return max(files, key=lambda p: p.stat().st_mtime) if files else None
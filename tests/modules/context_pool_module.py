@@ -0,0 +1,256 @@
+"""
+浏览器上下文池模块
+按 (环境, 账号, 品牌别名, 请求过滤配置) 缓存已加载登录态的浏览器上下文，测试结束后重置后放回池中，
+下一个相同键的测试直接复用（保留登录态cookie和浏览器内存缓存），省去新建上下文、加载登录态和重新下载前端资源的时间
+
+隔离级别（测试标记 @pytest.mark.isolation('fresh') > 环境变量 CONTEXT_ISOLATION > 默认值）：
+- fresh：每个测试新建上下文（默认，与之前的行为一致）
+- pooled：从上下文池获取，测试结束后重置（关闭页面、恢复登录态cookie和localStorage、清空sessionStorage和权限）
+"""
+
+import json
+import os
+from typing import Callable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+# 隔离级别
+ISOLATION_FRESH = 'fresh'
+ISOLATION_POOLED = 'pooled'
+ISOLATION_LEVELS = (ISOLATION_FRESH, ISOLATION_POOLED)
+
+# 每个工作进程最多保留的空闲上下文数（不同键的上下文共用）
+CONTEXT_POOL_SIZE = int(os.getenv('CONTEXT_POOL_SIZE', '2'))
+
+# 单个上下文最多复用的测试数，超过后关闭重建（避免长时间复用积累内存和状态）
+CONTEXT_POOL_MAX_USES = int(os.getenv('CONTEXT_POOL_MAX_USES', '50'))
+
+# 将页面所在源的localStorage恢复为登录态中的内容，并清空sessionStorage
+_RESET_STORAGE_JS = '''
+(items) => {
+    sessionStorage.clear();
+    const keep = new Map(items.map(item => [item.name, item.value]));
+    for (const name of Object.keys(localStorage)) {
+        if (!keep.has(name)) localStorage.removeItem(name);
+    }
+    for (const [name, value] of keep) localStorage.setItem(name, value);
+}
+'''
+
+
+def get_isolation_level(item=None) -> str:
+    """
+    获取测试使用的隔离级别
+
+    Args:
+        item: pytest测试项（可选）
+
+    Returns:
+        ISOLATION_FRESH 或 ISOLATION_POOLED；标记fresh_login的测试始终为ISOLATION_FRESH
+    """
+    if item is not None and item.get_closest_marker('fresh_login'):
+        return ISOLATION_FRESH
+    marker = item.get_closest_marker('isolation') if item is not None else None
+    level = marker.args[0] if marker and marker.args else os.getenv('CONTEXT_ISOLATION', ISOLATION_FRESH)
+    level = level.lower()
+    if level not in ISOLATION_LEVELS:
+        print(f'⚠️  未知的隔离级别 "{level}"，使用默认值: {ISOLATION_FRESH}')
+        level = ISOLATION_FRESH
+    return level
+
+
+def get_pool_key(env: str, account: str, brand_alias: str, route_profile: str) -> Tuple[str, str, str, str]:
+    """
+    上下文池的键：键相同的测试可以复用同一个上下文
+
+    Args:
+        env: 环境名称
+        account: 账号
+        brand_alias: 品牌别名
+        route_profile: 请求过滤配置名称（路由在创建上下文时注册，配置不同的测试不能共用）
+
+    Returns:
+        (环境, 账号, 品牌别名, 请求过滤配置)
+    """
+    return (env, account, brand_alias, route_profile)
+
+
+def load_baseline_state(storage_state) -> dict:
+    """
+    读取上下文创建时加载的登录态，作为重置时恢复的基准
+
+    Args:
+        storage_state: storage_state文件路径（None表示未加载登录态）
+
+    Returns:
+        {'cookies': [...], 'origins': {源: [{'name', 'value'}]}}
+    """
+    state = {}
+    if storage_state:
+        try:
+            with open(storage_state, encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f'⚠️  读取登录态失败，重置时清空所有cookie: {e}')
+    return {
+        'cookies': state.get('cookies', []),
+        'origins': {origin['origin']: origin.get('localStorage', []) for origin in state.get('origins', [])}
+    }
+
+
+def _get_origin(url: str) -> Optional[str]:
+    """URL的源（scheme://host:port），非http(s)页面返回None"""
+    parsed = urlparse(url)
+    if parsed.scheme not in ('http', 'https'):
+        return None
+    return f'{parsed.scheme}://{parsed.netloc}'
+
+
+def track_origins(context, origins: set):
+    """
+    记录上下文中页面访问过的源（重置时恢复这些源的localStorage）
+
+    Args:
+        context: 浏览器上下文（sync_api）
+        origins: 记录访问过的源的集合
+    """
+    def on_frame_navigated(frame):
+        origin = _get_origin(frame.url)
+        if origin and frame.parent_frame is None:
+            origins.add(origin)
+
+    context.on('page', lambda page: page.on('framenavigated', on_frame_navigated))
+
+
+def reset_context(context, baseline: dict, origins: set = None):
+    """
+    重置上下文：关闭所有页面，将访问过的源的localStorage恢复为登录态中的内容，
+    cookie恢复为登录态中的cookie，清空授予的权限（sessionStorage随页面关闭销毁）
+
+    Args:
+        context: 浏览器上下文（sync_api）
+        baseline: load_baseline_state的返回值
+        origins: 需要恢复localStorage的源（track_origins记录的集合，恢复后清空）
+    """
+    for page in list(context.pages):
+        page.close()
+
+    if origins:
+        # 在临时页面中以本地返回的空白文档打开各个源（不发出网络请求），在该源下恢复localStorage
+        page = context.new_page()
+        try:
+            page.route('**/*', lambda route: route.fulfill(status=200, content_type='text/html', body='<html></html>'))
+            for origin in sorted(origins):
+                page.goto(f'{origin}/', wait_until='commit')
+                page.evaluate(_RESET_STORAGE_JS, baseline['origins'].get(origin, []))
+        finally:
+            page.close()
+        origins.clear()
+
+    context.clear_cookies()
+    if baseline['cookies']:
+        context.add_cookies(baseline['cookies'])
+    context.clear_permissions()
+
+
+class ContextPool:
+    """
+    浏览器上下文池（每个工作进程一个，同一时间只有一个测试使用某个上下文）
+
+    acquire() 优先返回相同键的空闲上下文，没有时调用create新建；release() 重置后放回池中，
+    空闲上下文超过size时关闭最早放回的；测试失败或重置失败的上下文直接关闭，不再复用
+    """
+
+    def __init__(self, size: int = None, max_uses: int = None):
+        self.size = CONTEXT_POOL_SIZE if size is None else size
+        self.max_uses = max_uses or CONTEXT_POOL_MAX_USES
+        # 空闲上下文（按放回顺序）和使用中的上下文
+        self._idle: List[dict] = []
+        self._in_use = {}
+        self.stats = {'created': 0, 'reused': 0, 'discarded': 0}
+
+    def acquire(
+        self,
+        key: tuple,
+        create: Callable[[], Tuple[object, list]],
+        storage_state: Optional[str] = None
+    ):
+        """
+        获取上下文
+
+        Args:
+            key: get_pool_key的返回值
+            create: 新建上下文的函数，返回 (上下文, 统计对象列表)，统计对象提供format_stats()，在上下文关闭时输出
+            storage_state: 新建上下文加载的登录态文件（重置时恢复）
+
+        Returns:
+            浏览器上下文
+        """
+        for index, entry in enumerate(self._idle):
+            if entry['key'] == key:
+                del self._idle[index]
+                self.stats['reused'] += 1
+                break
+        else:
+            context, reporters = create()
+            entry = {
+                'key': key,
+                'context': context,
+                'reporters': reporters,
+                'baseline': load_baseline_state(storage_state),
+                'origins': set(),
+                'uses': 0
+            }
+            track_origins(context, entry['origins'])
+            self.stats['created'] += 1
+        entry['uses'] += 1
+        self._in_use[id(entry['context'])] = entry
+        return entry['context']
+
+    def release(self, context, reusable: bool = True):
+        """
+        测试结束后归还上下文
+
+        Args:
+            context: acquire返回的上下文
+            reusable: 是否可以复用（测试失败时传False，直接关闭）
+        """
+        entry = self._in_use.pop(id(context), None)
+        if entry is None:
+            return
+        if reusable and entry['uses'] < self.max_uses and self.size > 0:
+            try:
+                reset_context(context, entry['baseline'], entry['origins'])
+                self._idle.append(entry)
+            except Exception as e:
+                print(f'⚠️  重置浏览器上下文失败，关闭后重建: {e}')
+                self._close_entry(entry)
+        else:
+            self._close_entry(entry)
+        while len(self._idle) > self.size:
+            self._close_entry(self._idle.pop(0))
+
+    def _close_entry(self, entry: dict):
+        """关闭上下文并输出其统计"""
+        self.stats['discarded'] += 1
+        for reporter in entry['reporters']:
+            if reporter is not None:
+                print(reporter.format_stats())
+        try:
+            entry['context'].close()
+        except Exception as e:
+            print(f'⚠️  关闭浏览器上下文失败: {e}')
+
+    def close(self):
+        """关闭池中的所有上下文"""
+        for entry in self._idle + list(self._in_use.values()):
+            self._close_entry(entry)
+        self._idle = []
+        self._in_use = {}
+
+    def format_stats(self) -> str:
+        """格式化输出上下文池统计"""
+        total = self.stats['created'] + self.stats['reused']
+        return (
+            f'上下文池: {total} 个测试，新建 {self.stats["created"]} 个上下文，复用 {self.stats["reused"]} 次'
+            f'（池大小 {self.size}，单个上下文最多复用 {self.max_uses} 次）'
+        )
@@ -0,0 +1,217 @@
+"""
+登录态缓存模块
+按 (环境, 账号, 品牌别名) 缓存登录后的storage_state，会话内只登录一次
+缓存文件落盘，下次运行前先做过期检查和有效性探测，失效时才重新登录
+"""
+
+import json
+import os
+import re
+import time
+from pathlib import Path
+from playwright.sync_api import Browser
+from ..config.login_config import LOGIN_CONFIG, ENV
+from .login_module import login
+from .timing_module import session_timings
+from .worker_module import file_lock
+
+# 登录态缓存目录（可通过环境变量LOGIN_CACHE_DIR覆盖）
+LOGIN_CACHE_DIR = Path(os.getenv('LOGIN_CACHE_DIR', '.auth'))
+
+# 登录态缓存有效期（秒），超过后重新登录
+LOGIN_CACHE_TTL = int(os.getenv('LOGIN_CACHE_TTL', '3600'))
+
+# 有效性探测的超时时间（毫秒）
+LOGIN_PROBE_TIMEOUT = int(os.getenv('LOGIN_PROBE_TIMEOUT', '10000'))
+
+
+def is_login_cache_enabled() -> bool:
+    """
+    是否启用登录态缓存（环境变量LOGIN_CACHE=false可关闭）
+
+    Returns:
+        bool: 是否启用
+    """
+    return os.getenv('LOGIN_CACHE', 'true').lower() == 'true'
+
+
+def get_storage_state_path(env: str, account: str, brand_alias: str) -> Path:
+    """
+    获取登录态缓存文件路径
+
+    Args:
+        env: 环境名称（'production' 或 'test'）
+        account: 账号
+        brand_alias: 品牌别名
+
+    Returns:
+        缓存文件路径
+    """
+    file_name = re.sub(r'[^\w.-]', '_', f'{env}_{account}_{brand_alias}')
+    return LOGIN_CACHE_DIR / f'{file_name}.json'
+
+
+def is_storage_state_fresh(path: Path, ttl: int = LOGIN_CACHE_TTL) -> bool:
+    """
+    检查缓存文件是否在有效期内，且其中的cookie均未过期
+
+    Args:
+        path: 缓存文件路径
+        ttl: 有效期（秒）
+
+    Returns:
+        bool: 是否可以复用
+    """
+    if not path.exists():
+        return False
+
+    if time.time() - path.stat().st_mtime > ttl:
+        print(f'登录态缓存已超过有效期（{ttl}秒）: {path}')
+        return False
+
+    try:
+        state = json.loads(path.read_text(encoding='utf-8'))
+    except Exception as e:
+        print(f'登录态缓存文件读取失败: {e}')
+        return False
+
+    now = time.time()
+    for cookie in state.get('cookies', []):
+        # expires为-1表示会话cookie
+        expires = cookie.get('expires', -1)
+        if expires != -1 and expires < now:
+            print(f'登录态缓存中的cookie已过期: {cookie.get("name")}')
+            return False
+
+    return True
+
+
+def _get_boh_base_url(env: str) -> str:
+    """获取BOH基础URL（与order_module一致，支持环境变量BOH_BASE_URL覆盖）"""
+    config = LOGIN_CONFIG.get(env, LOGIN_CONFIG['test'])
+    return os.getenv('BOH_BASE_URL', config['bohBaseUrl'])
+
+
+class LoginCache:
+    """
+    会话级登录态缓存
+
+    每个 (环境, 账号, 品牌别名) 在一次会话中最多登录一次，
+    之后的BrowserContext直接通过storage_state加载登录态；
+    pytest-xdist并行执行时各工作进程通过文件锁共享同一份缓存
+    """
+
+    def __init__(self, browser: Browser):
+        self.browser = browser
+        # 本次会话中已验证可用的缓存: key -> 缓存文件路径
+        self._validated = {}
+
+    def get_storage_state(
+        self,
+        env: str = ENV,
+        account: str = None,
+        password: str = None,
+        brand_alias: str = None
+    ) -> str:
+        """
+        获取可用的登录态缓存文件，必要时执行登录
+
+        Args:
+            env: 环境名称（'production' 或 'test'）
+            account: 账号（可选，默认使用配置文件中的账号）
+            password: 密码（可选，默认使用配置文件中的密码）
+            brand_alias: 品牌别名（可选，默认使用配置文件中的品牌别名）
+
+        Returns:
+            storage_state文件路径
+        """
+        config = LOGIN_CONFIG.get(env, LOGIN_CONFIG['test'])
+        credentials = config['credentials']
+        if account is None:
+            account = credentials['account']
+        if password is None:
+            password = credentials['password']
+        if brand_alias is None:
+            brand_alias = credentials['brandAlias']
+
+        key = (env, account, brand_alias)
+        if key in self._validated:
+            return str(self._validated[key])
+
+        path = get_storage_state_path(env, account, brand_alias)
+        # 多个工作进程共享同一份缓存文件，加锁保证只有一个进程执行登录，其余进程等待后直接复用；
+        # 登录耗时记入会话级步骤记录，不计入首个使用缓存的测试
+        with file_lock(path.with_name(f'{path.name}.lock')), session_timings():
+            if is_storage_state_fresh(path) and self._probe(path, _get_boh_base_url(env)):
+                print(f'♻️  复用登录态缓存: {path}')
+            else:
+                self._login_and_save(path, config['loginUrl'], account, password, brand_alias)
+
+        self._validated[key] = path
+        return str(path)
+
+    def invalidate(self, env: str = ENV, account: str = None, brand_alias: str = None):
+        """
+        使登录态缓存失效（例如测试中发现登录态被踢出时）
+
+        Args:
+            env: 环境名称
+            account: 账号（可选，默认使用配置文件中的账号）
+            brand_alias: 品牌别名（可选，默认使用配置文件中的品牌别名）
+        """
+        credentials = LOGIN_CONFIG.get(env, LOGIN_CONFIG['test'])['credentials']
+        account = account or credentials['account']
+        brand_alias = brand_alias or credentials['brandAlias']
+        self._validated.pop((env, account, brand_alias), None)
+        path = get_storage_state_path(env, account, brand_alias)
+        if path.exists():
+            path.unlink()
+
+    def _probe(self, path: Path, boh_base_url: str) -> bool:
+        """
+        有效性探测：携带缓存的登录态打开BOH首页，未被重定向到登录页即视为有效
+        """
+        context = self.browser.new_context(storage_state=str(path))
+        try:
+            page = context.new_page()
+            page.goto(boh_base_url, wait_until='domcontentloaded', timeout=LOGIN_PROBE_TIMEOUT)
+            try:
+                page.wait_for_load_state('networkidle', timeout=LOGIN_PROBE_TIMEOUT)
+            except Exception:
+                pass
+            if '/page/login' in page.url:
+                print(f'登录态缓存已失效（被重定向到登录页）: {path}')
+                return False
+            return True
+        except Exception as e:
+            print(f'登录态缓存探测失败: {e}')
+            return False
+        finally:
+            context.close()
+
+    def _login_and_save(
+        self,
+        path: Path,
+        login_url: str,
+        account: str,
+        password: str,
+        brand_alias: str
+    ):
+        """执行一次完整登录，并将storage_state写入缓存文件"""
+        print(f'🔐 登录态缓存不可用，执行登录: {account}@{brand_alias}')
+        path.parent.mkdir(parents=True, exist_ok=True)
+        context = self.browser.new_context()
+        try:
+            page = context.new_page()
+            login(
+                page,
+                login_url=login_url,
+                account=account,
+                password=password,
+                brand_alias=brand_alias,
+                reuse_session=False
+            )
+            context.storage_state(path=str(path))
+            print(f'✓ 登录态已缓存: {path}')
+        finally:
+            context.close()
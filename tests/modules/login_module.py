@@ -3,16 +3,224 @@
 包含登录、租户名验证功能
 """
 
+import os
+import weakref
 from playwright.sync_api import Page
-from ..config.login_config import LOGIN_URL, CREDENTIALS
+from ..config.login_config import LOGIN_CONFIG, LOGIN_URL, CREDENTIALS, BOH_BASE_URL, ENV
+from .selector_module import resolve_selector
+from .snapshot_module import take_snapshot
+from .timing_module import timed_step
+from .wait_module import wait_for_dom_quiet, wait_for_locator, wait_for_page_ready
+from .web_vitals_module import measure_navigation
 
+# 登录页和页面头部的备选选择器（按优先级排列，同步和异步版本共用）
 
+# 账号输入框
+ACCOUNT_SELECTORS = [
+    'input[name="account"]',
+    'input[name="username"]',
+    'input[id="account"]',
+    'input[id="username"]',
+    'input[placeholder*="账号"]',
+    'input[placeholder*="用户名"]',
+    'input[type="text"]'
+]
+
+# 密码输入框
+PASSWORD_SELECTORS = [
+    'input[name="password"]',
+    'input[id="password"]',
+    'input[type="password"]'
+]
+
+# 品牌别名输入框
+BRAND_SELECTORS = [
+    'input[name*="brand"]',
+    'input[name*="alias"]',
+    'input[id*="brand"]',
+    'input[id*="alias"]',
+    'input[placeholder*="品牌"]',
+    'input[placeholder*="别名"]'
+]
+
+# 协议复选框
+AGREEMENT_SELECTORS = [
+    'input[type="checkbox"]',
+    '[class*="agreement"] input',
+    '[class*="protocol"] input',
+    'input[name*="agreement"]',
+    'input[name*="protocol"]'
+]
+
+# 登录按钮
+LOGIN_BUTTON_SELECTORS = [
+    'button:has-text("登录")',
+    'button:has-text("登陆")',
+    'button[type="submit"]',
+    'input[type="submit"]',
+    'button.login',
+    '.login-button',
+    '[class*="login"] button',
+    'button:has-text("Login")',
+    'button:has-text("Sign in")',
+    '[class*="login-btn"]',
+    '[class*="submit"]'
+]
+
+# 登录失败时的错误/提示信息
+LOGIN_ERROR_SELECTORS = [
+    '[class*="error"]',
+    '[class*="alert"]',
+    '[class*="message"]',
+    '.ant-message',
+    '.ant-notification',
+    '[role="alert"]'
+]
+
+# 页面头部的租户名（{tenant}为租户名）
+TENANT_HEADER_SELECTORS = [
+    'header:has-text("{tenant}")',
+    'nav:has-text("{tenant}")',
+    '[class*="header"]:has-text("{tenant}")',
+    '[class*="navbar"]:has-text("{tenant}")'
+]
+
+
+# 加载了登录态缓存（storage_state）的上下文 -> 缓存的 (环境, 账号, 品牌别名)，
+# login()只在请求的凭据与之一致时跳过登录页
+_session_contexts = weakref.WeakKeyDictionary()
+
+
+def get_session_key(env: str = ENV, account: str = None, brand_alias: str = None) -> tuple:
+    """
+    获取登录态的键（与登录态缓存一致）
+
+    Args:
+        env: 环境名称
+        account: 账号（可选，默认使用该环境配置的账号）
+        brand_alias: 品牌别名（可选，默认使用该环境配置的品牌别名）
+
+    Returns:
+        (环境, 账号, 品牌别名)
+    """
+    credentials = LOGIN_CONFIG.get(env, LOGIN_CONFIG['test'])['credentials']
+    return (
+        env,
+        credentials['account'] if account is None else account,
+        credentials['brandAlias'] if brand_alias is None else brand_alias
+    )
+
+
+def get_login_env(login_url: str) -> str:
+    """
+    根据登录页URL获取环境名称
+
+    Args:
+        login_url: 登录页URL
+
+    Returns:
+        环境名称，不是已配置的登录页时返回None
+    """
+    if login_url == LOGIN_URL:
+        return ENV
+    for env, config in LOGIN_CONFIG.items():
+        if config['loginUrl'] == login_url:
+            return env
+    return None
+
+
+def mark_session_context(context, env: str = ENV, account: str = None, brand_alias: str = None):
+    """
+    标记上下文创建时加载了登录态缓存（创建上下文时传入storage_state后调用，同步和异步上下文均可）
+
+    Args:
+        context: 浏览器上下文
+        env: 登录态缓存的环境名称
+        account: 登录态缓存的账号（可选，默认使用该环境配置的账号）
+        brand_alias: 登录态缓存的品牌别名（可选，默认使用该环境配置的品牌别名）
+    """
+    _session_contexts[context] = get_session_key(env, account, brand_alias)
+
+
+def is_session_context(context) -> bool:
+    """上下文是否加载了登录态缓存（任意凭据）"""
+    return context in _session_contexts
+
+
+def has_cached_session(context, key: tuple) -> bool:
+    """
+    上下文是否加载了指定凭据的登录态缓存（不以cookie是否为空判断，第三方脚本或之前的页面访问也会留下cookie）
+
+    Args:
+        context: 浏览器上下文
+        key: 请求的 (环境, 账号, 品牌别名)
+
+    Returns:
+        bool: 加载了登录态缓存且凭据一致
+    """
+    return _session_contexts.get(context) == key
+
+
+def check_cached_session(context, login_url: str, account: str, brand_alias: str) -> bool:
+    """
+    检查上下文中缓存的登录态能否用于本次登录（同步和异步版本共用）
+
+    上下文加载了其他账号/品牌/环境的登录态时，取消标记并返回False，调用方需清除cookie后执行完整登录
+
+    Args:
+        context: 浏览器上下文
+        login_url: 本次登录的登录页URL
+        account: 本次登录的账号
+        brand_alias: 本次登录的品牌别名
+
+    Returns:
+        bool: 可以跳过登录页
+    """
+    if not is_session_context(context):
+        return False
+    key = (get_login_env(login_url), account, brand_alias)
+    if has_cached_session(context, key):
+        return True
+    print(f'上下文中的登录态 {_session_contexts[context]} 与本次登录 {key} 不一致，清除后执行完整登录')
+    del _session_contexts[context]
+    return False
+
+
+def _enter_with_existing_session(page: Page) -> bool:
+    """
+    辅助函数：使用上下文中已有的登录态（如登录态缓存）直接进入BOH
+    
+    Args:
+        page: Playwright页面对象
+        
+    Returns:
+        bool: 登录态是否有效（未被重定向到登录页）
+    """
+    boh_base_url = os.getenv('BOH_BASE_URL', BOH_BASE_URL)
+    try:
+        page.goto(boh_base_url, wait_until='domcontentloaded', timeout=30000)
+        wait_for_page_ready(page, timeout=10000)
+    except Exception as e:
+        print(f'使用已有登录态打开BOH失败: {e}')
+        return False
+    
+    if '/page/login' in page.url:
+        print('已有登录态无效，执行完整登录流程')
+        return False
+    
+    print(f'✓ 已使用缓存的登录态进入BOH: {page.url}')
+    return True
+
+
+@timed_step('登录')
+@measure_navigation
 def login(
     page: Page,
     login_url: str = LOGIN_URL,
     account: str = None,
     password: str = None,
-    brand_alias: str = None
+    brand_alias: str = None,
+    reuse_session: bool = True
 ):
     """
     执行登录操作
@@ -23,6 +231,7 @@ def login(
         account: 账号（可选，默认使用配置文件中的账号）
         password: 密码（可选，默认使用配置文件中的密码）
         brand_alias: 品牌别名（可选，默认使用配置文件中的品牌别名）
+        reuse_session: 上下文加载了相同环境、账号和品牌别名的登录态缓存（mark_session_context）时是否跳过登录页直接进入BOH
     """
     # 使用默认凭据
     if account is None:
@@ -32,6 +241,14 @@ def login(
     if brand_alias is None:
         brand_alias = CREDENTIALS['brandAlias']
     
+    # 上下文已通过登录态缓存预先登录时，无需再走登录页；缓存的是其他凭据的登录态时清除后重新登录
+    if reuse_session and is_session_context(page.context):
+        if check_cached_session(page.context, login_url, account, brand_alias):
+            if _enter_with_existing_session(page):
+                return
+        else:
+            page.context.clear_cookies()
+    
     # 步骤1: 打开登录页面
     page.goto(login_url)
     
@@ -40,30 +257,13 @@ def login(
         page.wait_for_load_state('domcontentloaded', timeout=10000)
     except Exception as e:
         print(f'等待domcontentloaded超时，继续执行: {e}')
-    page.wait_for_timeout(2000)
 
-    # 步骤2: 填写登录表单
+    # 步骤2: 填写登录表单（等待输入框出现且表单渲染稳定）
     page.wait_for_selector('input[type="text"], input[type="password"]', timeout=10000)
+    wait_for_dom_quiet(page, timeout=2000)
     
     # 填写账号
-    account_selectors = [
-        'input[name="account"]',
-        'input[name="username"]',
-        'input[id="account"]',
-        'input[id="username"]',
-        'input[placeholder*="账号"]',
-        'input[placeholder*="用户名"]',
-        'input[type="text"]'
-    ]
-    
-    account_input = None
-    for selector in account_selectors:
-        try:
-            account_input = page.locator(selector).first
-            if account_input.is_visible(timeout=2000):
-                break
-        except Exception:
-            continue
+    account_input = resolve_selector(page, 'accountInput', ACCOUNT_SELECTORS, timeout=5000)
     
     if account_input:
         account_input.fill(account)
@@ -71,20 +271,7 @@ def login(
         raise Exception('无法找到账号输入框')
 
     # 填写密码
-    password_selectors = [
-        'input[name="password"]',
-        'input[id="password"]',
-        'input[type="password"]'
-    ]
-    
-    password_input = None
-    for selector in password_selectors:
-        try:
-            password_input = page.locator(selector).first
-            if password_input.is_visible(timeout=2000):
-                break
-        except Exception:
-            continue
+    password_input = resolve_selector(page, 'passwordInput', PASSWORD_SELECTORS, timeout=5000)
     
     if password_input:
         password_input.fill(password)
@@ -92,23 +279,7 @@ def login(
         raise Exception('无法找到密码输入框')
 
     # 填写品牌别名
-    brand_selectors = [
-        'input[name*="brand"]',
-        'input[name*="alias"]',
-        'input[id*="brand"]',
-        'input[id*="alias"]',
-        'input[placeholder*="品牌"]',
-        'input[placeholder*="别名"]'
-    ]
-    
-    brand_input = None
-    for selector in brand_selectors:
-        try:
-            brand_input = page.locator(selector).first
-            if brand_input.is_visible(timeout=2000):
-                break
-        except Exception:
-            continue
+    brand_input = resolve_selector(page, 'brandInput', BRAND_SELECTORS, timeout=2000)
     
     if brand_input:
         brand_input.fill(brand_alias)
@@ -118,27 +289,14 @@ def login(
 
     # 检查并勾选协议复选框（如果需要）
     try:
-        agreement_selectors = [
-            'input[type="checkbox"]',
-            '[class*="agreement"] input',
-            '[class*="protocol"] input',
-            'input[name*="agreement"]',
-            'input[name*="protocol"]'
-        ]
-        for selector in agreement_selectors:
-            try:
-                checkbox = page.locator(selector).first
-                if checkbox.is_visible(timeout=1000) and not checkbox.is_checked():
-                    checkbox.check()
-                    print('已勾选协议复选框')
-                    break
-            except Exception:
-                continue
+        checkbox = resolve_selector(page, 'agreementCheckbox', AGREEMENT_SELECTORS, timeout=1000)
+        if checkbox and not checkbox.is_checked():
+            checkbox.check()
+            print('已勾选协议复选框')
     except Exception:
         pass
 
     # 验证表单是否已正确填写
-    page.wait_for_timeout(500)
     try:
         account_value = account_input.input_value() if account_input else ''
         password_value = password_input.input_value() if password_input else ''
@@ -148,34 +306,12 @@ def login(
         print(f'表单验证失败: {e}')
 
     # 步骤3: 点击登录按钮
-    login_button_selectors = [
-        'button:has-text("登录")',
-        'button:has-text("登陆")',
-        'button[type="submit"]',
-        'input[type="submit"]',
-        'button.login',
-        '.login-button',
-        '[class*="login"] button',
-        'button:has-text("Login")',
-        'button:has-text("Sign in")',
-        '[class*="login-btn"]',
-        '[class*="submit"]'
-    ]
-    
-    login_button = None
-    for selector in login_button_selectors:
-        try:
-            login_button = page.locator(selector).first
-            if login_button.is_visible(timeout=2000):
-                print(f'找到登录按钮，准备点击')
-                break
-        except Exception:
-            continue
+    login_button = resolve_selector(page, 'loginButton', LOGIN_BUTTON_SELECTORS, timeout=5000)
     
     if login_button:
-        # 等待按钮可点击
-        login_button.wait_for(state='visible', timeout=5000)
-        page.wait_for_timeout(500)
+        print(f'找到登录按钮，准备点击')
+        # 等待按钮可见（click会自动等待按钮可点击）
+        wait_for_locator(login_button, state='visible', timeout=5000)
         
         # 点击登录按钮并等待导航（类似JavaScript版本的Promise.all）
         print('准备点击登录按钮并等待导航...')
@@ -196,86 +332,51 @@ def login(
         except Exception:
             pass
     
-    # 等待页面跳转，检查是否登录成功
+    # 等待页面跳转离开登录页，检查是否登录成功（最多等待30秒）
     login_success = False
-    max_wait_time = 30000  # 最多等待30秒
-    import time
-    start_time = time.time() * 1000
     
-    # 先等待网络请求完成
     try:
-        print('等待网络请求完成...')
-        page.wait_for_load_state('networkidle', timeout=15000)
-        print('网络请求已完成')
+        page.wait_for_url(lambda url: '/page/login' not in url, timeout=30000)
+        login_success = True
+        print(f'登录成功，页面已跳转到: {page.url}')
     except Exception as e:
-        print(f'等待网络空闲超时: {e}')
+        print(f'等待离开登录页超时: {e}')
     
-    # 检查是否有错误提示或验证消息
-    try:
-        error_selectors = [
-            '[class*="error"]',
-            '[class*="alert"]',
-            '[class*="message"]',
-            '.ant-message',
-            '.ant-notification',
-            '[role="alert"]'
-        ]
-        for selector in error_selectors:
-            try:
-                error_element = page.locator(selector).first
-                if error_element.is_visible(timeout=1000):
-                    error_text = error_element.text_content()
-                    if error_text:
-                        print(f'检测到错误/提示信息: {error_text[:200]}')
-            except Exception:
-                continue
-    except Exception:
-        pass
-    
-    while (time.time() * 1000) - start_time < max_wait_time:
-        current_url = page.url
-        print(f'检查登录状态，当前URL: {current_url}')
-        
-        if '/page/login' not in current_url:
-            login_success = True
-            print(f'登录成功，页面已跳转到: {current_url}')
-            break
-        
-        # 检查是否有错误提示
+    if not login_success:
+        # 检查是否有错误提示或验证消息
         try:
-            page_text = page.text_content('body') or ''
-            # 检查更具体的错误关键词
-            error_keywords = ['错误', '失败', 'error', 'Error', '用户名或密码', '账号', '验证码', 'captcha']
-            if page_text:
-                for keyword in error_keywords:
-                    if keyword.lower() in page_text.lower():
-                        # 提取包含错误关键词的上下文
-                        idx = page_text.lower().find(keyword.lower())
-                        context = page_text[max(0, idx-50):idx+100]
-                        print(f'检测到可能的相关信息: {context}')
-        except Exception as e:
-            print(f'检查页面内容时出错: {e}')
+            for selector in LOGIN_ERROR_SELECTORS:
+                try:
+                    error_element = page.locator(selector).first
+                    if error_element.is_visible():
+                        error_text = error_element.text_content()
+                        if error_text:
+                            print(f'检测到错误/提示信息: {error_text[:200]}')
+                except Exception:
+                    continue
+        except Exception:
+            pass
         
-        # 等待1秒后再次检查
-        page.wait_for_timeout(1000)
-    
-    if not login_success:
         final_url = page.url
-        page_text = page.text_content('body') or ''
+        page_text = take_snapshot(page).text
+        # 检查更具体的错误关键词
+        error_keywords = ['错误', '失败', 'error', 'Error', '用户名或密码', '账号', '验证码', 'captcha']
+        for keyword in error_keywords:
+            if keyword.lower() in page_text.lower():
+                # 提取包含错误关键词的上下文
+                idx = page_text.lower().find(keyword.lower())
+                context = page_text[max(0, idx-50):idx+100]
+                print(f'检测到可能的相关信息: {context}')
         print(f'登录超时，当前URL: {final_url}')
         print(f'页面内容预览: {page_text[:500] if page_text else "空内容"}')
         raise Exception('登录失败，页面仍在登录页面或登录超时')
     
-    # 使用更宽松的等待策略
-    try:
-        page.wait_for_load_state('domcontentloaded', timeout=10000)
-    except Exception as e:
-        print(f'等待domcontentloaded超时，继续执行: {e}')
-    
-    page.wait_for_timeout(3000)
+    # 等待登录后的页面加载完成并渲染稳定
+    wait_for_page_ready(page, timeout=10000)
     print(f'登录后页面URL: {page.url}')
 
 
+@timed_step('验证租户名')
 def verify_tenant_name(page: Page, expected_tenant_name: str = '合阔x'):
     """
     验证租户名
@@ -284,8 +385,7 @@ def verify_tenant_name(page: Page, expected_tenant_name: str = '合阔x'):
         page: Playwright页面对象
         expected_tenant_name: 期望的租户名，默认为"合阔x"
     """
-    page.wait_for_load_state('domcontentloaded')
-    page.wait_for_timeout(2000)
+    wait_for_page_ready(page, timeout=5000)
     
     try:
         page_url = page.url
@@ -310,23 +410,19 @@ def verify_tenant_name(page: Page, expected_tenant_name: str = '合阔x'):
     
     if not found:
         try:
-            header_selectors = ['header', 'nav', '[class*="header"]', '[class*="navbar"]']
-            for header_selector in header_selectors:
-                try:
-                    header = page.locator(header_selector).first
-                    if header.is_visible(timeout=2000):
-                        tenant_element = header.get_by_text(expected_tenant_name, exact=False).first
-                        if tenant_element.is_visible(timeout=2000):
-                            found = True
-                            break
-                except Exception:
-                    continue
+            header = resolve_selector(
+                page, 'tenantHeader', TENANT_HEADER_SELECTORS,
+                params={'tenant': expected_tenant_name}, timeout=2000
+            )
+            if header:
+                tenant_element = header.get_by_text(expected_tenant_name, exact=False).first
+                found = tenant_element.is_visible()
         except Exception:
             print('在header中查找失败')
     
+    # 页面快照在DOM未变化时复用，两次文本校验只提取一次
     if not found:
-        page_text = page.text_content('body') or ''
-        if expected_tenant_name in page_text:
+        if take_snapshot(page).contains(expected_tenant_name):
             found = True
             print('租户名存在于页面文本中')
     
@@ -334,8 +430,7 @@ def verify_tenant_name(page: Page, expected_tenant_name: str = '合阔x'):
     assert found is True, f'租户名 "{expected_tenant_name}" 未找到'
     
     # 验证页面文本中包含租户名（双重验证）
-    page_text = page.text_content('body') or ''
-    assert expected_tenant_name in page_text, f'页面文本中未包含租户名 "{expected_tenant_name}"'
+    assert take_snapshot(page).contains(expected_tenant_name), f'页面文本中未包含租户名 "{expected_tenant_name}"'
     
     print(f'✓ 租户名验证通过: {expected_tenant_name}')
 
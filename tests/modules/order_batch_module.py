@@ -0,0 +1,339 @@
+"""
+订单批量校验模块
+在同一个已登录的浏览器上下文中并发打开多个标签页，批量校验订单详情（用于生产巡检，每次校验成百上千个订单）
+列表页只查询一次，从中取出各订单的详情链接；列表中没有链接的订单在各自的标签页中按订货日期查询后点击打开
+
+运行：python -m tests.modules.order_batch_module --orders orders.json --concurrency 8
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional
+from ..config.login_config import CREDENTIALS, ENV, LOGIN_URL
+from .api_capture_module import start_response_capture
+from .asset_cache_module import async_apply_asset_cache
+from .async_login_module import async_login
+from .async_order_module import (
+    async_click_order_to_open_detail,
+    async_open_order_list,
+    async_verify_order_detail,
+    async_verify_product_rows
+)
+from .benchmark_module import percentile
+from .login_module import mark_session_context
+from .order_module import as_date
+from .route_module import async_apply_route_profile
+from .timing_module import replay_allure_steps, timed_step, without_allure_steps
+from .worker_module import run_coroutine
+
+# 批量校验结果文件
+ORDER_BATCH_RESULT_FILE = Path('test-results') / 'order-batch.json'
+
+# 订单期望记录中传给verify_order_detail的字段（product_code/product_name/expected_count可选，用于校验商品行）
+ORDER_DETAIL_FIELDS = ('order_number', 'status', 'source', 'order_date', 'store_name', 'store_code')
+
+# 从列表页取出订单号对应的详情链接（一次调用），返回 {订单号: 链接}
+_DETAIL_LINKS_JS = '''
+(links, orderNumbers) => {
+    const wanted = new Set(orderNumbers);
+    const found = {};
+    for (const link of links) {
+        const text = (link.textContent || '').trim();
+        if (wanted.has(text) && link.href && !found[text]) found[text] = link.href;
+    }
+    return found;
+}
+'''
+
+
+def get_batch_concurrency() -> int:
+    """
+    获取并发标签页数量（环境变量ORDER_BATCH_CONCURRENCY，默认4）
+
+    Returns:
+        并发数
+    """
+    return max(int(os.getenv('ORDER_BATCH_CONCURRENCY', '4')), 1)
+
+
+async def fan_out(items: list, worker: Callable[..., Awaitable], concurrency: int) -> list:
+    """
+    并发执行worker，同时执行的数量不超过concurrency
+
+    Args:
+        items: 待处理的条目
+        worker: 异步函数，参数为单个条目
+        concurrency: 最大并发数
+
+    Returns:
+        与items顺序一致的结果
+    """
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+    async def run(item):
+        async with semaphore:
+            return await worker(item)
+
+    return await asyncio.gather(*(run(item) for item in items))
+
+
+async def async_collect_detail_links(page, order_numbers: List[str]) -> Dict[str, str]:
+    """
+    从当前列表页取出各订单号的详情链接
+
+    Args:
+        page: 已打开订货列表的页面（async_api）
+        order_numbers: 订单号列表
+
+    Returns:
+        {订单号: 详情链接}，列表中没有链接的订单不包含在内
+    """
+    try:
+        return await page.locator('a[href]').evaluate_all(_DETAIL_LINKS_JS, list(order_numbers))
+    except Exception as e:
+        print(f'⚠️  读取详情链接失败: {e}')
+        return {}
+
+
+async def _async_verify_one(context, expected: dict, detail_url: Optional[str]) -> dict:
+    """
+    辅助函数：在新标签页中打开订单详情并校验（与其他订单并发执行，步骤只记录耗时，Allure步骤由_report_order_steps输出）
+
+    Args:
+        context: 已登录的浏览器上下文（async_api）
+        expected: 订单期望记录
+        detail_url: 详情链接（为None时在标签页中按订货日期查询后点击打开）
+
+    Returns:
+        单个订单的校验结果
+    """
+    order_number = expected['order_number']
+    result = {'order_number': order_number, 'passed': False, 'error': None, 'detail_url': detail_url, 'steps': []}
+    record = None
+    start = time.perf_counter()
+    page = await context.new_page()
+    try:
+        with without_allure_steps(), timed_step(f'校验订单 {order_number}', name='verify_order') as record:
+            if detail_url:
+                start_response_capture(page, 'orderDetail')
+                await page.goto(detail_url, wait_until='domcontentloaded', timeout=30000)
+            else:
+                order_date = as_date(expected['order_date'][:10])
+                await async_open_order_list(page, start_date=order_date, end_date=order_date)
+                await async_click_order_to_open_detail(page, order_number)
+            await async_verify_order_detail(page, **{field: expected[field] for field in ORDER_DETAIL_FIELDS})
+            if expected.get('product_code'):
+                await async_verify_product_rows(
+                    page,
+                    expected_count=expected.get('expected_count', 1),
+                    product_code=expected['product_code'],
+                    product_name=expected.get('product_name')
+                )
+        result['passed'] = True
+    except Exception as e:
+        result['error'] = f'{type(e).__name__}: {e}'[:500]
+    finally:
+        result['duration_ms'] = round((time.perf_counter() - start) * 1000, 1)
+        if record is not None:
+            result['steps'] = record['children']
+        await page.close()
+
+    print(f'{"✓" if result["passed"] else "✗"} 订单 {order_number}: {result["duration_ms"]:.0f}ms'
+          + (f' {result["error"]}' if result['error'] else ''))
+    return result
+
+
+async def async_verify_orders(
+    context,
+    orders: List[dict],
+    concurrency: int = None,
+    list_page=None
+) -> List[dict]:
+    """
+    在已登录的上下文中并发校验多个订单的详情
+
+    先在一个列表页中按所有订单的订货日期范围查询一次，取出详情链接，再按并发数开标签页逐个校验
+
+    Args:
+        context: 已登录的浏览器上下文（async_api）
+        orders: 订单期望记录列表（字段见ORDER_DETAIL_FIELDS，可选product_code/product_name/expected_count）
+        concurrency: 最大并发标签页数（可选，默认读取环境变量ORDER_BATCH_CONCURRENCY）
+        list_page: 已登录的页面，用于查询列表（可选，默认新开一个标签页，用完关闭）
+
+    Returns:
+        与orders顺序一致的校验结果 {'order_number', 'passed', 'error', 'duration_ms', 'detail_url', 'steps'}
+    """
+    if not orders:
+        return []
+    concurrency = concurrency or get_batch_concurrency()
+
+    dates = [as_date(order['order_date'][:10]) for order in orders]
+    page = list_page or await context.new_page()
+    try:
+        await async_open_order_list(page, start_date=min(dates), end_date=max(dates))
+        links = await async_collect_detail_links(page, [order['order_number'] for order in orders])
+    finally:
+        if list_page is None:
+            await page.close()
+    print(f'列表页中找到 {len(links)}/{len(orders)} 个订单的详情链接，并发数: {concurrency}')
+
+    results = await fan_out(
+        orders,
+        lambda order: _async_verify_one(context, order, links.get(order['order_number'])),
+        concurrency
+    )
+    _report_order_steps(results)
+    return results
+
+
+def _report_order_steps(results: List[dict]):
+    """
+    辅助函数：并发校验全部结束后，按订单顺序为每个订单输出一个Allure步骤（包含该订单的各步骤）
+
+    Args:
+        results: _async_verify_one的结果列表
+    """
+    replay_allure_steps([
+        {
+            'title': f'校验订单 {result["order_number"]}',
+            'duration_ms': result['duration_ms'],
+            'status': 'passed' if result['passed'] else 'failed',
+            'error': result['error'],
+            'children': result['steps']
+        }
+        for result in results
+    ])
+
+
+def summarize_order_results(results: List[dict]) -> dict:
+    """
+    汇总批量校验结果
+
+    Args:
+        results: async_verify_orders的返回值
+
+    Returns:
+        {'total', 'passed', 'failed', 'p50_ms', 'p95_ms', 'failures': [{'order_number', 'error'}]}
+    """
+    durations = [result['duration_ms'] for result in results]
+    failures = [
+        {'order_number': result['order_number'], 'error': result['error']}
+        for result in results if not result['passed']
+    ]
+    return {
+        'total': len(results),
+        'passed': len(results) - len(failures),
+        'failed': len(failures),
+        'p50_ms': percentile(durations, 50),
+        'p95_ms': percentile(durations, 95),
+        'failures': failures
+    }
+
+
+def format_order_summary(summary: dict) -> str:
+    """格式化输出批量校验汇总"""
+    lines = [
+        f'订单校验: {summary["passed"]}/{summary["total"]} 通过，'
+        f'单个订单耗时 p50 {summary["p50_ms"]:.0f}ms / p95 {summary["p95_ms"]:.0f}ms'
+    ]
+    for failure in summary['failures']:
+        lines.append(f'  ✗ {failure["order_number"]}: {failure["error"]}')
+    return '\n'.join(lines)
+
+
+async def async_run_order_batch(
+    orders: List[dict],
+    concurrency: int = None,
+    headless: bool = True,
+    storage_state: str = None
+) -> List[dict]:
+    """
+    启动浏览器，登录一次后批量校验订单
+
+    Args:
+        orders: 订单期望记录列表
+        concurrency: 最大并发标签页数（可选）
+        headless: 是否无头模式
+        storage_state: 当前环境默认账号的登录态缓存文件（可选，有效时跳过登录页）
+
+    Returns:
+        校验结果列表
+    """
+    from playwright.async_api import async_playwright
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=headless)
+        try:
+            context = await browser.new_context(storage_state=storage_state)
+            if storage_state:
+                mark_session_context(context, ENV, CREDENTIALS['account'], CREDENTIALS['brandAlias'])
+            await async_apply_asset_cache(context)
+            await async_apply_route_profile(context)
+            page = await context.new_page()
+            await async_login(page, login_url=LOGIN_URL)
+            return await async_verify_orders(context, orders, concurrency=concurrency, list_page=page)
+        finally:
+            await browser.close()
+
+
+def load_orders(path: Path) -> List[dict]:
+    """
+    读取订单期望记录文件（JSON数组）
+
+    Args:
+        path: 文件路径
+
+    Returns:
+        订单期望记录列表
+    """
+    orders = json.loads(Path(path).read_text(encoding='utf-8'))
+    for order in orders:
+        missing = [field for field in ORDER_DETAIL_FIELDS if field not in order]
+        if missing:
+            raise ValueError(f'订单记录缺少字段 {missing}: {order}')
+    return orders
+
+
+def main() -> int:
+    from .login_cache_module import get_storage_state_path, is_storage_state_fresh
+
+    parser = argparse.ArgumentParser(description='在同一个登录上下文中并发批量校验订单详情')
+    parser.add_argument('--orders', required=True, help='订单期望记录文件（JSON数组）')
+    parser.add_argument('--concurrency', type=int, default=None, help='最大并发标签页数（默认ORDER_BATCH_CONCURRENCY或4）')
+    parser.add_argument('--headed', action='store_true', help='显示浏览器窗口')
+    parser.add_argument('--output', default=str(ORDER_BATCH_RESULT_FILE), help='结果文件')
+    args = parser.parse_args()
+
+    storage_path = get_storage_state_path(ENV, CREDENTIALS['account'], CREDENTIALS['brandAlias'])
+    storage_state = str(storage_path) if is_storage_state_fresh(storage_path) else None
+
+    results = run_coroutine(async_run_order_batch(
+        load_orders(args.orders),
+        concurrency=args.concurrency,
+        headless=not args.headed,
+        storage_state=storage_state
+    ))
+    summary = summarize_order_results(results)
+    print()
+    print(format_order_summary(summary))
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({
+        'written_at': datetime.now().isoformat(timespec='seconds'),
+        'env': ENV,
+        'summary': summary,
+        'results': results
+    }, ensure_ascii=False, indent=2), encoding='utf-8')
+    print(f'\n✓ 校验结果已保存: {output}')
+    return 1 if summary['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -5,9 +5,159 @@
 
 import os
 import re
-import time
+from datetime import date
+from typing import List, Optional, Union
 from playwright.sync_api import Page
 from ..config.login_config import BOH_BASE_URL
+from ..config.url_config import LIST_QUERY_PARAMS, URL_CONFIG, get_query_url
+from ..config.api_config import ORDER_LIST_FIELDS, API_VALUE_LABELS
+from .api_capture_module import find_record, get_captured_json, match_record_fields, start_response_capture
+from .selector_module import resolve_selector
+from .snapshot_module import SNAPSHOT_FUNCTION_JS, PageSnapshot, remember_snapshot, take_snapshot
+from .table_module import read_table
+from .timing_module import record_order_number, timed_step
+from .wait_module import (
+    StepBudget,
+    wait_for_dom_quiet,
+    wait_for_locator,
+    wait_for_named_response,
+    wait_for_page_ready
+)
+from .web_vitals_module import measure_navigation
+
+# 详情页头部字段未加载时显示的占位符
+DETAIL_HEADER_PLACEHOLDERS = ['订货单号：-', '单据状态：-', '来源：-', '订货日期：-', '订货门店：-']
+
+# 直接打开带筛选条件的列表后，等待列表接口请求确认条件生效的最长时间（毫秒，包含页面打开时间），超时后退回为日期选择器
+ORDER_LIST_CONFIRM_TIMEOUT = int(os.getenv('ORDER_LIST_CONFIRM_TIMEOUT', '10000'))
+
+# 订货单列表中各校验字段所在的列名（表格中没有该列时退回为整行文本校验）
+ORDER_LIST_COLUMNS = {
+    'status': '状态',
+    'store_name': '订货门店',
+    'source': '来源',
+    'order_date': '订货日期'
+}
+
+# 订货页面的备选选择器（按优先级排列，同步和异步版本共用）
+
+# 日期选择器弹层
+DATE_PICKER_SELECTORS = [
+    '[class*="calendar"]',
+    '[class*="date-picker"]',
+    '[class*="picker"]',
+    '[class*="DatePicker"]',
+    '[role="dialog"]',
+    '[class*="ant-picker-dropdown"]',
+    '[class*="rc-calendar"]',
+    '.ant-picker-dropdown',
+    '.rc-calendar-picker'
+]
+
+# 日期选择器中的日期单元格（{date_string}为YYYY-MM-DD）
+DATE_PICKER_DAY_SELECTORS = [
+    '[aria-label*="{date_string}"]',
+    '[data-date="{date_string}"]',
+    '[data-value="{date_string}"]',
+    '[title*="{date_string}"]',
+    '[aria-label*="{year}年{month}月{day}日"]',
+    '[aria-label*="{year}-{month}-{day}"]'
+]
+
+# 查询按钮
+QUERY_BUTTON_SELECTORS = [
+    'button:has-text("查询")',
+    'button:has-text("Search")',
+    'button[type="submit"]',
+    'button.btn-primary:has-text("查询")',
+    'button.ant-btn-primary',
+    '[class*="query-button"]',
+    '[class*="search-button"]',
+    'button:has([class*="search"])',
+    'button:has([class*="query"])'
+]
+
+# 订货单列表表格
+ORDER_TABLE_SELECTORS = [
+    'table:has-text("订货单号")',
+    'table:has-text("状态")',
+    '[class*="table"]:has-text("订货单号")',
+    '[class*="table"]:has-text("状态")',
+    '[role="table"]:has-text("订货单号")',
+    '[role="grid"]:has-text("订货单号")'
+]
+
+# 详情页商品行（{product_code}为商品编号），候选选择器均限定为包含商品编号的行
+PRODUCT_ROW_SELECTORS = [
+    'table:has-text("商品编号") tr:has-text("{product_code}")',
+    'table:has-text("商品编号") tr:not(:has-text("商品编号")):has-text("{product_code}")',
+    '[class*="product-row"]:has-text("{product_code}")',
+    '[class*="item-row"]:has-text("{product_code}")',
+    'tr:has([class*="product-code"]):has-text("{product_code}")',
+    'tbody tr:has-text("{product_code}")',
+    'table tr:has-text("{product_code}")'
+]
+
+# 订单号元素向上查找所在行（表格行或列表项）
+ORDER_ROW_ANCESTOR_XPATH = 'xpath=ancestor::tr | ancestor::*[contains(@class, "row")] | ancestor::*[contains(@class, "item")]'
+
+# 订单列表懒加载：滚动到底部触发加载，再回到顶部
+SCROLL_TO_BOTTOM_JS = '() => { window.scrollTo(0, document.body.scrollHeight); }'
+SCROLL_TO_TOP_JS = '() => { window.scrollTo(0, 0); }'
+
+# 开始/结束日期输入框
+START_DATE_INPUT_SELECTOR = 'input[aria-label*="Start Time"], input[aria-label*="Start"], input[placeholder*="Start"], input[placeholder*="开始"]'
+END_DATE_INPUT_SELECTOR = 'input[aria-label*="End Time"], input[aria-label*="End"], input[placeholder*="End"], input[placeholder*="结束"]'
+
+# 详情页就绪快照：在页面内用MutationObserver等待订单号出现且头部占位符全部消失，
+# 就绪（或超时）时在同一次调用中返回结构化页面快照，避免反复拉取整页文本
+DETAIL_SNAPSHOT_SCRIPT = '''
+({ orderNumber, placeholders, timeoutMs }) => new Promise(resolve => {
+    const extract = __SNAPSHOT_FUNCTION__;
+    const read = () => document.body ? document.body.textContent : '';
+    const isReady = (text) => text.includes(orderNumber) && !placeholders.some(p => text.includes(p));
+    if (isReady(read())) {
+        resolve({ ready: true, snapshot: extract() });
+        return;
+    }
+    let pending = false;
+    let timer = null;
+    const finish = (ready) => {
+        observer.disconnect();
+        clearTimeout(timer);
+        resolve({ ready, snapshot: extract() });
+    };
+    const observer = new MutationObserver(() => {
+        // 合并同一轮的多次变化，只检查一次
+        if (pending) return;
+        pending = true;
+        setTimeout(() => {
+            pending = false;
+            if (isReady(read())) finish(true);
+        }, 50);
+    });
+    observer.observe(document.documentElement, { childList: true, subtree: true, characterData: true });
+    timer = setTimeout(() => finish(false), timeoutMs);
+})
+'''.replace('__SNAPSHOT_FUNCTION__', SNAPSHOT_FUNCTION_JS.strip())
+
+
+# 日期单元格查找（JS函数表达式）：返回第一个可见、未禁用且文本为该日（或aria-label/data-date为该日期）的单元格序号，
+# 上月/下月的补位单元格不计入，未找到时返回-1
+DAY_CELL_FINDER_JS = '''
+(cells, { day, dateString }) => {
+    const className = (el) => el.getAttribute('class') || '';
+    const isVisible = (el) => !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+    const isDisabled = (el) => /disabled/.test(className(el)) || !!el.querySelector('[class*="disabled"]');
+    const isOtherMonth = (el) => /other|prev-month|next-month/.test(className(el)) || !!el.querySelector('[class*="other"]');
+    return cells.findIndex(el => {
+        if (!isVisible(el) || isDisabled(el)) return false;
+        if ((el.getAttribute('aria-label') || '').includes(dateString)) return true;
+        if (el.getAttribute('data-date') === dateString) return true;
+        return (el.textContent || '').trim() === day && !isOtherMonth(el);
+    });
+}
+'''
 
 
 def _select_date_from_picker(page: Page, year: int, month: int, day: int) -> bool:
@@ -24,105 +174,42 @@ def _select_date_from_picker(page: Page, year: int, month: int, day: int) -> boo
         bool: 是否成功选择日期
     """
     try:
-        picker_selectors = [
-            '[class*="calendar"]',
-            '[class*="date-picker"]',
-            '[class*="picker"]',
-            '[class*="DatePicker"]',
-            '[role="dialog"]',
-            '[class*="ant-picker-dropdown"]',
-            '[class*="rc-calendar"]',
-            '.ant-picker-dropdown',
-            '.rc-calendar-picker'
-        ]
+        picker = resolve_selector(page, 'datePicker', DATE_PICKER_SELECTORS, timeout=3000)
         
-        picker_visible = False
-        for selector in picker_selectors:
-            try:
-                page.wait_for_selector(selector, timeout=2000)
-                picker_visible = True
-                print(f'日期选择器出现: {selector}')
-                break
-            except Exception:
-                continue
+        if not picker:
+            wait_for_dom_quiet(page, timeout=1000)
+            picker = resolve_selector(page, 'datePicker', DATE_PICKER_SELECTORS, timeout=1000)
         
-        if not picker_visible:
-            page.wait_for_timeout(1000)
-            for selector in picker_selectors:
-                try:
-                    if page.locator(selector).first.is_visible(timeout=1000):
-                        picker_visible = True
-                        break
-                except Exception:
-                    continue
-        
-        if not picker_visible:
+        if not picker:
             return False
+        print('日期选择器已出现')
         
-        page.wait_for_timeout(500)
+        # 等待日期选择器展开动画结束
+        wait_for_dom_quiet(page, quiet_ms=200, timeout=1000)
         
         date_string = f'{year}-{str(month).zfill(2)}-{str(day).zfill(2)}'
-        day_selectors = [
-            f'[aria-label*="{date_string}"]',
-            f'[data-date="{date_string}"]',
-            f'[data-value="{date_string}"]',
-            f'[title*="{date_string}"]',
-            f'[aria-label*="{year}年{month}月{day}日"]',
-            f'[aria-label*="{year}-{month}-{day}"]'
-        ]
-        
-        for selector in day_selectors:
+        day_element = resolve_selector(
+            page, 'datePickerDay', DATE_PICKER_DAY_SELECTORS,
+            params={'date_string': date_string, 'year': year, 'month': month, 'day': day},
+            timeout=2000
+        )
+        if day_element:
             try:
-                day_element = page.locator(selector).first
-                if day_element.is_visible(timeout=2000):
-                    day_element.click()
-                    page.wait_for_timeout(500)
-                    print(f'成功点击日期元素: {selector}')
-                    return True
+                day_element.click()
+                wait_for_dom_quiet(page, quiet_ms=200, timeout=1000)
+                print(f'成功点击日期元素: {date_string}')
+                return True
             except Exception:
-                continue
-        
-        all_day_elements = page.locator('[class*="day"], [class*="date"], [role="gridcell"], td, [class*="calendar-day"]').all()
-        print(f'找到 {len(all_day_elements)} 个日期元素')
-        
-        for day_el in all_day_elements:
-            try:
-                text = day_el.text_content()
-                aria_label = day_el.get_attribute('aria-label') or ''
-                data_date = day_el.get_attribute('data-date') or ''
-                
-                if ((text and text.strip() == str(day) and not any([
-                    day_el.locator('[class*="disabled"]').is_visible(timeout=100),
-                    day_el.locator('[class*="other"]').is_visible(timeout=100)
-                ])) or aria_label and date_string in aria_label or data_date == date_string):
-                    try:
-                        is_disabled = day_el.locator('[class*="disabled"]').is_visible(timeout=100)
-                        if not is_disabled:
-                            day_el.click()
-                            page.wait_for_timeout(500)
-                            print(f'成功点击日期单元格: {text or aria_label or data_date}')
-                            return True
-                    except Exception:
-                        continue
-            except Exception:
-                continue
+                pass
         
-        day_text_elements = page.locator(f'text={day}').all()
-        for day_text_el in day_text_elements:
-            try:
-                parent = day_text_el.locator('xpath=ancestor::*[contains(@class, "day") or contains(@class, "date")]').first
-                if parent.is_visible(timeout=1000):
-                    try:
-                        is_disabled = parent.locator('[class*="disabled"]').is_visible(timeout=100)
-                        if not is_disabled:
-                            parent.click()
-                            page.wait_for_timeout(500)
-                            print(f'成功通过文本点击日期: {day}')
-                            return True
-                    except Exception:
-                        continue
-            except Exception:
-                continue
+        # 按属性未找到时，一次调用在所有候选单元格中查找可见、未禁用、文本为该日的单元格
+        day_cells = page.locator('[class*="day"], [class*="date"], [role="gridcell"], td, [class*="calendar-day"]')
+        index = day_cells.evaluate_all(DAY_CELL_FINDER_JS, {'day': str(day), 'dateString': date_string})
+        if index is not None and index >= 0:
+            day_cells.nth(index).click()
+            wait_for_dom_quiet(page, quiet_ms=200, timeout=1000)
+            print(f'成功点击日期单元格: {date_string}')
+            return True
         
         return False
     except Exception as e:
@@ -130,6 +217,8 @@ def _select_date_from_picker(page: Page, year: int, month: int, day: int) -> boo
         return False
 
 
+@timed_step('导航到订货页面')
+@measure_navigation
 def navigate_to_order_page(page: Page):
     """
     导航到订货页面
@@ -138,10 +227,12 @@ def navigate_to_order_page(page: Page):
         page: Playwright页面对象
     """
     page.wait_for_load_state('domcontentloaded')
-    page.wait_for_timeout(2000)
     
     print(f'当前页面URL: {page.url}')
     
+    # 捕获订货单列表接口数据，供列表校验的接口模式使用
+    start_response_capture(page, 'orderList')
+    
     # 使用环境变量配置BOH基础URL，如果未设置则使用默认值
     boh_base_url = os.getenv('BOH_BASE_URL', BOH_BASE_URL)
     order_page_url = f'{boh_base_url}/store-supply/demand-daily'
@@ -151,7 +242,7 @@ def navigate_to_order_page(page: Page):
         
         # 使用domcontentloaded而不是networkidle，避免长时间等待
         page.goto(order_page_url, wait_until='domcontentloaded', timeout=30000)
-        page.wait_for_timeout(3000)
+        wait_for_page_ready(page, timeout=10000)
         
         final_url = page.url
         print(f'导航后URL: {final_url}')
@@ -160,29 +251,23 @@ def navigate_to_order_page(page: Page):
             # 等待页面内容加载
             try:
                 page.wait_for_load_state('domcontentloaded', timeout=10000)
-                page_text = page.text_content('body') or ''
-                if '订货' in page_text or '订单' in page_text:
+                snapshot = take_snapshot(page)
+                if snapshot.contains('订货') or snapshot.contains('订单'):
                     print('成功导航到订货页面（demand-daily）')
             except Exception as e:
                 print(f'等待页面内容超时，但URL已正确: {e}')
-        
-        # 使用更宽松的等待策略
-        try:
-            page.wait_for_load_state('domcontentloaded', timeout=5000)
-        except Exception as e:
-            print(f'等待domcontentloaded超时，继续执行: {e}')
-        page.wait_for_timeout(2000)
     except Exception as e:
         print(f'导航到订货页面失败: {e}')
         # 检查是否已经导航到目标页面
         current_url = page.url
         if 'demand-daily' in current_url:
             print('虽然出现错误，但URL已正确，继续执行')
-            page.wait_for_timeout(2000)
+            wait_for_page_ready(page, timeout=5000)
             return
         raise Exception(f'无法导航到订货页面: {e}')
 
 
+@timed_step('选择日期范围并查询')
 def select_date_range_and_query(
     page: Page,
     start_year: int,
@@ -204,25 +289,21 @@ def select_date_range_and_query(
         end_month: 结束月份
         end_day: 结束日期
     """
-    page.wait_for_load_state('domcontentloaded')
-    page.wait_for_timeout(2000)
+    # 整个步骤共享60秒等待预算
+    budget = StepBudget(60000)
+    start_response_capture(page, 'orderList')
     
     current_url = page.url
     if 'demand-daily' not in current_url:
         navigate_to_order_page(page)
     
-    # 使用更宽松的等待策略
-    try:
-        page.wait_for_load_state('domcontentloaded', timeout=10000)
-    except Exception as e:
-        print(f'等待domcontentloaded超时，继续执行: {e}')
-    page.wait_for_timeout(2000)
+    wait_for_page_ready(page, timeout=10000, budget=budget)
     
     start_date_set = False
     end_date_set = False
     
     # 设置开始日期
-    start_time_inputs = page.locator('input[aria-label*="Start Time"], input[aria-label*="Start"], input[placeholder*="Start"], input[placeholder*="开始"]').all()
+    start_time_inputs = page.locator(START_DATE_INPUT_SELECTOR).all()
     if len(start_time_inputs) > 0 and not start_date_set:
         retry_count = 0
         max_retries = 3
@@ -232,10 +313,7 @@ def select_date_range_and_query(
                 print(f'点击开始日期输入框（尝试 {retry_count + 1}/{max_retries}）')
                 
                 start_time_inputs[0].scroll_into_view_if_needed()
-                page.wait_for_timeout(500)
-                
                 start_time_inputs[0].click(force=True)
-                page.wait_for_timeout(1500)
                 
                 selected = _select_date_from_picker(page, start_year, start_month, start_day)
                 if selected:
@@ -245,28 +323,25 @@ def select_date_range_and_query(
                 else:
                     retry_count += 1
                     if retry_count < max_retries:
-                        page.wait_for_timeout(1000)
+                        wait_for_dom_quiet(page, quiet_ms=200, timeout=1000, budget=budget)
             except Exception as e:
                 retry_count += 1
                 if retry_count < max_retries:
-                    page.wait_for_timeout(1000)
+                    wait_for_dom_quiet(page, quiet_ms=200, timeout=1000, budget=budget)
         
         if not start_date_set:
             try:
                 start_time_inputs[0].click()
-                page.wait_for_timeout(500)
                 start_time_inputs[0].fill('')
-                page.wait_for_timeout(200)
                 start_date_str = f'{start_year}-{str(start_month).zfill(2)}-{str(start_day).zfill(2)}'
                 start_time_inputs[0].fill(start_date_str)
-                page.wait_for_timeout(500)
                 start_date_set = True
                 print(f'通过fill设置开始日期: {start_date_str}（后备方案）')
             except Exception as e:
                 print(f'fill后备方案也失败: {e}')
     
     # 设置结束日期
-    end_time_inputs = page.locator('input[aria-label*="End Time"], input[aria-label*="End"], input[placeholder*="End"], input[placeholder*="结束"]').all()
+    end_time_inputs = page.locator(END_DATE_INPUT_SELECTOR).all()
     if len(end_time_inputs) > 0 and not end_date_set:
         retry_count = 0
         max_retries = 3
@@ -276,10 +351,7 @@ def select_date_range_and_query(
                 print(f'点击结束日期输入框（尝试 {retry_count + 1}/{max_retries}）')
                 
                 end_time_inputs[0].scroll_into_view_if_needed()
-                page.wait_for_timeout(500)
-                
                 end_time_inputs[0].click(force=True)
-                page.wait_for_timeout(1500)
                 
                 selected = _select_date_from_picker(page, end_year, end_month, end_day)
                 if selected:
@@ -289,21 +361,18 @@ def select_date_range_and_query(
                 else:
                     retry_count += 1
                     if retry_count < max_retries:
-                        page.wait_for_timeout(1000)
+                        wait_for_dom_quiet(page, quiet_ms=200, timeout=1000, budget=budget)
             except Exception as e:
                 retry_count += 1
                 if retry_count < max_retries:
-                    page.wait_for_timeout(1000)
+                    wait_for_dom_quiet(page, quiet_ms=200, timeout=1000, budget=budget)
         
         if not end_date_set:
             try:
                 end_time_inputs[0].click()
-                page.wait_for_timeout(500)
                 end_time_inputs[0].fill('')
-                page.wait_for_timeout(200)
                 end_date_str = f'{end_year}-{str(end_month).zfill(2)}-{str(end_day).zfill(2)}'
                 end_time_inputs[0].fill(end_date_str)
-                page.wait_for_timeout(500)
                 end_date_set = True
                 print(f'通过fill设置结束日期: {end_date_str}（后备方案）')
             except Exception as e:
@@ -315,95 +384,71 @@ def select_date_range_and_query(
         navigate_to_order_page(page)
     
     # 等待页面稳定
-    page.wait_for_timeout(2000)
+    wait_for_dom_quiet(page, timeout=2000, budget=budget)
     
     # 尝试多种方式定位查询按钮
-    query_button_selectors = [
-        'button:has-text("查询")',
-        'button:has-text("Search")',
-        'button[type="submit"]',
-        'button.btn-primary:has-text("查询")',
-        'button.ant-btn-primary',
-        '[class*="query-button"]',
-        '[class*="search-button"]',
-        'button:has([class*="search"])',
-        'button:has([class*="query"])'
-    ]
-    
-    query_button = None
-    query_button_found = False
-    
-    for selector in query_button_selectors:
-        try:
-            query_button = page.locator(selector).first
-            if query_button.is_visible(timeout=3000):
-                print(f'找到查询按钮，使用选择器: {selector}')
-                query_button_found = True
-                break
-        except Exception:
-            continue
+    query_button = resolve_selector(page, 'queryButton', QUERY_BUTTON_SELECTORS, timeout=3000)
+    query_button_found = query_button is not None
+    if query_button_found:
+        print('找到查询按钮')
     
     if not query_button_found:
         # 如果找不到按钮，尝试滚动页面后再找
         page.evaluate('() => { window.scrollTo(0, document.body.scrollHeight); }')
-        page.wait_for_timeout(1000)
+        wait_for_dom_quiet(page, quiet_ms=200, timeout=1000, budget=budget)
         page.evaluate('() => { window.scrollTo(0, 0); }')
-        page.wait_for_timeout(1000)
+        wait_for_dom_quiet(page, quiet_ms=200, timeout=1000, budget=budget)
         
         # 再次尝试查找
-        for selector in query_button_selectors:
-            try:
-                query_button = page.locator(selector).first
-                if query_button.is_visible(timeout=3000):
-                    print(f'滚动后找到查询按钮，使用选择器: {selector}')
-                    query_button_found = True
-                    break
-            except Exception:
-                continue
+        query_button = resolve_selector(page, 'queryButton', QUERY_BUTTON_SELECTORS, timeout=3000)
+        query_button_found = query_button is not None
+        if query_button_found:
+            print('滚动后找到查询按钮')
     
+    # 查询结果以订货单列表接口响应为准
+    list_response = None
     if query_button_found and query_button:
         try:
             # 确保按钮可点击
             query_button.scroll_into_view_if_needed()
-            page.wait_for_timeout(500)
-            
-            # Python版本的Promise.all等价操作
-            from concurrent.futures import ThreadPoolExecutor
-            executor = ThreadPoolExecutor(max_workers=3)
             
-            futures = [
-                executor.submit(lambda: page.wait_for_url('**/demand-daily**', timeout=20000)),
-                executor.submit(lambda: page.wait_for_load_state('networkidle', timeout=20000)),
-                executor.submit(lambda: query_button.click(force=True))
-            ]
-            
-            # 忽略前两个的异常，只执行点击
-            query_button.click(force=True)
+            # 点击查询并等待列表接口返回（Python版本的Promise.all等价操作）
+            list_response = wait_for_named_response(
+                page, 'orderList',
+                action=lambda: query_button.click(force=True),
+                timeout=20000, budget=budget
+            )
             print('成功点击查询按钮')
         except Exception as e:
             print(f'查询按钮点击时出错: {e}')
             # 尝试使用键盘Enter键作为后备方案
             try:
-                page.keyboard.press('Enter')
-                page.wait_for_timeout(2000)
+                list_response = wait_for_named_response(
+                    page, 'orderList',
+                    action=lambda: page.keyboard.press('Enter'),
+                    timeout=10000, budget=budget
+                )
                 print('使用Enter键触发查询')
             except Exception as key_error:
                 print(f'Enter键也失败: {key_error}')
     else:
         print('警告: 未找到查询按钮，尝试使用Enter键')
         try:
-            page.keyboard.press('Enter')
-            page.wait_for_timeout(2000)
+            list_response = wait_for_named_response(
+                page, 'orderList',
+                action=lambda: page.keyboard.press('Enter'),
+                timeout=10000, budget=budget
+            )
             print('使用Enter键触发查询')
         except Exception as e:
             print(f'Enter键也失败: {e}')
     
-    # 使用更宽松的等待策略，避免超时
-    try:
-        page.wait_for_load_state('domcontentloaded', timeout=10000)
-    except Exception as e:
-        print(f'等待domcontentloaded超时，继续执行: {e}')
-    page.wait_for_timeout(5000)
+    # 接口已返回时只需等待列表渲染完成，否则退回到页面就绪判定
+    if list_response is not None:
+        print(f'订货单列表接口已返回: {list_response.status}')
+        wait_for_dom_quiet(page, timeout=5000, budget=budget)
+    else:
+        wait_for_page_ready(page, timeout=10000, budget=budget)
     
     url_after_query = page.url
     print(f'查询后页面URL: {url_after_query}')
@@ -413,13 +458,282 @@ def select_date_range_and_query(
         navigate_to_order_page(page)
 
 
-def find_and_verify_order_in_list(
+def is_direct_list_navigation_enabled() -> bool:
+    """
+    是否通过URL查询参数直接打开带筛选条件的列表（环境变量ORDER_LIST_DIRECT_URL=true时启用，默认操作日期选择器）
+
+    页面是否支持URL查询参数需要先确认，不支持时每次打开都要等待列表接口确认超时后才退回为日期选择器
+
+    Returns:
+        bool: 是否启用
+    """
+    return os.getenv('ORDER_LIST_DIRECT_URL', 'false').lower() == 'true'
+
+
+def as_date(value: Union[date, str]) -> date:
+    """将日期或YYYY-MM-DD字符串转换为日期"""
+    return value if isinstance(value, date) else date.fromisoformat(value)
+
+
+def build_order_list_url(
+    start_date: Union[date, str],
+    end_date: Union[date, str],
+    store: str = None,
+    status: str = None
+) -> str:
+    """
+    构造带筛选条件的订货列表URL
+
+    Args:
+        start_date: 开始日期（date或YYYY-MM-DD）
+        end_date: 结束日期（date或YYYY-MM-DD）
+        store: 订货门店（可选）
+        status: 单据状态（可选）
+
+    Returns:
+        订货列表URL（参数名见url_config.LIST_QUERY_PARAMS）
+    """
+    param_names = LIST_QUERY_PARAMS['order']
+    params = {
+        param_names['start_date']: as_date(start_date).isoformat(),
+        param_names['end_date']: as_date(end_date).isoformat(),
+        param_names['store']: store,
+        param_names['status']: status
+    }
+    boh_base_url = os.getenv('BOH_BASE_URL', BOH_BASE_URL)
+    return get_query_url(boh_base_url, URL_CONFIG['storeOperations']['order'], params)
+
+
+def _list_filters_applied(page: Page, list_response, start: str, end: str) -> bool:
+    """
+    判断URL中的日期条件是否生效：列表接口请求中带有该日期范围，或页面日期输入框已显示该日期范围
+    """
+    request = list_response.request
+    sent = f'{request.url} {request.post_data or ""}'
+    if start in sent and end in sent:
+        return True
+    try:
+        values = page.locator('input').evaluate_all('inputs => inputs.map(input => input.value || "")')
+    except Exception:
+        return False
+    return any(start in value for value in values) and any(end in value for value in values)
+
+
+@timed_step('按条件打开订货列表')
+def open_order_list(
+    page: Page,
+    start_date: Union[date, str],
+    end_date: Union[date, str],
+    store: str = None,
+    status: str = None,
+    timeout: int = 30000
+) -> bool:
+    """
+    按条件打开订货列表：ORDER_LIST_DIRECT_URL=true时直接打开带筛选条件的URL（查询参数），替代逐个操作日期选择器再点击查询
+
+    打开后在ORDER_LIST_CONFIRM_TIMEOUT内以订货单列表接口请求或日期输入框确认条件已生效；未启用或页面不支持URL参数时使用
+    select_date_range_and_query() 操作日期选择器（此时门店和状态条件不生效）。日期选择器本身由单独的测试覆盖
+
+    Args:
+        page: Playwright页面对象
+        start_date: 开始日期（date或YYYY-MM-DD）
+        end_date: 结束日期（date或YYYY-MM-DD）
+        store: 订货门店（可选）
+        status: 单据状态（可选）
+        timeout: 打开页面的超时时间（毫秒）
+
+    Returns:
+        bool: 条件是否通过URL生效（False表示使用日期选择器查询）
+    """
+    start, end = as_date(start_date), as_date(end_date)
+    start_response_capture(page, 'orderList')
+
+    if is_direct_list_navigation_enabled():
+        list_url = build_order_list_url(start, end, store, status)
+        print(f'直接打开订货列表: {list_url}')
+        try:
+            list_response = wait_for_named_response(
+                page, 'orderList',
+                action=lambda: page.goto(list_url, wait_until='domcontentloaded', timeout=timeout),
+                timeout=min(timeout, ORDER_LIST_CONFIRM_TIMEOUT)
+            )
+        except Exception as e:
+            print(f'⚠️  打开订货列表失败: {e}')
+            list_response = None
+
+        if list_response is not None and _list_filters_applied(page, list_response, start.isoformat(), end.isoformat()):
+            wait_for_dom_quiet(page, timeout=5000)
+            print(f'✓ 订货列表已按URL条件加载: {start} ~ {end}')
+            return True
+        print('⚠️  URL中的筛选条件未生效，改为通过日期选择器查询')
+
+    select_date_range_and_query(page, start.year, start.month, start.day, end.year, end.month, end.day)
+    return False
+
+
+def _verify_order_in_list_api(
     page: Page,
     order_number: str,
+    expected: dict
+) -> bool:
+    """
+    辅助函数：使用捕获的订货单列表接口数据校验订单
+    
+    Args:
+        page: Playwright页面对象
+        order_number: 订单号
+        expected: 期望值 {字段名: 期望值}
+        
+    Returns:
+        bool: 是否在接口数据中找到订单并完成校验（未找到时返回False，由调用方退回DOM校验）
+    """
+    if match_order_list_record(get_captured_json(page, 'orderList'), order_number, expected) is None:
+        return False
+    
+    # DOM只需确认订单行已渲染
+    page.get_by_text(order_number, exact=True).first.wait_for(state='visible', timeout=10000)
+    print('✓ 订单行已在列表中展示')
+    return True
+
+
+def match_order_list_record(captured: List, order_number: str, expected: dict) -> Optional[dict]:
+    """
+    在捕获的订货单列表接口数据中查找订单并按字段校验（同步和异步版本共用）
+    
+    Args:
+        captured: 捕获的接口响应数据（get_captured_json的返回值）
+        order_number: 订单号
+        expected: 期望值 {字段名: 期望值}
+        
+    Returns:
+        订单记录，接口数据中没有该订单时返回None
+    """
+    record = None
+    for data in captured:
+        record = find_record(data, order_number)
+        if record is not None:
+            break
+    
+    if record is None:
+        print('未捕获到包含该订单的列表接口数据，退回DOM校验')
+        return None
+    
+    print(f'接口数据中的订单记录: {str(record)[:500]}')
+    mismatches = match_record_fields(record, expected, ORDER_LIST_FIELDS, API_VALUE_LABELS)
+    assert not mismatches, f'订单列表接口数据不匹配（字段: (期望, 实际)）: {mismatches}'
+    for field, value in expected.items():
+        print(f'✓ {field} 验证通过: {value}')
+    return record
+
+
+def find_order_row_in_table(list_table, order_number: str) -> tuple:
+    """
+    在读取到的订单表格中按订货单号列查找订单行（同步和异步版本共用）
+    
+    Args:
+        list_table: 订单表格（TableData，未读取到时为None）
+        order_number: 订单号
+        
+    Returns:
+        (表格行, 行文本)，未找到时为 (None, '')
+    """
+    if not list_table:
+        return None, ''
+    print(f'在数据表格中读取到 {len(list_table)} 行')
+    table_row = list_table.lookup('订货单号', order_number)
+    if not table_row:
+        return None, ''
+    print('在数据表格中找到订单行')
+    return table_row, ' '.join(table_row)
+
+
+def find_order_row_in_snapshot(snapshot: PageSnapshot, order_number: str) -> str:
+    """
+    在页面快照提取的表格行中查找订单行（同步和异步版本共用）
+    
+    Args:
+        snapshot: 页面快照
+        order_number: 订单号
+        
+    Returns:
+        行文本，未找到时返回空字符串（订单号可能仍在页面文本中，由调用方从订单号元素向上查找所在行）
+    """
+    snapshot_rows = snapshot.find_rows(order_number)
+    if not snapshot_rows:
+        return ''
+    print('在页面快照中找到订单行')
+    return ' '.join(snapshot_rows[0])
+
+
+def assert_order_list_row(
+    row_text: str,
+    list_table,
+    table_row,
     status: str,
     store_name: str,
     source: str,
     order_date: str
+):
+    """
+    校验找到的订单行（同步和异步版本共用）：通过表格读取到订单行时按列名取值，否则在整行文本中查找
+    
+    Args:
+        row_text: 订单行文本
+        list_table: 订单表格（TableData，未读取到时为None）
+        table_row: 表格中的订单行（未通过表格找到时为None）
+        status: 状态
+        store_name: 订货门店
+        source: 来源
+        order_date: 订货日期
+    """
+    print(f'订单行内容: {row_text[:500]}')
+    
+    def field_text(field: str) -> str:
+        """字段所在单元格的文本，未通过表格读取到该列时使用整行文本"""
+        if table_row is not None:
+            value = list_table.cell(table_row, ORDER_LIST_COLUMNS[field])
+            if value is not None:
+                return value
+        return row_text
+    
+    assert_order_list_fields(field_text, status, store_name, source, order_date)
+    print('订单列表验证全部通过')
+
+
+def assert_order_list_fields(field_text, status: str, store_name: str, source: str, order_date: str):
+    """
+    校验订单行中的各字段（同步和异步版本共用）
+    
+    Args:
+        field_text: 函数，字段名（见ORDER_LIST_COLUMNS） -> 用于校验的文本
+        status: 状态
+        store_name: 订货门店
+        source: 来源
+        order_date: 订货日期
+    """
+    # 使用标准断言验证订单信息
+    assert status in field_text('status'), f'订单行中未找到状态: {status}'
+    print(f'✓ 状态验证通过: {status}')
+    
+    assert store_name in field_text('store_name'), f'订单行中未找到订货门店: {store_name}'
+    print(f'✓ 订货门店验证通过: {store_name}')
+    
+    assert source in field_text('source'), f'订单行中未找到来源: {source}'
+    print(f'✓ 来源验证通过: {source}')
+    
+    assert order_date in field_text('order_date'), f'订单行中未找到订货日期: {order_date}'
+    print(f'✓ 订货日期验证通过: {order_date}')
+
+
+@timed_step('验证订单列表')
+def find_and_verify_order_in_list(
+    page: Page,
+    order_number: str,
+    status: str,
+    store_name: str,
+    source: str,
+    order_date: str,
+    mode: str = None
 ):
     """
     查找并验证订单列表数据
@@ -431,76 +745,72 @@ def find_and_verify_order_in_list(
         store_name: 订货门店
         source: 来源
         order_date: 订货日期
+        mode: 校验方式，'dom' 在页面表格中按文本校验，'api' 使用捕获的列表接口数据按字段校验
+              （可选，默认读取环境变量ORDER_LIST_VERIFY_MODE，未设置时为'dom'）
     """
-    # 使用更宽松的等待策略
-    try:
-        page.wait_for_load_state('domcontentloaded', timeout=10000)
-    except Exception as e:
-        print(f'等待domcontentloaded超时，继续执行: {e}')
-    page.wait_for_timeout(2000)
+    record_order_number(order_number)
+    if mode is None:
+        mode = os.getenv('ORDER_LIST_VERIFY_MODE', 'dom').lower()
+    
+    wait_for_page_ready(page, timeout=10000)
     
     current_url = page.url
     if 'demand-daily' not in current_url:
         navigate_to_order_page(page)
     
+    if mode == 'api':
+        expected = {
+            'order_number': order_number,
+            'status': status,
+            'store_name': store_name,
+            'source': source,
+            'order_date': order_date
+        }
+        if _verify_order_in_list_api(page, order_number, expected):
+            print('订单列表验证全部通过（接口数据）')
+            return
+    
     order_row = None
     row_text = ''
+    # 通过表格读取到订单行时，按列名取值校验
+    list_table = None
+    table_row = None
     
-    page.evaluate('() => { window.scrollTo(0, document.body.scrollHeight); }')
-    page.wait_for_timeout(2000)
-    page.evaluate('() => { window.scrollTo(0, 0); }')
-    page.wait_for_timeout(2000)
+    # 滚动页面触发懒加载，等待新内容渲染完成
+    page.evaluate(SCROLL_TO_BOTTOM_JS)
+    wait_for_dom_quiet(page, timeout=2000)
+    page.evaluate(SCROLL_TO_TOP_JS)
+    wait_for_dom_quiet(page, timeout=2000)
     
-    # 方法1: 使用get_by_text精确查找订单号
+    if not wait_for_locator(page.get_by_text(order_number, exact=True).first, timeout=10000):
+        print('订单号未在页面上显示，尝试其他方法')
+    
+    # 方法1: 一次读取整张订单表格，按订货单号列直接取行
     try:
-        order_element = page.get_by_text(order_number, exact=True).first
-        order_element.wait_for(state='visible', timeout=10000)
-        
-        order_row = order_element.locator('xpath=ancestor::tr | ancestor::*[contains(@class, "row")] | ancestor::*[contains(@class, "item")]').first
-        if order_row.is_visible(timeout=2000):
-            row_text = order_row.text_content() or ''
-            print('通过精确文本匹配找到订单行')
-    except Exception:
-        print('精确文本匹配失败，尝试其他方法')
-    
-    # 方法2: 在数据表格中查找
-    if not order_row or not row_text:
-        data_table_selectors = [
-            'table:has-text("订货单号")',
-            'table:has-text("状态")',
-            '[class*="table"]:has-text("订货单号")',
-            '[class*="table"]:has-text("状态")',
-            '[role="table"]:has-text("订货单号")',
-            '[role="grid"]:has-text("订货单号")'
-        ]
-        
-        for selector in data_table_selectors:
-            try:
-                table = page.locator(selector).first
-                if table.is_visible(timeout=3000):
-                    rows = table.locator('tr, [class*="row"], [role="row"]').all()
-                    print(f'在数据表格中找到 {len(rows)} 行')
-                    
-                    for row in rows:
-                        try:
-                            text = row.text_content() or ''
-                            if order_number in text:
-                                order_row = row
-                                row_text = text
-                                print('在数据表格中找到订单行')
-                                break
-                        except Exception:
-                            continue
-                    if order_row:
-                        break
-            except Exception:
-                continue
+        table = resolve_selector(page, 'orderListTable', ORDER_TABLE_SELECTORS, timeout=3000, first=False)
+        list_table = read_table(table or page, '订货单号')
+        table_row, row_text = find_order_row_in_table(list_table, order_number)
+    except Exception as e:
+        print(f'数据表格读取失败: {e}')
     
-    # 方法3: 在整个页面中搜索订单号
-    if not order_row or not row_text:
+    # 方法2: 从订单号元素向上查找所在行
+    if not row_text:
         try:
-            page_text = page.text_content('body') or ''
-            if order_number in page_text:
+            order_element = page.get_by_text(order_number, exact=True).first
+            order_row = order_element.locator(ORDER_ROW_ANCESTOR_XPATH).first
+            if order_row.is_visible(timeout=2000):
+                row_text = order_row.text_content() or ''
+                print('通过精确文本匹配找到订单行')
+        except Exception:
+            print('精确文本匹配失败，尝试其他方法')
+    
+    # 方法3: 在页面快照中搜索订单号（表格行已按单元格提取，优先直接使用）
+    if not row_text:
+        try:
+            snapshot = take_snapshot(page)
+            row_text = find_order_row_in_snapshot(snapshot, order_number)
+            page_text = snapshot.text
+            if not row_text and order_number in page_text:
                 order_element = page.locator(f'text={order_number}').first
                 if order_element.is_visible(timeout=5000):
                     order_row = order_element.locator('xpath=ancestor::tr | ancestor::*[contains(@class, "row")]').first
@@ -514,28 +824,15 @@ def find_and_verify_order_in_list(
             print(f'页面搜索失败: {e}')
     
     if not row_text or order_number not in row_text:
-        page_text = page.text_content('body') or ''
+        page_text = take_snapshot(page).text
         print(f'页面内容预览: {page_text[:2000] if page_text else "空内容"}')
         raise Exception(f'未找到订单号 {order_number}')
     
-    print(f'订单行内容: {row_text[:500]}')
-    
-    # 使用标准断言验证订单信息
-    assert status in row_text, f'订单行中未找到状态: {status}'
-    print(f'✓ 状态验证通过: {status}')
-    
-    assert store_name in row_text, f'订单行中未找到订货门店: {store_name}'
-    print(f'✓ 订货门店验证通过: {store_name}')
-    
-    assert source in row_text, f'订单行中未找到来源: {source}'
-    print(f'✓ 来源验证通过: {source}')
-    
-    assert order_date in row_text, f'订单行中未找到订货日期: {order_date}'
-    print(f'✓ 订货日期验证通过: {order_date}')
-    
-    print('订单列表验证全部通过')
+    assert_order_list_row(row_text, list_table, table_row, status, store_name, source, order_date)
 
 
+@timed_step('打开订单详情')
+@measure_navigation
 def click_order_to_open_detail(page: Page, order_number: str):
     """
     点击订单打开详情页
@@ -544,12 +841,10 @@ def click_order_to_open_detail(page: Page, order_number: str):
         page: Playwright页面对象
         order_number: 订单号
     """
-    # 使用更宽松的等待策略
-    try:
-        page.wait_for_load_state('domcontentloaded', timeout=5000)
-    except Exception as e:
-        print(f'等待domcontentloaded超时，继续执行: {e}')
-    page.wait_for_timeout(2000)
+    record_order_number(order_number)
+    # 详情接口在点击后的页面跳转过程中返回，需要提前开始捕获
+    start_response_capture(page, 'orderDetail')
+    wait_for_page_ready(page, timeout=5000)
     
     order_link_clicked = False
     
@@ -607,12 +902,8 @@ def click_order_to_open_detail(page: Page, order_number: str):
         except Exception:
             print('链接选择器查找失败')
     
-    # 使用更宽松的等待策略
-    try:
-        page.wait_for_load_state('domcontentloaded', timeout=10000)
-    except Exception as e:
-        print(f'等待domcontentloaded超时，继续执行: {e}')
-    page.wait_for_timeout(3000)
+    # 等待详情页加载完成并渲染稳定
+    wait_for_page_ready(page, timeout=10000)
     
     detail_url = page.url
     print(f'详情页URL: {detail_url}')
@@ -621,8 +912,93 @@ def click_order_to_open_detail(page: Page, order_number: str):
         print('警告: 可能未能点击订单链接，但继续执行')
 
 
-def verify_order_detail(
-    page: Page,
+def _observe_order_detail(page: Page, order_number: str, timeout: int) -> dict:
+    """
+    辅助函数：在页面内等待详情页头部字段加载完成，并返回页面快照
+    
+    Args:
+        page: Playwright页面对象
+        order_number: 订单号
+        timeout: 超时时间（毫秒）
+        
+    Returns:
+        dict: {'ready': 是否就绪, 'snapshot': PageSnapshot}
+    """
+    try:
+        result = page.evaluate(DETAIL_SNAPSHOT_SCRIPT, {
+            'orderNumber': order_number,
+            'placeholders': DETAIL_HEADER_PLACEHOLDERS,
+            'timeoutMs': timeout
+        })
+        return {'ready': result['ready'], 'snapshot': remember_snapshot(page, result['snapshot'])}
+    except Exception as e:
+        # 等待过程中页面跳转会销毁执行上下文，此时返回未就绪
+        print(f'等待详情页数据中断: {e}')
+        return {'ready': False, 'snapshot': PageSnapshot({'url': page.url})}
+
+
+def _detail_api_returned(page: Page, order_number: str) -> bool:
+    """辅助函数：详情接口是否已返回该订单的数据"""
+    return any(find_record(data, order_number) is not None for data in get_captured_json(page, 'orderDetail'))
+
+
+@timed_step('加载订单详情')
+def load_order_detail(page: Page, order_number: str, timeout: int = 30000) -> dict:
+    """
+    加载订单详情页：等待详情数据就绪后返回结构化页面快照
+    
+    就绪判定在页面内通过MutationObserver完成（订单号已出现且头部字段均不再显示"-"）；
+    超时后结合详情接口的返回情况决定继续等待接口、滚动触发加载，最后刷新页面重试一次
+    
+    Args:
+        page: Playwright页面对象
+        order_number: 订单号
+        timeout: 首次等待的超时时间（毫秒）
+        
+    Returns:
+        dict: {'ready': 是否就绪, 'snapshot': PageSnapshot}
+    """
+    record_order_number(order_number)
+    start_response_capture(page, 'orderDetail')
+    
+    print('等待详情页数据加载...')
+    snapshot = _observe_order_detail(page, order_number, timeout)
+    if snapshot['ready']:
+        print(f'详情页数据已加载: {order_number}')
+        return snapshot
+    
+    # 详情接口还没有返回该订单时，继续等待接口响应
+    if not _detail_api_returned(page, order_number):
+        print('详情接口尚未返回该订单数据，等待接口响应...')
+        if wait_for_named_response(page, 'orderDetail', timeout=10000) is not None:
+            snapshot = _observe_order_detail(page, order_number, 5000)
+            if snapshot['ready']:
+                print(f'详情接口返回后数据已加载: {order_number}')
+                return snapshot
+    
+    # 尝试滚动页面以触发数据加载
+    print('尝试滚动页面以触发数据加载')
+    page.evaluate('() => { window.scrollTo(0, document.body.scrollHeight); window.scrollTo(0, 0); }')
+    snapshot = _observe_order_detail(page, order_number, 2000)
+    if snapshot['ready']:
+        return snapshot
+    
+    # 数据仍未加载完成，刷新页面并等待详情接口重新返回
+    print('检测到详情页数据未加载（显示"-"），刷新页面...')
+    wait_for_named_response(
+        page, 'orderDetail',
+        action=lambda: page.reload(wait_until='domcontentloaded'),
+        timeout=15000
+    )
+    print('页面刷新完成，重新等待数据加载...')
+    snapshot = _observe_order_detail(page, order_number, 15000)
+    if snapshot['ready']:
+        print('刷新后详情页数据已完全加载')
+    return snapshot
+
+
+def assert_order_detail(
+    snapshot: PageSnapshot,
     order_number: str,
     status: str,
     source: str,
@@ -631,10 +1007,10 @@ def verify_order_detail(
     store_code: str
 ):
     """
-    验证订单详情页顶部信息
+    基于详情页快照校验顶部信息（同步和异步版本共用）
     
     Args:
-        page: Playwright页面对象
+        snapshot: 详情页快照
         order_number: 订单号
         status: 状态
         source: 来源
@@ -642,138 +1018,18 @@ def verify_order_detail(
         store_name: 订货门店
         store_code: 订货门店编号
     """
-    # 使用更宽松的等待策略
-    try:
-        page.wait_for_load_state('domcontentloaded', timeout=10000)
-    except Exception as e:
-        print(f'等待domcontentloaded超时，继续执行: {e}')
-    
-    # 使用 Playwright 的智能等待
-    print('等待详情页订单号出现...')
-    try:
-        page.wait_for_selector(f'text={order_number}', timeout=30000, state='visible')
-        
-        page_text = page.text_content('body') or ''
-        if order_number in page_text and '订货单号：-' not in page_text:
-            print(f'订单号已加载: {order_number}')
-    except Exception:
-        print('等待订单号元素超时，继续尝试其他方法...')
-    
-    # 等待详情页数据加载完成
-    retry_count = 0
-    max_retries = 10
-    order_number_found = False
-    
-    while retry_count < max_retries and not order_number_found:
-        page.wait_for_timeout(1000)
-        
-        page_text = page.text_content('body') or ''
-        if order_number in page_text and '订货单号：-' not in page_text:
-            order_number_found = True
-            print(f'订单号已加载: {order_number}')
-            break
-        
-        try:
-            order_number_element = page.locator(f'text={order_number}').first
-            if order_number_element.is_visible(timeout=500):
-                order_number_found = True
-                print(f'通过元素查找找到订单号: {order_number}')
-                break
-        except Exception:
-            pass
-        
-        if '订货单号：-' in page_text:
-            print(f'等待详情页数据加载... (尝试 {retry_count + 1}/{max_retries})')
-        else:
-            print(f'等待订单号出现... (尝试 {retry_count + 1}/{max_retries})')
-        
-        retry_count += 1
-    
-    # 如果等待超时，尝试滚动页面
-    if not order_number_found:
-        print('尝试滚动页面以触发数据加载')
-        page.evaluate('() => { window.scrollTo(0, document.body.scrollHeight); }')
-        page.wait_for_timeout(1000)
-        page.evaluate('() => { window.scrollTo(0, 0); }')
-        page.wait_for_timeout(1000)
-    
-    # 等待详情页数据完全加载
-    print('等待详情页数据完全加载...')
-    data_loaded = False
-    max_data_wait_retries = 15
-    data_wait_retry_count = 0
-    
-    while not data_loaded and data_wait_retry_count < max_data_wait_retries:
-        page.wait_for_timeout(500)
-        page_text = page.text_content('body') or ''
-        
-        has_order_number = order_number in page_text and '订货单号：-' not in page_text
-        has_status = status in page_text and '单据状态：-' not in page_text
-        has_source = source in page_text and '来源：-' not in page_text
-        has_order_date = order_date in page_text and '订货日期：-' not in page_text
-        has_store_name = store_name in page_text and '订货门店：-' not in page_text
-        
-        if has_order_number and has_status and has_source and has_order_date and has_store_name:
-            data_loaded = True
-            print('详情页数据已完全加载')
-            break
-        
-        data_wait_retry_count += 1
-        if data_wait_retry_count % 5 == 0:
-            print(f'等待数据加载... ({data_wait_retry_count}/{max_data_wait_retries})')
-            page.evaluate('() => { window.scrollTo(0, document.body.scrollHeight); window.scrollTo(0, 0); }')
-    
-    page_text = page.text_content('body') or ''
+    page_text = snapshot.text
     print(f'详情页内容预览: {page_text[:2000] if page_text else "空内容"}')
     
-    # 如果数据还未加载完成，先刷新页面
     if '订货单号：-' in page_text or '单据状态：-' in page_text:
-        print('检测到详情页数据未加载（显示"-"），刷新页面...')
-        page.reload(wait_until='domcontentloaded')
-        page.wait_for_timeout(3000)
-        print('页面刷新完成，重新等待数据加载...')
-        
-        additional_wait_count = 0
-        max_additional_waits = 15
-        
-        while additional_wait_count < max_additional_waits:
-            page.wait_for_timeout(1000)
-            page_text = page.text_content('body') or ''
-            
-            has_order_number = order_number in page_text and '订货单号：-' not in page_text
-            has_status = status in page_text and '单据状态：-' not in page_text
-            has_source = source in page_text and '来源：-' not in page_text
-            has_order_date = order_date in page_text and '订货日期：-' not in page_text
-            has_store_name = store_name in page_text and '订货门店：-' not in page_text
-            
-            if has_order_number and has_status and has_source and has_order_date and has_store_name:
-                print('刷新后详情页数据已完全加载')
-                break
-            
-            additional_wait_count += 1
-            if additional_wait_count % 5 == 0:
-                print(f'刷新后继续等待数据加载... ({additional_wait_count}/{max_additional_waits})')
-                page.evaluate('() => { window.scrollTo(0, document.body.scrollHeight); window.scrollTo(0, 0); }')
-        
-        page_text = page.text_content('body') or ''
-        if '订货单号：-' in page_text or '单据状态：-' in page_text:
-            raise Exception('刷新页面后，详情页数据仍未加载完成，仍显示"-"，测试失败')
+        raise Exception('刷新页面后，详情页数据仍未加载完成，仍显示"-"，测试失败')
     
     # 确保页面文本存在
     assert page_text, '页面文本为空'
     
     # 验证订单号
-    if order_number in page_text and '订货单号：-' not in page_text:
-        assert order_number in page_text, f'页面文本中未找到订单号: {order_number}'
-        print(f'✓ 订货单号验证通过: {order_number}')
-    else:
-        current_url = page.url
-        if 'detail' in current_url:
-            print(f'警告: 页面文本中未找到订单号 {order_number}，但URL显示已在详情页: {current_url}')
-            if '订货单号：-' in page_text:
-                raise Exception(f'详情页数据未加载完成，订货单号仍显示"-"')
-        else:
-            assert order_number in page_text, f'页面文本中未找到订单号: {order_number}'
+    assert order_number in page_text, f'页面文本中未找到订单号: {order_number}（当前页面: {snapshot.url}）'
+    print(f'✓ 订货单号验证通过: {order_number}')
     
     # 验证单据状态
     assert '单据状态：-' not in page_text, '单据状态仍显示"-"，数据未加载完成'
@@ -795,112 +1051,142 @@ def verify_order_detail(
     assert store_name in page_text, f'页面文本中未找到订货门店: {store_name}'
     print(f'✓ 订货门店验证通过: {store_name}')
     
-    # 门店编号验证：严格精确匹配
-    store_code_match = re.search(r'订货门店编号[：:]\s*(\d+)', page_text)
-    assert store_code_match is not None, '页面文本中未找到门店编号模式'
+    # 门店编号验证：严格精确匹配（优先使用快照中的头部字段，未提取到时按文本模式匹配）
+    header_store_code = snapshot.get_header('订货门店编号')
+    store_code_match = re.match(r'\d+', header_store_code or '') or re.search(r'订货门店编号[：:]\s*(\d+)', page_text)
+    assert store_code_match is not None, f'页面文本中未找到门店编号: {store_code}'
     
-    if store_code_match:
-        actual_store_code = store_code_match.group(1).strip()
-        expected_store_code = store_code.strip()
-        print(f'实际门店编号: "{actual_store_code}", 期望: "{expected_store_code}"')
-        
-        assert actual_store_code == expected_store_code, f'门店编号不匹配: 实际="{actual_store_code}", 期望="{expected_store_code}"'
-        print(f'✓ 订货门店编号验证通过: {store_code}')
-    else:
-        assert f'订货门店编号：{store_code}' in page_text, f'页面文本中未找到门店编号: {store_code}'
-        print(f'✓ 订货门店编号验证通过: {store_code}')
-    
-    print('详情页顶部信息验证通过')
+    actual_store_code = (store_code_match.group(1) if store_code_match.lastindex else store_code_match.group(0)).strip()
+    expected_store_code = store_code.strip()
+    print(f'实际门店编号: "{actual_store_code}", 期望: "{expected_store_code}"')
+    assert actual_store_code == expected_store_code, f'门店编号不匹配: 实际="{actual_store_code}", 期望="{expected_store_code}"'
+    print(f'✓ 订货门店编号验证通过: {store_code}')
 
 
-def verify_product_rows(
+@timed_step('验证订单详情')
+def verify_order_detail(
     page: Page,
-    expected_count: int = 1,
-    product_code: str = None,
-    product_name: str = None
+    order_number: str,
+    status: str,
+    source: str,
+    order_date: str,
+    store_name: str,
+    store_code: str
 ):
     """
-    验证商品行
+    验证订单详情页顶部信息
     
     Args:
         page: Playwright页面对象
-        expected_count: 期望的商品行数量
-        product_code: 商品编号
-        product_name: 商品名称
+        order_number: 订单号
+        status: 状态
+        source: 来源
+        order_date: 订货日期
+        store_name: 订货门店
+        store_code: 订货门店编号
     """
     # 使用更宽松的等待策略
     try:
         page.wait_for_load_state('domcontentloaded', timeout=10000)
     except Exception as e:
         print(f'等待domcontentloaded超时，继续执行: {e}')
-    page.wait_for_timeout(2000)
-    
-    # 查找商品行（多种选择器）
-    product_row_selectors = [
-        f'table:has-text("商品编号") tr:has-text("{product_code}")',
-        'table:has-text("商品编号") tr:not(:has-text("商品编号"))',
-        '[class*="product-row"]',
-        '[class*="item-row"]',
-        'tr:has([class*="product-code"])',
-        'tbody tr',
-        'table tr'
-    ]
     
-    product_rows = []
-    for selector in product_row_selectors:
-        try:
-            rows = page.locator(selector).all()
-            if rows:
-                data_rows = []
-                for row in rows:
-                    try:
-                        text = row.text_content() or ''
-                        if '商品编号' not in text and '商品名称' not in text and product_code in text:
-                            data_rows.append(row)
-                    except Exception:
-                        continue
-                if data_rows:
-                    product_rows = data_rows
-                    print(f'找到 {len(product_rows)} 个商品行（使用选择器: {selector}）')
-                    break
-        except Exception:
-            continue
+    # 等待详情数据就绪，之后的校验都基于同一份页面快照
+    snapshot = load_order_detail(page, order_number)['snapshot']
+    assert_order_detail(snapshot, order_number, status, source, order_date, store_name, store_code)
     
-    # 如果还是没找到，尝试在整个页面中查找商品编号
-    if not product_rows:
-        page_text = page.text_content('body') or ''
-        if product_code in page_text:
-            all_rows = page.locator('table tr, tbody tr').all()
-            for row in all_rows:
-                try:
-                    text = row.text_content() or ''
-                    if product_code in text and '商品编号' not in text:
-                        product_rows.append(row)
-                except Exception:
-                    continue
+    print('详情页顶部信息验证通过')
+
+
+def assert_product_rows(
+    page_text: str,
+    product_table,
+    product_rows: list,
+    expected_count: int,
+    product_code: str,
+    product_name: str,
+    rows_from_table: bool = False
+):
+    """
+    校验商品行（同步和异步版本共用）
     
-    # 获取页面文本用于验证
-    page_text = page.text_content('body') or ''
+    Args:
+        page_text: 页面文本
+        product_table: 商品表格（TableData，未读取到时为None）
+        product_rows: 找到的商品行（表格行，或备选选择器找到的行文本）
+        expected_count: 期望的商品行数量
+        product_code: 商品编号
+        product_name: 商品名称
+        rows_from_table: 商品行是否来自product_table（只有表格行可以按列校验商品名称）
+    """
     assert page_text, '页面文本为空'
     
     # 验证商品行数量
-    if product_code in page_text:
-        assert product_code in page_text, f'页面文本中未找到商品编号: {product_code}'
-        print('商品行数量验证通过: 至少1个商品行（商品编号存在于页面中）')
-    elif len(product_rows) >= expected_count:
-        assert len(product_rows) >= expected_count, f'商品行数量不足: 实际={len(product_rows)}, 期望>={expected_count}'
-        print(f'商品行数量验证通过: {len(product_rows)}个商品行')
-    else:
-        has_product_table = '商品编号' in page_text or '商品名称' in page_text
-        assert has_product_table is True, '页面中未检测到商品表格'
-        print('检测到商品表格存在，商品行数量验证通过')
+    assert len(product_rows) >= expected_count, f'商品行数量不足: 实际={len(product_rows)}, 期望>={expected_count}'
+    print(f'商品行数量验证通过: {len(product_rows)}个商品行')
     
     # 验证商品编号
     assert product_code in page_text, f'页面文本中未找到商品编号: {product_code}'
     print(f'✓ 商品编号验证通过: {product_code}')
     
-    # 验证商品名称
+    # 验证商品名称（通过表格读取到商品行时，校验同一行的商品名称列）
     assert product_name in page_text, f'页面文本中未找到商品名称: {product_name}'
+    if rows_from_table and product_table.column('商品名称') is not None:
+        row_names = [product_table.cell(row, '商品名称') for row in product_rows]
+        assert product_name in row_names, f'商品行中的商品名称不匹配: 实际={row_names}, 期望="{product_name}"'
     print(f'✓ 商品名称验证通过: {product_name}')
+
+
+@timed_step('验证商品行')
+def verify_product_rows(
+    page: Page,
+    expected_count: int = 1,
+    product_code: str = None,
+    product_name: str = None
+):
+    """
+    验证商品行
+    
+    Args:
+        page: Playwright页面对象
+        expected_count: 期望的商品行数量
+        product_code: 商品编号
+        product_name: 商品名称
+    """
+    wait_for_page_ready(page, timeout=10000)
+    
+    # 优先一次读取整张商品表格，按商品编号列直接取行
+    product_table = None
+    product_rows = []
+    try:
+        product_table = read_table(page, '商品编号')
+        if product_table:
+            product_rows = product_table.lookup_all('商品编号', product_code)
+            print(f'在商品表格中找到 {len(product_rows)} 个商品行')
+    except Exception as e:
+        print(f'商品表格读取失败: {e}')
+    rows_from_table = bool(product_rows)
+    
+    # 表格中没有找到时按备选选择器查找，所有行的文本一次读取
+    if not product_rows:
+        rows_locator = resolve_selector(
+            page, 'productRows', PRODUCT_ROW_SELECTORS,
+            params={'product_code': product_code}, timeout=5000, first=False
+        )
+        if rows_locator:
+            texts = rows_locator.evaluate_all('rows => rows.map(row => row.textContent || "")')
+            product_rows = [text for text in texts if '商品编号' not in text and '商品名称' not in text]
+            print(f'找到 {len(product_rows)} 个商品行')
+    
+    # 如果还是没找到，尝试在整个页面中查找商品编号
+    if not product_rows and take_snapshot(page).contains(product_code):
+        texts = page.locator('table tr, tbody tr').evaluate_all('rows => rows.map(row => row.textContent || "")')
+        product_rows = [text for text in texts if product_code in text and '商品编号' not in text]
+    
+    # 获取页面文本用于验证（DOM未变化时复用同一份快照）
+    assert_product_rows(
+        take_snapshot(page).text, product_table, product_rows,
+        expected_count, product_code, product_name, rows_from_table
+    )
     
     print('商品信息验证通过')
@@ -0,0 +1,288 @@
+"""
+Allure报告内联模块（fix-allure-report.js的Python版本）
+将报告的 data/、widgets/ 和 data/test-cases/ 下的JSON逐个流式写入一个数据脚本（allure-inline-data.js），
+并在index.html中注入拦截fetch/XHR/jQuery的脚本，使报告可以通过file://协议直接打开（不受CORS限制）
+
+与JS版本的区别：JSON文件按原文逐块复制到数据脚本中，不整体读入内存；数据文件没有变化时跳过
+
+运行：python -m tests.modules.report_inline_module [--report allure-report] [--force]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+from pathlib import Path
+from typing import List, Tuple
+
+# 报告目录
+ALLURE_REPORT_DIR = Path('allure-report')
+
+# 数据脚本文件名（位于报告目录中）
+INLINE_DATA_FILE = 'allure-inline-data.js'
+
+# 记录上次内联时各数据文件的大小和修改时间
+INLINE_MANIFEST_FILE = '.inline-manifest'
+
+# 复制JSON文件时的块大小
+_COPY_CHUNK_SIZE = 1024 * 1024
+
+# 注入内容的起止标记（再次执行时替换）
+_INLINE_START = '<!-- allure-inline:start -->'
+_INLINE_END = '<!-- allure-inline:end -->'
+_INLINE_BLOCK_PATTERN = re.compile(re.escape(_INLINE_START) + r'.*?' + re.escape(_INLINE_END) + r'\n?', re.S)
+
+# fix-allure-report.js注入的旧脚本（不跨越其他script标签）
+_LEGACY_SCRIPT_PATTERN = re.compile(
+    r'<script>(?:(?!</script>).)*?window\.__ALLURE_INLINE_DATA__(?:(?!</script>).)*</script>\n?',
+    re.S
+)
+
+# 拦截报告对JSON数据的请求，从window.__ALLURE_INLINE_DATA__返回（jQuery.ajax基于XHR，同样被拦截）
+_INTERCEPT_JS = '''
+(function () {
+    'use strict';
+    var DATA_URL = /(?:^|\\/)((?:data|widgets)\\/(?:test-cases\\/)?[^\\/]+\\.json)$/;
+
+    function isLocal(url) {
+        return typeof url === 'string' && !/^https?:\\/\\//.test(url);
+    }
+
+    window.getInlineData = function (url) {
+        var data = window.__ALLURE_INLINE_DATA__;
+        if (!data || !isLocal(url)) return null;
+        var match = url.split(/[?#]/)[0].match(DATA_URL);
+        if (!match) return null;
+        var key = match[1];
+        if (key.indexOf('data/test-cases/') === 0) {
+            var name = key.substring('data/test-cases/'.length);
+            return data.testCases && Object.prototype.hasOwnProperty.call(data.testCases, name) ? data.testCases[name] : null;
+        }
+        return Object.prototype.hasOwnProperty.call(data, key) ? data[key] : null;
+    };
+
+    var originalFetch = window.fetch;
+    window.fetch = function (input) {
+        var url = typeof input === 'string' ? input : (input && input.url);
+        var data = window.getInlineData(url);
+        if (data !== null) {
+            var body = JSON.stringify(data);
+            if (typeof Response !== 'undefined') {
+                return Promise.resolve(new Response(body, { status: 200, headers: { 'Content-Type': 'application/json' } }));
+            }
+            return Promise.resolve({
+                ok: true,
+                status: 200,
+                json: function () { return Promise.resolve(data); },
+                text: function () { return Promise.resolve(body); }
+            });
+        }
+        return originalFetch ? originalFetch.apply(this, arguments) : Promise.reject(new Error('fetch not available'));
+    };
+
+    if (typeof XMLHttpRequest !== 'undefined') {
+        var originalOpen = XMLHttpRequest.prototype.open;
+        var originalSend = XMLHttpRequest.prototype.send;
+        XMLHttpRequest.prototype.open = function (method, url) {
+            this.__allureUrl = url;
+            return originalOpen.apply(this, arguments);
+        };
+        XMLHttpRequest.prototype.send = function () {
+            var xhr = this;
+            var data = window.getInlineData(xhr.__allureUrl);
+            if (data === null) return originalSend.apply(this, arguments);
+            var body = JSON.stringify(data);
+            setTimeout(function () {
+                var values = {
+                    readyState: 4,
+                    status: 200,
+                    statusText: 'OK',
+                    responseText: body,
+                    response: xhr.responseType === 'json' ? data : body
+                };
+                Object.keys(values).forEach(function (name) {
+                    Object.defineProperty(xhr, name, { value: values[name], configurable: true });
+                });
+                xhr.getResponseHeader = function (name) {
+                    return String(name).toLowerCase() === 'content-type' ? 'application/json' : null;
+                };
+                xhr.getAllResponseHeaders = function () {
+                    return 'content-type: application/json\\r\\n';
+                };
+                ['readystatechange', 'load', 'loadend'].forEach(function (type) {
+                    xhr.dispatchEvent(new Event(type));
+                });
+            }, 0);
+        };
+    }
+})();
+'''
+
+
+def collect_inline_sources(report_dir: Path = ALLURE_REPORT_DIR) -> List[Tuple[str, Path]]:
+    """
+    列出需要内联的JSON文件
+
+    Args:
+        report_dir: 报告目录
+
+    Returns:
+        [(数据键, 文件路径)]，数据键为报告中的相对路径（如 data/suites.json）
+    """
+    report_dir = Path(report_dir)
+    sources = []
+    for pattern in ('data/*.json', 'widgets/*.json', 'data/test-cases/*.json'):
+        for path in sorted(report_dir.glob(pattern)):
+            sources.append((path.relative_to(report_dir).as_posix(), path))
+    return sources
+
+
+def compute_sources_manifest(sources: List[Tuple[str, Path]]) -> str:
+    """
+    计算数据文件的清单指纹（相对路径、大小、修改时间）
+
+    Args:
+        sources: collect_inline_sources的返回值
+
+    Returns:
+        SHA-256指纹
+    """
+    digest = hashlib.sha256()
+    for key, path in sources:
+        stat = path.stat()
+        digest.update(f'{key}\0{stat.st_size}\0{stat.st_mtime_ns}\n'.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def write_inline_bundle(sources: List[Tuple[str, Path]], bundle_path: Path) -> int:
+    """
+    将JSON文件逐个写入数据脚本（按块复制原文，内存占用与文件数量和大小无关）
+
+    data/test-cases/ 下的文件写入 __ALLURE_INLINE_DATA__.testCases[文件名]，其他文件以相对路径为键
+
+    Args:
+        sources: collect_inline_sources的返回值
+        bundle_path: 数据脚本路径
+
+    Returns:
+        写入的文件数
+    """
+    tmp_path = bundle_path.with_name(f'{bundle_path.name}.tmp')
+    written = 0
+    with open(tmp_path, 'wb') as bundle:
+        bundle.write(b'window.__ALLURE_INLINE_DATA__ = {"testCases": {}};\n(function (d) {\n')
+        for key, path in sources:
+            if key.startswith('data/test-cases/'):
+                target = f'd.testCases[{json.dumps(path.name)}]'
+            else:
+                target = f'd[{json.dumps(key)}]'
+            try:
+                with open(path, 'rb') as source:
+                    bundle.write(f'{target} = '.encode('utf-8'))
+                    shutil.copyfileobj(source, bundle, _COPY_CHUNK_SIZE)
+                    bundle.write(b'\n;\n')
+                written += 1
+            except OSError as e:
+                print(f'⚠️  无法读取文件 {path}: {e}')
+        bundle.write(b'})(window.__ALLURE_INLINE_DATA__);\n')
+    os.replace(tmp_path, bundle_path)
+    return written
+
+
+def patch_index_html(index_path: Path, version: str) -> bool:
+    """
+    在index.html的</head>之前注入数据脚本和拦截脚本（已注入的内容会被替换），首次修改前备份为index.html.backup
+
+    Args:
+        index_path: index.html路径
+        version: 数据脚本版本（加在脚本URL上，避免浏览器使用缓存的旧数据）
+
+    Returns:
+        bool: 是否注入成功
+    """
+    html = index_path.read_text(encoding='utf-8')
+    if _INLINE_START not in html and '__ALLURE_INLINE_DATA__' not in html:
+        backup_path = index_path.with_name(f'{index_path.name}.backup')
+        if not backup_path.exists():
+            shutil.copy2(index_path, backup_path)
+            print(f'📋 已备份原始文件到: {backup_path}')
+
+    html = _INLINE_BLOCK_PATTERN.sub('', html)
+    html = _LEGACY_SCRIPT_PATTERN.sub('', html)
+    if '</head>' not in html:
+        print(f'⚠️  index.html中没有</head>，无法注入脚本: {index_path}')
+        return False
+
+    block = (
+        f'{_INLINE_START}\n'
+        f'<script src="{INLINE_DATA_FILE}?v={version[:12]}"></script>\n'
+        f'<script>{_INTERCEPT_JS}</script>\n'
+        f'{_INLINE_END}\n'
+    )
+    html = html.replace('</head>', block + '</head>', 1)
+    index_path.write_text(html, encoding='utf-8')
+    return True
+
+
+def inline_report(report_dir: Path = ALLURE_REPORT_DIR, force: bool = False) -> bool:
+    """
+    修复Allure报告，使其可以通过file://协议直接打开
+
+    Args:
+        report_dir: 报告目录
+        force: 忽略清单指纹，强制重新写入
+
+    Returns:
+        bool: 报告是否已可直接打开（本次写入或数据没有变化）
+    """
+    report_dir = Path(report_dir)
+    index_path = report_dir / 'index.html'
+    if not index_path.exists():
+        print(f'❌ index.html不存在: {index_path}')
+        return False
+
+    sources = collect_inline_sources(report_dir)
+    manifest = compute_sources_manifest(sources)
+    manifest_path = report_dir / INLINE_MANIFEST_FILE
+    bundle_path = report_dir / INLINE_DATA_FILE
+    if (
+        not force
+        and bundle_path.exists()
+        and manifest_path.exists()
+        and manifest_path.read_text(encoding='utf-8').strip() == manifest
+        and _INLINE_START in index_path.read_text(encoding='utf-8')
+    ):
+        print('✓ Allure报告数据没有变化，跳过内联')
+        return True
+
+    written = write_inline_bundle(sources, bundle_path)
+    if not patch_index_html(index_path, manifest):
+        return False
+    manifest_path.write_text(manifest, encoding='utf-8')
+    print(f'✅ Allure报告已内联 {written} 个数据文件，可以直接打开: {index_path}')
+    return True
+
+
+def is_report_inline_enabled() -> bool:
+    """
+    生成报告后是否内联数据（环境变量ALLURE_INLINE=false可关闭）
+
+    Returns:
+        bool: 是否启用
+    """
+    return os.getenv('ALLURE_INLINE', 'true').lower() == 'true'
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='将Allure报告数据内联，使报告可以通过file://协议直接打开')
+    parser.add_argument('--report', default=str(ALLURE_REPORT_DIR), help='报告目录')
+    parser.add_argument('--force', action='store_true', help='忽略清单指纹，强制重新写入')
+    args = parser.parse_args()
+    return 0 if inline_report(Path(args.report), force=args.force) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
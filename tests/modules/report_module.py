@@ -0,0 +1,379 @@
+"""
+Allure报告生成模块
+会话结束时按模式生成Allure报告：只用本次运行写入的结果生成，并合并上次报告的history（趋势图跨运行累积），
+结果文件没有变化时跳过生成；超过保留期的旧结果从结果目录中删除
+后台模式下在独立进程中生成，pytest进程直接退出；CI环境（CI=true）不自动打开报告服务器
+生成后内联报告数据（见report_inline_module），报告可以通过file://协议直接打开
+
+模式（环境变量ALLURE_REPORT_MODE）：
+    background  在后台进程中生成（本地默认）
+    foreground  在当前进程中生成，完成后再退出（CI默认）
+    off         不生成
+
+单独运行：python -m tests.modules.report_module [--open]
+"""
+
+import argparse
+import hashlib
+import os
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+from .report_inline_module import inline_report, is_report_inline_enabled
+from .worker_module import file_lock
+
+# 结果目录和报告目录
+ALLURE_RESULTS_DIR = Path('allure-results')
+ALLURE_REPORT_DIR = Path('allure-report')
+
+# 报告目录中记录本次报告对应的结果指纹
+REPORT_FINGERPRINT_FILE = '.results-fingerprint'
+
+# 后台生成的日志
+REPORT_LOG_FILE = Path('test-results') / 'allure-generate.log'
+
+# allure generate的超时时间（秒）
+ALLURE_GENERATE_TIMEOUT = int(os.getenv('ALLURE_GENERATE_TIMEOUT', '300'))
+
+# 报告锁超过该时长才视为持有进程已退出（需要大于allure generate的超时时间，避免抢占仍在生成的进程的锁）
+REPORT_LOCK_STALE_AFTER = ALLURE_GENERATE_TIMEOUT + 120
+
+# 结果目录中保留的旧结果天数（结果目录在多次运行间不清空，超过该天数的结果文件删除）
+ALLURE_RESULTS_MAX_AGE_DAYS = float(os.getenv('ALLURE_RESULTS_MAX_AGE_DAYS', '7'))
+
+REPORT_MODES = ('background', 'foreground', 'off')
+
+
+def is_ci() -> bool:
+    """是否运行在CI环境"""
+    return os.getenv('CI', 'false').lower() == 'true'
+
+
+def get_report_mode() -> str:
+    """
+    获取报告生成模式
+
+    Returns:
+        'background'、'foreground' 或 'off'（未设置时CI环境为foreground，本地为background）
+    """
+    mode = os.getenv('ALLURE_REPORT_MODE', 'foreground' if is_ci() else 'background').lower()
+    if mode not in REPORT_MODES:
+        print(f'⚠️  未知的报告生成模式 "{mode}"，使用默认值: background')
+        mode = 'background'
+    return mode
+
+
+def should_open_report() -> bool:
+    """
+    生成后是否自动打开报告（CI环境始终不打开，本地可用ALLURE_OPEN=false关闭）
+
+    Returns:
+        bool: 是否打开
+    """
+    return not is_ci() and os.getenv('ALLURE_OPEN', 'true').lower() == 'true'
+
+
+def compute_results_fingerprint(results_dir: Path = ALLURE_RESULTS_DIR) -> str:
+    """
+    计算结果目录的指纹（文件名、大小、修改时间），不包含复制进来的history
+
+    Args:
+        results_dir: 结果目录
+
+    Returns:
+        SHA-256指纹
+    """
+    digest = hashlib.sha256()
+    for path in sorted(Path(results_dir).rglob('*')):
+        relative = path.relative_to(results_dir)
+        if not path.is_file() or relative.parts[0] == 'history':
+            continue
+        stat = path.stat()
+        digest.update(f'{relative.as_posix()}\0{stat.st_size}\0{stat.st_mtime_ns}\n'.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def has_results_since(results_dir: Path = ALLURE_RESULTS_DIR, since: float = 0) -> bool:
+    """
+    结果目录中是否有指定时间之后写入的测试结果（结果目录在多次运行间保留，旧结果不算本次运行的结果）
+
+    Args:
+        results_dir: Allure结果目录
+        since: 时间戳（秒，time.time()）
+
+    Returns:
+        bool: 是否有新的*-result.json
+    """
+    for path in Path(results_dir).glob('*-result.json'):
+        try:
+            # 按整秒比较，兼容修改时间精度为1秒的文件系统
+            if path.stat().st_mtime >= int(since):
+                return True
+        except FileNotFoundError:
+            continue
+    return False
+
+
+def prune_results(results_dir: Path = ALLURE_RESULTS_DIR, max_age_days: float = ALLURE_RESULTS_MAX_AGE_DAYS) -> int:
+    """
+    删除结果目录中超过保留期的结果文件（不包含history）
+
+    Args:
+        results_dir: 结果目录
+        max_age_days: 保留天数
+
+    Returns:
+        删除的文件数
+    """
+    cutoff = time.time() - max_age_days * 86400
+    removed = 0
+    for path in Path(results_dir).glob('*'):
+        try:
+            if path.is_file() and path.stat().st_mtime < cutoff:
+                path.unlink()
+                removed += 1
+        except FileNotFoundError:
+            continue
+    return removed
+
+
+def stage_results_since(results_dir: Path, since: float, staging_dir: Path) -> int:
+    """
+    将本次运行写入的结果文件（修改时间不早于since的结果、容器和附件）硬链接到单独的目录（无法链接时复制）
+
+    Args:
+        results_dir: 结果目录
+        since: 运行开始时间（秒，time.time()）
+        staging_dir: 目标目录（已存在时先清空）
+
+    Returns:
+        放入的文件数
+    """
+    shutil.rmtree(staging_dir, ignore_errors=True)
+    staging_dir.mkdir(parents=True)
+    staged = 0
+    for path in Path(results_dir).glob('*'):
+        try:
+            # 按整秒比较，兼容修改时间精度为1秒的文件系统
+            if not path.is_file() or path.stat().st_mtime < int(since):
+                continue
+            try:
+                os.link(path, staging_dir / path.name)
+            except OSError:
+                shutil.copy2(path, staging_dir / path.name)
+            staged += 1
+        except FileNotFoundError:
+            continue
+    return staged
+
+
+def is_report_up_to_date(results_dir: Path = ALLURE_RESULTS_DIR, report_dir: Path = ALLURE_REPORT_DIR) -> bool:
+    """报告是否已经是当前结果生成的（指纹一致且index.html存在）"""
+    fingerprint_path = Path(report_dir) / REPORT_FINGERPRINT_FILE
+    if not (Path(report_dir) / 'index.html').exists() or not fingerprint_path.exists():
+        return False
+    return fingerprint_path.read_text(encoding='utf-8').strip() == compute_results_fingerprint(results_dir)
+
+
+def copy_history(report_dir: Path = ALLURE_REPORT_DIR, results_dir: Path = ALLURE_RESULTS_DIR) -> int:
+    """
+    将上次报告的history复制到结果目录，生成的新报告在此基础上累积趋势数据
+
+    Args:
+        report_dir: 上次生成的报告目录
+        results_dir: 结果目录
+
+    Returns:
+        复制的文件数
+    """
+    source = Path(report_dir) / 'history'
+    if not source.is_dir():
+        return 0
+    destination = Path(results_dir) / 'history'
+    destination.mkdir(parents=True, exist_ok=True)
+    copied = 0
+    for path in source.glob('*.json'):
+        shutil.copy2(path, destination / path.name)
+        copied += 1
+    return copied
+
+
+def _replace_report_dir(new_dir: Path, report_dir: Path):
+    """用新生成的报告替换旧报告（先生成到临时目录，生成期间旧报告仍可查看）"""
+    old_dir = report_dir.with_name(f'{report_dir.name}.old')
+    shutil.rmtree(old_dir, ignore_errors=True)
+    if report_dir.exists():
+        report_dir.rename(old_dir)
+    new_dir.rename(report_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+
+
+def generate_report(
+    results_dir: Path = ALLURE_RESULTS_DIR,
+    report_dir: Path = ALLURE_REPORT_DIR,
+    force: bool = False,
+    since: float = None
+) -> Optional[Path]:
+    """
+    生成Allure报告（结果没有变化时直接返回已有报告）
+
+    指定since时只用该时间之后写入的结果（本次运行）生成，之前运行的结果只通过history体现在趋势图中，
+    生成耗时不随结果目录中累积的旧结果增长；未指定时使用结果目录中的全部结果
+
+    Args:
+        results_dir: 结果目录
+        report_dir: 报告目录
+        force: 忽略指纹，强制重新生成
+        since: 运行开始时间（秒，time.time()，可选）
+
+    Returns:
+        报告index.html路径，allure命令不可用、没有结果或生成失败时返回None
+    """
+    results_dir = Path(results_dir)
+    report_dir = Path(report_dir)
+    pruned = prune_results(results_dir)
+    if pruned:
+        print(f'已删除 {pruned} 个超过 {ALLURE_RESULTS_MAX_AGE_DAYS:g} 天的旧结果文件')
+
+    # 同时结束的多次运行只有一个进程生成报告
+    try:
+        with file_lock(
+            report_dir.with_name(f'{report_dir.name}.lock'),
+            timeout=ALLURE_GENERATE_TIMEOUT,
+            stale_after=REPORT_LOCK_STALE_AFTER
+        ):
+            if since is None:
+                return _generate_report_locked(results_dir, report_dir, force)
+            staging_dir = results_dir.with_name(f'{results_dir.name}.current')
+            try:
+                if not stage_results_since(results_dir, since, staging_dir):
+                    print('⚠️  本次运行没有写入Allure测试结果')
+                    return None
+                return _generate_report_locked(staging_dir, report_dir, force)
+            finally:
+                shutil.rmtree(staging_dir, ignore_errors=True)
+    except TimeoutError as e:
+        print(f'⚠️  其他进程正在生成Allure报告，本次跳过: {e}')
+        return None
+
+
+def _generate_report_locked(results_dir: Path, report_dir: Path, force: bool) -> Optional[Path]:
+    """持有报告锁时生成报告（见generate_report）"""
+    fingerprint = compute_results_fingerprint(results_dir)
+    if not force and is_report_up_to_date(results_dir, report_dir):
+        print(f'✓ Allure结果没有变化，跳过生成: {report_dir}')
+        if is_report_inline_enabled():
+            inline_report(report_dir)
+        return report_dir / 'index.html'
+
+    copied = copy_history(report_dir, results_dir)
+    if copied:
+        print(f'已保留 {copied} 个history文件（趋势图）')
+
+    tmp_dir = report_dir.with_name(f'{report_dir.name}.tmp')
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    try:
+        result = subprocess.run(
+            ['allure', 'generate', str(results_dir), '-o', str(tmp_dir), '--clean'],
+            capture_output=True,
+            text=True,
+            timeout=ALLURE_GENERATE_TIMEOUT
+        )
+    except FileNotFoundError:
+        print('⚠️  Allure命令行工具未安装')
+        return None
+    except subprocess.TimeoutExpired:
+        print(f'⚠️  生成Allure报告超时（{ALLURE_GENERATE_TIMEOUT}秒）')
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        return None
+
+    if result.returncode != 0 or not (tmp_dir / 'index.html').exists():
+        print(f'⚠️  Allure报告生成失败: {result.stderr.strip()[:500]}')
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        return None
+
+    if is_report_inline_enabled():
+        inline_report(tmp_dir)
+    (tmp_dir / REPORT_FINGERPRINT_FILE).write_text(fingerprint, encoding='utf-8')
+    _replace_report_dir(tmp_dir, report_dir)
+    print(f'✅ Allure报告已生成: {report_dir.absolute()}')
+    return report_dir / 'index.html'
+
+
+def open_report(report_dir: Path = ALLURE_REPORT_DIR):
+    """使用allure open在后台启动本地服务器并打开报告"""
+    try:
+        subprocess.Popen(
+            ['allure', 'open', str(report_dir)],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+        print('✅ 已在浏览器中打开Allure报告（通过本地服务器）')
+    except Exception as e:
+        print(f'⚠️  自动打开报告失败: {e}')
+        print(f'   请使用以下命令手动打开: allure open {report_dir}')
+
+
+def start_background_generation(
+    results_dir: Path = ALLURE_RESULTS_DIR,
+    report_dir: Path = ALLURE_REPORT_DIR,
+    open_after: bool = False,
+    since: float = None
+) -> subprocess.Popen:
+    """
+    在脱离当前进程的后台进程中生成报告（pytest退出后继续运行），输出写入REPORT_LOG_FILE
+
+    Args:
+        results_dir: 结果目录
+        report_dir: 报告目录
+        open_after: 生成后是否打开报告
+        since: 只使用该时间之后写入的结果（见generate_report）
+
+    Returns:
+        后台进程
+    """
+    command = [
+        sys.executable, '-m', 'tests.modules.report_module',
+        '--results', str(results_dir),
+        '--report', str(report_dir)
+    ]
+    if since is not None:
+        command.extend(['--since', str(since)])
+    if open_after:
+        command.append('--open')
+
+    REPORT_LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
+    log_file = open(REPORT_LOG_FILE, 'w', encoding='utf-8')
+    options = {'stdin': subprocess.DEVNULL, 'stdout': log_file, 'stderr': subprocess.STDOUT}
+    if os.name == 'nt':
+        options['creationflags'] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        options['start_new_session'] = True
+    try:
+        return subprocess.Popen(command, **options)
+    finally:
+        log_file.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='生成Allure报告（合并history，结果没有变化时跳过）')
+    parser.add_argument('--results', default=str(ALLURE_RESULTS_DIR), help='结果目录')
+    parser.add_argument('--report', default=str(ALLURE_REPORT_DIR), help='报告目录')
+    parser.add_argument('--force', action='store_true', help='忽略指纹，强制重新生成')
+    parser.add_argument('--since', type=float, default=None, help='只使用该时间戳（秒）之后写入的结果')
+    parser.add_argument('--open', action='store_true', help='生成后打开报告（CI环境忽略）')
+    args = parser.parse_args()
+
+    report_index = generate_report(Path(args.results), Path(args.report), force=args.force, since=args.since)
+    if report_index is None:
+        return 1
+    if args.open and not is_ci():
+        open_report(Path(args.report))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
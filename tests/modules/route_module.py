@@ -0,0 +1,196 @@
+"""
+请求过滤模块
+在浏览器上下文上注册路由，按过滤配置（见route_config.ROUTE_PROFILES）拦截图片、字体、媒体和第三方统计，
+埋点上报直接返回204；按页面所属的URL_CONFIG分组放行白名单中的请求，其余请求交给后续的路由处理器或正常发出
+路由只注册在可能被过滤的URL上（媒体文件扩展名、统计服务域名等），其他请求不经过路由处理
+
+优先级：测试上的 @pytest.mark.route_profile('off') 标记 > 环境变量 ROUTE_PROFILE > 默认值
+"""
+
+import os
+import re
+from typing import Dict, Optional, Pattern, Union
+from ..config.route_config import DEFAULT_ROUTE_PROFILE, ROUTE_ALLOWLIST, ROUTE_PROFILES, ROUTE_RESOURCE_EXTENSIONS
+from ..config.url_config import get_url_group
+
+# 处理结果：放行（交给后续处理器）、拦截、返回空响应
+ROUTE_CONTINUE = 'continue'
+ROUTE_ABORT = 'abort'
+ROUTE_STUB = 'stub'
+
+
+def get_route_profile_name(item=None) -> str:
+    """
+    获取测试使用的过滤配置名称
+
+    Args:
+        item: pytest测试项（可选）
+
+    Returns:
+        配置名称（见ROUTE_PROFILES）
+    """
+    marker = item.get_closest_marker('route_profile') if item is not None else None
+    name = marker.args[0] if marker and marker.args else None
+    if name is None:
+        name = os.getenv('ROUTE_PROFILE', DEFAULT_ROUTE_PROFILE)
+    name = name.lower()
+    if name not in ROUTE_PROFILES:
+        print(f'⚠️  未知的请求过滤配置 "{name}"，使用默认值: {DEFAULT_ROUTE_PROFILE}')
+        name = DEFAULT_ROUTE_PROFILE
+    return name
+
+
+class RouteFilter:
+    """
+    请求过滤器
+
+    按请求的资源类型和URL决定拦截、返回空响应还是放行，并统计各类处理次数
+    """
+
+    def __init__(self, name: str, profile: dict, allowlist: Dict[str, list] = None):
+        self.name = name
+        self.block_resource_types = set(profile.get('block_resource_types', []))
+        self.block_patterns = [re.compile(pattern) for pattern in profile.get('block_patterns', [])]
+        self.stub_patterns = [re.compile(pattern) for pattern in profile.get('stub_patterns', [])]
+        self.allowlist = {
+            group: [re.compile(pattern) for pattern in patterns]
+            for group, patterns in (ROUTE_ALLOWLIST if allowlist is None else allowlist).items()
+        }
+        # 处理结果 -> 资源类型 -> 次数
+        self.stats: Dict[str, Dict[str, int]] = {ROUTE_ABORT: {}, ROUTE_STUB: {}}
+        self.route_url = self._build_route_url()
+
+    def _build_route_url(self) -> Union[str, Pattern]:
+        """
+        路由注册的URL：可能被拦截或替换的请求（按扩展名识别的资源类型、拦截和空响应规则）
+
+        Returns:
+            正则表达式；需要按扩展名无法识别的资源类型拦截时为'**/*'（所有请求）
+        """
+        if any(resource_type not in ROUTE_RESOURCE_EXTENSIONS for resource_type in self.block_resource_types):
+            return '**/*'
+        patterns = [pattern.pattern for pattern in self.stub_patterns + self.block_patterns]
+        extensions = [
+            extension
+            for resource_type in sorted(self.block_resource_types)
+            for extension in ROUTE_RESOURCE_EXTENSIONS[resource_type]
+        ]
+        if extensions:
+            patterns.append(rf'^[^?#]*\.({"|".join(extensions)})([?#]|$)')
+        # 正则表达式由Playwright驱动（JavaScript）匹配，只使用两者通用的语法
+        return re.compile('|'.join(f'(?:{pattern})' for pattern in patterns) or '$^', re.IGNORECASE)
+
+    def _allowed(self, url: str, page_url: str) -> bool:
+        """请求是否在全局或页面所属分组的白名单中"""
+        patterns = list(self.allowlist.get('*', []))
+        group = get_url_group(page_url) if page_url else None
+        if group:
+            patterns.extend(self.allowlist.get(group, []))
+        return any(pattern.search(url) for pattern in patterns)
+
+    def decide(self, url: str, resource_type: str, page_url: str = '') -> str:
+        """
+        决定请求的处理方式
+
+        Args:
+            url: 请求URL
+            resource_type: 资源类型（document、image、font、xhr等）
+            page_url: 发起请求的页面URL（用于分组白名单）
+
+        Returns:
+            ROUTE_CONTINUE、ROUTE_ABORT 或 ROUTE_STUB
+        """
+        if resource_type == 'document' or self._allowed(url, page_url):
+            return ROUTE_CONTINUE
+        if any(pattern.search(url) for pattern in self.stub_patterns):
+            return ROUTE_STUB
+        if resource_type in self.block_resource_types or any(pattern.search(url) for pattern in self.block_patterns):
+            return ROUTE_ABORT
+        return ROUTE_CONTINUE
+
+    def _decide_route(self, route) -> str:
+        """根据路由中的请求决定处理方式，并记录统计"""
+        request = route.request
+        try:
+            page_url = request.frame.url
+        except Exception:
+            # Service Worker等没有所属frame的请求
+            page_url = request.headers.get('referer', '')
+        action = self.decide(request.url, request.resource_type, page_url)
+        if action != ROUTE_CONTINUE:
+            counts = self.stats[action]
+            counts[request.resource_type] = counts.get(request.resource_type, 0) + 1
+        return action
+
+    def handle(self, route):
+        """路由处理器（sync_api）"""
+        action = self._decide_route(route)
+        if action == ROUTE_ABORT:
+            route.abort('blockedbyclient')
+        elif action == ROUTE_STUB:
+            route.fulfill(status=204, body='')
+        else:
+            route.fallback()
+
+    async def handle_async(self, route):
+        """路由处理器（async_api）"""
+        action = self._decide_route(route)
+        if action == ROUTE_ABORT:
+            await route.abort('blockedbyclient')
+        elif action == ROUTE_STUB:
+            await route.fulfill(status=204, body='')
+        else:
+            await route.fallback()
+
+    def format_stats(self) -> str:
+        """格式化输出拦截统计"""
+        blocked = sum(self.stats[ROUTE_ABORT].values())
+        stubbed = sum(self.stats[ROUTE_STUB].values())
+        details = ', '.join(
+            f'{resource_type} {count}' for resource_type, count in sorted(self.stats[ROUTE_ABORT].items())
+        )
+        return f'请求过滤[{self.name}]: 拦截 {blocked} 个' + (f'（{details}）' if details else '') + f'，空响应 {stubbed} 个'
+
+
+def create_route_filter(name: str = None) -> Optional[RouteFilter]:
+    """
+    创建请求过滤器
+
+    Args:
+        name: 配置名称（可选，默认读取环境变量ROUTE_PROFILE）
+
+    Returns:
+        RouteFilter，配置为'off'时返回None
+    """
+    name = (name or os.getenv('ROUTE_PROFILE', DEFAULT_ROUTE_PROFILE)).lower()
+    profile = ROUTE_PROFILES.get(name)
+    if profile is None:
+        return None
+    return RouteFilter(name, profile)
+
+
+def apply_route_profile(context, name: str = None) -> Optional[RouteFilter]:
+    """
+    在浏览器上下文（sync_api）上注册请求过滤
+
+    Args:
+        context: 浏览器上下文
+        name: 配置名称（可选，默认读取环境变量ROUTE_PROFILE）
+
+    Returns:
+        注册的RouteFilter，配置为'off'时返回None
+    """
+    route_filter = create_route_filter(name)
+    if route_filter is not None:
+        context.route(route_filter.route_url, route_filter.handle)
+    return route_filter
+
+
+async def async_apply_route_profile(context, name: str = None) -> Optional[RouteFilter]:
+    """
+    在浏览器上下文（async_api）上注册请求过滤（apply_route_profile的异步版本）
+    """
+    route_filter = create_route_filter(name)
+    if route_filter is not None:
+        await context.route(route_filter.route_url, route_filter.handle_async)
+    return route_filter
@@ -0,0 +1,626 @@
+"""
+运行历史模块
+每次测试运行结束时向本地SQLite数据库追加一条运行记录：各测试的结果和耗时、各步骤的耗时（timing_module的记录）、
+环境、校验的订单号和页面性能指标（web_vitals_module的记录，按URL_CONFIG条目归类）；定时测试（scheduled-tests.yml）通过缓存保留数据库，累积成BOH各步骤耗时的时间序列
+
+查询：
+    python -m tests.modules.run_history_module stats [--days 7] [--env test]       各步骤p50/p95和各测试通过率
+    python -m tests.modules.run_history_module pages [--days 7]                     各页面TTFB/load/LCP/CLS和资源大小
+    python -m tests.modules.run_history_module regressions [--recent 6]             最近几次运行与之前的运行对比，有退化时返回1
+    python -m tests.modules.run_history_module export history.csv [--days 30]      导出步骤明细CSV（--table pages 导出页面性能）
+
+环境变量：RUN_HISTORY=false 关闭记录，RUN_HISTORY_DB 指定数据库文件
+"""
+
+import argparse
+import csv
+import json
+import os
+import sqlite3
+import sys
+import time
+from contextlib import closing
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+from .benchmark_module import (
+    DEFAULT_MIN_DELTA_MS,
+    DEFAULT_THRESHOLD,
+    compare_to_baseline,
+    format_summary,
+    percentile
+)
+
+# 数据库文件
+RUN_HISTORY_DB = Path(os.getenv('RUN_HISTORY_DB', str(Path('.cache') / 'run-history.sqlite3')))
+
+# 保留的天数，更早的运行在写入时删除（0表示不删除）
+RUN_HISTORY_MAX_DAYS = int(os.getenv('RUN_HISTORY_MAX_DAYS', '365'))
+
+# 对比退化时的默认窗口：最近的运行数和之前作为基准的运行数
+DEFAULT_RECENT_RUNS = 6
+DEFAULT_BASELINE_RUNS = 48
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    env TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    finished_at REAL NOT NULL,
+    exit_status INTEGER,
+    passed INTEGER NOT NULL,
+    failed INTEGER NOT NULL,
+    skipped INTEGER NOT NULL,
+    commit_sha TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_started_at ON runs (env, started_at);
+CREATE TABLE IF NOT EXISTS tests (
+    run_id TEXT NOT NULL REFERENCES runs (run_id) ON DELETE CASCADE,
+    nodeid TEXT NOT NULL,
+    outcome TEXT NOT NULL,
+    duration_ms REAL NOT NULL,
+    order_number TEXT,
+    PRIMARY KEY (run_id, nodeid)
+);
+CREATE TABLE IF NOT EXISTS steps (
+    run_id TEXT NOT NULL REFERENCES runs (run_id) ON DELETE CASCADE,
+    nodeid TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    title TEXT NOT NULL,
+    status TEXT NOT NULL,
+    duration_ms REAL NOT NULL,
+    playwright_calls INTEGER NOT NULL,
+    wait_ms REAL NOT NULL,
+    sleep_ms REAL NOT NULL,
+    order_number TEXT,
+    PRIMARY KEY (run_id, nodeid, seq)
+);
+CREATE INDEX IF NOT EXISTS steps_name ON steps (name);
+CREATE TABLE IF NOT EXISTS pages (
+    run_id TEXT NOT NULL REFERENCES runs (run_id) ON DELETE CASCADE,
+    nodeid TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    step TEXT NOT NULL,
+    url_key TEXT NOT NULL,
+    url TEXT NOT NULL,
+    navigation_type TEXT,
+    ttfb_ms REAL,
+    dom_content_loaded_ms REAL,
+    load_ms REAL,
+    lcp_ms REAL,
+    cls REAL,
+    inp_ms REAL,
+    long_tasks_ms REAL,
+    elapsed_ms REAL,
+    resource_count INTEGER NOT NULL,
+    transfer_bytes INTEGER NOT NULL,
+    PRIMARY KEY (run_id, nodeid, seq)
+);
+CREATE INDEX IF NOT EXISTS pages_url_key ON pages (url_key);
+'''
+
+# 页面性能的统计指标：(列名, 显示名称)
+PAGE_METRICS = (
+    ('ttfb_ms', 'TTFB'),
+    ('load_ms', 'load'),
+    ('lcp_ms', 'LCP'),
+    ('inp_ms', 'INP'),
+    ('elapsed_ms', '耗时')
+)
+
+# 本次运行各测试的结果（主进程在pytest_runtest_logreport中收集，pytest-xdist工作进程的报告同样会转发到主进程）
+_test_results: Dict[str, dict] = {}
+
+
+def is_run_history_enabled() -> bool:
+    """
+    是否记录运行历史（环境变量RUN_HISTORY=false可关闭）
+
+    Returns:
+        bool: 是否启用
+    """
+    return os.getenv('RUN_HISTORY', 'true').lower() == 'true'
+
+
+def connect(db_path: Path = RUN_HISTORY_DB) -> sqlite3.Connection:
+    """
+    打开运行历史数据库（不存在时创建）
+
+    Args:
+        db_path: 数据库文件
+
+    Returns:
+        数据库连接（行可以按列名访问）
+    """
+    db_path = Path(db_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(db_path), timeout=30)
+    conn.row_factory = sqlite3.Row
+    conn.execute('PRAGMA foreign_keys = ON')
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def record_test_report(report):
+    """
+    收集一个测试阶段的报告（setup/call/teardown），任一阶段失败即为失败，setup阶段跳过即为跳过
+
+    Args:
+        report: pytest的TestReport
+    """
+    result = _test_results.setdefault(report.nodeid, {'outcome': 'passed', 'duration_ms': 0.0, 'start': None})
+    result['duration_ms'] += report.duration * 1000
+    start = getattr(report, 'start', None)
+    if start is not None and (result['start'] is None or start < result['start']):
+        result['start'] = start
+    if report.failed:
+        result['outcome'] = 'failed'
+    elif report.skipped and result['outcome'] == 'passed':
+        result['outcome'] = 'skipped'
+
+
+def _flatten_steps(records: List[dict], prefix: str = '') -> List[dict]:
+    """将嵌套步骤展开为列表，子步骤名称为 外层/内层（与benchmark_module的统计名称一致）"""
+    steps = []
+    for record in records:
+        name = f'{prefix}{record["name"]}'
+        steps.append(dict(record, name=name))
+        steps.extend(_flatten_steps(record.get('children', []), f'{name}/'))
+    return steps
+
+
+def record_run(
+    run_id: str,
+    env: str,
+    test_results: Dict[str, dict],
+    timings: Dict[str, List[dict]],
+    exit_status: Optional[int] = None,
+    db_path: Path = RUN_HISTORY_DB
+) -> dict:
+    """
+    写入一次运行的记录
+
+    Args:
+        run_id: 运行ID（timing_module.get_run_id）
+        env: 环境名称
+        test_results: {nodeid: {'outcome', 'duration_ms', 'start'}}（record_test_report收集的结果）
+        timings: {nodeid: 顶层步骤记录}（step-timings.json中的tests）
+        exit_status: pytest退出码
+        db_path: 数据库文件
+
+    Returns:
+        {'tests', 'passed', 'failed', 'skipped', 'steps', 'pages'}
+    """
+    finished_at = time.time()
+    starts = [result['start'] for result in test_results.values() if result.get('start')]
+    started_at = min(starts) if starts else finished_at
+    counts = {outcome: 0 for outcome in ('passed', 'failed', 'skipped')}
+    test_rows = []
+    step_rows = []
+    page_rows = []
+    for nodeid in sorted(set(test_results) | set(timings)):
+        steps = _flatten_steps(timings.get(nodeid, []))
+        order_numbers = [step['order_number'] for step in steps if step.get('order_number')]
+        result = test_results.get(nodeid)
+        if result is None:
+            # 没有pytest报告的记录（如会话级步骤）只保存步骤
+            outcome = 'failed' if any(step['status'] != 'passed' for step in steps) else 'passed'
+            result = {'outcome': outcome, 'duration_ms': sum(record['duration_ms'] for record in timings[nodeid])}
+        counts[result['outcome']] = counts.get(result['outcome'], 0) + 1
+        test_rows.append((
+            run_id, nodeid, result['outcome'], round(result['duration_ms'], 1),
+            order_numbers[0] if order_numbers else None
+        ))
+        for seq, step in enumerate(steps):
+            step_rows.append((
+                run_id, nodeid, seq, step['name'], step['title'], step['status'], step['duration_ms'],
+                step['playwright_calls'], step['wait_ms'], step['sleep_ms'], step.get('order_number')
+            ))
+            for metrics in step.get('page_metrics', []):
+                navigation = metrics.get('navigation') or {}
+                page_rows.append((
+                    run_id, nodeid, len(page_rows), metrics['step'], metrics['key'], metrics['url'],
+                    navigation.get('type'), navigation.get('ttfb_ms'), navigation.get('dom_content_loaded_ms'),
+                    navigation.get('load_ms'), metrics['lcp_ms'], metrics['cls'], metrics['inp_ms'],
+                    metrics['long_tasks_ms'], metrics['elapsed_ms'], metrics['resources']['count'],
+                    metrics['resources']['transfer_bytes']
+                ))
+
+    with closing(connect(db_path)) as conn, conn:
+        conn.execute('DELETE FROM runs WHERE run_id = ?', (run_id,))
+        conn.execute(
+            'INSERT INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (run_id, env, started_at, finished_at, exit_status, counts['passed'], counts['failed'],
+             counts['skipped'], os.getenv('GITHUB_SHA'))
+        )
+        conn.executemany('INSERT INTO tests VALUES (?, ?, ?, ?, ?)', test_rows)
+        conn.executemany('INSERT INTO steps VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', step_rows)
+        conn.executemany(f'INSERT INTO pages VALUES ({", ".join("?" * 17)})', page_rows)
+        if RUN_HISTORY_MAX_DAYS > 0:
+            conn.execute('DELETE FROM runs WHERE started_at < ?', (finished_at - RUN_HISTORY_MAX_DAYS * 86400,))
+    return dict(counts, tests=len(test_rows), steps=len(step_rows), pages=len(page_rows))
+
+
+def record_session(
+    timings_path: Optional[Path],
+    exit_status: Optional[int] = None,
+    db_path: Path = RUN_HISTORY_DB
+) -> Optional[dict]:
+    """
+    会话结束时写入本次运行（主进程调用，步骤记录从合并后的step-timings.json读取）
+
+    Args:
+        timings_path: 步骤耗时文件（没有步骤记录时为None）
+        exit_status: pytest退出码
+        db_path: 数据库文件
+
+    Returns:
+        record_run的返回值，本次没有执行任何测试时返回None
+    """
+    from .timing_module import get_run_id
+    timings = {}
+    if timings_path and Path(timings_path).exists():
+        timings = json.loads(Path(timings_path).read_text(encoding='utf-8')).get('tests', {})
+    if not _test_results and not timings:
+        return None
+    return record_run(get_run_id(), os.getenv('ENV', 'test'), _test_results, timings, exit_status, db_path)
+
+
+def _select_runs(conn: sqlite3.Connection, env: Optional[str] = None, days: Optional[float] = None) -> List[str]:
+    """按开始时间从新到旧列出运行ID"""
+    sql = 'SELECT run_id FROM runs WHERE 1 = 1'
+    params = []
+    if env:
+        sql += ' AND env = ?'
+        params.append(env)
+    if days:
+        sql += ' AND started_at >= ?'
+        params.append(time.time() - days * 86400)
+    sql += ' ORDER BY started_at DESC'
+    return [row['run_id'] for row in conn.execute(sql, params)]
+
+
+def _in_runs(run_ids: List[str]) -> str:
+    return f'run_id IN ({", ".join("?" * len(run_ids))})'
+
+
+def summarize_steps(conn: sqlite3.Connection, run_ids: List[str], order_number: Optional[str] = None) -> Dict[str, dict]:
+    """
+    按步骤汇总指定运行中的记录（统计格式与benchmark_module.summarize_runs相同，可直接用于基线对比）
+
+    Args:
+        conn: 数据库连接
+        run_ids: 运行ID列表
+        order_number: 只统计校验该订单号的步骤（可选）
+
+    Returns:
+        {步骤名称: {'title', 'samples', 'failed', 'p50_ms', 'p95_ms', 'calls_p50', 'calls_max', 'sleep_p50_ms', 'wait_p50_ms'}}
+    """
+    if not run_ids:
+        return {}
+    sql = f'SELECT * FROM steps WHERE {_in_runs(run_ids)}'
+    params = list(run_ids)
+    if order_number:
+        sql += ' AND order_number = ?'
+        params.append(order_number)
+    samples: Dict[str, dict] = {}
+    for row in conn.execute(sql + ' ORDER BY nodeid, seq', params):
+        sample = samples.setdefault(row['name'], {
+            'title': row['title'], 'duration_ms': [], 'calls': [], 'sleep_ms': [], 'wait_ms': [], 'failed': 0
+        })
+        sample['duration_ms'].append(row['duration_ms'])
+        sample['calls'].append(row['playwright_calls'])
+        sample['sleep_ms'].append(row['sleep_ms'])
+        sample['wait_ms'].append(row['wait_ms'])
+        if row['status'] != 'passed':
+            sample['failed'] += 1
+
+    return {
+        name: {
+            'title': sample['title'],
+            'samples': len(sample['duration_ms']),
+            'failed': sample['failed'],
+            'p50_ms': percentile(sample['duration_ms'], 50),
+            'p95_ms': percentile(sample['duration_ms'], 95),
+            'calls_p50': percentile(sample['calls'], 50),
+            'calls_max': max(sample['calls']),
+            'sleep_p50_ms': percentile(sample['sleep_ms'], 50),
+            'wait_p50_ms': percentile(sample['wait_ms'], 50)
+        }
+        for name, sample in samples.items()
+    }
+
+
+def summarize_tests(conn: sqlite3.Connection, run_ids: List[str]) -> Dict[str, dict]:
+    """
+    按测试汇总指定运行中的结果
+
+    Args:
+        conn: 数据库连接
+        run_ids: 运行ID列表
+
+    Returns:
+        {nodeid: {'runs', 'passed', 'failed', 'p50_ms', 'p95_ms'}}
+    """
+    if not run_ids:
+        return {}
+    samples: Dict[str, dict] = {}
+    for row in conn.execute(f'SELECT * FROM tests WHERE {_in_runs(run_ids)} ORDER BY nodeid', run_ids):
+        sample = samples.setdefault(row['nodeid'], {'duration_ms': [], 'passed': 0, 'failed': 0})
+        if row['outcome'] == 'skipped':
+            continue
+        sample['duration_ms'].append(row['duration_ms'])
+        sample[row['outcome']] += 1
+    return {
+        nodeid: {
+            'runs': len(sample['duration_ms']),
+            'passed': sample['passed'],
+            'failed': sample['failed'],
+            'p50_ms': percentile(sample['duration_ms'], 50),
+            'p95_ms': percentile(sample['duration_ms'], 95)
+        }
+        for nodeid, sample in samples.items()
+    }
+
+
+def summarize_pages(conn: sqlite3.Connection, run_ids: List[str]) -> Dict[str, dict]:
+    """
+    按URL_CONFIG条目汇总指定运行中的页面性能指标
+
+    Args:
+        conn: 数据库连接
+        run_ids: 运行ID列表
+
+    Returns:
+        {条目: {'samples', 'loads', 'ttfb_ms_p50', 'load_ms_p50', 'load_ms_p95', 'lcp_ms_p50', 'lcp_ms_p95',
+        'inp_ms_p50', 'inp_ms_p95', 'elapsed_ms_p50', 'elapsed_ms_p95', 'cls_p95', 'resources_p50', 'transfer_kb_p50'}}
+        （没有样本的指标为None；整页加载才有TTFB和load）
+    """
+    if not run_ids:
+        return {}
+    samples: Dict[str, List[sqlite3.Row]] = {}
+    for row in conn.execute(f'SELECT * FROM pages WHERE {_in_runs(run_ids)} ORDER BY url_key', run_ids):
+        samples.setdefault(row['url_key'], []).append(row)
+
+    def stat(rows, column, pct):
+        values = [row[column] for row in rows if row[column] is not None]
+        return percentile(values, pct) if values else None
+
+    summary = {}
+    for key, rows in samples.items():
+        stats = {'samples': len(rows), 'loads': sum(1 for row in rows if row['navigation_type'])}
+        for column, _ in PAGE_METRICS:
+            stats[f'{column}_p50'] = stat(rows, column, 50)
+            stats[f'{column}_p95'] = stat(rows, column, 95)
+        # percentile保留一位小数，CLS放大1000倍计算
+        cls = [row['cls'] * 1000 for row in rows if row['cls'] is not None]
+        stats['cls_p95'] = percentile(cls, 95) / 1000 if cls else None
+        stats['resources_p50'] = stat(rows, 'resource_count', 50)
+        transfer = stat(rows, 'transfer_bytes', 50)
+        stats['transfer_kb_p50'] = round(transfer / 1024, 1) if transfer is not None else None
+        summary[key] = stats
+    return summary
+
+
+def format_page_summary(summary: Dict[str, dict]) -> str:
+    """格式化页面性能统计表"""
+    def ms(value):
+        return f'{"-":>8}' if value is None else f'{value:>6.0f}ms'
+
+    lines = [
+        f'{"页面":<36} {"次数":>4} {"TTFB":>8} {"load":>8} {"LCP p50":>8} {"LCP p95":>8} '
+        f'{"INP p95":>8} {"CLS p95":>7} {"资源":>5} {"传输":>9}'
+    ]
+    for key, stats in summary.items():
+        cls = f'{"-":>7}' if stats['cls_p95'] is None else f'{stats["cls_p95"]:>7.3f}'
+        resources = f'{"-":>5}' if stats['resources_p50'] is None else f'{stats["resources_p50"]:>5.0f}'
+        transfer = f'{"-":>9}' if stats['transfer_kb_p50'] is None else f'{stats["transfer_kb_p50"]:>7.0f}KB'
+        lines.append(
+            f'{key:<36} {stats["samples"]:>4} {ms(stats["ttfb_ms_p50"])} {ms(stats["load_ms_p50"])} '
+            f'{ms(stats["lcp_ms_p50"])} {ms(stats["lcp_ms_p95"])} {ms(stats["inp_ms_p95"])} {cls} {resources} {transfer}'
+        )
+    return '\n'.join(lines)
+
+
+def format_test_summary(summary: Dict[str, dict]) -> str:
+    """格式化测试通过率和耗时表"""
+    lines = [f'{"测试":<60} {"运行":>4} {"通过率":>6} {"p50":>8} {"p95":>8}']
+    for nodeid, stats in summary.items():
+        rate = stats['passed'] / stats['runs'] if stats['runs'] else 0
+        lines.append(
+            f'{nodeid:<60} {stats["runs"]:>4} {rate:>6.0%} {stats["p50_ms"] / 1000:>7.1f}s {stats["p95_ms"] / 1000:>7.1f}s'
+        )
+    return '\n'.join(lines)
+
+
+def detect_regressions(
+    conn: sqlite3.Connection,
+    env: Optional[str] = None,
+    recent: int = DEFAULT_RECENT_RUNS,
+    baseline: int = DEFAULT_BASELINE_RUNS,
+    threshold: float = DEFAULT_THRESHOLD,
+    min_delta_ms: float = DEFAULT_MIN_DELTA_MS
+) -> List[str]:
+    """
+    将最近recent次运行与之前的baseline次运行对比，找出变慢的步骤（判定规则见benchmark_module.compare_to_baseline）
+    和页面性能指标p50变慢的页面（同样的阈值），并列出最近运行中失败次数多于基准期的测试
+
+    Args:
+        conn: 数据库连接
+        env: 只对比该环境的运行（可选）
+        recent: 最近的运行数
+        baseline: 作为基准的运行数
+        threshold: 耗时增长比例阈值
+        min_delta_ms: 最小耗时差值（毫秒）
+
+    Returns:
+        退化说明列表，运行数不足或没有退化时为空列表
+    """
+    run_ids = _select_runs(conn, env)
+    recent_ids = run_ids[:recent]
+    baseline_ids = run_ids[recent:recent + baseline]
+    if not recent_ids or not baseline_ids:
+        return []
+
+    regressions = compare_to_baseline(
+        summarize_steps(conn, recent_ids), summarize_steps(conn, baseline_ids), threshold, min_delta_ms
+    )
+    base_pages = summarize_pages(conn, baseline_ids)
+    for key, current in summarize_pages(conn, recent_ids).items():
+        base = base_pages.get(key)
+        if base is None:
+            continue
+        for column, label in PAGE_METRICS:
+            current_p50, base_p50 = current[f'{column}_p50'], base[f'{column}_p50']
+            if current_p50 is None or base_p50 is None:
+                continue
+            delta = current_p50 - base_p50
+            if delta > min_delta_ms and current_p50 > base_p50 * (1 + threshold):
+                regressions.append(f'{key}: {label} p50 {base_p50:.0f}ms -> {current_p50:.0f}ms (+{delta:.0f}ms)')
+
+    base_tests = summarize_tests(conn, baseline_ids)
+    for nodeid, current in summarize_tests(conn, recent_ids).items():
+        base = base_tests.get(nodeid)
+        if not base or not current['runs'] or not base['runs']:
+            continue
+        if current['failed'] / current['runs'] > base['failed'] / base['runs']:
+            regressions.append(
+                f'{nodeid}: 失败 {current["failed"]}/{current["runs"]} 次（之前 {base["failed"]}/{base["runs"]} 次）'
+            )
+    return regressions
+
+
+# 导出CSV的列：表名 -> (CSV列名, 该表中的列)，每行前面另有运行ID、开始时间、环境、测试和测试结果
+_EXPORT_COLUMNS = {
+    'steps': [
+        ('step', 'name'), ('title', 'title'), ('status', 'status'), ('duration_ms', 'duration_ms'),
+        ('playwright_calls', 'playwright_calls'), ('wait_ms', 'wait_ms'), ('sleep_ms', 'sleep_ms'),
+        ('order_number', 'order_number')
+    ],
+    'pages': [
+        ('step', 'step'), ('url_key', 'url_key'), ('url', 'url'), ('navigation_type', 'navigation_type'),
+        ('ttfb_ms', 'ttfb_ms'), ('dom_content_loaded_ms', 'dom_content_loaded_ms'), ('load_ms', 'load_ms'),
+        ('lcp_ms', 'lcp_ms'), ('cls', 'cls'), ('inp_ms', 'inp_ms'), ('long_tasks_ms', 'long_tasks_ms'),
+        ('elapsed_ms', 'elapsed_ms'), ('resource_count', 'resource_count'), ('transfer_bytes', 'transfer_bytes')
+    ]
+}
+
+
+def export_csv(
+    conn: sqlite3.Connection,
+    path: Path,
+    env: Optional[str] = None,
+    days: Optional[float] = None,
+    table: str = 'steps'
+) -> int:
+    """
+    导出明细CSV（每行一个步骤或一次页面导航，带运行时间、环境和测试结果）
+
+    Args:
+        conn: 数据库连接
+        path: 输出文件
+        env: 只导出该环境的运行（可选）
+        days: 只导出最近几天的运行（可选）
+        table: 'steps'（步骤耗时）或 'pages'（页面性能）
+
+    Returns:
+        导出的行数
+    """
+    run_ids = _select_runs(conn, env, days)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    table_columns = _EXPORT_COLUMNS[table]
+    columns = ['run_id', 'started_at', 'env', 'nodeid', 'outcome'] + [name for name, _ in table_columns]
+    count = 0
+    # utf-8-sig：Excel直接打开时中文不乱码
+    with open(path, 'w', newline='', encoding='utf-8-sig') as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        if not run_ids:
+            return 0
+        selected = ', '.join(f'{table}.{column}' for _, column in table_columns)
+        rows = conn.execute(
+            f'''
+            SELECT runs.run_id, runs.started_at, runs.env, {table}.nodeid, tests.outcome, {selected}
+            FROM {table}
+            JOIN runs ON runs.run_id = {table}.run_id
+            LEFT JOIN tests ON tests.run_id = {table}.run_id AND tests.nodeid = {table}.nodeid
+            WHERE {table}.{_in_runs(run_ids)}
+            ORDER BY runs.started_at, {table}.nodeid, {table}.seq
+            ''',
+            run_ids
+        )
+        for row in rows:
+            values = list(row)
+            values[1] = datetime.fromtimestamp(values[1]).isoformat(timespec='seconds')
+            writer.writerow(values)
+            count += 1
+    return count
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='查询测试运行历史（步骤耗时和页面性能p50/p95、退化检测、导出CSV）')
+    parser.add_argument('--db', default=str(RUN_HISTORY_DB), help='数据库文件')
+    parser.add_argument('--env', help='只查询该环境的运行')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    stats_parser = subparsers.add_parser('stats', help='各步骤p50/p95和各测试通过率')
+    stats_parser.add_argument('--days', type=float, default=7, help='统计最近几天的运行')
+    stats_parser.add_argument('--order', help='只统计校验该订单号的步骤')
+
+    pages_parser = subparsers.add_parser('pages', help='各页面TTFB/load/LCP/INP/CLS和资源大小')
+    pages_parser.add_argument('--days', type=float, default=7, help='统计最近几天的运行')
+
+    regressions_parser = subparsers.add_parser('regressions', help='最近几次运行与之前的运行对比，有退化时返回1')
+    regressions_parser.add_argument('--recent', type=int, default=DEFAULT_RECENT_RUNS, help='最近的运行数')
+    regressions_parser.add_argument('--baseline', type=int, default=DEFAULT_BASELINE_RUNS, help='作为基准的运行数')
+    regressions_parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help='p50耗时增长比例阈值')
+    regressions_parser.add_argument('--min-delta', type=float, default=DEFAULT_MIN_DELTA_MS, help='最小耗时差值（毫秒）')
+
+    export_parser = subparsers.add_parser('export', help='导出步骤或页面性能明细CSV')
+    export_parser.add_argument('output', help='输出文件')
+    export_parser.add_argument('--table', choices=sorted(_EXPORT_COLUMNS), default='steps', help='导出的明细')
+    export_parser.add_argument('--days', type=float, help='只导出最近几天的运行')
+    args = parser.parse_args()
+
+    if not Path(args.db).exists():
+        print(f'⚠️  运行历史数据库不存在: {args.db}')
+        return 1
+
+    with closing(connect(Path(args.db))) as conn:
+        if args.command == 'stats':
+            run_ids = _select_runs(conn, args.env, args.days)
+            print(f'最近 {args.days:g} 天共 {len(run_ids)} 次运行\n')
+            if run_ids:
+                print(format_summary(summarize_steps(conn, run_ids, args.order)))
+                print()
+                print(format_test_summary(summarize_tests(conn, run_ids)))
+            return 0
+
+        if args.command == 'pages':
+            run_ids = _select_runs(conn, args.env, args.days)
+            print(f'最近 {args.days:g} 天共 {len(run_ids)} 次运行\n')
+            if run_ids:
+                print(format_page_summary(summarize_pages(conn, run_ids)))
+            return 0
+
+        if args.command == 'regressions':
+            regressions = detect_regressions(
+                conn, args.env, args.recent, args.baseline, args.threshold, args.min_delta
+            )
+            if regressions:
+                print(f'⚠️  最近 {args.recent} 次运行相对之前的运行变慢或失败增多:')
+                for regression in regressions:
+                    print(f'  - {regression}')
+                return 1
+            print(f'✓ 最近 {args.recent} 次运行没有退化')
+            return 0
+
+        count = export_csv(conn, Path(args.output), args.env, args.days, args.table)
+        print(f'✓ 已导出 {count} 行: {args.output}')
+        return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
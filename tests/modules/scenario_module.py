@@ -0,0 +1,328 @@
+"""
+数据驱动场景模块
+从YAML/JSON/CSV文件加载订单校验场景，按共同的前置条件（环境、登录账号、列表日期范围）分组，
+同一组的场景只登录一次、只查询一次列表，再逐个校验列表行、详情和商品行
+"""
+
+import csv
+import json
+import os
+import yaml
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin
+from playwright.sync_api import Browser, Page
+from ..config.login_config import ENV, LOGIN_CONFIG
+from .api_capture_module import start_response_capture
+from .asset_cache_module import apply_asset_cache
+from .login_module import login, mark_session_context
+from .order_module import (
+    click_order_to_open_detail,
+    find_and_verify_order_in_list,
+    open_order_list,
+    verify_order_detail,
+    verify_product_rows
+)
+from .route_module import apply_route_profile
+
+# 场景文件（逗号分隔的路径或通配符，可通过环境变量SCENARIO_FILES覆盖）
+SCENARIO_FILES = os.getenv('SCENARIO_FILES', 'tests/data/*.yaml,tests/data/*.yml,tests/data/*.json,tests/data/*.csv')
+
+# 场景必填字段
+SCENARIO_REQUIRED_FIELDS = (
+    'order_number', 'status', 'source', 'order_date', 'store_name', 'store_code', 'start_date', 'end_date'
+)
+
+# 场景可选字段及默认值（env/account/password/brand_alias为None时使用当前环境的配置）
+SCENARIO_OPTIONAL_FIELDS = {
+    'id': None,
+    'env': None,
+    'account': None,
+    'password': None,
+    'brand_alias': None,
+    'product_code': None,
+    'product_name': None,
+    'expected_count': 1
+}
+
+
+def _normalize_value(value):
+    """将YAML解析出的日期、CSV中的空字符串统一为字符串/None"""
+    if isinstance(value, date):
+        return value.isoformat()
+    if value == '':
+        return None
+    return value
+
+
+def normalize_scenario(record: dict, defaults: dict = None, source: str = '') -> dict:
+    """
+    合并默认值并校验场景字段
+
+    Args:
+        record: 场景记录
+        defaults: 文件级默认值（可选）
+        source: 来源文件（用于错误信息和场景ID）
+
+    Returns:
+        标准化后的场景（包含所有必填和可选字段）
+    """
+    # 空值（CSV中的空单元格、YAML中的null）视为未指定，不覆盖默认值
+    merged = dict(SCENARIO_OPTIONAL_FIELDS)
+    for values in (defaults or {}, record):
+        for key, value in values.items():
+            value = _normalize_value(value)
+            if value is not None:
+                merged[key] = value
+
+    missing = [field for field in SCENARIO_REQUIRED_FIELDS if merged.get(field) is None]
+    if missing:
+        raise ValueError(f'场景缺少字段 {missing}（{source}）: {record}')
+
+    unknown = set(merged) - set(SCENARIO_REQUIRED_FIELDS) - set(SCENARIO_OPTIONAL_FIELDS)
+    if unknown:
+        raise ValueError(f'场景包含未知字段 {sorted(unknown)}（{source}）: {record}')
+
+    for field in SCENARIO_REQUIRED_FIELDS + ('account', 'brand_alias', 'product_code', 'product_name'):
+        if merged[field] is not None:
+            merged[field] = str(merged[field])
+    merged['expected_count'] = int(merged['expected_count'])
+    merged['env'] = merged['env'] or ENV
+    merged['id'] = str(merged['id'] or merged['order_number'])
+    merged['source_file'] = source
+    return merged
+
+
+def load_scenario_file(path: Path) -> List[dict]:
+    """
+    加载单个场景文件
+
+    YAML/JSON文件可以是场景数组，也可以是 {'defaults': {...}, 'scenarios': [...]}（defaults为同一文件中各场景的公共字段）；
+    CSV文件每行一个场景，表头为字段名
+
+    Args:
+        path: 场景文件路径
+
+    Returns:
+        标准化后的场景列表
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    text = path.read_text(encoding='utf-8')
+
+    if suffix in ('.yaml', '.yml'):
+        data = yaml.safe_load(text)
+    elif suffix == '.json':
+        data = json.loads(text)
+    elif suffix == '.csv':
+        data = list(csv.DictReader(text.splitlines()))
+    else:
+        raise ValueError(f'不支持的场景文件类型: {path}')
+
+    defaults = {}
+    if isinstance(data, dict):
+        defaults = data.get('defaults') or {}
+        data = data.get('scenarios') or []
+    return [normalize_scenario(record, defaults, str(path)) for record in data or []]
+
+
+def find_scenario_files(patterns: str = SCENARIO_FILES) -> List[Path]:
+    """
+    按路径或通配符查找场景文件
+
+    Args:
+        patterns: 逗号分隔的路径或通配符（相对于当前目录）
+
+    Returns:
+        场景文件列表（去重，按模式顺序）
+    """
+    files = []
+    for pattern in (part.strip() for part in patterns.split(',')):
+        if not pattern:
+            continue
+        matches = sorted(Path().glob(pattern)) if any(char in pattern for char in '*?[') else [Path(pattern)]
+        files.extend(path for path in matches if path.is_file() and path not in files)
+    return files
+
+
+def load_scenarios(patterns: str = SCENARIO_FILES, env: str = ENV) -> List[dict]:
+    """
+    加载当前环境的所有场景
+
+    Args:
+        patterns: 逗号分隔的路径或通配符
+        env: 只保留该环境的场景
+
+    Returns:
+        场景列表（同一分组的场景相邻，组内保持文件中的顺序）
+    """
+    scenarios = []
+    for path in find_scenario_files(patterns):
+        scenarios.extend(scenario for scenario in load_scenario_file(path) if scenario['env'] == env)
+    return [scenario for group in group_scenarios(scenarios).values() for scenario in group]
+
+
+def scenario_group_key(scenario: dict) -> Tuple[str, str, str, str, str]:
+    """
+    场景的分组键：共享前置条件（环境、登录账号、品牌别名、列表日期范围）的场景属于同一组
+
+    Args:
+        scenario: 标准化后的场景
+
+    Returns:
+        (环境, 账号, 品牌别名, 开始日期, 结束日期)，账号为None表示当前环境的默认账号
+    """
+    return (
+        scenario['env'],
+        scenario['account'] or '',
+        scenario['brand_alias'] or '',
+        scenario['start_date'],
+        scenario['end_date']
+    )
+
+
+def group_scenarios(scenarios: List[dict]) -> Dict[tuple, List[dict]]:
+    """
+    按前置条件分组
+
+    Args:
+        scenarios: 场景列表
+
+    Returns:
+        {分组键: 场景列表}，分组按首次出现的顺序排列
+    """
+    groups: Dict[tuple, List[dict]] = {}
+    for scenario in scenarios:
+        groups.setdefault(scenario_group_key(scenario), []).append(scenario)
+    return groups
+
+
+class ScenarioGroupRunner:
+    """
+    按分组执行场景
+
+    同一分组的场景共用一个浏览器上下文和一个已查询好的列表页：分组切换时才重新登录（登录态缓存可用时直接加载）
+    并查询列表；每个场景的详情在新标签页中打开，列表页保持不变，供同组的下一个场景继续使用
+    """
+
+    def __init__(self, browser: Browser, login_cache=None):
+        self.browser = browser
+        self.login_cache = login_cache
+        self._key = None
+        self._context = None
+        self._list_page: Optional[Page] = None
+        # 列表页被点击跳转到详情后需要重新查询
+        self._list_stale = False
+
+    def _credentials(self, scenario: dict) -> dict:
+        """场景使用的登录凭据（未指定时使用当前环境的默认账号）"""
+        credentials = LOGIN_CONFIG.get(scenario['env'], LOGIN_CONFIG['test'])['credentials']
+        return {
+            'account': scenario['account'] or credentials['account'],
+            'password': scenario['password'] or credentials['password'],
+            'brand_alias': scenario['brand_alias'] or credentials['brandAlias']
+        }
+
+    def get_list_page(self, scenario: dict) -> Page:
+        """
+        获取场景所在分组的列表页（分组切换时登录并查询列表）
+
+        Args:
+            scenario: 标准化后的场景
+
+        Returns:
+            已按分组日期范围查询好的订货列表页
+        """
+        key = scenario_group_key(scenario)
+        if key != self._key:
+            self.close()
+            credentials = self._credentials(scenario)
+            storage_state = None
+            if self.login_cache is not None:
+                try:
+                    storage_state = self.login_cache.get_storage_state(env=scenario['env'], **credentials)
+                except Exception as e:
+                    print(f'⚠️  获取登录态缓存失败，将完整执行登录: {e}')
+            viewport = {'width': 1920, 'height': 1080} if os.getenv('CI', 'false').lower() == 'true' else None
+            self._context = self.browser.new_context(storage_state=storage_state, viewport=viewport)
+            if storage_state:
+                mark_session_context(self._context, scenario['env'], credentials['account'], credentials['brand_alias'])
+            apply_asset_cache(self._context)
+            apply_route_profile(self._context)
+            self._list_page = self._context.new_page()
+            login_url = LOGIN_CONFIG.get(scenario['env'], LOGIN_CONFIG['test'])['loginUrl']
+            login(self._list_page, login_url=os.getenv('LOGIN_URL', login_url), **credentials)
+            self._key = key
+            self._list_stale = True
+            print(f'场景分组: {key[0]} {credentials["account"]}@{credentials["brand_alias"]} {key[3]} ~ {key[4]}')
+
+        if self._list_stale:
+            open_order_list(self._list_page, start_date=scenario['start_date'], end_date=scenario['end_date'])
+            self._list_stale = False
+        return self._list_page
+
+    def run(self, scenario: dict):
+        """
+        执行单个场景：在分组列表页中校验订单行，在新标签页中打开详情并校验
+
+        Args:
+            scenario: 标准化后的场景
+        """
+        list_page = self.get_list_page(scenario)
+        find_and_verify_order_in_list(
+            list_page,
+            order_number=scenario['order_number'],
+            status=scenario['status'],
+            store_name=scenario['store_name'],
+            source=scenario['source'],
+            order_date=scenario['order_date']
+        )
+
+        href = None
+        try:
+            href = list_page.get_by_text(scenario['order_number'], exact=True).first.get_attribute('href', timeout=2000)
+        except Exception:
+            pass
+
+        if href:
+            detail_page = self._context.new_page()
+            start_response_capture(detail_page, 'orderDetail')
+            detail_page.goto(urljoin(list_page.url, href), wait_until='domcontentloaded', timeout=30000)
+        else:
+            # 列表中没有详情链接时只能在列表页中点击打开，下一个场景需要重新查询列表
+            detail_page = list_page
+            self._list_stale = True
+            click_order_to_open_detail(detail_page, scenario['order_number'])
+
+        try:
+            verify_order_detail(
+                detail_page,
+                order_number=scenario['order_number'],
+                status=scenario['status'],
+                source=scenario['source'],
+                order_date=scenario['order_date'],
+                store_name=scenario['store_name'],
+                store_code=scenario['store_code']
+            )
+            if scenario['product_code']:
+                verify_product_rows(
+                    detail_page,
+                    expected_count=scenario['expected_count'],
+                    product_code=scenario['product_code'],
+                    product_name=scenario['product_name']
+                )
+        finally:
+            if detail_page is not list_page:
+                detail_page.close()
+
+    def close(self):
+        """关闭当前分组的浏览器上下文"""
+        if self._context is not None:
+            try:
+                self._context.close()
+            except Exception as e:
+                print(f'⚠️  关闭场景分组上下文失败: {e}')
+        self._key = None
+        self._context = None
+        self._list_page = None
@@ -0,0 +1,284 @@
+"""
+选择器解析模块
+为备选选择器列表记录各页面上实际命中的选择器（命中者），并持久化到JSON缓存
+下次先尝试命中者，其余候选合并为一个组合Locator同时等待，而不是逐个探测
+同时统计各候选的命中/未命中次数，便于清理失效的选择器
+"""
+
+import json
+import os
+import re
+from functools import reduce
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+from urllib.parse import urlparse
+from playwright.sync_api import Page, Locator
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+from .timing_module import record_selector
+
+# 选择器缓存文件（可通过环境变量SELECTOR_CACHE_FILE覆盖）
+SELECTOR_CACHE_FILE = Path(os.getenv('SELECTOR_CACHE_FILE', '.cache/selectors.json'))
+
+
+def get_page_pattern(url: str) -> str:
+    """
+    获取页面URL模式：只保留路径，并将数字段归一化
+
+    Args:
+        url: 页面URL（如：https://saas-boh-qa.hexcloud.cn/store-supply/demand-daily/detail/342512080002）
+
+    Returns:
+        URL模式（如：/store-supply/demand-daily/detail/{n}）
+    """
+    path = urlparse(url).path or '/'
+    return re.sub(r'\d+', '{n}', path)
+
+
+class SelectorRegistry:
+    """
+    备选选择器注册表
+
+    按 (页面URL模式, 用途) 记录命中的选择器模板，候选选择器可以包含 {name} 占位符，
+    由resolve的params参数填充，这样不同订单号/日期之间也能复用命中记录
+    """
+
+    def __init__(self, cache_file: Path = SELECTOR_CACHE_FILE):
+        self.cache_file = Path(cache_file)
+        # "URL模式|用途" -> 命中的选择器模板
+        self._winners: Dict[str, str] = {}
+        # 本次会话的统计: 用途 -> {'hits': {模板: 次数}, 'misses': {模板: 次数}, 'failures': 次数}
+        self._session_stats: Dict[str, dict] = {}
+        self._load()
+
+    def _load(self):
+        """从缓存文件加载命中记录"""
+        if not self.cache_file.exists():
+            return
+        try:
+            data = json.loads(self.cache_file.read_text(encoding='utf-8'))
+            self._winners.update(data.get('winners', {}))
+        except Exception as e:
+            print(f'⚠️  选择器缓存读取失败，忽略缓存: {e}')
+
+    def resolve(
+        self,
+        page: Page,
+        key: str,
+        candidates: List[str],
+        params: dict = None,
+        timeout: int = 5000,
+        state: str = 'visible',
+        scope: Union[Page, Locator] = None,
+        first: bool = True
+    ) -> Optional[Locator]:
+        """
+        在候选选择器中解析出第一个命中的元素
+
+        Args:
+            page: Playwright页面对象（用于确定URL模式）
+            key: 用途名称（如：loginButton），同一用途在不同页面上分别记录
+            candidates: 候选选择器模板列表，按优先级排列
+            params: 模板占位符参数（可选）
+            timeout: 等待任一候选出现的超时时间（毫秒）
+            state: 'visible' 或 'attached'
+            scope: 查找范围（可选，默认整个页面）
+            first: 是否只返回第一个匹配元素
+
+        Returns:
+            命中选择器对应的Locator，全部未命中时返回None
+        """
+        winner_key, winner, ordered = self._order(page, key, candidates)
+        build = self._builder(scope or page, params, state)
+
+        # 先直接检查上次的命中者，已出现时无需等待
+        if winner in candidates:
+            try:
+                if build(winner).count() > 0:
+                    return self._hit(key, winner_key, winner, [], build(winner), first)
+            except Exception:
+                pass
+
+        # 所有候选合并为一个Locator同时等待，任一出现即可
+        combined = reduce(lambda a, b: a.or_(b), [build(c) for c in ordered])
+        try:
+            combined.first.wait_for(state='attached', timeout=timeout)
+        except PlaywrightTimeoutError:
+            self._record(key, misses=ordered, failed=True)
+            record_selector(key, None, ordered)
+            return None
+
+        # 按优先级找出实际命中的候选（此时元素已出现，无需等待）
+        for index, template in enumerate(ordered):
+            try:
+                if build(template).count() > 0:
+                    return self._hit(key, winner_key, template, ordered[:index], build(template), first)
+            except Exception:
+                continue
+
+        self._record(key, misses=ordered, failed=True)
+        record_selector(key, None, ordered)
+        return None
+
+    async def resolve_async(
+        self,
+        page,
+        key: str,
+        candidates: List[str],
+        params: dict = None,
+        timeout: int = 5000,
+        state: str = 'visible',
+        scope=None,
+        first: bool = True
+    ):
+        """
+        resolve的异步版本（playwright.async_api的页面对象），参数和返回值相同，与同步版本共享命中记录
+        """
+        winner_key, winner, ordered = self._order(page, key, candidates)
+        build = self._builder(scope or page, params, state)
+
+        if winner in candidates:
+            try:
+                if await build(winner).count() > 0:
+                    return self._hit(key, winner_key, winner, [], build(winner), first)
+            except Exception:
+                pass
+
+        combined = reduce(lambda a, b: a.or_(b), [build(c) for c in ordered])
+        try:
+            await combined.first.wait_for(state='attached', timeout=timeout)
+        except PlaywrightTimeoutError:
+            self._record(key, misses=ordered, failed=True)
+            record_selector(key, None, ordered)
+            return None
+
+        for index, template in enumerate(ordered):
+            try:
+                if await build(template).count() > 0:
+                    return self._hit(key, winner_key, template, ordered[:index], build(template), first)
+            except Exception:
+                continue
+
+        self._record(key, misses=ordered, failed=True)
+        record_selector(key, None, ordered)
+        return None
+
+    def _order(self, page, key: str, candidates: List[str]):
+        """按上次的命中者优先排列候选，返回 (命中记录键, 上次的命中者, 排序后的候选)"""
+        winner_key = f'{get_page_pattern(page.url)}|{key}'
+        winner = self._winners.get(winner_key)
+        ordered = list(candidates)
+        if winner in ordered:
+            ordered.remove(winner)
+            ordered.insert(0, winner)
+        return winner_key, winner, ordered
+
+    @staticmethod
+    def _builder(root, params: Optional[dict], state: str):
+        """生成 模板 -> Locator 的构造函数"""
+        def build(template: str):
+            selector = template.format(**params) if params else template
+            locator = root.locator(selector)
+            return locator.locator('visible=true') if state == 'visible' else locator
+        return build
+
+    def _hit(
+        self,
+        key: str,
+        winner_key: str,
+        template: str,
+        missed: List[str],
+        locator: Locator,
+        first: bool
+    ) -> Locator:
+        """记录命中并返回Locator"""
+        if self._winners.get(winner_key) != template:
+            print(f'选择器命中记录更新 [{key}]: {template}')
+        self._winners[winner_key] = template
+        self._record(key, hits=[template], misses=missed)
+        record_selector(key, template, missed)
+        return locator.first if first else locator
+
+    def _record(self, key: str, hits: List[str] = (), misses: List[str] = (), failed: bool = False):
+        """累计本次会话的命中/未命中统计"""
+        stats = self._session_stats.setdefault(key, {'hits': {}, 'misses': {}, 'failures': 0})
+        for template in hits:
+            stats['hits'][template] = stats['hits'].get(template, 0) + 1
+        for template in misses:
+            stats['misses'][template] = stats['misses'].get(template, 0) + 1
+        if failed:
+            stats['failures'] += 1
+
+    def get_stats(self) -> Dict[str, dict]:
+        """
+        获取本次会话的命中/未命中统计
+
+        Returns:
+            用途 -> {'hits': {模板: 次数}, 'misses': {模板: 次数}, 'failures': 次数}
+        """
+        return json.loads(json.dumps(self._session_stats))
+
+    def format_stats(self) -> str:
+        """格式化输出本次会话的统计，从未命中过的候选标记为可清理"""
+        lines = []
+        for key, stats in sorted(self._session_stats.items()):
+            total_hits = sum(stats['hits'].values())
+            lines.append(f'[{key}] 命中 {total_hits} 次，全部未命中 {stats["failures"]} 次')
+            for template, count in sorted(stats['hits'].items(), key=lambda item: -item[1]):
+                lines.append(f'    ✓ {count:>3} 次命中: {template}')
+            for template, count in stats['misses'].items():
+                if template not in stats['hits']:
+                    lines.append(f'    ✗ {count:>3} 次未命中（可清理）: {template}')
+        return '\n'.join(lines)
+
+    def save(self):
+        """
+        写入缓存文件：命中记录以本次会话为准，统计与文件中已有的累计值合并
+        （先读后写并原子替换，多个进程同时保存时不会写坏文件）
+        """
+        data = {'winners': {}, 'stats': {}}
+        if self.cache_file.exists():
+            try:
+                data = json.loads(self.cache_file.read_text(encoding='utf-8'))
+            except Exception:
+                pass
+
+        data.setdefault('winners', {}).update(self._winners)
+        total_stats = data.setdefault('stats', {})
+        for key, stats in self._session_stats.items():
+            total = total_stats.setdefault(key, {'hits': {}, 'misses': {}, 'failures': 0})
+            for kind in ('hits', 'misses'):
+                for template, count in stats[kind].items():
+                    total[kind][template] = total[kind].get(template, 0) + count
+            total['failures'] += stats['failures']
+
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.cache_file.with_name(f'{self.cache_file.name}.{os.getpid()}.tmp')
+        tmp_file.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding='utf-8')
+        os.replace(tmp_file, self.cache_file)
+        # 已写入的统计不再重复累计
+        self._session_stats = {}
+
+
+_registry: Optional[SelectorRegistry] = None
+
+
+def get_selector_registry() -> SelectorRegistry:
+    """获取进程内共享的选择器注册表"""
+    global _registry
+    if _registry is None:
+        _registry = SelectorRegistry()
+    return _registry
+
+
+def resolve_selector(page: Page, key: str, candidates: List[str], **kwargs) -> Optional[Locator]:
+    """
+    便捷函数：使用共享注册表解析备选选择器（参数同SelectorRegistry.resolve）
+    """
+    return get_selector_registry().resolve(page, key, candidates, **kwargs)
+
+
+async def async_resolve_selector(page, key: str, candidates: List[str], **kwargs):
+    """
+    便捷函数：resolve_selector的异步版本（参数同SelectorRegistry.resolve_async）
+    """
+    return await get_selector_registry().resolve_async(page, key, candidates, **kwargs)
@@ -0,0 +1,201 @@
+"""
+页面快照模块
+一次page.evaluate提取页面的结构化快照：头部键值对、表格行（按单元格拆分）、可见的提示信息，
+快照在页面跳转或DOM变化前保持缓存，所有校验函数共用，避免反复拉取整页文本
+"""
+
+import weakref
+from typing import Dict, List, Optional
+from playwright.sync_api import Page
+from .table_module import TABLE_READER_JS, TableData
+
+# 快照提取函数（JS函数表达式），也供其他脚本内嵌使用（如详情页就绪等待）
+# 首次执行时在页面中安装MutationObserver维护DOM版本号，用于判断缓存的快照是否过期
+SNAPSHOT_FUNCTION_JS = '''
+() => {
+    if (!window.__bohSnapshotObserver) {
+        window.__bohSnapshotVersion = 0;
+        window.__bohSnapshotObserver = new MutationObserver(() => { window.__bohSnapshotVersion += 1; });
+        window.__bohSnapshotObserver.observe(document.documentElement, {
+            childList: true, subtree: true, characterData: true
+        });
+    }
+    const clean = (text) => (text || '').replace(/\\s+/g, ' ').trim();
+    const isVisible = (el) => !!(el.offsetParent || el.getClientRects().length);
+
+    // 头部键值对：描述列表/表单项，以及"标签：值"形式的文本
+    const headers = {};
+    const addHeader = (label, value) => {
+        label = clean(label).replace(/[：:]$/, '').trim();
+        value = clean(value);
+        if (label && label.length <= 20 && !(label in headers)) headers[label] = value;
+    };
+    document.querySelectorAll(
+        '.ant-descriptions-item, .ant-form-item, [class*="descriptions-item"], [class*="info-item"]'
+    ).forEach(item => {
+        const label = item.querySelector('[class*="label"]');
+        const content = item.querySelector('[class*="content"], [class*="control"], [class*="value"]');
+        if (label && content) addHeader(label.textContent, content.textContent);
+    });
+    document.querySelectorAll('body *').forEach(el => {
+        if (el.children.length > 0 || ['SCRIPT', 'STYLE'].includes(el.tagName)) return;
+        const text = clean(el.textContent);
+        const match = text.match(/^([^：:]{1,20})[：:]\\s*(.*)$/);
+        if (match && match[2]) {
+            addHeader(match[1], match[2]);
+        } else if (match && el.nextElementSibling) {
+            addHeader(match[1], el.nextElementSibling.textContent);
+        }
+    });
+
+    // 表格：与table_module.read_tables()使用同一个提取函数
+    const readTables = __TABLE_READER__;
+    const tables = readTables(Array.from(document.querySelectorAll('table')));
+
+    // 可见的提示信息
+    const alerts = Array.from(document.querySelectorAll(
+        '[role="alert"], .ant-message-notice, .ant-notification-notice, .ant-alert, [class*="error-message"]'
+    )).filter(isVisible).map(el => clean(el.textContent)).filter(Boolean);
+
+    return {
+        url: location.href,
+        version: window.__bohSnapshotVersion,
+        text: document.body ? document.body.textContent : '',
+        headers,
+        tables,
+        alerts
+    };
+}
+'''.replace('__TABLE_READER__', TABLE_READER_JS.strip())
+
+
+class PageSnapshot:
+    """
+    页面结构化快照
+
+    Attributes:
+        url: 页面URL
+        version: 提取快照时的DOM版本号
+        text: 页面完整文本（兼容原有的文本包含校验）
+        headers: 头部键值对 {标签: 值}
+        tables: 表格列表（TableData）
+        alerts: 可见的提示信息文本
+    """
+
+    def __init__(self, data: dict):
+        self.url: str = data.get('url', '')
+        self.version = data.get('version')
+        self.text: str = data.get('text') or ''
+        self.headers: Dict[str, str] = data.get('headers') or {}
+        self.tables: List[TableData] = [
+            TableData(table['headers'], table['rows']) for table in data.get('tables') or []
+        ]
+        self.alerts: List[str] = data.get('alerts') or []
+
+    def contains(self, value: str) -> bool:
+        """页面文本中是否包含value"""
+        return value in self.text
+
+    def get_header(self, label: str) -> Optional[str]:
+        """
+        获取头部字段值
+
+        Args:
+            label: 字段标签（如：订货门店编号），不含冒号
+
+        Returns:
+            字段值，不存在时返回None
+        """
+        return self.headers.get(label)
+
+    def get_table(self, header: str) -> Optional[TableData]:
+        """
+        获取包含指定列的表格
+
+        Args:
+            header: 列名（如：商品编号）
+
+        Returns:
+            第一个包含该列且有数据行的表格，未找到时返回None
+        """
+        tables = [table for table in self.tables if header in table.headers]
+        for table in tables:
+            if table.rows:
+                return table
+        return tables[0] if tables else None
+
+    def find_rows(self, value: str, header: str = None) -> List[List[str]]:
+        """
+        查找包含value的表格行（按单元格完全相等匹配）
+
+        Args:
+            value: 单元格的值（如：订单号）
+            header: 只查找包含该列名的表格（可选）
+
+        Returns:
+            匹配的行（单元格文本列表）
+        """
+        rows = []
+        for table in self.tables:
+            if header and header not in table.headers:
+                continue
+            rows.extend(table.find_rows(value))
+        return rows
+
+
+# 页面 -> 最近一次的快照，页面关闭后自动释放
+_snapshots = weakref.WeakKeyDictionary()
+
+
+def remember_snapshot(page: Page, data: dict) -> PageSnapshot:
+    """
+    缓存由其他脚本（内嵌SNAPSHOT_FUNCTION_JS）提取的快照
+
+    Args:
+        page: Playwright页面对象
+        data: SNAPSHOT_FUNCTION_JS的返回值
+
+    Returns:
+        PageSnapshot
+    """
+    snapshot = PageSnapshot(data)
+    _snapshots[page] = snapshot
+    return snapshot
+
+
+def take_snapshot(page: Page, force: bool = False) -> PageSnapshot:
+    """
+    获取页面快照：页面未跳转且DOM未变化时直接返回缓存
+
+    Args:
+        page: Playwright页面对象
+        force: 是否忽略缓存重新提取
+
+    Returns:
+        PageSnapshot
+    """
+    cached = _snapshots.get(page)
+    if cached is not None and not force and cached.url == page.url:
+        try:
+            # 只读取DOM版本号（跳转后为undefined），比重新提取整页快照轻量得多
+            if page.evaluate('() => window.__bohSnapshotVersion') == cached.version:
+                return cached
+        except Exception:
+            pass
+
+    return remember_snapshot(page, page.evaluate(SNAPSHOT_FUNCTION_JS))
+
+
+async def async_take_snapshot(page, force: bool = False) -> PageSnapshot:
+    """
+    take_snapshot的异步版本（playwright.async_api的页面对象），与同步版本共用缓存规则
+    """
+    cached = _snapshots.get(page)
+    if cached is not None and not force and cached.url == page.url:
+        try:
+            if await page.evaluate('() => window.__bohSnapshotVersion') == cached.version:
+                return cached
+        except Exception:
+            pass
+
+    return remember_snapshot(page, await page.evaluate(SNAPSHOT_FUNCTION_JS))
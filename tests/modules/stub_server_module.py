@@ -0,0 +1,526 @@
+"""
+本地BOH模拟服务模块
+提供登录页、订货单列表页和详情页（页面结构和接口路径与BOH一致），使用种子数据，
+支持人为延迟和列表分页大小配置，用于无网络环境运行和测量测试框架自身的耗时
+
+单独启动：python -m tests.modules.stub_server_module --port 8765 --latency 100
+"""
+
+import argparse
+import html
+import json
+import threading
+import time
+import uuid
+from datetime import date, timedelta
+from http import HTTPStatus
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+from urllib.request import urlopen
+from ..config.api_config import API_VALUE_LABELS
+from ..config.stub_config import STUB_CONFIG, STUB_ORDERS, get_stub_port
+
+# 会话cookie名称
+SESSION_COOKIE = 'boh_stub_session'
+
+# 接口枚举值对应的页面文案
+_STATUS_LABELS = API_VALUE_LABELS['status']
+_SOURCE_LABELS = API_VALUE_LABELS['source']
+
+_PAGE_STYLE = '''
+body { font-family: sans-serif; margin: 0; }
+header { display: flex; gap: 24px; padding: 12px 24px; background: #001529; color: #fff; }
+main { padding: 24px; }
+.ant-table table { border-collapse: collapse; width: 100%; }
+.ant-table th, .ant-table td { border: 1px solid #ddd; padding: 4px 8px; text-align: left; }
+.ant-picker-dropdown { position: absolute; background: #fff; border: 1px solid #ccc; padding: 8px; z-index: 10; }
+.ant-picker-dropdown[hidden] { display: none; }
+.ant-picker-cell { cursor: pointer; padding: 2px 6px; }
+.ant-descriptions-item { display: inline-block; margin-right: 24px; }
+'''
+
+_HEADER_HTML = '''
+<header class="boh-header">
+  <span class="tenant-name">{tenant}</span>
+  <nav class="boh-menu"><a href="/store-supply/demand-daily">门店运营</a> / <a href="/store-supply/demand-daily">订货</a></nav>
+</header>
+'''
+
+_LOGIN_PAGE = '''<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>登录</title><style>{style}</style></head>
+<body><main>
+<form id="login-form" class="login-form">
+  <input type="text" name="account" placeholder="请输入账号">
+  <input type="password" name="password" placeholder="请输入密码">
+  <input type="text" name="brandAlias" placeholder="请输入品牌别名">
+  <label class="agreement"><input type="checkbox" name="agreement">已阅读并同意用户协议</label>
+  <button type="submit" class="login-button">登录</button>
+  <div class="ant-message" role="alert" hidden></div>
+</form>
+</main>
+<script>
+document.getElementById('login-form').addEventListener('submit', async (event) => {{
+  event.preventDefault();
+  const form = event.target;
+  const message = form.querySelector('.ant-message');
+  const response = await fetch('/api/auth/login', {{
+    method: 'POST',
+    headers: {{ 'Content-Type': 'application/json' }},
+    body: JSON.stringify({{
+      account: form.account.value,
+      password: form.password.value,
+      brandAlias: form.brandAlias.value
+    }})
+  }});
+  const data = await response.json();
+  if (response.ok) {{
+    location.href = '/';
+  }} else {{
+    message.textContent = data.message;
+    message.hidden = false;
+  }}
+}});
+</script>
+</body></html>
+'''
+
+_HOME_PAGE = '''<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>BOH供应链中台</title><style>{style}</style></head>
+<body>{header}<main><h1>工作台</h1></main></body></html>
+'''
+
+_LIST_PAGE = '''<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>订货</title><style>{style}</style></head>
+<body>{header}
+<main>
+  <form class="query-form" onsubmit="return false">
+    <input class="date-input" placeholder="开始日期" aria-label="Start Time" value="{start}" readonly>
+    <input class="date-input" placeholder="结束日期" aria-label="End Time" value="{end}" readonly>
+    <button type="button" class="ant-btn-primary" id="query-button">查询</button>
+  </form>
+  <div class="ant-picker-dropdown" hidden>
+    <div class="ant-picker-header">
+      <button type="button" class="ant-picker-prev">‹</button>
+      <span class="ant-picker-month"></span>
+      <button type="button" class="ant-picker-next">›</button>
+    </div>
+    <table class="ant-picker-content"><tbody></tbody></table>
+  </div>
+  <div class="ant-table"><table>
+    <thead><tr><th>订货单号</th><th>状态</th><th>订货门店</th><th>来源</th><th>订货日期</th></tr></thead>
+    <tbody class="ant-table-tbody"></tbody>
+  </table></div>
+  <div class="ant-pagination"></div>
+</main>
+<script>
+const statusLabels = {status_labels};
+const sourceLabels = {source_labels};
+const inputs = document.querySelectorAll('.date-input');
+const dropdown = document.querySelector('.ant-picker-dropdown');
+let activeInput = null;
+let viewMonth = null;
+
+const pad = (n) => String(n).padStart(2, '0');
+const renderPicker = () => {{
+  const [year, month] = viewMonth;
+  dropdown.querySelector('.ant-picker-month').textContent = `${{year}}年${{month}}月`;
+  const days = new Date(year, month, 0).getDate();
+  const cells = [];
+  for (let day = 1; day <= days; day++) {{
+    const value = `${{year}}-${{pad(month)}}-${{pad(day)}}`;
+    cells.push(`<td class="ant-picker-cell ant-picker-cell-in-view" title="${{value}}"><div class="ant-picker-cell-inner">${{day}}</div></td>`);
+  }}
+  const rows = [];
+  for (let i = 0; i < cells.length; i += 7) rows.push(`<tr>${{cells.slice(i, i + 7).join('')}}</tr>`);
+  dropdown.querySelector('tbody').innerHTML = rows.join('');
+}};
+inputs.forEach(input => input.addEventListener('click', () => {{
+  activeInput = input;
+  const value = input.value || '{default_date}';
+  viewMonth = value.split('-').slice(0, 2).map(Number);
+  renderPicker();
+  const rect = input.getBoundingClientRect();
+  dropdown.style.left = `${{rect.left}}px`;
+  dropdown.style.top = `${{rect.bottom + window.scrollY}}px`;
+  dropdown.hidden = false;
+}}));
+dropdown.addEventListener('click', (event) => {{
+  if (event.target.closest('.ant-picker-prev, .ant-picker-next')) {{
+    const step = event.target.closest('.ant-picker-prev') ? -1 : 1;
+    const current = new Date(viewMonth[0], viewMonth[1] - 1 + step, 1);
+    viewMonth = [current.getFullYear(), current.getMonth() + 1];
+    renderPicker();
+    return;
+  }}
+  const cell = event.target.closest('.ant-picker-cell');
+  if (cell && activeInput) {{
+    activeInput.value = cell.getAttribute('title');
+    dropdown.hidden = true;
+  }}
+}});
+
+const loadList = async () => {{
+  const params = new URLSearchParams({{ start: inputs[0].value, end: inputs[1].value, page: 1 }});
+  const pageQuery = new URLSearchParams(location.search);
+  ['store', 'status'].forEach(key => {{ if (pageQuery.get(key)) params.set(key, pageQuery.get(key)); }});
+  const response = await fetch(`/api/store-supply/demand/list?${{params}}`);
+  const data = await response.json();
+  document.querySelector('.ant-table-tbody').innerHTML = data.payload.rows.map(row => `
+    <tr class="ant-table-row">
+      <td><a href="/store-supply/demand-daily/detail/${{row.id}}">${{row.code}}</a></td>
+      <td>${{statusLabels[row.status] || row.status}}</td>
+      <td>${{row.storeName}}</td>
+      <td>${{sourceLabels[row.type] || row.type}}</td>
+      <td>${{row.demandDate.slice(0, 10)}}</td>
+    </tr>`).join('');
+  document.querySelector('.ant-pagination').textContent = `共 ${{data.payload.total}} 条`;
+}};
+document.getElementById('query-button').addEventListener('click', loadList);
+loadList();
+</script>
+</body></html>
+'''
+
+_DETAIL_PAGE = '''<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>订货单详情</title><style>{style}</style></head>
+<body>{header}
+<main>
+  <div class="ant-descriptions">
+    <div class="ant-descriptions-item"><span class="ant-descriptions-item-label">订货单号：</span><span class="ant-descriptions-item-content" data-field="code">-</span></div>
+    <div class="ant-descriptions-item"><span class="ant-descriptions-item-label">单据状态：</span><span class="ant-descriptions-item-content" data-field="status">-</span></div>
+    <div class="ant-descriptions-item"><span class="ant-descriptions-item-label">来源：</span><span class="ant-descriptions-item-content" data-field="type">-</span></div>
+    <div class="ant-descriptions-item"><span class="ant-descriptions-item-label">订货日期：</span><span class="ant-descriptions-item-content" data-field="demandDate">-</span></div>
+    <div class="ant-descriptions-item"><span class="ant-descriptions-item-label">订货门店：</span><span class="ant-descriptions-item-content" data-field="storeName">-</span></div>
+    <div class="ant-descriptions-item"><span class="ant-descriptions-item-label">订货门店编号：</span><span class="ant-descriptions-item-content" data-field="storeCode">-</span></div>
+  </div>
+  <div class="ant-table"><table>
+    <thead><tr><th>商品编号</th><th>商品名称</th><th>单位</th><th>订货数量</th></tr></thead>
+    <tbody class="ant-table-tbody"></tbody>
+  </table></div>
+</main>
+<script>
+const statusLabels = {status_labels};
+const sourceLabels = {source_labels};
+const loadDetail = async () => {{
+  const response = await fetch('/api/store-supply/demand/detail?id={order_id}');
+  const data = await response.json();
+  const order = data.payload;
+  const values = Object.assign({{}}, order, {{
+    status: statusLabels[order.status] || order.status,
+    type: sourceLabels[order.type] || order.type,
+    demandDate: order.demandDate.slice(0, 10)
+  }});
+  document.querySelectorAll('[data-field]').forEach(el => {{ el.textContent = values[el.dataset.field]; }});
+  document.querySelector('.ant-table-tbody').innerHTML = order.products.map(product => `
+    <tr class="ant-table-row"><td>${{product.code}}</td><td>${{product.name}}</td><td>${{product.unit}}</td><td>${{product.quantity}}</td></tr>`).join('');
+}};
+loadDetail();
+</script>
+</body></html>
+'''
+
+
+def build_orders(filler_count: int = STUB_CONFIG['fillerOrders']) -> List[dict]:
+    """
+    生成模拟服务的订货单数据：种子订货单在前，其后是按日期分布的填充订货单
+
+    Args:
+        filler_count: 填充订货单数量
+
+    Returns:
+        订货单列表（demandDate为接口格式的带时间日期）
+    """
+    orders = []
+    for order in STUB_ORDERS:
+        orders.append(dict(order, demandDate=f'{order["demandDate"]}T00:00:00Z'))
+
+    statuses = ['INITED', 'SUBMITTED', 'APPROVED', 'REJECTED']
+    sources = list(_SOURCE_LABELS)
+    start = date(2025, 12, 1)
+    for index in range(filler_count):
+        demand_date = start + timedelta(days=index % 31)
+        orders.append({
+            'id': str(5000 + index),
+            'code': f'3425121{index:05d}',
+            'status': statuses[index % len(statuses)],
+            'type': sources[index % len(sources)],
+            'demandDate': f'{demand_date.isoformat()}T00:00:00Z',
+            'storeName': f'WEN测试直营门店{index % 20 + 3:02d}',
+            'storeCode': str(100000100 + index % 20),
+            'products': [
+                {'code': f'T2025120{index:05d}', 'name': f'填充商品{index}', 'unit': '个', 'quantity': index % 9 + 1}
+            ]
+        })
+    return orders
+
+
+class StubState:
+    """模拟服务的数据和配置（各请求线程共享，只读）"""
+
+    def __init__(
+        self,
+        latency_ms: int = STUB_CONFIG['latencyMs'],
+        api_latency_ms: int = STUB_CONFIG['apiLatencyMs'],
+        page_size: int = STUB_CONFIG['pageSize'],
+        filler_orders: int = STUB_CONFIG['fillerOrders']
+    ):
+        self.latency_ms = latency_ms
+        self.api_latency_ms = api_latency_ms
+        self.page_size = page_size
+        self.orders = build_orders(filler_orders)
+        self.orders_by_id: Dict[str, dict] = {order['id']: order for order in self.orders}
+        self.sessions = set()
+        self.lock = threading.Lock()
+
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    """模拟服务请求处理"""
+
+    server_version = 'BOHStub/1.0'
+    state: StubState = None
+
+    def log_message(self, format, *args):
+        # 不输出每个请求的访问日志
+        pass
+
+    # ---- 通用 ----
+
+    def _delay(self, is_api: bool):
+        delay_ms = self.state.api_latency_ms if is_api else self.state.latency_ms
+        if delay_ms > 0:
+            time.sleep(delay_ms / 1000)
+
+    def _send(self, status: int, body: str, content_type: str, headers: dict = None):
+        data = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', f'{content_type}; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.send_header('Cache-Control', 'no-store')
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_json(self, status: int, payload: dict, headers: dict = None):
+        self._send(status, json.dumps(payload, ensure_ascii=False), 'application/json', headers)
+
+    def _send_html(self, html: str):
+        self._send(HTTPStatus.OK, html, 'text/html')
+
+    def _redirect(self, location: str):
+        self.send_response(HTTPStatus.FOUND)
+        self.send_header('Location', location)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def _logged_in(self) -> bool:
+        cookie = SimpleCookie(self.headers.get('Cookie', ''))
+        token = cookie.get(SESSION_COOKIE)
+        with self.state.lock:
+            return token is not None and token.value in self.state.sessions
+
+    def _page(self, template: str, **values) -> str:
+        header = _HEADER_HTML.format(tenant=STUB_CONFIG['tenantName'])
+        return template.format(style=_PAGE_STYLE, header=header, **values)
+
+    # ---- 路由 ----
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        path = url.path.rstrip('/') or '/'
+        is_api = path.startswith('/api/')
+        self._delay(is_api)
+
+        if path == '/__stub/health':
+            self._send_json(HTTPStatus.OK, {'status': 'ok', 'orders': len(self.state.orders)})
+        elif path == '/page/login':
+            self._send_html(_LOGIN_PAGE.format(style=_PAGE_STYLE))
+        elif not self._logged_in():
+            if is_api:
+                self._send_json(HTTPStatus.UNAUTHORIZED, {'status_code': 401, 'message': '未登录'})
+            else:
+                self._redirect('/page/login')
+        elif path == '/':
+            self._send_html(self._page(_HOME_PAGE))
+        elif path == '/store-supply/demand-daily':
+            self._send_html(self._page(
+                _LIST_PAGE,
+                start=html.escape(query.get('start', '')),
+                end=html.escape(query.get('end', '')),
+                default_date=STUB_ORDERS[0]['demandDate'],
+                status_labels=json.dumps(_STATUS_LABELS, ensure_ascii=False),
+                source_labels=json.dumps(_SOURCE_LABELS, ensure_ascii=False)
+            ))
+        elif path.startswith('/store-supply/demand-daily/detail/'):
+            order_id = path.rsplit('/', 1)[-1]
+            if order_id not in self.state.orders_by_id:
+                self._send(HTTPStatus.NOT_FOUND, '订货单不存在', 'text/plain')
+                return
+            self._send_html(self._page(
+                _DETAIL_PAGE,
+                order_id=order_id,
+                status_labels=json.dumps(_STATUS_LABELS, ensure_ascii=False),
+                source_labels=json.dumps(_SOURCE_LABELS, ensure_ascii=False)
+            ))
+        elif path == '/api/store-supply/demand/list':
+            self._send_json(HTTPStatus.OK, self._list_orders(query))
+        elif path == '/api/store-supply/demand/detail':
+            order = self.state.orders_by_id.get(query.get('id', ''))
+            if order is None:
+                self._send_json(HTTPStatus.NOT_FOUND, {'status_code': 404, 'message': '订货单不存在'})
+            else:
+                self._send_json(HTTPStatus.OK, {'status_code': 0, 'payload': order})
+        else:
+            self._send(HTTPStatus.NOT_FOUND, 'Not Found', 'text/plain')
+
+    def do_POST(self):
+        path = urlparse(self.path).path
+        self._delay(is_api=True)
+        if path != '/api/auth/login':
+            self._send(HTTPStatus.NOT_FOUND, 'Not Found', 'text/plain')
+            return
+
+        length = int(self.headers.get('Content-Length', '0'))
+        try:
+            body = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            body = {}
+        credentials = STUB_CONFIG['credentials']
+        if (body.get('account') != credentials['account']
+                or body.get('password') != credentials['password']
+                or body.get('brandAlias', credentials['brandAlias']) != credentials['brandAlias']):
+            self._send_json(HTTPStatus.UNAUTHORIZED, {'status_code': 401, 'message': '用户名或密码错误'})
+            return
+
+        token = uuid.uuid4().hex
+        with self.state.lock:
+            self.state.sessions.add(token)
+        self._send_json(
+            HTTPStatus.OK,
+            {'status_code': 0, 'payload': {'token': token}},
+            headers={'Set-Cookie': f'{SESSION_COOKIE}={token}; Path=/; Max-Age=86400; HttpOnly'}
+        )
+
+    def _list_orders(self, query: dict) -> dict:
+        """按日期范围、门店（名称或编号）和状态（枚举值或文案）筛选订货单并分页"""
+        start = query.get('start') or ''
+        end = query.get('end') or ''
+        store = query.get('store') or ''
+        status = query.get('status') or ''
+        page = max(int(query.get('page') or 1), 1)
+        size = int(query.get('size') or self.state.page_size)
+        rows = [
+            {key: value for key, value in order.items() if key != 'products'}
+            for order in self.state.orders
+            if (not start or order['demandDate'][:10] >= start)
+            and (not end or order['demandDate'][:10] <= end)
+            and (not store or store in order['storeName'] or store == order['storeCode'])
+            and (not status or status in (order['status'], _STATUS_LABELS.get(order['status'])))
+        ]
+        return {
+            'status_code': 0,
+            'payload': {'total': len(rows), 'page': page, 'rows': rows[(page - 1) * size:page * size]}
+        }
+
+
+class StubServer:
+    """
+    本地BOH模拟服务（后台线程运行）
+
+    Args:
+        host: 监听地址
+        port: 监听端口，0表示随机端口
+        state: 模拟数据和配置（可选）
+    """
+
+    def __init__(self, host: str = STUB_CONFIG['host'], port: int = None, state: StubState = None):
+        handler = type('BoundStubRequestHandler', (StubRequestHandler,), {'state': state or StubState()})
+        self.httpd = ThreadingHTTPServer((host, get_stub_port() if port is None else port), handler)
+        self.httpd.daemon_threads = True
+        self.thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self) -> 'StubServer':
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name='boh-stub-server', daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self.thread:
+            self.thread.join(timeout=5)
+
+
+def is_stub_running(base_url: str) -> bool:
+    """
+    检查模拟服务是否已在运行（例如已单独启动）
+
+    Args:
+        base_url: 模拟服务基础URL
+
+    Returns:
+        bool: 健康检查是否通过
+    """
+    try:
+        with urlopen(f'{base_url}/__stub/health', timeout=1) as response:
+            return response.status == 200
+    except Exception:
+        return False
+
+
+def start_stub_server(port: int = None, **state_options) -> Optional[StubServer]:
+    """
+    启动模拟服务；端口上已有模拟服务在运行时直接复用
+
+    Args:
+        port: 监听端口（可选，默认按STUB_CONFIG和工作进程计算）
+        **state_options: StubState参数（latency_ms、api_latency_ms、page_size、filler_orders）
+
+    Returns:
+        新启动的StubServer，复用已有服务时返回None
+    """
+    port = get_stub_port() if port is None else port
+    base_url = f'http://{STUB_CONFIG["host"]}:{port}'
+    if is_stub_running(base_url):
+        print(f'♻️  复用已运行的BOH模拟服务: {base_url}')
+        return None
+    server = StubServer(port=port, state=StubState(**state_options)).start()
+    print(f'🧪 BOH模拟服务已启动: {server.base_url}')
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description='本地BOH模拟服务')
+    parser.add_argument('--port', type=int, default=get_stub_port(), help='监听端口')
+    parser.add_argument('--latency', type=int, default=STUB_CONFIG['latencyMs'], help='页面请求延迟（毫秒）')
+    parser.add_argument('--api-latency', type=int, default=STUB_CONFIG['apiLatencyMs'], help='接口请求延迟（毫秒）')
+    parser.add_argument('--page-size', type=int, default=STUB_CONFIG['pageSize'], help='订货单列表每页行数')
+    parser.add_argument('--orders', type=int, default=STUB_CONFIG['fillerOrders'], help='填充订货单数量')
+    args = parser.parse_args()
+
+    state = StubState(
+        latency_ms=args.latency,
+        api_latency_ms=args.api_latency,
+        page_size=args.page_size,
+        filler_orders=args.orders
+    )
+    server = StubServer(port=args.port, state=state)
+    print(f'BOH模拟服务: {server.base_url}（Ctrl+C 退出）')
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == '__main__':
+    main()
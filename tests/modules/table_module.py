@@ -0,0 +1,214 @@
+"""
+表格读取模块
+一次evaluate_all读取表格的全部行和单元格，按列名建立索引，
+替代 locator(...).all() 后逐行 text_content() 的读取方式（每行一次往返）
+"""
+
+from typing import Dict, List, Optional, Union
+from playwright.sync_api import Page, Locator
+from playwright.async_api import Locator as AsyncLocator
+
+# 默认读取的表格元素
+DEFAULT_TABLE_SELECTOR = 'table, [role="table"], [role="grid"]'
+
+# 表格提取函数（JS函数表达式），参数为匹配到的元素列表，也供页面快照内嵌使用
+# Ant Design固定表头时表头和表体是两个table，按外层.ant-table容器合并；
+# 测量行、空数据占位行、展开行和滚动条占位列不计入
+TABLE_READER_JS = '''
+(elements) => {
+    const clean = (text) => (text || '').replace(/\\s+/g, ' ').trim();
+    const containers = [];
+    const seen = new Set();
+    const addContainer = (el) => {
+        const container = el.closest('.ant-table') || el;
+        if (!seen.has(container)) {
+            seen.add(container);
+            containers.push(container);
+        }
+    };
+    elements.forEach(el => {
+        const tables = el.matches('table') ? [el] : Array.from(el.querySelectorAll('table'));
+        if (tables.length > 0) {
+            tables.forEach(addContainer);
+        } else {
+            addContainer(el);
+        }
+    });
+    return containers.map(container => {
+        let headerCells = Array.from(container.querySelectorAll('thead th, [role="columnheader"]'))
+            .filter(th => !th.classList.contains('ant-table-cell-scrollbar'));
+        let rowElements = Array.from(container.querySelectorAll('tbody tr, [role="row"]'))
+            .filter(tr => !tr.closest('thead') && !tr.querySelector('[role="columnheader"]'));
+        if (headerCells.length === 0 && rowElements.length > 0) {
+            headerCells = Array.from(rowElements[0].querySelectorAll('th'));
+            if (headerCells.length > 0) rowElements = rowElements.slice(1);
+        }
+        const rows = rowElements
+            .filter(tr => tr.getAttribute('aria-hidden') !== 'true'
+                && !tr.classList.contains('ant-table-measure-row')
+                && !tr.classList.contains('ant-table-placeholder')
+                && !tr.classList.contains('ant-table-expanded-row'))
+            .map(tr => Array.from(tr.querySelectorAll('td, [role="cell"], [role="gridcell"]')).map(td => clean(td.textContent)))
+            .filter(cells => cells.length > 0);
+        return { headers: headerCells.map(th => clean(th.textContent)), rows };
+    });
+}
+'''
+
+
+class TableData:
+    """
+    表格数据
+
+    行为单元格文本列表；按列名查找时首次构建该列的索引，之后的查找为O(1)
+
+    Attributes:
+        headers: 列名列表
+        rows: 行列表 [[单元格文本]]
+    """
+
+    def __init__(self, headers: List[str], rows: List[List[str]]):
+        self.headers = headers
+        self.rows = rows
+        # 列名 -> {单元格值: [行]}
+        self._indexes: Dict[str, Dict[str, List[List[str]]]] = {}
+        # 单元格值 -> [行]（任意列）
+        self._value_index: Optional[Dict[str, List[List[str]]]] = None
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def column(self, header: str) -> Optional[int]:
+        """列名对应的列序号，不存在时返回None"""
+        try:
+            return self.headers.index(header)
+        except ValueError:
+            return None
+
+    def cell(self, row: List[str], header: str) -> Optional[str]:
+        """
+        获取行中指定列的单元格文本
+
+        Args:
+            row: 行（单元格文本列表）
+            header: 列名
+
+        Returns:
+            单元格文本，列不存在时返回None
+        """
+        index = self.column(header)
+        if index is None or index >= len(row):
+            return None
+        return row[index]
+
+    def as_dict(self, row: List[str]) -> Dict[str, str]:
+        """将行转换为 {列名: 单元格文本}（跳过无列名的列）"""
+        return {header: value for header, value in zip(self.headers, row) if header}
+
+    def lookup_all(self, header: str, key: str) -> List[List[str]]:
+        """
+        按列值查找所有匹配的行（单元格完全相等）
+
+        Args:
+            header: 列名（如：订货单号）
+            key: 单元格的值
+
+        Returns:
+            匹配的行，列不存在或未找到时为空列表
+        """
+        if header not in self._indexes:
+            index = self.column(header)
+            if index is None:
+                return []
+            column_index = {}
+            for row in self.rows:
+                if index < len(row):
+                    column_index.setdefault(row[index], []).append(row)
+            self._indexes[header] = column_index
+        return self._indexes[header].get(key, [])
+
+    def lookup(self, header: str, key: str) -> Optional[List[str]]:
+        """
+        按列值查找第一行
+
+        Args:
+            header: 列名（如：订货单号）
+            key: 单元格的值
+
+        Returns:
+            匹配的行，未找到时返回None
+        """
+        rows = self.lookup_all(header, key)
+        return rows[0] if rows else None
+
+    def find_rows(self, value: str) -> List[List[str]]:
+        """
+        查找任意单元格等于value的行
+
+        Args:
+            value: 单元格的值
+
+        Returns:
+            匹配的行
+        """
+        if self._value_index is None:
+            self._value_index = {}
+            for row in self.rows:
+                for cell in set(row):
+                    self._value_index.setdefault(cell, []).append(row)
+        return self._value_index.get(value, [])
+
+
+def read_tables(target: Union[Page, Locator], selector: str = DEFAULT_TABLE_SELECTOR) -> List[TableData]:
+    """
+    一次调用读取所有匹配的表格
+
+    不会等待表格出现，调用前需确认表格已渲染
+
+    Args:
+        target: Playwright页面对象，或已定位到表格的Locator
+        selector: 表格选择器（target为Locator时忽略）
+
+    Returns:
+        表格列表
+    """
+    locator = target if isinstance(target, Locator) else target.locator(selector)
+    return [TableData(table['headers'], table['rows']) for table in locator.evaluate_all(TABLE_READER_JS)]
+
+
+def read_table(
+    target: Union[Page, Locator],
+    header: str,
+    selector: str = DEFAULT_TABLE_SELECTOR
+) -> Optional[TableData]:
+    """
+    读取包含指定列的表格
+
+    Args:
+        target: Playwright页面对象，或已定位到表格的Locator
+        header: 列名（如：订货单号、商品编号）
+        selector: 表格选择器（target为Locator时忽略）
+
+    Returns:
+        第一个包含该列且有数据行的表格，未找到时返回None
+    """
+    tables = [table for table in read_tables(target, selector) if header in table.headers]
+    for table in tables:
+        if table.rows:
+            return table
+    return tables[0] if tables else None
+
+
+async def async_read_tables(target, selector: str = DEFAULT_TABLE_SELECTOR) -> List[TableData]:
+    """read_tables的异步版本（playwright.async_api的页面对象或Locator）"""
+    locator = target if isinstance(target, AsyncLocator) else target.locator(selector)
+    return [TableData(table['headers'], table['rows']) for table in await locator.evaluate_all(TABLE_READER_JS)]
+
+
+async def async_read_table(target, header: str, selector: str = DEFAULT_TABLE_SELECTOR) -> Optional[TableData]:
+    """read_table的异步版本（playwright.async_api的页面对象或Locator）"""
+    tables = [table for table in await async_read_tables(target, selector) if header in table.headers]
+    for table in tables:
+        if table.rows:
+            return table
+    return tables[0] if tables else None
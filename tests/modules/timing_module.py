@@ -0,0 +1,518 @@
+"""
+步骤耗时模块
+为登录/订货等公共函数记录步骤耗时：总耗时、条件等待耗时、备选选择器的回退情况，
+以及（STEP_TIMING_CALLS=true时）Playwright调用次数和固定等待耗时；每个步骤同时作为Allure步骤展示，会话结束时输出JSON
+"""
+
+import functools
+import importlib
+import inspect
+import json
+import os
+import time
+import uuid
+from contextlib import ContextDecorator, contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    import allure
+except ImportError:  # 未安装allure时只记录耗时
+    allure = None
+
+# 步骤耗时JSON文件名（位于test-results目录，并行执行时先写入各工作进程目录再合并）
+STEP_TIMINGS_FILE = 'step-timings.json'
+
+# 正在执行的步骤（嵌套调用时外层在前）；使用上下文变量，异步版本中各任务（页面）的步骤互不干扰
+_stack_var: ContextVar[tuple] = ContextVar('boh_step_stack', default=())
+
+# 会话级准备工作（会话级fixture、登录态缓存的登录）的步骤记录归入该键，不计入当时执行的测试
+SESSION_TIMINGS_KEY = '<session>'
+
+# 统计调用次数的Playwright公开API类（同步和异步API）
+COUNTED_API_CLASSES = ('Page', 'Frame', 'Locator', 'FrameLocator', 'ElementHandle', 'BrowserContext', 'Keyboard', 'Mouse', 'Response')
+
+# 测试 -> 顶层步骤记录
+_records: Dict[str, List[dict]] = {}
+
+# 当前执行的测试
+_current_test: Optional[str] = None
+
+# 是否为步骤打开Allure步骤；Allure把新步骤挂在本线程最后打开的步骤下，并发任务中需要关闭（见without_allure_steps）
+_allure_steps_var: ContextVar[bool] = ContextVar('boh_allure_steps', default=True)
+
+# 条件等待的嵌套深度（wait_for_page_ready内部调用wait_for_dom_quiet时只计一次）
+_wait_depth_var: ContextVar[int] = ContextVar('boh_wait_depth', default=0)
+
+_call_counter_installed = False
+
+
+def is_step_timing_enabled() -> bool:
+    """
+    是否启用步骤耗时记录（环境变量STEP_TIMING=false可关闭）
+
+    Returns:
+        bool: 是否启用
+    """
+    return os.getenv('STEP_TIMING', 'true').lower() == 'true'
+
+
+def is_call_counting_enabled() -> bool:
+    """
+    是否统计Playwright调用次数和固定等待耗时（环境变量STEP_TIMING_CALLS=true时启用，性能基准默认启用）
+
+    统计需要包装Playwright公开API类的方法（进程内全局生效），默认关闭，只记录步骤耗时、条件等待和选择器回退
+
+    Returns:
+        bool: 是否启用
+    """
+    return os.getenv('STEP_TIMING_CALLS', 'false').lower() == 'true'
+
+
+def get_run_id() -> str:
+    """
+    获取本次运行ID（主进程生成后通过环境变量BOH_RUN_ID传给pytest-xdist工作进程）
+
+    Returns:
+        运行ID（如：20251208-101500-1a2b3c）
+    """
+    run_id = os.getenv('BOH_RUN_ID')
+    if not run_id:
+        run_id = f'{datetime.now().strftime("%Y%m%d-%H%M%S")}-{uuid.uuid4().hex[:6]}'
+        os.environ['BOH_RUN_ID'] = run_id
+    return run_id
+
+
+def record_call(name: str):
+    """累计一次Playwright调用到所有正在执行的步骤"""
+    for record in _stack_var.get():
+        record['playwright_calls'] += 1
+        record['calls_by_method'][name] = record['calls_by_method'].get(name, 0) + 1
+
+
+def _counting_method(name: str, method):
+    """辅助函数：包装公开API方法，调用时计数；wait_for_timeout同时计为固定等待"""
+    timed = name.endswith('.wait_for_timeout')
+
+    if inspect.iscoroutinefunction(method):
+        @functools.wraps(method)
+        async def async_wrapper(*args, **kwargs):
+            record_call(name)
+            start = time.perf_counter()
+            try:
+                return await method(*args, **kwargs)
+            finally:
+                if timed:
+                    record_sleep((time.perf_counter() - start) * 1000)
+        return async_wrapper
+
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        record_call(name)
+        start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            if timed:
+                record_sleep((time.perf_counter() - start) * 1000)
+    return wrapper
+
+
+def _install_call_counter():
+    """
+    统计Playwright调用次数：包装COUNTED_API_CLASSES中公开API类（同步和异步API）的公开方法，每次调用计一次，
+    固定时长等待（wait_for_timeout）单独计时；只在is_call_counting_enabled()时调用
+    """
+    global _call_counter_installed
+    if _call_counter_installed:
+        return
+    _call_counter_installed = True
+
+    modules = []
+    for module_name in ('playwright.sync_api', 'playwright.async_api'):
+        try:
+            modules.append(importlib.import_module(module_name))
+        except ImportError as e:
+            print(f'⚠️  无法统计Playwright调用次数: {e}')
+
+    for module in modules:
+        for class_name in COUNTED_API_CLASSES:
+            cls = getattr(module, class_name, None)
+            if cls is None:
+                continue
+            for attr, method in list(vars(cls).items()):
+                if attr.startswith('_') or not inspect.isfunction(method):
+                    continue
+                setattr(cls, attr, _counting_method(f'{class_name}.{attr}', method))
+
+
+def set_current_test(name: Optional[str]):
+    """
+    设置当前执行的测试（由conftest在每个测试开始时调用）
+
+    Args:
+        name: 测试ID（nodeid），测试结束后传None
+    """
+    global _current_test
+    _current_test = name
+
+
+@contextmanager
+def session_timings():
+    """
+    期间的顶层步骤记入SESSION_TIMINGS_KEY，而不是当时执行的测试
+
+    会话级fixture和登录态缓存的登录在首个使用它们的测试中执行，其耗时不属于该测试
+
+    Example:
+        with session_timings():
+            login(page)
+    """
+    global _current_test
+    previous = _current_test
+    _current_test = None
+    try:
+        yield
+    finally:
+        _current_test = previous
+
+
+def reset_step_timings():
+    """清空本进程的步骤记录（会话结束、记录写入文件后调用）"""
+    global _current_test
+    _records.clear()
+    _current_test = None
+
+
+def _new_record(name: str, title: str) -> dict:
+    return {
+        'name': name,
+        'title': title,
+        'start': time.time(),
+        'duration_ms': 0.0,
+        'status': 'passed',
+        'playwright_calls': 0,
+        'calls_by_method': {},
+        'wait_ms': 0.0,
+        'sleep_ms': 0.0,
+        'selector_fallbacks': [],
+        'order_number': None,
+        'page_metrics': [],
+        'children': []
+    }
+
+
+class timed_step(ContextDecorator):
+    """
+    步骤耗时记录，可作为上下文管理器或装饰器使用（也可以装饰异步函数）
+
+    嵌套步骤记录在外层步骤的children中，调用次数和等待耗时按包含关系累计到所有外层步骤
+
+    Args:
+        title: 步骤标题（Allure中展示）
+        name: 步骤名称（JSON中使用，作为装饰器时默认取函数名）
+
+    Example:
+        @timed_step('导航到订货页面')
+        def navigate_to_order_page(page): ...
+
+        with timed_step('最大化窗口'):
+            ...
+    """
+
+    def __init__(self, title: str, name: str = None):
+        self.title = title
+        self.name = name
+        # 本次调用的 (步骤记录, Allure步骤上下文, 开始时间, 上下文变量令牌)
+        self._frame = None
+
+    def __call__(self, func):
+        if self.name is None:
+            self.name = func.__name__
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with self._recreate_cm():
+                    return await func(*args, **kwargs)
+            return async_wrapper
+        return super().__call__(func)
+
+    def _recreate_cm(self):
+        # 作为装饰器时每次调用使用独立的实例，嵌套/递归调用互不影响
+        return timed_step(self.title, self.name)
+
+    def __enter__(self):
+        if not is_step_timing_enabled():
+            return None
+        if is_call_counting_enabled():
+            _install_call_counter()
+        record = _new_record(self.name or self.title, self.title)
+        stack = _stack_var.get()
+        if stack:
+            stack[-1]['children'].append(record)
+        else:
+            _records.setdefault(_current_test or SESSION_TIMINGS_KEY, []).append(record)
+        token = _stack_var.set(stack + (record,))
+
+        allure_step = None
+        if allure is not None and _allure_steps_var.get():
+            allure_step = allure.step(self.title)
+            allure_step.__enter__()
+        self._frame = (record, allure_step, time.perf_counter(), token)
+        return record
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self._frame is None:
+            return False
+        record, allure_step, start, token = self._frame
+        self._frame = None
+        record['duration_ms'] = round((time.perf_counter() - start) * 1000, 1)
+        record['wait_ms'] = round(record['wait_ms'], 1)
+        record['sleep_ms'] = round(record['sleep_ms'], 1)
+        if exc_type is not None:
+            record['status'] = 'failed'
+            record['error'] = f'{exc_type.__name__}: {exc_value}'[:500]
+        _stack_var.reset(token)
+        if allure_step is not None:
+            allure_step.__exit__(exc_type, exc_value, traceback)
+        if is_call_counting_enabled():
+            print(
+                f'⏱️  {self.title}: {record["duration_ms"]:.0f}ms '
+                f'(Playwright调用 {record["playwright_calls"]} 次, 条件等待 {record["wait_ms"]:.0f}ms, '
+                f'固定等待 {record["sleep_ms"]:.0f}ms)'
+            )
+        else:
+            print(f'⏱️  {self.title}: {record["duration_ms"]:.0f}ms (条件等待 {record["wait_ms"]:.0f}ms)')
+        return False
+
+
+@contextmanager
+def without_allure_steps():
+    """
+    当前上下文（异步任务）中的timed_step只记录耗时，不打开Allure步骤
+
+    asyncio.gather并发执行的任务在同一线程中交替运行，Allure会把各任务的步骤挂到其他任务最后打开的步骤下；
+    并发任务中使用该上下文，全部结束后再用replay_allure_steps按顺序输出
+
+    Example:
+        async def verify_one(order):
+            with without_allure_steps(), timed_step('校验订单') as record:
+                ...
+    """
+    token = _allure_steps_var.set(False)
+    try:
+        yield
+    finally:
+        _allure_steps_var.reset(token)
+
+
+def replay_allure_steps(records: List[dict]):
+    """
+    将步骤记录按顺序输出为Allure步骤（挂在当前步骤下，标题附带耗时，失败的步骤标记为失败）
+
+    Args:
+        records: 步骤记录列表（timed_step记录的格式，包含title、duration_ms、status、error和children）
+    """
+    if allure is None:
+        return
+    for record in records:
+        step = allure.step(f'{record["title"]} ({record["duration_ms"]:.0f}ms)')
+        step.__enter__()
+        replay_allure_steps(record['children'])
+        if record['status'] == 'failed':
+            error = AssertionError(record.get('error') or record['title'])
+            step.__exit__(AssertionError, error, None)
+        else:
+            step.__exit__(None, None, None)
+
+
+def record_wait(duration_ms: float):
+    """累计条件等待耗时到所有正在执行的步骤"""
+    for record in _stack_var.get():
+        record['wait_ms'] += duration_ms
+
+
+def record_sleep(duration_ms: float):
+    """累计固定时长等待耗时到所有正在执行的步骤"""
+    for record in _stack_var.get():
+        record['sleep_ms'] += duration_ms
+
+
+def record_order_number(order_number: str):
+    """记录正在执行的步骤校验的订单号（所有外层步骤同时记录，已记录订单号的外层步骤不覆盖）"""
+    for record in _stack_var.get():
+        if record['order_number'] is None:
+            record['order_number'] = order_number
+
+
+def record_page_metrics(metrics: dict):
+    """记录正在执行的步骤中页面导航的性能指标（见web_vitals_module，只记录到最内层步骤）"""
+    stack = _stack_var.get()
+    if stack:
+        stack[-1]['page_metrics'].append(metrics)
+
+
+def record_selector(key: str, winner: Optional[str], missed: List[str]):
+    """
+    记录一次备选选择器解析（只记录发生回退或全部未命中的情况）
+
+    Args:
+        key: 选择器用途
+        winner: 命中的选择器模板，全部未命中时为None
+        missed: 在命中者之前尝试过但未命中的模板
+    """
+    stack = _stack_var.get()
+    if not stack or (winner is not None and not missed):
+        return
+    stack[-1]['selector_fallbacks'].append({
+        'key': key,
+        'winner': winner,
+        'missed': list(missed)
+    })
+
+
+def measure_wait(func):
+    """
+    装饰器：将函数耗时计为条件等待（嵌套调用时只计最外层，支持异步函数）
+    """
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            if not _stack_var.get():
+                return await func(*args, **kwargs)
+            depth = _wait_depth_var.get()
+            token = _wait_depth_var.set(depth + 1)
+            start = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                _wait_depth_var.reset(token)
+                if depth == 0:
+                    record_wait((time.perf_counter() - start) * 1000)
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _stack_var.get():
+            return func(*args, **kwargs)
+        depth = _wait_depth_var.get()
+        token = _wait_depth_var.set(depth + 1)
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _wait_depth_var.reset(token)
+            if depth == 0:
+                record_wait((time.perf_counter() - start) * 1000)
+    return wrapper
+
+
+def get_test_timings(test: str) -> List[dict]:
+    """
+    获取测试的步骤记录
+
+    Args:
+        test: 测试ID（nodeid）
+
+    Returns:
+        顶层步骤记录列表
+    """
+    return _records.get(test, [])
+
+
+def format_step_summary(records: List[dict], indent: int = 0) -> str:
+    """
+    格式化步骤耗时摘要
+
+    Args:
+        records: 步骤记录列表
+        indent: 缩进层级
+
+    Returns:
+        每行一个步骤的文本
+    """
+    lines = []
+    count_calls = is_call_counting_enabled()
+    for record in records:
+        status = '✓' if record['status'] == 'passed' else '✗'
+        fallbacks = len(record['selector_fallbacks'])
+        lines.append(
+            f'{"  " * indent}{status} {record["title"]}: {record["duration_ms"]:.0f}ms, '
+            + (f'调用 {record["playwright_calls"]} 次, ' if count_calls else '')
+            + f'条件等待 {record["wait_ms"]:.0f}ms'
+            + (f', 固定等待 {record["sleep_ms"]:.0f}ms' if count_calls else '')
+            + (f', 选择器回退 {fallbacks} 次' if fallbacks else '')
+        )
+        if record['children']:
+            lines.append(format_step_summary(record['children'], indent + 1))
+    return '\n'.join(lines)
+
+
+def write_step_timings(path: Path) -> Optional[Path]:
+    """
+    将本进程的步骤记录写入JSON文件
+
+    Args:
+        path: 输出文件路径
+
+    Returns:
+        输出文件路径，没有任何记录时返回None
+    """
+    if not _records:
+        return None
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {
+        'run_id': get_run_id(),
+        'env': os.getenv('ENV', 'test'),
+        'worker': os.getenv('PYTEST_XDIST_WORKER', 'master'),
+        'written_at': datetime.now().isoformat(timespec='seconds'),
+        'tests': _records
+    }
+    tmp_path = path.with_name(f'{path.name}.tmp')
+    tmp_path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding='utf-8')
+    os.replace(tmp_path, path)
+    return path
+
+
+def merge_step_timings(files: List[Path], path: Path) -> Optional[Path]:
+    """
+    合并各工作进程的步骤耗时文件（只合并本次运行的文件）
+
+    Args:
+        files: 各工作进程的输出文件
+        path: 合并后的文件路径
+
+    Returns:
+        合并后的文件路径，没有本次运行的文件时返回None
+    """
+    run_id = get_run_id()
+    tests = {}
+    workers = []
+    for file in files:
+        try:
+            data = json.loads(Path(file).read_text(encoding='utf-8'))
+        except Exception as e:
+            print(f'⚠️  步骤耗时文件读取失败: {file} ({e})')
+            continue
+        if data.get('run_id') != run_id:
+            continue
+        workers.append(data.get('worker'))
+        # 各工作进程都有自己的会话级记录，按键追加
+        for test, records in data.get('tests', {}).items():
+            tests.setdefault(test, []).extend(records)
+    if not tests:
+        return None
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    merged = {
+        'run_id': run_id,
+        'env': os.getenv('ENV', 'test'),
+        'workers': workers,
+        'written_at': datetime.now().isoformat(timespec='seconds'),
+        'tests': tests
+    }
+    path.write_text(json.dumps(merged, ensure_ascii=False, indent=2), encoding='utf-8')
+    return path
@@ -0,0 +1,322 @@
+"""
+等待模块
+基于条件的等待：接口响应、DOM变化静默、元素状态，替代固定时长的wait_for_timeout
+所有等待都有超时上限，条件满足后立即返回
+"""
+
+import re
+import time
+from typing import Awaitable, Callable, Optional, Union
+from playwright.sync_api import Page, Locator, Response
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+from ..config.api_config import get_api_pattern
+from .timing_module import measure_wait
+
+# DOM静默判定：在quiet_ms内没有节点/文本变化即视为页面已稳定
+_DOM_QUIET_SCRIPT = '''
+([quietMs, timeoutMs]) => new Promise(resolve => {
+    const root = document.documentElement || document;
+    let quietTimer = null;
+    let hardTimer = null;
+    const observer = new MutationObserver(() => {
+        clearTimeout(quietTimer);
+        quietTimer = setTimeout(() => done(true), quietMs);
+    });
+    const done = (quiet) => {
+        observer.disconnect();
+        clearTimeout(quietTimer);
+        clearTimeout(hardTimer);
+        resolve(quiet);
+    };
+    observer.observe(root, { childList: true, subtree: true, characterData: true });
+    quietTimer = setTimeout(() => done(true), quietMs);
+    hardTimer = setTimeout(() => done(false), timeoutMs);
+})
+'''
+
+
+class StepBudget:
+    """
+    单个步骤的等待预算
+
+    步骤内的多次等待共享同一个截止时间，避免每次等待都用满各自的超时
+    """
+
+    def __init__(self, total_ms: int):
+        self.total_ms = total_ms
+        self.deadline = time.monotonic() + total_ms / 1000
+
+    def remaining(self, cap: int = None) -> int:
+        """
+        剩余预算（毫秒）
+
+        Args:
+            cap: 单次等待的上限（毫秒），为None时不设上限
+
+        Returns:
+            剩余毫秒数，预算用尽时返回1（让等待立即超时而不是无限等待）
+        """
+        remaining_ms = int((self.deadline - time.monotonic()) * 1000)
+        if cap is not None:
+            remaining_ms = min(remaining_ms, cap)
+        return max(remaining_ms, 1)
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.deadline
+
+
+def _timeout(timeout: int, budget: Optional[StepBudget]) -> int:
+    """结合步骤预算计算本次等待的超时时间"""
+    return budget.remaining(timeout) if budget else timeout
+
+
+def response_matcher(name: str) -> Callable[[Response], bool]:
+    """
+    根据接口名称生成响应匹配函数
+
+    Args:
+        name: 接口名称（见api_config.API_CONFIG），或URL正则
+
+    Returns:
+        判断响应URL是否匹配的函数
+    """
+    pattern = re.compile(get_api_pattern(name))
+    return lambda response: bool(pattern.search(response.url))
+
+
+@measure_wait
+def wait_for_named_response(
+    page: Page,
+    name: str,
+    action: Callable[[], None] = None,
+    timeout: int = 10000,
+    budget: StepBudget = None
+) -> Optional[Response]:
+    """
+    等待指定名称的接口响应
+
+    Args:
+        page: Playwright页面对象
+        name: 接口名称（见api_config.API_CONFIG），或URL正则
+        action: 触发请求的操作（如点击查询按钮），会在开始监听后执行
+        timeout: 超时时间（毫秒）
+        budget: 步骤等待预算（可选）
+
+    Returns:
+        匹配的响应，超时返回None；action本身的异常会继续抛出
+    """
+    predicate = response_matcher(name)
+    timeout = _timeout(timeout, budget)
+
+    if action is None:
+        try:
+            return page.wait_for_event('response', predicate=predicate, timeout=timeout)
+        except PlaywrightTimeoutError:
+            print(f'等待接口响应超时: {name}')
+            return None
+
+    acted = False
+    try:
+        with page.expect_response(predicate, timeout=timeout) as response_info:
+            action()
+            acted = True
+        return response_info.value
+    except PlaywrightTimeoutError:
+        if not acted:
+            raise
+        print(f'等待接口响应超时: {name}')
+        return None
+
+
+@measure_wait
+def wait_for_dom_quiet(
+    page: Page,
+    quiet_ms: int = 300,
+    timeout: int = 5000,
+    budget: StepBudget = None
+) -> bool:
+    """
+    等待DOM在quiet_ms内不再变化
+
+    Args:
+        page: Playwright页面对象
+        quiet_ms: 静默时长（毫秒）
+        timeout: 超时时间（毫秒）
+        budget: 步骤等待预算（可选）
+
+    Returns:
+        bool: DOM是否已静默（超时或页面跳转时返回False）
+    """
+    timeout = _timeout(timeout, budget)
+    try:
+        return bool(page.evaluate(_DOM_QUIET_SCRIPT, [quiet_ms, timeout]))
+    except Exception as e:
+        # 等待过程中页面跳转会销毁执行上下文
+        print(f'等待DOM静默中断: {e}')
+        return False
+
+
+@measure_wait
+def wait_for_locator(
+    target: Union[Page, Locator],
+    selector: str = None,
+    state: str = 'visible',
+    timeout: int = 5000,
+    budget: StepBudget = None
+) -> bool:
+    """
+    等待元素达到指定状态
+
+    Args:
+        target: Playwright页面对象或Locator
+        selector: 选择器（target为Locator时可省略）
+        state: 'attached'、'detached'、'visible' 或 'hidden'
+        timeout: 超时时间（毫秒）
+        budget: 步骤等待预算（可选）
+
+    Returns:
+        bool: 是否在超时前达到指定状态
+    """
+    locator = target.locator(selector).first if selector else target
+    try:
+        locator.wait_for(state=state, timeout=_timeout(timeout, budget))
+        return True
+    except PlaywrightTimeoutError:
+        return False
+
+
+@measure_wait
+def wait_for_condition(
+    page: Page,
+    expression: str,
+    arg=None,
+    timeout: int = 5000,
+    budget: StepBudget = None
+) -> bool:
+    """
+    等待页面中的JS条件成立
+
+    Args:
+        page: Playwright页面对象
+        expression: JS函数表达式，返回真值时结束等待
+        arg: 传给JS函数的参数
+        timeout: 超时时间（毫秒）
+        budget: 步骤等待预算（可选）
+
+    Returns:
+        bool: 条件是否在超时前成立
+    """
+    try:
+        page.wait_for_function(expression, arg=arg, timeout=_timeout(timeout, budget))
+        return True
+    except PlaywrightTimeoutError:
+        return False
+    except Exception as e:
+        print(f'等待页面条件中断: {e}')
+        return False
+
+
+@measure_wait
+def wait_for_page_ready(
+    page: Page,
+    timeout: int = 10000,
+    quiet_ms: int = 300,
+    budget: StepBudget = None
+) -> bool:
+    """
+    等待页面就绪：DOM加载完成且DOM变化静默
+
+    Args:
+        page: Playwright页面对象
+        timeout: 超时时间（毫秒）
+        quiet_ms: DOM静默时长（毫秒）
+        budget: 步骤等待预算（可选）
+
+    Returns:
+        bool: 页面是否就绪
+    """
+    step_budget = budget or StepBudget(timeout)
+    try:
+        page.wait_for_load_state('domcontentloaded', timeout=step_budget.remaining(timeout))
+    except Exception as e:
+        print(f'等待domcontentloaded超时，继续执行: {e}')
+    return wait_for_dom_quiet(page, quiet_ms=quiet_ms, timeout=timeout, budget=step_budget)
+
+
+# ---- 异步版本（playwright.async_api的页面对象，参数和返回值与同步版本相同） ----
+
+@measure_wait
+async def async_wait_for_named_response(
+    page,
+    name: str,
+    action: Callable[[], Awaitable] = None,
+    timeout: int = 10000,
+    budget: StepBudget = None
+):
+    """wait_for_named_response的异步版本，action为返回可等待对象的函数"""
+    predicate = response_matcher(name)
+    timeout = _timeout(timeout, budget)
+
+    if action is None:
+        try:
+            return await page.wait_for_event('response', predicate=predicate, timeout=timeout)
+        except PlaywrightTimeoutError:
+            print(f'等待接口响应超时: {name}')
+            return None
+
+    acted = False
+    try:
+        async with page.expect_response(predicate, timeout=timeout) as response_info:
+            await action()
+            acted = True
+        return await response_info.value
+    except PlaywrightTimeoutError:
+        if not acted:
+            raise
+        print(f'等待接口响应超时: {name}')
+        return None
+
+
+@measure_wait
+async def async_wait_for_dom_quiet(page, quiet_ms: int = 300, timeout: int = 5000, budget: StepBudget = None) -> bool:
+    """wait_for_dom_quiet的异步版本"""
+    timeout = _timeout(timeout, budget)
+    try:
+        return bool(await page.evaluate(_DOM_QUIET_SCRIPT, [quiet_ms, timeout]))
+    except Exception as e:
+        print(f'等待DOM静默中断: {e}')
+        return False
+
+
+@measure_wait
+async def async_wait_for_locator(
+    target,
+    selector: str = None,
+    state: str = 'visible',
+    timeout: int = 5000,
+    budget: StepBudget = None
+) -> bool:
+    """wait_for_locator的异步版本"""
+    locator = target.locator(selector).first if selector else target
+    try:
+        await locator.wait_for(state=state, timeout=_timeout(timeout, budget))
+        return True
+    except PlaywrightTimeoutError:
+        return False
+
+
+@measure_wait
+async def async_wait_for_page_ready(
+    page,
+    timeout: int = 10000,
+    quiet_ms: int = 300,
+    budget: StepBudget = None
+) -> bool:
+    """wait_for_page_ready的异步版本"""
+    step_budget = budget or StepBudget(timeout)
+    try:
+        await page.wait_for_load_state('domcontentloaded', timeout=step_budget.remaining(timeout))
+    except Exception as e:
+        print(f'等待domcontentloaded超时，继续执行: {e}')
+    return await async_wait_for_dom_quiet(page, quiet_ms=quiet_ms, timeout=timeout, budget=step_budget)
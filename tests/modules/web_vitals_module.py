@@ -0,0 +1,273 @@
+"""
+页面性能模块
+page fixture为每个页面注入性能采集脚本（LCP、CLS、交互延迟、长任务），登录、导航到订货页面、打开订单详情时
+记录该步骤内页面导航的性能指标：Navigation Timing（整页加载时）、LCP/CLS/INP类指标、资源数量和大小，
+按URL_CONFIG条目（如 storeOperations.order）归类，写入步骤耗时记录（Allure附件、step-timings.json和运行历史）
+
+步骤内发生整页加载时指标取新文档的Navigation Timing；前端路由切换（不重新加载文档）时只统计步骤开始后的资源和指标
+采集失败不影响测试；环境变量WEB_VITALS=false可关闭
+"""
+
+import functools
+import inspect
+import os
+from typing import List, Optional
+from urllib.parse import urlparse
+from ..config.url_config import get_url_entry
+from .timing_module import record_page_metrics
+
+# 在每个文档中注册PerformanceObserver（只在主frame中），结果保存在window.__BOH_VITALS__
+_VITALS_INIT_JS = '''
+(() => {
+    if (window.__BOH_VITALS__ || window.top !== window || typeof PerformanceObserver === 'undefined') return;
+    const vitals = window.__BOH_VITALS__ = { lcp: [], shifts: [], interactions: [], longTasks: [] };
+    try { performance.setResourceTimingBufferSize(2000); } catch (e) {}
+    const observe = (type, callback, options) => {
+        try {
+            new PerformanceObserver(list => list.getEntries().forEach(callback))
+                .observe(Object.assign({ type, buffered: true }, options));
+        } catch (e) {}
+    };
+    observe('largest-contentful-paint', entry => vitals.lcp.push({ time: entry.startTime }));
+    observe('layout-shift', entry => {
+        if (!entry.hadRecentInput) vitals.shifts.push({ time: entry.startTime, value: entry.value });
+    });
+    observe('event', entry => {
+        if (entry.interactionId) vitals.interactions.push({ time: entry.startTime, duration: entry.duration });
+    }, { durationThreshold: 16 });
+    observe('longtask', entry => vitals.longTasks.push({ time: entry.startTime, duration: entry.duration }));
+})();
+'''
+
+# 步骤开始时的位置：文档（timeOrigin）、时间和已有的资源数
+_MARK_JS = '''
+() => ({
+    timeOrigin: performance.timeOrigin,
+    now: performance.now(),
+    resources: performance.getEntriesByType('resource').length
+})
+'''
+
+# 步骤结束时汇总指标（文档变化时为整页加载，否则只统计mark之后的记录）
+_COLLECT_JS = '''
+(mark) => {
+    const round = value => value === null || value === undefined ? null : Math.round(value * 10) / 10;
+    const hard = !mark || mark.timeOrigin !== performance.timeOrigin;
+    const since = hard ? 0 : mark.now;
+    const vitals = window.__BOH_VITALS__;
+    const after = list => vitals ? list.filter(entry => entry.time >= since) : [];
+
+    const nav = performance.getEntriesByType('navigation')[0];
+    const navigation = hard && nav ? {
+        type: nav.type,
+        ttfb_ms: round(nav.responseStart),
+        dom_content_loaded_ms: round(nav.domContentLoadedEventEnd),
+        load_ms: nav.loadEventEnd ? round(nav.loadEventEnd) : null,
+        transfer_bytes: nav.transferSize
+    } : null;
+
+    const resources = performance.getEntriesByType('resource').slice(hard ? 0 : mark.resources);
+    const sum = (list, field) => list.reduce((total, entry) => total + (entry[field] || 0), 0);
+
+    // CLS：按会话窗口（间隔不超过1秒、总长不超过5秒）累计，取最大的窗口
+    let cls = 0, current = 0, windowStart = 0, last = -Infinity;
+    for (const shift of after(vitals ? vitals.shifts : [])) {
+        if (shift.time - last > 1000 || shift.time - windowStart > 5000) {
+            current = 0;
+            windowStart = shift.time;
+        }
+        current += shift.value;
+        last = shift.time;
+        cls = Math.max(cls, current);
+    }
+
+    const lcp = after(vitals ? vitals.lcp : []);
+    const interactions = after(vitals ? vitals.interactions : []);
+    return {
+        url: location.href,
+        navigation,
+        elapsed_ms: round(performance.now() - since),
+        lcp_ms: lcp.length ? round(lcp[lcp.length - 1].time - since) : null,
+        cls: vitals ? Math.round(cls * 10000) / 10000 : null,
+        inp_ms: interactions.length ? round(Math.max(...interactions.map(entry => entry.duration))) : null,
+        long_tasks_ms: vitals ? round(sum(after(vitals.longTasks), 'duration')) : null,
+        resources: {
+            count: resources.length,
+            transfer_bytes: sum(resources, 'transferSize'),
+            encoded_bytes: sum(resources, 'encodedBodySize')
+        }
+    };
+}
+'''
+
+
+def is_web_vitals_enabled() -> bool:
+    """
+    是否采集页面性能指标（环境变量WEB_VITALS=false可关闭）
+
+    Returns:
+        bool: 是否启用
+    """
+    return os.getenv('WEB_VITALS', 'true').lower() == 'true'
+
+
+def install_web_vitals(page):
+    """
+    为页面注入性能采集脚本（page fixture创建页面时调用，之后打开的每个文档都会执行）
+
+    Args:
+        page: Playwright页面对象（sync_api）
+    """
+    if is_web_vitals_enabled():
+        page.add_init_script(_VITALS_INIT_JS)
+
+
+async def async_install_web_vitals(page):
+    """
+    为页面注入性能采集脚本（install_web_vitals的异步版本）
+
+    Args:
+        page: Playwright页面对象（async_api）
+    """
+    if is_web_vitals_enabled():
+        await page.add_init_script(_VITALS_INIT_JS)
+
+
+def get_metrics_key(url: str) -> str:
+    """
+    页面性能指标的归类键
+
+    Args:
+        url: 页面URL
+
+    Returns:
+        URL_CONFIG条目名（如：storeOperations.order），不属于任何条目时为URL路径
+    """
+    return get_url_entry(url) or urlparse(url).path or '/'
+
+
+def _finish_metrics(step: str, metrics: Optional[dict]) -> Optional[dict]:
+    """补充步骤名称和归类键，记录到当前步骤并输出摘要"""
+    if not metrics:
+        return None
+    metrics = dict(metrics, step=step, key=get_metrics_key(metrics['url']))
+    record_page_metrics(metrics)
+    print(format_page_metrics(metrics))
+    return metrics
+
+
+def _mark(page) -> Optional[dict]:
+    try:
+        return page.evaluate(_MARK_JS)
+    except Exception as e:
+        print(f'⚠️  页面性能采集失败: {e}')
+        return None
+
+
+def _collect(page, mark: Optional[dict]) -> Optional[dict]:
+    if page.is_closed():
+        return None
+    try:
+        return page.evaluate(_COLLECT_JS, mark)
+    except Exception as e:
+        print(f'⚠️  页面性能采集失败: {e}')
+        return None
+
+
+async def _async_mark(page) -> Optional[dict]:
+    try:
+        return await page.evaluate(_MARK_JS)
+    except Exception as e:
+        print(f'⚠️  页面性能采集失败: {e}')
+        return None
+
+
+async def _async_collect(page, mark: Optional[dict]) -> Optional[dict]:
+    if page.is_closed():
+        return None
+    try:
+        return await page.evaluate(_COLLECT_JS, mark)
+    except Exception as e:
+        print(f'⚠️  页面性能采集失败: {e}')
+        return None
+
+
+def measure_navigation(func):
+    """
+    装饰器：记录函数执行期间页面导航的性能指标（函数的第一个参数为page，支持异步函数）
+
+    放在 @timed_step 之下，指标记录到该步骤中；函数抛出异常时不采集（页面可能处于异常状态）
+
+    Example:
+        @timed_step('导航到订货页面')
+        @measure_navigation
+        def navigate_to_order_page(page): ...
+    """
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(page, *args, **kwargs):
+            if not is_web_vitals_enabled():
+                return await func(page, *args, **kwargs)
+            mark = await _async_mark(page)
+            result = await func(page, *args, **kwargs)
+            _finish_metrics(func.__name__, await _async_collect(page, mark))
+            return result
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(page, *args, **kwargs):
+        if not is_web_vitals_enabled():
+            return func(page, *args, **kwargs)
+        mark = _mark(page)
+        result = func(page, *args, **kwargs)
+        _finish_metrics(func.__name__, _collect(page, mark))
+        return result
+    return wrapper
+
+
+def format_page_metrics(metrics: dict) -> str:
+    """
+    格式化一次导航的性能指标摘要
+
+    Args:
+        metrics: 指标（_COLLECT_JS的结果，含step和key）
+
+    Returns:
+        一行摘要文本
+    """
+    def ms(value):
+        return '-' if value is None else f'{value:.0f}ms'
+
+    parts = []
+    navigation = metrics.get('navigation')
+    if navigation:
+        parts.append(f'TTFB {ms(navigation["ttfb_ms"])}')
+        parts.append(f'DOMContentLoaded {ms(navigation["dom_content_loaded_ms"])}')
+        parts.append(f'load {ms(navigation["load_ms"])}')
+    else:
+        parts.append(f'路由切换 {ms(metrics["elapsed_ms"])}')
+    parts.append(f'LCP {ms(metrics["lcp_ms"])}')
+    parts.append(f'CLS {"-" if metrics["cls"] is None else metrics["cls"]}')
+    if metrics['inp_ms'] is not None:
+        parts.append(f'INP {ms(metrics["inp_ms"])}')
+    resources = metrics['resources']
+    parts.append(f'资源 {resources["count"]} 个 ({resources["transfer_bytes"] / 1024:.0f}KB)')
+    return f'📊 页面性能 {metrics["key"]}: ' + ', '.join(parts)
+
+
+def get_page_metrics(records: List[dict]) -> List[dict]:
+    """
+    从步骤记录（含子步骤）中取出页面性能指标
+
+    Args:
+        records: 顶层步骤记录（timing_module.get_test_timings的返回值）
+
+    Returns:
+        按执行顺序排列的指标列表
+    """
+    metrics = []
+    for record in records:
+        # 外层步骤的指标在子步骤之后记录
+        metrics.extend(get_page_metrics(record.get('children', [])))
+        metrics.extend(record.get('page_metrics', []))
+    return metrics
@@ -0,0 +1,128 @@
+"""
+并行执行模块
+pytest-xdist多进程执行时的工作进程识别、产物目录隔离和跨进程文件锁，以及在同步代码中运行协程
+"""
+
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+
+# 未使用pytest-xdist（串行执行）时的进程标识
+MASTER_WORKER_ID = 'master'
+
+
+def get_worker_id() -> str:
+    """
+    获取当前pytest-xdist工作进程ID
+
+    Returns:
+        工作进程ID（如：gw0），串行执行时返回'master'
+    """
+    return os.getenv('PYTEST_XDIST_WORKER', MASTER_WORKER_ID)
+
+
+def is_xdist_worker() -> bool:
+    """是否运行在pytest-xdist工作进程中"""
+    return get_worker_id() != MASTER_WORKER_ID
+
+
+def run_coroutine(coro):
+    """
+    在新的事件循环中运行协程并返回结果
+
+    当前线程已有运行中的事件循环时（例如同一进程中已启动sync_api的Playwright，asyncio.run会报
+    "cannot be called from a running event loop"），在单独的线程中运行
+
+    Args:
+        coro: 协程对象
+
+    Returns:
+        协程的返回值
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+
+def get_worker_dir(base_dir) -> Path:
+    """
+    获取按工作进程隔离的产物目录，串行执行时保持原目录不变
+
+    Args:
+        base_dir: 基础目录（如：test-results）
+
+    Returns:
+        工作进程专属目录（如：test-results/gw0）
+    """
+    base_dir = Path(base_dir)
+    if is_xdist_worker():
+        return base_dir / get_worker_id()
+    return base_dir
+
+
+def get_artifact_name(file_name: str, test_name: str = None) -> str:
+    """
+    获取在共享目录（如allure-results）中不会冲突的产物文件名
+
+    Args:
+        file_name: 原始文件名（如：video.webm）
+        test_name: 测试名称（可选）
+
+    Returns:
+        带工作进程ID和测试名称前缀的文件名
+    """
+    parts = [get_worker_id()]
+    if test_name:
+        parts.append(test_name)
+    parts.append(file_name)
+    return '-'.join(parts)
+
+
+@contextmanager
+def file_lock(lock_path, timeout: float = 120, stale_after: float = 300):
+    """
+    跨进程文件锁（基于原子创建锁文件），用于多个工作进程共享同一份磁盘缓存
+
+    Args:
+        lock_path: 锁文件路径
+        timeout: 等待锁的超时时间（秒）
+        stale_after: 锁文件超过该时长（秒）视为持有进程已退出，强制清理
+
+    Raises:
+        TimeoutError: 超时仍未获得锁（不加锁继续执行会与持有锁的进程同时写入缓存）
+    """
+    lock_path = Path(lock_path)
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    deadline = time.monotonic() + timeout
+
+    while True:
+        try:
+            fd = os.open(str(lock_path), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            os.write(fd, f'{os.getpid()} {get_worker_id()}'.encode())
+            os.close(fd)
+            break
+        except FileExistsError:
+            try:
+                if time.time() - lock_path.stat().st_mtime > stale_after:
+                    print(f'清理过期的锁文件: {lock_path}')
+                    lock_path.unlink()
+                    continue
+            except FileNotFoundError:
+                continue
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f'等待锁超时（{timeout:g}秒）: {lock_path}')
+            time.sleep(0.2)
+
+    try:
+        yield True
+    finally:
+        try:
+            lock_path.unlink()
+        except FileNotFoundError:
+            pass
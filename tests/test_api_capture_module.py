@@ -0,0 +1,59 @@
+"""
+接口数据校验测试
+验证从列表接口JSON中查找订单记录并按字段校验（包括同步和异步版本共用的match_order_list_record）
+"""
+
+import pytest
+from tests.config.api_config import ORDER_LIST_FIELDS, API_VALUE_LABELS
+from tests.modules.api_capture_module import find_record, match_record_fields
+
+LIST_RESPONSE = {
+    'status_code': 0,
+    'payload': {
+        'total': 2,
+        'rows': [
+            {'id': '1', 'code': '342512080001', 'status': 'APPROVED', 'type': 'HD',
+             'demandDate': '2025-12-08T00:00:00Z', 'store': {'storeName': 'WEN测试直营门店02'}},
+            {'id': '2', 'code': '342512080002', 'status': 'APPROVED', 'type': 'HD',
+             'demandDate': '2025-12-08T00:00:00Z', 'store': {'storeName': 'WEN测试直营门店01'}}
+        ]
+    }
+}
+
+EXPECTED = {
+    'order_number': '342512080002',
+    'status': '已审核',
+    'store_name': 'WEN测试直营门店01',
+    'source': '总部分配',
+    'order_date': '2025-12-08'
+}
+
+
+def test_find_record_returns_innermost_row():
+    """按订单号找到对应的行记录，而不是外层的分页对象"""
+    record = find_record(LIST_RESPONSE, '342512080002')
+    assert record['id'] == '2'
+    assert find_record(LIST_RESPONSE, '342512089999') is None
+
+
+def test_match_record_fields_maps_enums_and_dates():
+    """枚举值按展示文案比较，日期允许带时间"""
+    record = find_record(LIST_RESPONSE, '342512080002')
+    assert match_record_fields(record, EXPECTED, ORDER_LIST_FIELDS, API_VALUE_LABELS) == {}
+
+
+def test_match_record_fields_does_not_substring_match():
+    """门店名称必须完全相等，不会因为子串命中而误判通过"""
+    record = find_record(LIST_RESPONSE, '342512080002')
+    expected = dict(EXPECTED, store_name='WEN测试直营门店0')
+    mismatches = match_record_fields(record, expected, ORDER_LIST_FIELDS, API_VALUE_LABELS)
+    assert mismatches == {'store_name': ('WEN测试直营门店0', 'WEN测试直营门店01')}
+
+
+def test_match_order_list_record():
+    from tests.modules.order_module import match_order_list_record
+    captured = [{'payload': {'rows': []}}, LIST_RESPONSE]
+    assert match_order_list_record(captured, '342512080002', EXPECTED)['id'] == '2'
+    assert match_order_list_record(captured, '342512089999', EXPECTED) is None
+    with pytest.raises(AssertionError, match='订单列表接口数据不匹配'):
+        match_order_list_record(captured, '342512080002', {**EXPECTED, 'status': '新建'})
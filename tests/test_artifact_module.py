@@ -0,0 +1,43 @@
+"""
+产物后台处理测试
+验证后台写入、按目标文件等待、异常隔离和会话结束时的等待超时
+"""
+
+import threading
+from tests.modules.artifact_module import ArtifactWorker, write_artifact
+
+
+def test_write_and_wait_for(tmp_path):
+    worker = ArtifactWorker(max_workers=2)
+    release = threading.Event()
+    screenshot = tmp_path / 'test' / 'screenshot.png'
+
+    def slow_write(path, data):
+        release.wait(5)
+        write_artifact(path, data)
+
+    worker.submit(slow_write, screenshot, b'png', path=screenshot, description='失败截图')
+    assert worker.is_pending(screenshot) and not screenshot.exists()
+
+    # 依赖截图的任务等待写入完成后执行
+    copied = tmp_path / 'copied.png'
+    worker.submit(lambda: (worker.wait_for(screenshot), copied.write_bytes(screenshot.read_bytes())), path=copied)
+    release.set()
+    assert worker.drain(timeout=5) == 0
+    assert copied.read_bytes() == b'png'
+
+
+def test_failures_and_timeout(tmp_path):
+    worker = ArtifactWorker(max_workers=1)
+    worker.submit(lambda: 1 / 0, description='除零')
+    blocker = threading.Event()
+    worker.submit(blocker.wait, 5)
+    assert worker.drain(timeout=0.2) == 1
+    assert worker.stats == {'submitted': 2, 'failed': 1}
+    blocker.set()
+
+    # 工作线程数为0时在当前线程中同步执行
+    inline = ArtifactWorker(max_workers=0)
+    inline.submit(write_artifact, tmp_path / 'a.bin', b'x', path=tmp_path / 'a.bin')
+    assert (tmp_path / 'a.bin').read_bytes() == b'x'
+    assert inline.drain(timeout=1) == 0
@@ -0,0 +1,61 @@
+"""
+静态资源缓存测试
+验证可缓存判断、按内容哈希/有效期的失效规则和磁盘读写
+"""
+
+import time
+from tests.modules.asset_cache_module import AssetCache, create_asset_cache
+
+BASE_URL = 'https://saas-boh-qa.hexcloud.cn/static'
+
+
+def test_is_cacheable():
+    assert AssetCache.is_cacheable('GET', f'{BASE_URL}/js/app.3f2a1c9b.js', 'script')
+    assert AssetCache.is_cacheable('GET', f'{BASE_URL}/css/main.css?v=2', 'stylesheet')
+    assert not AssetCache.is_cacheable('POST', f'{BASE_URL}/js/app.js', 'script')
+    assert not AssetCache.is_cacheable('GET', 'https://saas-boh-qa.hexcloud.cn/api/order/list', 'xhr')
+    assert not AssetCache.is_cacheable('GET', f'{BASE_URL}/index.html', 'document')
+
+
+def test_store_and_lookup(tmp_path):
+    cache = AssetCache(cache_dir=tmp_path, max_age=60)
+    hashed_url = f'{BASE_URL}/js/chunk-vendors.8d1e2f3a.js'
+    plain_url = f'{BASE_URL}/js/config.js'
+    headers = {'Content-Type': 'application/javascript', 'Set-Cookie': 'sid=1'}
+
+    assert cache.lookup(hashed_url) is None
+    assert cache.store(hashed_url, 200, headers, b'console.log(1)')
+    assert cache.store(plain_url, 200, headers, b'console.log(1)')
+    assert not cache.store(f'{BASE_URL}/js/missing.js', 404, headers, b'')
+    assert not cache.store(f'{BASE_URL}/js/live.js', 200, {'cache-control': 'no-store'}, b'x')
+
+    cached = cache.lookup(hashed_url)
+    assert cached['body'] == b'console.log(1)'
+    assert cached['headers'] == {'content-type': 'application/javascript'}
+    # 相同内容只保存一份
+    assert cache.summary()['entries'] == 2
+    assert cache.summary()['objects'] == 1
+
+    # 超过有效期后只有带内容哈希的资源仍然有效
+    stored_at = time.time()
+    assert cache.is_fresh(hashed_url, stored_at - 3600)
+    assert not cache.is_fresh(plain_url, stored_at - 3600)
+    assert cache.prune(now=stored_at + 3600) == 1
+    assert cache.lookup(plain_url) is None
+    assert cache.lookup(hashed_url) is not None
+
+    # 内容损坏时视为未命中
+    for path in (tmp_path / 'objects').glob('*/*'):
+        path.write_bytes(b'corrupted')
+    assert cache.lookup(hashed_url) is None
+
+
+def test_cache_mode(monkeypatch, tmp_path):
+    monkeypatch.setenv('ASSET_CACHE_MODE', 'off')
+    assert create_asset_cache() is None
+    monkeypatch.setenv('ASSET_CACHE_MODE', 'refresh')
+    cache = create_asset_cache()
+    assert cache.refresh
+    cache.cache_dir = tmp_path
+    cache.store(f'{BASE_URL}/js/app.3f2a1c9b.js', 200, {}, b'x')
+    assert cache.lookup(f'{BASE_URL}/js/app.3f2a1c9b.js') is None
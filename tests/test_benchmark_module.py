@@ -0,0 +1,50 @@
+"""
+性能基准统计测试
+验证百分位计算、嵌套步骤汇总和基线对比
+"""
+
+from tests.modules.benchmark_module import compare_to_baseline, percentile, summarize_runs
+
+
+def _record(name, duration_ms, calls=10, sleep_ms=0.0, children=None):
+    return {
+        'name': name,
+        'title': name,
+        'duration_ms': duration_ms,
+        'status': 'passed',
+        'playwright_calls': calls,
+        'wait_ms': 0.0,
+        'sleep_ms': sleep_ms,
+        'selector_fallbacks': [],
+        'children': children or []
+    }
+
+
+def test_percentile():
+    assert percentile([], 50) == 0.0
+    assert percentile([30, 10, 20], 50) == 20
+    assert percentile([0, 100], 95) == 95.0
+
+
+def test_summarize_runs_flattens_children():
+    runs = [
+        [_record('login', 100 + i), _record('verify_order_detail', 50, children=[_record('load_order_detail', 40, calls=4)])]
+        for i in range(5)
+    ]
+    summary = summarize_runs(runs)
+    assert summary['login']['p50_ms'] == 102
+    assert summary['login']['samples'] == 5
+    assert summary['verify_order_detail/load_order_detail']['calls_p50'] == 4
+    assert summary['total']['p50_ms'] == 152
+    assert summary['total']['calls_p50'] == 20
+
+
+def test_compare_to_baseline_flags_new_sleep_and_calls():
+    baseline = summarize_runs([[_record('navigate_to_order_page', 200)]] * 3)
+    assert compare_to_baseline(summarize_runs([[_record('navigate_to_order_page', 230)]] * 3), baseline) == []
+
+    slower = summarize_runs([[_record('navigate_to_order_page', 1200, calls=12, sleep_ms=1000)]] * 3)
+    regressions = compare_to_baseline(slower, baseline)
+    assert any('p50' in r for r in regressions)
+    assert any('Playwright调用' in r for r in regressions)
+    assert any('固定等待' in r for r in regressions)
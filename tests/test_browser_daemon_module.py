@@ -0,0 +1,62 @@
+"""
+常驻浏览器测试
+验证启动参数、状态文件过期判断、健康检查和停止逻辑（不启动真实浏览器）
+"""
+
+import socket
+import time
+from tests.modules import browser_daemon_module
+from tests.modules.browser_daemon_module import (
+    BROWSER_DAEMON_MAX_AGE,
+    build_daemon_args,
+    get_cdp_version,
+    is_daemon_state_stale,
+    read_daemon_state,
+    stop_browser_daemon,
+    write_daemon_state
+)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def test_build_daemon_args(tmp_path):
+    args = build_daemon_args('/usr/bin/chromium', 9333, True, tmp_path)
+    assert args[0] == '/usr/bin/chromium'
+    assert '--remote-debugging-port=9333' in args
+    assert f'--user-data-dir={tmp_path.resolve()}' in args
+    assert '--headless=new' in args
+    assert '--headless=new' not in build_daemon_args('/usr/bin/chromium', 9333, False, tmp_path)
+
+
+def test_state_staleness(tmp_path):
+    state_path = tmp_path / 'browser-daemon.json'
+    assert read_daemon_state(state_path) is None
+    now = time.time()
+    write_daemon_state({'pid': 1, 'port': 9333, 'headless': True, 'channel': None, 'started_at': now}, state_path)
+    state = read_daemon_state(state_path)
+
+    assert is_daemon_state_stale(None, True, None)
+    assert not is_daemon_state_stale(state, True, None, now=now + 60)
+    assert is_daemon_state_stale(state, False, None, now=now + 60)
+    assert is_daemon_state_stale(state, True, 'chrome', now=now + 60)
+    assert is_daemon_state_stale(state, True, None, now=now + BROWSER_DAEMON_MAX_AGE + 1)
+
+
+def test_health_check_and_stop(tmp_path, monkeypatch):
+    port = _free_port()
+    assert get_cdp_version(port, timeout=0.5) is None
+
+    # 进程已退出时停止操作只清理状态文件和用户数据目录
+    profile_dir = tmp_path / 'profile'
+    profile_dir.mkdir()
+    monkeypatch.setattr(browser_daemon_module, 'BROWSER_DAEMON_PROFILE_DIR', profile_dir)
+    state_path = tmp_path / 'browser-daemon.json'
+    write_daemon_state({'pid': 2 ** 22 + 1, 'port': port, 'headless': True, 'channel': None, 'started_at': 0}, state_path)
+    assert not stop_browser_daemon(state_path)
+    assert not state_path.exists()
+    assert not profile_dir.exists()
+    assert not stop_browser_daemon(state_path)
@@ -0,0 +1,61 @@
+"""
+录制策略测试
+验证策略解析、产物保留判断和添加附件前等待后台写入
+"""
+
+import threading
+from pathlib import Path
+import pytest
+from tests.modules.artifact_module import get_artifact_worker, write_artifact
+from tests.modules.capture_module import attach_artifact, get_capture_mode, should_keep, should_record
+
+
+class FakeItem:
+    """只提供get_closest_marker的测试项"""
+
+    def __init__(self, execution_count=1, **capture):
+        self.execution_count = execution_count
+        self._marker = pytest.mark.capture(**capture).mark if capture else None
+
+    def get_closest_marker(self, name):
+        return self._marker if name == 'capture' else None
+
+
+def test_marker_overrides_env(monkeypatch):
+    monkeypatch.setenv('VIDEO_MODE', 'always')
+    assert get_capture_mode(FakeItem(), 'video') == 'always'
+    assert get_capture_mode(FakeItem(video='off'), 'video') == 'off'
+    monkeypatch.setenv('TRACE_MODE', 'unknown')
+    assert get_capture_mode(FakeItem(), 'trace') == 'off'
+
+
+def test_record_and_keep_decisions():
+    assert should_record('on-failure', FakeItem()) is True
+    assert should_record('off', FakeItem()) is False
+    assert should_record('on-first-retry', FakeItem()) is False
+    assert should_record('on-first-retry', FakeItem(execution_count=2)) is True
+    assert should_keep('on-failure', failed=False) is False
+    assert should_keep('on-failure', failed=True) is True
+    assert should_keep('always', failed=False) is True
+
+
+def test_attach_artifact(tmp_path, monkeypatch):
+    import allure
+    attached = []
+    monkeypatch.setattr(allure.attach, 'file', lambda source, **kwargs: attached.append(Path(source).read_bytes()))
+
+    # 截图由后台任务写入时，等待写入完成后再添加附件
+    screenshot = tmp_path / 'screenshot.png'
+    release = threading.Event()
+
+    def slow_write():
+        release.wait(5)
+        write_artifact(screenshot, b'png')
+
+    get_artifact_worker().submit(slow_write, path=screenshot, description='失败截图')
+    threading.Timer(0.1, release.set).start()
+    assert attach_artifact(screenshot, '失败截图', allure.attachment_type.PNG) is True
+    assert attached == [b'png']
+
+    assert attach_artifact(tmp_path / 'missing.webm', '操作视频', allure.attachment_type.WEBM) is False
+    assert attached == [b'png']
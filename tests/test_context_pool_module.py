@@ -0,0 +1,103 @@
+"""
+浏览器上下文池测试
+验证隔离级别解析、按键复用、失败丢弃、池大小和复用次数限制、重置时恢复登录态cookie
+"""
+
+import json
+import pytest
+from tests.modules.context_pool_module import (
+    ISOLATION_FRESH,
+    ISOLATION_POOLED,
+    ContextPool,
+    get_isolation_level,
+    get_pool_key
+)
+
+
+class FakeItem:
+    """只提供get_closest_marker的测试项"""
+
+    def __init__(self, *args, fresh_login=False):
+        self._markers = {}
+        if args:
+            self._markers['isolation'] = pytest.mark.isolation(*args).mark
+        if fresh_login:
+            self._markers['fresh_login'] = pytest.mark.fresh_login.mark
+
+    def get_closest_marker(self, name):
+        return self._markers.get(name)
+
+
+class FakeContext:
+    """记录重置和关闭调用的浏览器上下文"""
+
+    def __init__(self):
+        self.pages = []
+        self.cookies = [{'name': 'stale'}]
+        self.closed = False
+
+    def on(self, event, handler):
+        pass
+
+    def clear_cookies(self):
+        self.cookies = []
+
+    def add_cookies(self, cookies):
+        self.cookies.extend(cookies)
+
+    def clear_permissions(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+def _create():
+    return FakeContext(), []
+
+
+def test_isolation_level(monkeypatch):
+    monkeypatch.delenv('CONTEXT_ISOLATION', raising=False)
+    assert get_isolation_level(FakeItem()) == ISOLATION_FRESH
+    monkeypatch.setenv('CONTEXT_ISOLATION', 'pooled')
+    assert get_isolation_level(FakeItem()) == ISOLATION_POOLED
+    assert get_isolation_level(FakeItem('fresh')) == ISOLATION_FRESH
+    assert get_isolation_level(FakeItem(fresh_login=True)) == ISOLATION_FRESH
+    assert get_isolation_level(FakeItem('unknown')) == ISOLATION_FRESH
+
+
+def test_reuse_and_reset(tmp_path):
+    storage_state = tmp_path / 'state.json'
+    storage_state.write_text(json.dumps({'cookies': [{'name': 'token'}], 'origins': []}), encoding='utf-8')
+    pool = ContextPool(size=1)
+    key = get_pool_key('test', 'account', 'brand', 'standard')
+
+    context = pool.acquire(key, _create, storage_state=str(storage_state))
+    pool.release(context)
+    assert not context.closed
+    assert context.cookies == [{'name': 'token'}]
+    assert pool.acquire(key, _create, storage_state=str(storage_state)) is context
+
+    # 测试失败时直接关闭，下一次新建
+    pool.release(context, reusable=False)
+    assert context.closed
+    assert pool.acquire(key, _create) is not context
+    assert pool.stats == {'created': 2, 'reused': 1, 'discarded': 1}
+
+
+def test_pool_limits():
+    pool = ContextPool(size=1, max_uses=2)
+    first = pool.acquire(('a',), _create)
+    pool.release(first)
+    second = pool.acquire(('b',), _create)
+    pool.release(second)
+    # 超过池大小时关闭最早放回的上下文
+    assert first.closed and not second.closed
+
+    # 达到复用次数上限后关闭
+    assert pool.acquire(('b',), _create) is second
+    pool.release(second)
+    assert second.closed
+
+    pool.close()
+    assert pool.format_stats().startswith('上下文池: 3 个测试')
@@ -0,0 +1,75 @@
+"""
+登录和订货测试（异步版本）
+与test_login.py相同的流程，使用async_page fixture和异步模块API（需要安装pytest-asyncio）
+"""
+
+import pytest
+
+pytest.importorskip('pytest_asyncio')
+
+from tests.config.login_config import LOGIN_URL
+from tests.modules.async_login_module import async_login, async_verify_tenant_name
+from tests.modules.async_order_module import (
+    async_click_order_to_open_detail,
+    async_find_and_verify_order_in_list,
+    async_open_order_list,
+    async_verify_order_detail,
+    async_verify_product_rows
+)
+from tests.modules.order_batch_module import async_verify_orders
+
+
+@pytest.mark.order
+@pytest.mark.asyncio(loop_scope='session')
+async def test_complete_flow_async(async_page):
+    """登录、订货单查询、详情和商品行验证"""
+    await async_login(async_page, login_url=LOGIN_URL)
+    await async_verify_tenant_name(async_page, '合阔x')
+
+    await async_open_order_list(async_page, start_date='2025-12-01', end_date='2025-12-31')
+    await async_find_and_verify_order_in_list(
+        async_page,
+        order_number='342512080002',
+        status='已审核',
+        store_name='WEN测试直营门店01',
+        source='总部分配',
+        order_date='2025-12-08'
+    )
+
+    await async_click_order_to_open_detail(async_page, '342512080002')
+    await async_verify_order_detail(
+        async_page,
+        order_number='342512080002',
+        status='已审核',
+        source='总部分配',
+        order_date='2025-12-08',
+        store_name='WEN测试直营门店01',
+        store_code='100000010'
+    )
+    await async_verify_product_rows(
+        async_page,
+        expected_count=1,
+        product_code='T20251128012',
+        product_name='测试20251128012'
+    )
+
+
+@pytest.mark.order
+@pytest.mark.asyncio(loop_scope='session')
+async def test_order_batch_async(async_context, async_page):
+    """同一个登录上下文中并发打开详情页批量校验订单"""
+    await async_login(async_page, login_url=LOGIN_URL)
+    orders = [{
+        'order_number': '342512080002',
+        'status': '已审核',
+        'source': '总部分配',
+        'order_date': '2025-12-08',
+        'store_name': 'WEN测试直营门店01',
+        'store_code': '100000010',
+        'product_code': 'T20251128012',
+        'product_name': '测试20251128012'
+    }]
+
+    results = await async_verify_orders(async_context, orders, concurrency=4, list_page=async_page)
+    failed = [result for result in results if not result['passed']]
+    assert not failed, f'订单校验失败: {failed}'
@@ -0,0 +1,71 @@
+"""
+登录测试（不启动浏览器）
+验证只有上下文中缓存的登录态与本次登录的环境、账号和品牌别名一致时才跳过登录页，不一致时清除cookie后完整登录
+"""
+
+import pytest
+from tests.config.login_config import CREDENTIALS, ENV, LOGIN_CONFIG, LOGIN_URL
+from tests.modules import login_module
+from tests.modules.login_module import get_login_env, login, mark_session_context
+
+
+class FullLoginStarted(Exception):
+    """打开登录页（开始完整登录流程）"""
+
+
+class FakeContext:
+    """记录cookie清除的浏览器上下文"""
+
+    def __init__(self):
+        self.cookies_cleared = False
+
+    def clear_cookies(self):
+        self.cookies_cleared = True
+
+
+class FakePage:
+    """打开登录页时抛出FullLoginStarted的页面"""
+
+    def __init__(self):
+        self.context = FakeContext()
+
+    def goto(self, url, **kwargs):
+        raise FullLoginStarted(url)
+
+
+@pytest.fixture
+def page(monkeypatch):
+    monkeypatch.setenv('WEB_VITALS', 'false')
+    monkeypatch.setattr(login_module, '_enter_with_existing_session', lambda page: True)
+    return FakePage()
+
+
+def test_login_reuses_matching_session(page):
+    mark_session_context(page.context, ENV, CREDENTIALS['account'], CREDENTIALS['brandAlias'])
+    login(page)
+    assert not page.context.cookies_cleared
+
+
+@pytest.mark.parametrize('kwargs', [
+    {'account': 'other-account'},
+    {'brand_alias': 'other-brand'},
+    {'login_url': 'https://example.com/page/login'}
+])
+def test_login_clears_mismatched_session(page, kwargs):
+    mark_session_context(page.context, ENV, CREDENTIALS['account'], CREDENTIALS['brandAlias'])
+    with pytest.raises(FullLoginStarted):
+        login(page, **kwargs)
+    assert page.context.cookies_cleared
+    assert not login_module.is_session_context(page.context)
+
+
+def test_login_without_cached_session(page):
+    with pytest.raises(FullLoginStarted):
+        login(page)
+    assert not page.context.cookies_cleared
+
+
+def test_get_login_env():
+    assert get_login_env(LOGIN_URL) == ENV
+    assert get_login_env(LOGIN_CONFIG['production']['loginUrl']) in (ENV, 'production')
+    assert get_login_env('https://example.com/page/login') is None
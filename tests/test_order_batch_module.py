@@ -0,0 +1,126 @@
+"""
+订单批量校验测试
+验证并发上限、结果顺序、并发校验时的Allure步骤层级和汇总（浏览器端的批量校验见tests/test_login_async.py）
+"""
+
+import asyncio
+from tests.modules import order_batch_module, timing_module
+from tests.modules.order_batch_module import (
+    async_verify_orders,
+    fan_out,
+    format_order_summary,
+    summarize_order_results
+)
+from tests.modules.timing_module import timed_step
+from tests.modules.worker_module import run_coroutine
+
+
+class FakeAllure:
+    """与allure一样把新步骤挂在最后打开的步骤下，记录 (步骤标题, 父步骤标题)"""
+
+    def __init__(self):
+        self.open_steps = []
+        self.steps = []
+
+    def step(self, title):
+        fake = self
+
+        class Step:
+            def __enter__(self):
+                parent = fake.open_steps[-1] if fake.open_steps else None
+                fake.steps.append((title.split(' (')[0], parent))
+                fake.open_steps.append(title.split(' (')[0])
+
+            def __exit__(self, *exc_info):
+                fake.open_steps.pop()
+
+        return Step()
+
+
+class FakePage:
+    async def goto(self, url, **kwargs):
+        pass
+
+    async def close(self):
+        pass
+
+
+class FakeContext:
+    async def new_page(self):
+        return FakePage()
+
+
+def test_fan_out_limits_concurrency():
+    running = set()
+    peak = []
+
+    async def worker(item):
+        running.add(item)
+        peak.append(len(running))
+        # 先开始的条目后完成
+        await asyncio.sleep(0.01 * (5 - item))
+        running.discard(item)
+        return item * 10
+
+    results = run_coroutine(fan_out(list(range(5)), worker, concurrency=2))
+    assert max(peak) == 2
+    # 结果与输入顺序一致，与完成顺序无关
+    assert results == [0, 10, 20, 30, 40]
+
+
+def test_summarize_order_results():
+    results = [
+        {'order_number': '342512080002', 'passed': True, 'error': None, 'duration_ms': 100.0},
+        {'order_number': '342512080001', 'passed': False, 'error': 'AssertionError: 单据状态', 'duration_ms': 300.0},
+        {'order_number': '342512080003', 'passed': True, 'error': None, 'duration_ms': 200.0}
+    ]
+    summary = summarize_order_results(results)
+    assert (summary['total'], summary['passed'], summary['failed']) == (3, 2, 1)
+    assert summary['p50_ms'] == 200.0
+    assert summary['failures'] == [{'order_number': '342512080001', 'error': 'AssertionError: 单据状态'}]
+    assert '2/3 通过' in format_order_summary(summary)
+
+
+def test_verify_orders_allure_steps(monkeypatch):
+    fake_allure = FakeAllure()
+    monkeypatch.setattr(timing_module, 'allure', fake_allure)
+    orders = [
+        {'order_number': f'34251208000{index}', 'status': '已提交', 'source': 'BOH', 'order_date': '2025-12-08',
+         'store_name': '门店', 'store_code': 'S001', 'delay': 0.01 * (3 - index)}
+        for index in range(3)
+    ]
+    delays = {order['order_number']: order['delay'] for order in orders}
+
+    async def open_order_list(page, start_date, end_date):
+        pass
+
+    async def collect_detail_links(page, order_numbers):
+        return {number: f'https://boh.example.com/order/{number}' for number in order_numbers}
+
+    @timed_step('验证订单详情')
+    async def verify_order_detail(page, order_number, **expected):
+        # 先开始的订单后完成，各订单的步骤交替打开和关闭
+        await asyncio.sleep(delays[order_number])
+        assert order_number != '342512080001', '单据状态不一致'
+
+    monkeypatch.setattr(order_batch_module, 'async_open_order_list', open_order_list)
+    monkeypatch.setattr(order_batch_module, 'async_collect_detail_links', collect_detail_links)
+    monkeypatch.setattr(order_batch_module, 'async_verify_order_detail', verify_order_detail)
+    monkeypatch.setattr(order_batch_module, 'start_response_capture', lambda page, name: None)
+
+    async def run():
+        with timed_step('批量校验'):
+            return await async_verify_orders(FakeContext(), orders, concurrency=3, list_page=FakePage())
+
+    results = run_coroutine(run())
+    assert [result['passed'] for result in results] == [True, False, True]
+    # 每个订单一个步骤，按输入顺序挂在外层步骤下，各订单的子步骤挂在自己的订单步骤下
+    assert fake_allure.steps == [
+        ('批量校验', None),
+        ('校验订单 342512080000', '批量校验'),
+        ('验证订单详情', '校验订单 342512080000'),
+        ('校验订单 342512080001', '批量校验'),
+        ('验证订单详情', '校验订单 342512080001'),
+        ('校验订单 342512080002', '批量校验'),
+        ('验证订单详情', '校验订单 342512080002')
+    ]
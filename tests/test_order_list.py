@@ -0,0 +1,45 @@
+"""
+订货列表日期选择器测试
+数据校验用例通过open_order_list打开列表（ORDER_LIST_DIRECT_URL=true时由URL直接带入日期条件），这里单独测试日期选择器的界面操作
+"""
+
+import pytest
+from playwright.sync_api import Page
+from tests.config.login_config import LOGIN_URL, CREDENTIALS
+from tests.modules.login_module import login
+from tests.modules.order_module import navigate_to_order_page, select_date_range_and_query
+from tests.modules.table_module import read_table
+from tests.modules.wait_module import wait_for_locator
+
+
+@pytest.mark.order
+def test_order_list_date_picker(page: Page):
+    """通过日期选择器选择12月1号到12月31号并查询，列表中应包含订货单342512080002"""
+    login(
+        page,
+        login_url=LOGIN_URL,
+        account=CREDENTIALS['account'],
+        password=CREDENTIALS['password'],
+        brand_alias=CREDENTIALS['brandAlias']
+    )
+    navigate_to_order_page(page)
+    select_date_range_and_query(
+        page,
+        start_year=2025,
+        start_month=12,
+        start_day=1,
+        end_year=2025,
+        end_month=12,
+        end_day=31
+    )
+
+    # 日期输入框应显示所选日期
+    values = page.locator('input').evaluate_all('inputs => inputs.map(input => input.value || "")')
+    assert any('2025-12-01' in value for value in values), f'开始日期未生效: {values}'
+    assert any('2025-12-31' in value for value in values), f'结束日期未生效: {values}'
+
+    # 查询结果中应包含该日期范围内的订货单
+    assert wait_for_locator(page, 'text=342512080002', timeout=10000), '查询结果中未找到订货单: 342512080002'
+    order_table = read_table(page, '订货单号')
+    assert order_table is not None, '未找到订货单列表'
+    assert order_table.lookup('订货单号', '342512080002'), '订货单列表中没有订货单号为342512080002的行'
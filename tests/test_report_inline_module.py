@@ -0,0 +1,60 @@
+"""
+Allure报告内联测试
+验证数据脚本内容、index.html注入和备份，以及数据文件没有变化时跳过
+"""
+
+import json
+from tests.modules.report_inline_module import (
+    INLINE_DATA_FILE,
+    INLINE_MANIFEST_FILE,
+    collect_inline_sources,
+    inline_report
+)
+
+
+def _make_report(report_dir):
+    """构造最小的报告目录"""
+    (report_dir / 'data' / 'test-cases').mkdir(parents=True)
+    (report_dir / 'widgets').mkdir()
+    (report_dir / 'index.html').write_text('<html><head><title>Allure</title></head><body></body></html>', encoding='utf-8')
+    (report_dir / 'data' / 'suites.json').write_text('{"uid": "suites"}', encoding='utf-8')
+    (report_dir / 'widgets' / 'summary.json').write_text('{"statistic": {"passed": 1}}', encoding='utf-8')
+    (report_dir / 'data' / 'test-cases' / 'abc.json').write_text('{"name": "</script>"}', encoding='utf-8')
+
+
+def test_inline_bundle_and_index(tmp_path):
+    report_dir = tmp_path / 'allure-report'
+    _make_report(report_dir)
+
+    keys = [key for key, _ in collect_inline_sources(report_dir)]
+    assert keys == ['data/suites.json', 'widgets/summary.json', 'data/test-cases/abc.json']
+
+    assert inline_report(report_dir)
+    bundle = (report_dir / INLINE_DATA_FILE).read_text(encoding='utf-8')
+    assert 'd["data/suites.json"] = {"uid": "suites"}' in bundle
+    assert 'd["widgets/summary.json"] = ' in bundle
+    assert 'd.testCases["abc.json"] = {"name": "</script>"}' in bundle
+
+    html = (report_dir / 'index.html').read_text(encoding='utf-8')
+    assert html.count(INLINE_DATA_FILE) == 1
+    assert html.index(INLINE_DATA_FILE) < html.index('</head>')
+    assert (report_dir / 'index.html.backup').read_text(encoding='utf-8').count(INLINE_DATA_FILE) == 0
+
+
+def test_inline_skips_unchanged(tmp_path, capsys):
+    report_dir = tmp_path / 'allure-report'
+    _make_report(report_dir)
+    assert inline_report(report_dir)
+    manifest = (report_dir / INLINE_MANIFEST_FILE).read_text(encoding='utf-8')
+    capsys.readouterr()
+
+    # 数据文件没有变化时跳过
+    assert inline_report(report_dir)
+    assert '跳过内联' in capsys.readouterr().out
+
+    # 新增数据文件后重新写入，index.html中只保留一份注入内容
+    (report_dir / 'data' / 'test-cases' / 'def.json').write_text(json.dumps({'name': 'def'}), encoding='utf-8')
+    assert inline_report(report_dir)
+    assert (report_dir / INLINE_MANIFEST_FILE).read_text(encoding='utf-8') != manifest
+    assert 'd.testCases["def.json"]' in (report_dir / INLINE_DATA_FILE).read_text(encoding='utf-8')
+    assert (report_dir / 'index.html').read_text(encoding='utf-8').count(INLINE_DATA_FILE) == 1
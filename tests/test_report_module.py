@@ -0,0 +1,88 @@
+"""
+Allure报告生成测试
+验证报告模式、结果指纹、history复制、本次运行是否有新结果、本次结果的提取、旧结果清理和CI环境下不打开报告
+"""
+
+import os
+from tests.modules.report_module import (
+    REPORT_FINGERPRINT_FILE,
+    compute_results_fingerprint,
+    copy_history,
+    get_report_mode,
+    has_results_since,
+    is_report_up_to_date,
+    prune_results,
+    should_open_report,
+    stage_results_since
+)
+
+
+def test_report_mode(monkeypatch):
+    monkeypatch.delenv('ALLURE_REPORT_MODE', raising=False)
+    monkeypatch.setenv('CI', 'true')
+    assert get_report_mode() == 'foreground'
+    assert not should_open_report()
+    monkeypatch.setenv('CI', 'false')
+    assert get_report_mode() == 'background'
+    assert should_open_report()
+    monkeypatch.setenv('ALLURE_REPORT_MODE', 'off')
+    assert get_report_mode() == 'off'
+
+
+def test_fingerprint_and_history(tmp_path):
+    results_dir = tmp_path / 'allure-results'
+    report_dir = tmp_path / 'allure-report'
+    results_dir.mkdir()
+    (results_dir / 'a-result.json').write_text('{}', encoding='utf-8')
+    fingerprint = compute_results_fingerprint(results_dir)
+
+    # 上次报告的history复制到结果目录，不影响指纹
+    (report_dir / 'history').mkdir(parents=True)
+    (report_dir / 'history' / 'history-trend.json').write_text('[]', encoding='utf-8')
+    assert copy_history(report_dir, results_dir) == 1
+    assert (results_dir / 'history' / 'history-trend.json').exists()
+    assert compute_results_fingerprint(results_dir) == fingerprint
+
+    (report_dir / 'index.html').write_text('', encoding='utf-8')
+    (report_dir / REPORT_FINGERPRINT_FILE).write_text(fingerprint, encoding='utf-8')
+    assert is_report_up_to_date(results_dir, report_dir)
+
+    # 新增或修改结果文件后需要重新生成
+    (results_dir / 'b-result.json').write_text('{}', encoding='utf-8')
+    assert not is_report_up_to_date(results_dir, report_dir)
+    os.remove(results_dir / 'b-result.json')
+    assert is_report_up_to_date(results_dir, report_dir)
+
+
+def test_has_results_since(tmp_path):
+    results_dir = tmp_path / 'allure-results'
+    results_dir.mkdir()
+    old_result = results_dir / 'a-result.json'
+    old_result.write_text('{}')
+    os.utime(old_result, (1000, 1000))
+    (results_dir / 'b-container.json').write_text('{}')
+    assert not has_results_since(results_dir, 2000)
+    assert has_results_since(results_dir, 500)
+    (results_dir / 'c-result.json').write_text('{}')
+    assert has_results_since(results_dir, 2000)
+    assert not has_results_since(tmp_path / 'missing', 0)
+
+
+def test_stage_and_prune_results(tmp_path):
+    results_dir = tmp_path / 'allure-results'
+    staging_dir = tmp_path / 'allure-results.current'
+    results_dir.mkdir()
+    old_result = results_dir / 'a-result.json'
+    old_result.write_text('{}')
+    os.utime(old_result, (1000, 1000))
+    (results_dir / 'b-result.json').write_text('{}')
+    (results_dir / 'history').mkdir()
+
+    # 只提取本次运行写入的结果
+    assert stage_results_since(results_dir, 2000, staging_dir) == 1
+    assert [path.name for path in staging_dir.iterdir()] == ['b-result.json']
+
+    assert prune_results(results_dir, max_age_days=1) == 1
+    assert not old_result.exists()
+    assert (results_dir / 'b-result.json').exists()
+    assert (results_dir / 'history').exists()
@@ -0,0 +1,77 @@
+"""
+请求过滤测试
+验证过滤配置解析、拦截/空响应/放行判断、路由注册的URL范围和按URL分组的白名单
+"""
+
+import pytest
+from tests.config.route_config import ROUTE_PROFILES
+from tests.modules.route_module import (
+    ROUTE_ABORT,
+    ROUTE_CONTINUE,
+    ROUTE_STUB,
+    RouteFilter,
+    create_route_filter,
+    get_route_profile_name
+)
+
+PAGE_URL = 'https://saas-boh-qa.hexcloud.cn/store-supply/demand-daily'
+
+
+class FakeItem:
+    """只提供get_closest_marker的测试项"""
+
+    def __init__(self, *args):
+        self._marker = pytest.mark.route_profile(*args).mark if args else None
+
+    def get_closest_marker(self, name):
+        return self._marker if name == 'route_profile' else None
+
+
+def test_profile_name(monkeypatch):
+    monkeypatch.setenv('ROUTE_PROFILE', 'strict')
+    assert get_route_profile_name(FakeItem()) == 'strict'
+    assert get_route_profile_name(FakeItem('off')) == 'off'
+    monkeypatch.setenv('ROUTE_PROFILE', 'unknown')
+    assert get_route_profile_name(None) == 'off'
+    monkeypatch.delenv('ROUTE_PROFILE')
+    assert get_route_profile_name(FakeItem()) == 'off'
+    assert create_route_filter('off') is None
+    assert create_route_filter() is None
+
+
+def test_decide():
+    route_filter = RouteFilter('standard', ROUTE_PROFILES['standard'])
+    assert route_filter.decide(PAGE_URL, 'document') == ROUTE_CONTINUE
+    assert route_filter.decide('https://cdn.example.com/logo.png', 'image', PAGE_URL) == ROUTE_ABORT
+    assert route_filter.decide('https://cdn.example.com/iconfont.woff2', 'font', PAGE_URL) == ROUTE_ABORT
+    assert route_filter.decide('https://hm.baidu.com/hm.js?abc', 'script', PAGE_URL) == ROUTE_ABORT
+    assert route_filter.decide('https://hm.baidu.com/hm.gif?si=abc', 'image', PAGE_URL) == ROUTE_STUB
+    assert route_filter.decide('https://boh.cn-shanghai.log.aliyuncs.com/logstores/web/track', 'xhr', PAGE_URL) == ROUTE_STUB
+    # 规则只匹配统计服务的域名，BOH自身路径中带track、collect的接口照常发出
+    assert route_filter.decide('https://saas-boh-qa.hexcloud.cn/api/track?e=click', 'xhr', PAGE_URL) == ROUTE_CONTINUE
+    assert route_filter.decide('https://saas-boh-qa.hexcloud.cn/api/collect/list', 'xhr', PAGE_URL) == ROUTE_CONTINUE
+    assert route_filter.decide('https://example.com/?ref=hm.baidu.com/', 'xhr', PAGE_URL) == ROUTE_CONTINUE
+    assert route_filter.decide('https://saas-boh-qa.hexcloud.cn/api/store-supply/demand/list', 'xhr', PAGE_URL) == ROUTE_CONTINUE
+    assert route_filter.decide('https://cdn.example.com/app.css', 'stylesheet', PAGE_URL) == ROUTE_CONTINUE
+
+
+def test_route_url():
+    route_url = RouteFilter('standard', ROUTE_PROFILES['standard']).route_url
+    # 只有可能被过滤的请求经过路由处理
+    assert route_url.search('https://cdn.example.com/logo.PNG?v=1')
+    assert route_url.search('https://cdn.example.com/iconfont.woff2')
+    assert route_url.search('https://www.googletagmanager.com/gtag/js?id=G-1')
+    assert not route_url.search('https://cdn.example.com/app.3f2a1c9b.js')
+    assert not route_url.search('https://saas-boh-qa.hexcloud.cn/api/store-supply/demand/list?file=a.png')
+    # 服务端推送请求无法按URL识别
+    assert RouteFilter('strict', ROUTE_PROFILES['strict']).route_url == '**/*'
+
+
+def test_allowlist_by_url_group():
+    route_filter = RouteFilter('standard', ROUTE_PROFILES['standard'])
+    image = 'https://cdn.example.com/items/T20251128012.jpg'
+    # 商品页面放行商品图片，订货页面照常拦截
+    assert route_filter.decide(image, 'image', 'https://saas-boh-qa.hexcloud.cn/product/item') == ROUTE_CONTINUE
+    assert route_filter.decide(image, 'image', PAGE_URL) == ROUTE_ABORT
+    # 验证码对所有页面放行
+    assert route_filter.decide('https://auth.example.com/captcha?t=1', 'image', '') == ROUTE_CONTINUE
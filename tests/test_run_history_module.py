@@ -0,0 +1,122 @@
+"""
+运行历史测试
+验证运行记录写入、步骤汇总（含订单号）、页面性能汇总、退化检测和CSV导出
+"""
+
+import csv
+import time
+from contextlib import closing
+from tests.modules.run_history_module import (
+    connect,
+    detect_regressions,
+    export_csv,
+    record_run,
+    summarize_pages,
+    summarize_steps,
+    summarize_tests
+)
+
+
+def _page_metrics(lcp_ms):
+    return {
+        'step': 'click_order_to_open_detail',
+        'key': 'storeOperations.order',
+        'url': 'https://boh.hexcloud.cn/store-supply/demand-daily/detail',
+        'navigation': {'type': 'navigate', 'ttfb_ms': 80.0, 'dom_content_loaded_ms': 300.0, 'load_ms': 600.0},
+        'elapsed_ms': lcp_ms + 100,
+        'lcp_ms': lcp_ms,
+        'cls': 0.01,
+        'inp_ms': None,
+        'long_tasks_ms': 0,
+        'resources': {'count': 20, 'transfer_bytes': 102400, 'encoded_bytes': 100000}
+    }
+
+
+def _record(name, duration_ms, order_number=None, status='passed', children=None, page_metrics=None):
+    return {
+        'name': name,
+        'title': name,
+        'duration_ms': duration_ms,
+        'status': status,
+        'playwright_calls': 10,
+        'wait_ms': 0.0,
+        'sleep_ms': 0.0,
+        'selector_fallbacks': [],
+        'order_number': order_number,
+        'page_metrics': page_metrics or [],
+        'children': children or []
+    }
+
+
+def _record_runs(db_path, detail_durations, failed_last=False):
+    """每次运行一个测试：登录 + 打开订单详情（嵌套加载详情）"""
+    now = time.time()
+    for index, duration in enumerate(detail_durations):
+        failed = failed_last and index == len(detail_durations) - 1
+        timings = {'tests/test_login.py::test_order': [
+            _record('login', 1000),
+            _record(
+                'click_order_to_open_detail', duration, '342512080002',
+                page_metrics=[_page_metrics(duration / 2)],
+                children=[_record('load_order_detail', duration - 100, '342512080002')]
+            )
+        ]}
+        results = {'tests/test_login.py::test_order': {
+            'outcome': 'failed' if failed else 'passed',
+            'duration_ms': duration + 1000,
+            'start': now - 3600 * (len(detail_durations) - index)
+        }}
+        record_run(f'run-{index:02d}', 'test', results, timings, 1 if failed else 0, db_path)
+
+
+def test_record_and_summarize(tmp_path):
+    db_path = tmp_path / 'history.sqlite3'
+    _record_runs(db_path, [2000, 2200, 2400])
+    with closing(connect(db_path)) as conn:
+        run_ids = [row['run_id'] for row in conn.execute('SELECT run_id FROM runs')]
+        assert len(run_ids) == 3
+        assert conn.execute('SELECT order_number FROM tests').fetchone()['order_number'] == '342512080002'
+
+        steps = summarize_steps(conn, run_ids)
+        assert set(steps) == {'login', 'click_order_to_open_detail', 'click_order_to_open_detail/load_order_detail'}
+        assert steps['click_order_to_open_detail']['p50_ms'] == 2200
+        assert steps['click_order_to_open_detail']['samples'] == 3
+        assert summarize_steps(conn, run_ids, order_number='342512080002').keys() == steps.keys() - {'login'}
+
+        tests = summarize_tests(conn, run_ids)
+        assert tests['tests/test_login.py::test_order']['passed'] == 3
+
+        pages = summarize_pages(conn, run_ids)
+        assert pages['storeOperations.order']['samples'] == 3
+        assert pages['storeOperations.order']['lcp_ms_p50'] == 1100
+        assert pages['storeOperations.order']['inp_ms_p50'] is None
+        assert pages['storeOperations.order']['cls_p95'] == 0.01
+        assert pages['storeOperations.order']['transfer_kb_p50'] == 100
+
+    # 同一运行ID再次写入时替换原记录
+    _record_runs(db_path, [2000])
+    with closing(connect(db_path)) as conn:
+        assert conn.execute('SELECT COUNT(*) FROM steps WHERE run_id = ?', ('run-00',)).fetchone()[0] == 3
+
+
+def test_regressions_and_export(tmp_path):
+    db_path = tmp_path / 'history.sqlite3'
+    _record_runs(db_path, [2000] * 6 + [3000] * 2, failed_last=True)
+    with closing(connect(db_path)) as conn:
+        regressions = detect_regressions(conn, recent=2, baseline=6)
+        assert any(r.startswith('click_order_to_open_detail: p50') for r in regressions)
+        assert 'storeOperations.order: LCP p50 1000ms -> 1500ms (+500ms)' in regressions
+        assert any('失败 1/2 次' in r for r in regressions)
+        assert not any(r.startswith('login') for r in regressions)
+        assert detect_regressions(conn, recent=2, baseline=3, threshold=1.0) == [
+            'tests/test_login.py::test_order: 失败 1/2 次（之前 0/3 次）'
+        ]
+
+        output = tmp_path / 'history.csv'
+        assert export_csv(conn, output) == 24
+        assert export_csv(conn, tmp_path / 'pages.csv', table='pages') == 8
+    with open(output, encoding='utf-8-sig') as f:
+        rows = list(csv.DictReader(f))
+    assert rows[0]['step'] == 'login'
+    assert rows[-1]['order_number'] == '342512080002'
+    assert rows[-1]['outcome'] == 'failed'
@@ -0,0 +1,76 @@
+"""
+数据驱动场景测试
+验证YAML/JSON/CSV场景加载、默认值合并、字段校验和按前置条件分组
+"""
+
+import json
+import pytest
+from tests.modules.scenario_module import (
+    group_scenarios,
+    load_scenario_file,
+    load_scenarios,
+    normalize_scenario
+)
+
+RECORD = {
+    'order_number': '342512080002',
+    'status': '已审核',
+    'source': '总部分配',
+    'order_date': '2025-12-08',
+    'store_name': 'WEN测试直营门店01',
+    'store_code': '100000010',
+    'start_date': '2025-12-01',
+    'end_date': '2025-12-31'
+}
+
+
+def test_json_defaults_and_validation(tmp_path):
+    path = tmp_path / 'orders.json'
+    path.write_text(json.dumps({
+        'defaults': {'start_date': '2025-12-01', 'end_date': '2025-12-31', 'env': 'test'},
+        'scenarios': [dict(RECORD, start_date=None), dict(RECORD, order_number='342512080001', account='ops')]
+    }), encoding='utf-8')
+
+    first, second = load_scenario_file(path)
+    # 场景中的空值不覆盖defaults
+    assert first['start_date'] == '2025-12-01'
+    assert first['id'] == '342512080002'
+    assert first['expected_count'] == 1
+    assert second['account'] == 'ops'
+
+    with pytest.raises(ValueError, match='缺少字段'):
+        normalize_scenario({'order_number': '1'})
+    with pytest.raises(ValueError, match='未知字段'):
+        normalize_scenario(dict(RECORD, stor_code='1'))
+
+
+def test_csv_and_grouping(tmp_path):
+    path = tmp_path / 'orders.csv'
+    header = list(RECORD) + ['env', 'expected_count', 'product_code']
+    rows = [
+        dict(RECORD, env='test', expected_count='2', product_code=''),
+        dict(RECORD, env='test', expected_count='', product_code='T1', order_number='2', start_date='2025-11-01'),
+        dict(RECORD, env='test', expected_count='', product_code='', order_number='3'),
+        dict(RECORD, env='production', expected_count='', product_code='', order_number='4')
+    ]
+    path.write_text('\n'.join([','.join(header)] + [','.join(row[field] for field in header) for row in rows]), encoding='utf-8')
+
+    scenarios = load_scenarios(str(path), env='test')
+    # 其他环境的场景被过滤，同一分组的场景相邻
+    assert [scenario['order_number'] for scenario in scenarios] == ['342512080002', '3', '2']
+    assert scenarios[0]['expected_count'] == 2 and scenarios[0]['product_code'] is None
+    assert [len(group) for group in group_scenarios(scenarios).values()] == [2, 1]
+
+
+def test_yaml_dates(tmp_path):
+    path = tmp_path / 'orders.yaml'
+    path.write_text(
+        'defaults:\n  start_date: 2025-12-01\n  end_date: 2025-12-31\n'
+        'scenarios:\n  - {order_number: "342512080002", status: 已审核, source: 总部分配, order_date: 2025-12-08,'
+        ' store_name: WEN测试直营门店01, store_code: 100000010}\n',
+        encoding='utf-8'
+    )
+    [scenario] = load_scenario_file(path)
+    assert scenario['start_date'] == '2025-12-01'
+    assert scenario['order_date'] == '2025-12-08'
+    assert scenario['store_code'] == '100000010'
@@ -0,0 +1,39 @@
+"""
+数据驱动的订货单校验测试
+场景从tests/data下的YAML/JSON/CSV文件加载（环境变量SCENARIO_FILES可指定其他文件），
+同一分组（环境、账号、列表日期范围相同）的场景只登录一次、只查询一次列表
+"""
+
+import pytest
+from tests.modules.scenario_module import ScenarioGroupRunner, load_scenarios
+
+
+def pytest_generate_tests(metafunc):
+    """按场景文件参数化，同一分组的场景相邻排列"""
+    if 'scenario' not in metafunc.fixturenames:
+        return
+    try:
+        scenarios = load_scenarios()
+    except Exception as e:
+        metafunc.parametrize('scenario', [pytest.param(None, marks=pytest.mark.skip(reason=f'场景文件加载失败: {e}'))])
+        return
+    if not scenarios:
+        metafunc.parametrize('scenario', [pytest.param(None, marks=pytest.mark.skip(reason='当前环境没有场景'))])
+        return
+    metafunc.parametrize('scenario', scenarios, ids=[scenario['id'] for scenario in scenarios])
+
+
+@pytest.fixture(scope='module')
+def scenario_runner(browser, request):
+    """模块级场景执行器，分组切换时才重新登录和查询列表"""
+    from tests.modules.login_cache_module import is_login_cache_enabled
+    login_cache = request.getfixturevalue('login_cache') if is_login_cache_enabled() else None
+    runner = ScenarioGroupRunner(browser, login_cache)
+    yield runner
+    runner.close()
+
+
+@pytest.mark.order
+def test_order_scenario(scenario_runner, scenario):
+    """校验场景中的订货单：列表行、详情页顶部信息和商品行"""
+    scenario_runner.run(scenario)
@@ -0,0 +1,41 @@
+"""
+选择器注册表测试
+验证URL模式归一化、命中记录持久化和统计累计
+"""
+
+import json
+from tests.modules.selector_module import SelectorRegistry, get_page_pattern
+
+
+def test_page_pattern_normalizes_numbers():
+    """不同订单号的详情页归为同一个URL模式"""
+    assert get_page_pattern('https://saas-boh-qa.hexcloud.cn/store-supply/demand-daily/detail/342512080002') == \
+        '/store-supply/demand-daily/detail/{n}'
+    assert get_page_pattern('https://saas-auth-qa.hexcloud.cn/page/login?redirect=1') == '/page/login'
+
+
+def test_save_merges_stats_and_reloads_winners(tmp_path):
+    """保存时统计与已有文件累计，命中记录可被新实例加载"""
+    cache_file = tmp_path / 'selectors.json'
+
+    first = SelectorRegistry(cache_file)
+    first._winners['/page/login|loginButton'] = 'button[type="submit"]'
+    first._record('loginButton', hits=['button[type="submit"]'], misses=['button:has-text("登录")'])
+    first.save()
+
+    second = SelectorRegistry(cache_file)
+    assert second._winners['/page/login|loginButton'] == 'button[type="submit"]'
+    second._record('loginButton', hits=['button[type="submit"]'], failed=False)
+    second._record('loginButton', misses=['button[type="submit"]'], failed=True)
+    assert 'button[type="submit"]' in second.format_stats()
+    second.save()
+
+    data = json.loads(cache_file.read_text(encoding='utf-8'))
+    stats = data['stats']['loginButton']
+    assert stats['hits']['button[type="submit"]'] == 2
+    assert stats['misses']['button:has-text("登录")'] == 1
+    assert stats['failures'] == 1
+    # 已保存的会话统计被清空，重复保存不会重复累计
+    second.save()
+    data = json.loads(cache_file.read_text(encoding='utf-8'))
+    assert data['stats']['loginButton']['hits']['button[type="submit"]'] == 2
@@ -0,0 +1,63 @@
+"""
+页面快照测试
+验证结构化快照的头部字段、表格行查询、订单行查找和基于快照的详情校验
+"""
+
+import pytest
+from tests.modules.order_module import assert_order_detail, find_order_row_in_snapshot
+from tests.modules.snapshot_module import PageSnapshot
+
+SNAPSHOT_DATA = {
+    'url': 'https://boh.example.com/web/boh/demand-daily/detail/1',
+    'version': 3,
+    'text': '订货单号：342512080002 订货门店编号：12345 商品编号 商品名称 T20251128012 测试20251128012',
+    'headers': {'订货单号': '342512080002', '订货门店编号': '12345'},
+    'tables': [
+        {'headers': ['订货单号', '状态'], 'rows': [['342512080001', '已审核'], ['342512080002', '已审核']]},
+        {'headers': ['商品编号', '商品名称'], 'rows': [['T20251128012', '测试20251128012'], ['T2025112801', '测试']]}
+    ],
+    'alerts': []
+}
+
+
+def test_get_header():
+    snapshot = PageSnapshot(SNAPSHOT_DATA)
+    assert snapshot.get_header('订货门店编号') == '12345'
+    assert snapshot.get_header('不存在') is None
+    assert snapshot.contains('342512080002')
+
+
+def test_find_rows_matches_whole_cells_in_named_table():
+    snapshot = PageSnapshot(SNAPSHOT_DATA)
+    # 按单元格完全相等匹配，不会命中以该值为前缀的其他编号
+    assert snapshot.find_rows('T20251128012', header='商品编号') == [['T20251128012', '测试20251128012']]
+    assert snapshot.find_rows('T2025112801', header='商品编号') == [['T2025112801', '测试']]
+    assert snapshot.find_rows('342512080002', header='商品编号') == []
+    assert snapshot.find_rows('342512080002') == [['342512080002', '已审核']]
+
+
+def test_empty_snapshot():
+    snapshot = PageSnapshot({'url': 'about:blank'})
+    assert snapshot.text == ''
+    assert snapshot.find_rows('x') == []
+
+
+def test_assert_order_detail_fails_on_missing_values():
+    snapshot = PageSnapshot(dict(
+        SNAPSHOT_DATA,
+        text='订货单号：342512080002 单据状态：已审核 来源：总部分配 订货日期：2025-12-08 订货门店：WEN测试直营门店01 订货门店编号：12345'
+    ))
+    expected = ('342512080002', '已审核', '总部分配', '2025-12-08', 'WEN测试直营门店01', '12345')
+    assert_order_detail(snapshot, *expected)
+    # 页面中没有期望的订单号或门店编号时校验失败
+    with pytest.raises(AssertionError, match='订单号'):
+        assert_order_detail(snapshot, '342512080001', *expected[1:])
+    with pytest.raises(AssertionError, match='门店编号不匹配'):
+        assert_order_detail(snapshot, *expected[:-1], '54321')
+
+
+def test_find_order_row_in_snapshot():
+    snapshot = PageSnapshot(SNAPSHOT_DATA)
+    assert find_order_row_in_snapshot(snapshot, '342512080002') == '342512080002 已审核'
+    # 订单号只在页面文本中时由调用方向上查找所在行
+    assert find_order_row_in_snapshot(PageSnapshot({'text': '订货单号：342512080002'}), '342512080002') == ''
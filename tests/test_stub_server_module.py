@@ -0,0 +1,82 @@
+"""
+本地模拟服务测试
+验证登录会话、未登录跳转、列表日期筛选分页和订货单详情接口
+"""
+
+import json
+from http.cookiejar import CookieJar
+from urllib.error import HTTPError
+from urllib.request import HTTPCookieProcessor, Request, build_opener
+import pytest
+from tests.config.stub_config import STUB_CONFIG
+from tests.modules.stub_server_module import StubServer, StubState
+
+
+@pytest.fixture(scope='module')
+def stub():
+    server = StubServer(port=0, state=StubState(latency_ms=0, api_latency_ms=0, page_size=10, filler_orders=40)).start()
+    yield server
+    server.stop()
+
+
+def _opener():
+    return build_opener(HTTPCookieProcessor(CookieJar()))
+
+
+def _login(opener, base_url, **overrides):
+    body = dict(STUB_CONFIG['credentials'], **overrides)
+    request = Request(
+        f'{base_url}/api/auth/login',
+        data=json.dumps(body).encode('utf-8'),
+        headers={'Content-Type': 'application/json'}
+    )
+    return opener.open(request)
+
+
+def _get_json(opener, url):
+    with opener.open(url) as response:
+        return json.loads(response.read().decode('utf-8'))
+
+
+def test_requires_login(stub):
+    opener = _opener()
+    with opener.open(f'{stub.base_url}/store-supply/demand-daily') as response:
+        assert response.url.endswith('/page/login')
+        assert 'name="brandAlias"' in response.read().decode('utf-8')
+
+    with pytest.raises(HTTPError) as error:
+        _login(opener, stub.base_url, password='wrong')
+    assert error.value.code == 401
+
+
+def test_list_filters_and_pages(stub):
+    opener = _opener()
+    _login(opener, stub.base_url)
+
+    data = _get_json(opener, f'{stub.base_url}/api/store-supply/demand/list?start=2025-12-08&end=2025-12-08&page=1')
+    rows = data['payload']['rows']
+    assert data['status_code'] == 0
+    assert [row['code'] for row in rows[:2]] == ['342512080002', '342512080001']
+    assert all(row['demandDate'].startswith('2025-12-08') for row in rows)
+    assert 'products' not in rows[0]
+
+    data = _get_json(opener, f'{stub.base_url}/api/store-supply/demand/list?store=100000010&status=APPROVED')
+    assert [row['code'] for row in data['payload']['rows']] == ['342512080002']
+
+    data = _get_json(opener, f'{stub.base_url}/api/store-supply/demand/list?page=2')
+    assert data['payload']['total'] == 42
+    assert len(data['payload']['rows']) == 10
+
+
+def test_detail_page_and_api(stub):
+    opener = _opener()
+    _login(opener, stub.base_url)
+
+    with opener.open(f'{stub.base_url}/store-supply/demand-daily/detail/4001') as response:
+        html = response.read().decode('utf-8')
+    assert '订货门店编号：' in html and STUB_CONFIG['tenantName'] in html
+
+    order = _get_json(opener, f'{stub.base_url}/api/store-supply/demand/detail?id=4001')['payload']
+    assert order['code'] == '342512080002'
+    assert order['storeCode'] == '100000010'
+    assert order['products'][0]['code'] == 'T20251128012'
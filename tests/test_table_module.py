@@ -0,0 +1,67 @@
+"""
+表格读取测试
+验证按列名索引的行查找、订单列表行的查找和按列校验，以及商品行校验只对表格行按列取值
+"""
+
+import pytest
+from tests.modules.table_module import TableData
+
+ORDER_TABLE = TableData(
+    ['', '订货单号', '状态', '订货门店', '来源', '订货日期'],
+    [
+        ['', '342512080001', '已审核', 'WEN测试直营门店02', '总部分配', '2025-12-08'],
+        ['', '342512080002', '已审核', 'WEN测试直营门店01', '总部分配', '2025-12-08'],
+        ['', '3425120800021', '新建', 'WEN测试直营门店01', '门店订货', '2025-12-09']
+    ]
+)
+
+
+def test_lookup_by_column():
+    row = ORDER_TABLE.lookup('订货单号', '342512080002')
+    assert ORDER_TABLE.cell(row, '订货门店') == 'WEN测试直营门店01'
+    assert ORDER_TABLE.as_dict(row)['状态'] == '已审核'
+    # 单元格完全相等匹配，不会命中以该值为前缀的订单号
+    assert len(ORDER_TABLE.lookup_all('订货单号', '342512080002')) == 1
+    assert ORDER_TABLE.lookup('订货单号', '3425120800') is None
+
+
+def test_missing_column():
+    assert ORDER_TABLE.lookup('商品编号', 'T20251128012') is None
+    assert ORDER_TABLE.cell(ORDER_TABLE.rows[0], '商品编号') is None
+
+
+def test_find_rows_any_column():
+    assert len(ORDER_TABLE.find_rows('WEN测试直营门店01')) == 2
+    assert ORDER_TABLE.find_rows('不存在') == []
+
+
+def test_product_rows_from_fallback_text():
+    from tests.modules.order_module import assert_product_rows
+    product_table = TableData(['商品编号', '商品名称'], [['T20251128012', '测试商品']])
+    page_text = '商品编号 商品名称 T20251128012 测试商品'
+    # 备选选择器找到的是行文本，不能按表格列取值
+    assert_product_rows(page_text, product_table, ['T20251128012 测试商品'], 1, 'T20251128012', '测试商品')
+    assert_product_rows(
+        page_text, product_table, product_table.lookup_all('商品编号', 'T20251128012'),
+        1, 'T20251128012', '测试商品', rows_from_table=True
+    )
+    # 没有找到商品行或页面中没有该商品时校验失败
+    with pytest.raises(AssertionError, match='商品行数量不足'):
+        assert_product_rows(page_text, product_table, [], 1, 'T20251128012', '测试商品')
+    with pytest.raises(AssertionError, match='商品编号'):
+        assert_product_rows(page_text, product_table, ['T2025 其他'], 1, 'T20251128099', '测试商品')
+
+
+def test_order_list_row():
+    from tests.modules.order_module import assert_order_list_row, find_order_row_in_table
+    table_row, row_text = find_order_row_in_table(ORDER_TABLE, '342512080002')
+    assert row_text == ' 342512080002 已审核 WEN测试直营门店01 总部分配 2025-12-08'
+    assert find_order_row_in_table(ORDER_TABLE, '3425120800') == (None, '')
+    assert find_order_row_in_table(None, '342512080002') == (None, '')
+
+    assert_order_list_row(row_text, ORDER_TABLE, table_row, '已审核', 'WEN测试直营门店01', '总部分配', '2025-12-08')
+    # 按列取值：其他列中的文本不能满足该列的校验
+    with pytest.raises(AssertionError, match='来源'):
+        assert_order_list_row(row_text, ORDER_TABLE, table_row, '已审核', 'WEN测试直营门店01', '2025', '2025-12-08')
+    # 通过其他方法找到的行文本按整行校验
+    assert_order_list_row(row_text, None, None, '已审核', 'WEN测试直营门店01', '2025', '2025-12-08')
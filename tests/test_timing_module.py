@@ -0,0 +1,185 @@
+"""
+步骤耗时测试
+验证嵌套步骤、等待耗时累计、选择器回退记录、调用统计开关、会话级记录和JSON合并
+"""
+
+import asyncio
+import json
+import time
+import pytest
+from tests.modules import timing_module
+from tests.modules.timing_module import (
+    SESSION_TIMINGS_KEY,
+    get_test_timings,
+    measure_wait,
+    merge_step_timings,
+    record_selector,
+    reset_step_timings,
+    session_timings,
+    set_current_test,
+    timed_step,
+    write_step_timings
+)
+from tests.modules.worker_module import run_coroutine
+
+
+@timed_step('外层步骤')
+def outer_step():
+    inner_step()
+    record_selector('queryButton', 'button:has-text("查询")', ['button[type="submit"]'])
+    record_selector('loginButton', 'button[type="submit"]', [])
+
+
+@timed_step('内层步骤')
+def inner_step():
+    short_wait()
+
+
+@measure_wait
+def short_wait():
+    nested_wait()
+    time.sleep(0.02)
+
+
+@measure_wait
+def nested_wait():
+    time.sleep(0.01)
+
+
+def test_nested_steps(request):
+    set_current_test('fake::test_nested')
+    outer_step()
+    set_current_test(request.node.nodeid)
+
+    [outer] = get_test_timings('fake::test_nested')
+    assert outer['name'] == 'outer_step'
+    assert outer['status'] == 'passed'
+    [inner] = outer['children']
+    assert inner['title'] == '内层步骤'
+    # 嵌套的条件等待只计一次，且累计到外层步骤
+    assert 25 <= inner['wait_ms'] < 200
+    assert outer['wait_ms'] == inner['wait_ms']
+    assert outer['duration_ms'] >= inner['duration_ms']
+    # 只记录发生回退的选择器
+    assert outer['selector_fallbacks'] == [
+        {'key': 'queryButton', 'winner': 'button:has-text("查询")', 'missed': ['button[type="submit"]']}
+    ]
+
+
+def test_failed_step_is_recorded(request):
+    set_current_test('fake::test_failed')
+    with pytest.raises(ValueError):
+        with timed_step('失败步骤'):
+            raise ValueError('boom')
+    set_current_test(request.node.nodeid)
+
+    [record] = get_test_timings('fake::test_failed')
+    assert record['status'] == 'failed'
+    assert 'boom' in record['error']
+    assert timing_module._stack_var.get() == ()
+
+
+def test_call_counting_is_opt_in(request, monkeypatch):
+    installs = []
+    monkeypatch.setattr(timing_module, '_install_call_counter', lambda: installs.append(True))
+    set_current_test('fake::test_calls')
+    monkeypatch.delenv('STEP_TIMING_CALLS', raising=False)
+    with timed_step('默认步骤'):
+        pass
+    assert installs == []
+
+    # 启用后才包装Playwright的公开API
+    monkeypatch.setenv('STEP_TIMING_CALLS', 'true')
+    with timed_step('统计调用的步骤'):
+        pass
+    set_current_test(request.node.nodeid)
+    assert installs == [True]
+
+
+def test_counting_method(request):
+    class FakePage:
+        def goto(self, url):
+            return url
+
+        def wait_for_timeout(self, timeout):
+            time.sleep(timeout / 1000)
+
+    goto = timing_module._counting_method('Page.goto', FakePage.goto)
+    wait = timing_module._counting_method('Page.wait_for_timeout', FakePage.wait_for_timeout)
+    page = FakePage()
+    # 步骤外的调用不计数
+    goto(page, 'https://boh.example.com')
+    set_current_test('fake::test_counting')
+    with timed_step('统计调用的步骤') as record:
+        assert goto(page, 'https://boh.example.com') == 'https://boh.example.com'
+        wait(page, 20)
+    set_current_test(request.node.nodeid)
+    assert record['playwright_calls'] == 2
+    assert record['calls_by_method'] == {'Page.goto': 1, 'Page.wait_for_timeout': 1}
+    assert 15 <= record['sleep_ms'] < 200
+
+
+def test_session_timings(request):
+    set_current_test('fake::test_first')
+    with session_timings():
+        with timed_step('会话级登录'):
+            pass
+    with timed_step('测试步骤'):
+        pass
+    set_current_test(request.node.nodeid)
+    assert [record['title'] for record in get_test_timings('fake::test_first')] == ['测试步骤']
+    assert '会话级登录' in [record['title'] for record in get_test_timings(SESSION_TIMINGS_KEY)]
+
+
+@timed_step('异步外层步骤')
+async def async_outer_step(delay):
+    await async_inner_step(delay)
+
+
+@timed_step('异步内层步骤')
+async def async_inner_step(delay):
+    await async_short_wait(delay)
+
+
+@measure_wait
+async def async_short_wait(delay):
+    await asyncio.sleep(delay)
+
+
+def test_concurrent_async_steps(request):
+    set_current_test('fake::test_async')
+
+    async def run_pages():
+        # 同一个事件循环中并发执行的步骤各自嵌套，不会挂到其他任务的步骤下
+        await asyncio.gather(async_outer_step(0.01), async_outer_step(0.05))
+
+    run_coroutine(run_pages())
+    set_current_test(request.node.nodeid)
+
+    fast, slow = sorted(get_test_timings('fake::test_async'), key=lambda record: record['wait_ms'])
+    for record in (fast, slow):
+        assert record['title'] == '异步外层步骤'
+        [inner] = record['children']
+        assert inner['title'] == '异步内层步骤'
+        assert record['wait_ms'] == inner['wait_ms']
+    assert 5 <= fast['wait_ms'] < 45 <= slow['wait_ms']
+    assert timing_module._stack_var.get() == ()
+
+
+def test_write_and_merge(tmp_path):
+    worker_file = write_step_timings(tmp_path / 'gw0' / 'step-timings.json')
+    stale_file = tmp_path / 'gw1' / 'step-timings.json'
+    stale_file.parent.mkdir()
+    stale_file.write_text(json.dumps({'run_id': 'old', 'tests': {'old::test': []}}), encoding='utf-8')
+
+    merged = merge_step_timings([worker_file, stale_file], tmp_path / 'step-timings.json')
+    data = json.loads(merged.read_text(encoding='utf-8'))
+    assert 'old::test' not in data['tests']
+    assert data['run_id'] == timing_module.get_run_id()
+
+
+def test_reset_step_timings(monkeypatch):
+    monkeypatch.setattr(timing_module, '_records', {'fake::test': [{'title': '步骤'}]})
+    reset_step_timings()
+    assert timing_module._records == {}
+    assert timing_module._current_test is None
@@ -0,0 +1,78 @@
+"""
+页面性能采集测试
+验证URL_CONFIG条目归类、指标记录到当前步骤、采集失败不影响测试和指标摘要
+"""
+
+from tests.modules.timing_module import get_test_timings, set_current_test, timed_step
+from tests.modules.web_vitals_module import (
+    format_page_metrics,
+    get_metrics_key,
+    get_page_metrics,
+    measure_navigation
+)
+
+
+class FakePage:
+    """按调用顺序返回mark和采集结果的页面"""
+
+    def __init__(self, url, error=None):
+        self.url = url
+        self.error = error
+        self.calls = []
+
+    def is_closed(self):
+        return False
+
+    def evaluate(self, script, arg=None):
+        self.calls.append(arg)
+        if self.error:
+            raise self.error
+        if arg is None:
+            return {'timeOrigin': 1.0, 'now': 10.0, 'resources': 3}
+        return {
+            'url': self.url,
+            'navigation': None,
+            'elapsed_ms': 420.0,
+            'lcp_ms': 380.0,
+            'cls': 0.012,
+            'inp_ms': None,
+            'long_tasks_ms': 0,
+            'resources': {'count': 12, 'transfer_bytes': 204800, 'encoded_bytes': 190000}
+        }
+
+
+@timed_step('导航到订货页面')
+@measure_navigation
+def fake_navigate(page):
+    return 'done'
+
+
+def test_metrics_key():
+    assert get_metrics_key('https://boh.hexcloud.cn/store-supply/demand-daily?start=2025-12-01') == 'storeOperations.order'
+    assert get_metrics_key('https://boh.hexcloud.cn/store-supply/receive-diff/123') == 'storeOperations.receiveDiff'
+    assert get_metrics_key('https://boh.hexcloud.cn/login') == '/login'
+
+
+def test_metrics_recorded_on_step(request, monkeypatch):
+    monkeypatch.delenv('WEB_VITALS', raising=False)
+    page = FakePage('https://boh.hexcloud.cn/store-supply/demand-daily')
+    set_current_test('fake::test_vitals')
+    assert fake_navigate(page) == 'done'
+    # 采集失败只输出警告
+    assert fake_navigate(FakePage('about:blank', error=RuntimeError('Target closed'))) == 'done'
+    monkeypatch.setenv('WEB_VITALS', 'false')
+    disabled_page = FakePage('https://boh.hexcloud.cn/store-supply/demand-daily')
+    fake_navigate(disabled_page)
+    set_current_test(request.node.nodeid)
+
+    # 采集时传入步骤开始时的mark
+    assert page.calls == [None, {'timeOrigin': 1.0, 'now': 10.0, 'resources': 3}]
+    assert disabled_page.calls == []
+    records = get_test_timings('fake::test_vitals')
+    assert [len(record['page_metrics']) for record in records] == [1, 0, 0]
+    [metrics] = get_page_metrics(records)
+    assert metrics['key'] == 'storeOperations.order'
+    assert metrics['step'] == 'fake_navigate'
+    assert format_page_metrics(metrics) == (
+        '📊 页面性能 storeOperations.order: 路由切换 420ms, LCP 380ms, CLS 0.012, 资源 12 个 (200KB)'
+    )
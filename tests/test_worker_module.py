@@ -0,0 +1,31 @@
+"""
+文件锁测试
+验证锁的获取与释放、等待超时抛出TimeoutError，以及过期锁文件被清理
+"""
+
+import os
+import time
+import pytest
+from tests.modules.worker_module import file_lock
+
+
+def test_file_lock_timeout(tmp_path):
+    lock_path = tmp_path / 'cache.lock'
+    with file_lock(lock_path):
+        assert lock_path.exists()
+        # 锁被占用时超时抛出异常，不加锁继续执行
+        with pytest.raises(TimeoutError):
+            with file_lock(lock_path, timeout=0.3):
+                pytest.fail('获得了已被占用的锁')
+        assert lock_path.exists()
+    assert not lock_path.exists()
+
+
+def test_file_lock_stale(tmp_path):
+    lock_path = tmp_path / 'cache.lock'
+    lock_path.write_text('12345 gw0')
+    stale = time.time() - 600
+    os.utime(lock_path, (stale, stale))
+    with file_lock(lock_path, timeout=1, stale_after=300):
+        assert lock_path.read_text() != '12345 gw0'
+    assert not lock_path.exists()